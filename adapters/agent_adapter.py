@@ -1,6 +1,16 @@
 """Adapters that expose agent capabilities for the workflow.
 
 Tests can call `reset_agent_adapter()` to clear the shared singleton between runs.
+
+The OpenAI and Gemini adapters run the intent and entity calls of
+`analyze_message` concurrently on the shared llm pool (utils.executors), so
+legacy-mode analysis costs the slower of the two round trips instead of their
+sum. With OE_FUSED_ANALYSIS=1 they instead ask for intent, confidence and
+entities in a single call, falling back to the two concurrent calls when the
+fused response is malformed.
+
+Environment:
+    OE_FUSED_ANALYSIS: 1 to use the single-call analysis schema (default: 0)
 """
 
 from __future__ import annotations
@@ -10,21 +20,95 @@ import logging
 import os
 import re
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 from domain import IntentLabel
 from llm.client import get_openai_client
+from llm.prompt_cache import prompt_call, report_gemini_usage, report_openai_usage
+from llm.provider_router import router_attempt_active
+from utils.cancellation import call_timeout, check_cancelled, llm_call
+from utils.executors import POOL_LLM, run_tasks
 
 import warnings
 
-try:  # pragma: no cover - optional dependency resolved at runtime
-    # Suppress deprecation warning until migration to google-genai SDK is complete
-    warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
-    import google.genai as genai # type: ignore
-except Exception:  # pragma: no cover - library may be unavailable in tests
-    genai = None  # type: ignore
+# google-genai takes ~1s to import; load it when a Gemini adapter is first built
+_GENAI_UNSET = object()
+genai: Any = _GENAI_UNSET
+
+
+def _load_genai() -> Any:
+    """Import google.genai on first use (None when the SDK is unavailable)."""
+    global genai
+    if genai is _GENAI_UNSET:
+        try:  # pragma: no cover - optional dependency resolved at runtime
+            # Suppress deprecation warning until migration to google-genai SDK is complete
+            warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
+            import google.genai as _genai  # type: ignore
+        except Exception:  # pragma: no cover - library may be unavailable in tests
+            _genai = None  # type: ignore
+        genai = _genai
+    return genai
+
+
+def _fused_analysis_enabled() -> bool:
+    return os.getenv("OE_FUSED_ANALYSIS", "0") == "1"
+
+
+def _intent_from_payload(payload: Dict[str, Any]) -> Tuple[str, float]:
+    """Normalise an {"intent", "confidence"} JSON payload to (intent label, confidence)."""
+    intent = str(payload.get("intent") or "").strip().lower()
+    if intent not in {IntentLabel.EVENT_REQUEST.value, IntentLabel.NON_EVENT.value}:
+        intent = IntentLabel.NON_EVENT.value
+    try:
+        confidence = float(payload.get("confidence"))
+    except (TypeError, ValueError):
+        confidence = 0.5
+    return intent, max(0.0, min(1.0, confidence))
+
+
+def _analysis_prompt(entity_prompt: str) -> str:
+    """Fused single-call prompt: intent + confidence with the entity schema under "fields"."""
+    return (
+        "Classify the email below as an event booking request or something else, and extract "
+        "its booking details. Respond with ONLY a JSON object: {\"intent\": \"event_request\" "
+        "or \"other\", \"confidence\": 0.0 to 1.0, \"fields\": {...}}. "
+        f"Instructions for \"fields\": {entity_prompt}"
+    )
+
+
+def _analyze_fused(adapter: Any, msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Single-call analysis using the adapter's _ANALYSIS_PROMPT on its entity model."""
+    payload = adapter._run_completion(
+        prompt=adapter._ANALYSIS_PROMPT,
+        body=msg.get("body") or "",
+        subject=msg.get("subject") or "",
+        model_name=adapter._entity_model,
+        call_type="analysis_fused",
+        context=f"Today is {date.today().strftime('%Y-%m-%d')}.",
+    )
+    raw_fields = payload.get("fields")
+    if not payload.get("intent") or not isinstance(raw_fields, dict):
+        raise ValueError("fused analysis response is missing intent or fields")
+    intent, confidence = _intent_from_payload(payload)
+    fields = {key: raw_fields.get(key) for key in adapter._ENTITY_KEYS}
+    return {"intent": intent, "confidence": confidence, "fields": fields}
+
+
+def _analyze_remote(adapter: Any, msg: Dict[str, Any]) -> Dict[str, Any]:
+    """analyze_message for the LLM adapters: one fused call, or intent + entities concurrently."""
+    if _fused_analysis_enabled():
+        try:
+            return _analyze_fused(adapter, msg)
+        except Exception as exc:
+            logger.warning("[ANALYSIS] fused call failed, using two calls: %s: %s", type(exc).__name__, exc)
+    (intent, confidence), fields = run_tasks(
+        POOL_LLM,
+        [lambda: adapter.route_intent(msg), lambda: adapter.extract_entities(msg)],
+        max_in_flight=2,
+    )
+    return {"intent": intent, "confidence": confidence, "fields": fields}
 
 
 class AgentAdapter:
@@ -67,6 +151,7 @@ class AgentAdapter:
         temperature: float = 0.1,
         max_tokens: int = 1000,
         json_mode: bool = False,
+        model: Optional[str] = None,
     ) -> str:
         """Run a raw completion with a custom prompt.
 
@@ -79,12 +164,33 @@ class AgentAdapter:
             temperature: Sampling temperature (default 0.1 for consistency)
             max_tokens: Max tokens in response
             json_mode: Whether to request JSON output
+            model: Override the adapter's intent model for this call
 
         Returns:
             Raw text response from the LLM
         """
         raise NotImplementedError("complete must be implemented by subclasses.")
 
+    def complete_stream(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """Stream a raw prose completion as text deltas.
+
+        Providers without native streaming yield the full `complete()` result
+        as a single delta, so callers can always iterate.
+        """
+        yield self.complete(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
 
 class StubAgentAdapter(AgentAdapter):
     """Deterministic heuristic stub replicating the pre-agent workflow behaviour."""
@@ -358,6 +464,7 @@ class StubAgentAdapter(AgentAdapter):
         temperature: float = 0.1,
         max_tokens: int = 1000,
         json_mode: bool = False,
+        model: Optional[str] = None,
     ) -> str:
         """Stub implementation returns a minimal JSON response for testing."""
         # For unified detection, return a basic structure
@@ -395,21 +502,24 @@ class OpenAIAgentAdapter(AgentAdapter):
         "Classify the email below. Respond with JSON object {\"intent\": <event_request|other>, "
         "\"confidence\": <0-1 float>}."
     )
-    _ENTITY_PROMPT_TEMPLATE = (
-        "Today is {today}. Extract booking details from the email. "
+    # Static (cacheable) instructions; today's date goes into the user message
+    _ENTITY_PROMPT = (
+        "Extract booking details from the email. "
         "Return JSON with keys: date (YYYY-MM-DD or null), "
         "start_time, end_time, city, participants, room, name, email, "
         "type (event type like wedding/workshop/dinner - NOT room descriptors), "
         "room_type_hint (room descriptor like 'conference room', 'meeting room', 'training room' - null if not mentioned), "
         "catering, phone, company, language, notes, billing_address, "
-        "products_add (array of {{name, quantity}} for items to add), "
+        "products_add (array of {name, quantity} for items to add), "
         "products_remove (array of product names to remove). Use null when unknown. "
         "IMPORTANT: When a year is explicitly mentioned (e.g., '2026'), use that exact year. "
         "For vague dates like 'late spring' or 'next month', return null for date. "
-        "For 'add another X' or 'one more X', include {{\"name\": \"X\", \"quantity\": 1}} in products_add. "
+        "For 'add another X' or 'one more X', include {\"name\": \"X\", \"quantity\": 1} in products_add. "
         "IMPORTANT: room_type_hint is for room descriptors only, NOT equipment like 'video conferencing'."
     )
 
+    _ANALYSIS_PROMPT = _analysis_prompt(_ENTITY_PROMPT)
+
     _ENTITY_KEYS = [
         "date",
         "start_time",
@@ -449,8 +559,13 @@ class OpenAIAgentAdapter(AgentAdapter):
         body: str,
         subject: str,
         model_name: str,
+        call_type: str = "analysis",
+        context: str = "",
     ) -> Dict[str, Any]:
-        message = f"Subject: {subject}\n\nBody:\n{body}"
+        # prompt is the static system prompt (cacheable prefix); per-turn
+        # context and the email follow in the user message
+        message = f"{context}\n\n" if context else ""
+        message += f"Subject: {subject}\n\nBody:\n{body}"
         kwargs: Dict[str, Any] = {
             "model": model_name,
             "messages": [
@@ -462,7 +577,12 @@ class OpenAIAgentAdapter(AgentAdapter):
         # O-series models (o1, o3, etc.) don't support temperature parameter
         if not model_name.startswith("o"):
             kwargs["temperature"] = 0
-        response = self._client.chat.completions.create(**kwargs)
+        timeout = call_timeout()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        with llm_call("openai.analysis"), prompt_call(call_type, prompt, prompt_text=f"{prompt}\n{message}"):
+            response = self._client.chat.completions.create(**kwargs)
+            report_openai_usage(getattr(response, "usage", None))
         try:
             return json.loads(response.choices[0].message.content or "{}")
         except Exception:
@@ -471,6 +591,8 @@ class OpenAIAgentAdapter(AgentAdapter):
     def _select_fallback_strategy(self, error: Exception, operation: str) -> str:
         error_msg = f"[OPENAI FALLBACK] {operation} failed: {type(error).__name__}: {error}"
         logger.error(error_msg)
+        if router_attempt_active():
+            return "raise"
         return "stub"
 
     def route_intent(self, msg: Dict[str, Any]) -> Tuple[str, float]:
@@ -482,17 +604,9 @@ class OpenAIAgentAdapter(AgentAdapter):
                 body=body,
                 subject=subject,
                 model_name=self._intent_model,
+                call_type="intent_classification",
             )
-            intent = str(payload.get("intent") or "").strip().lower()
-            if intent not in {IntentLabel.EVENT_REQUEST.value, IntentLabel.NON_EVENT.value}:
-                intent = IntentLabel.NON_EVENT.value
-            confidence_raw = payload.get("confidence")
-            try:
-                confidence = float(confidence_raw)
-            except (TypeError, ValueError):
-                confidence = 0.5
-            confidence = max(0.0, min(1.0, confidence))
-            return intent or IntentLabel.NON_EVENT.value, confidence
+            return _intent_from_payload(payload)
         except Exception as e:
             # Log when OpenAI fails and fallback to stub
             error_msg = f"[OPENAI FALLBACK] route_intent failed: {type(e).__name__}: {e}"
@@ -503,14 +617,15 @@ class OpenAIAgentAdapter(AgentAdapter):
         subject = msg.get("subject") or ""
         body = msg.get("body") or ""
         try:
-            # Build prompt with today's date for accurate year extraction
+            # Today's date for accurate year extraction
             today_str = date.today().strftime("%Y-%m-%d")
-            prompt = self._ENTITY_PROMPT_TEMPLATE.format(today=today_str)
             payload = self._run_completion(
-                prompt=prompt,
+                prompt=self._ENTITY_PROMPT,
                 body=body,
                 subject=subject,
                 model_name=self._entity_model,
+                call_type="entity_extraction",
+                context=f"Today is {today_str}.",
             )
             entities: Dict[str, Any] = {}
             for key in self._ENTITY_KEYS:
@@ -527,9 +642,7 @@ class OpenAIAgentAdapter(AgentAdapter):
 
     def analyze_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
         """Combine intent classification and entity extraction into a single response."""
-        intent, confidence = self.route_intent(msg)
-        fields = self.extract_entities(msg)
-        return {"intent": intent, "confidence": confidence, "fields": fields}
+        return _analyze_remote(self, msg)
 
     def complete(
         self,
@@ -539,21 +652,69 @@ class OpenAIAgentAdapter(AgentAdapter):
         temperature: float = 0.1,
         max_tokens: int = 1000,
         json_mode: bool = False,
+        model: Optional[str] = None,
     ) -> str:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        response = self._client.chat.completions.create(
-            model=self._intent_model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            #response_format={"type": "json_object"} if json_mode else None,
-        )
+        extra: Dict[str, Any] = {}
+        timeout = call_timeout()
+        if timeout is not None:
+            extra["timeout"] = timeout
+        with llm_call("openai.complete"):
+            response = self._client.chat.completions.create(
+                model=model or self._intent_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                #response_format={"type": "json_object"} if json_mode else None,
+                **extra,
+            )
+            report_openai_usage(getattr(response, "usage", None))
         return response.choices[0].message.content or ""
 
+    def complete_stream(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        extra: Dict[str, Any] = {}
+        timeout = call_timeout()
+        if timeout is not None:
+            extra["timeout"] = timeout
+        # The whole stream counts as one LLM call; every chunk is a checkpoint
+        with llm_call("openai.complete_stream"):
+            stream = self._client.chat.completions.create(
+                model=self._intent_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **extra,
+            )
+            try:
+                for chunk in stream:
+                    check_cancelled("openai.complete_stream")
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+
 
 class GeminiAgentAdapter(AgentAdapter):
     """Adapter backed by Google Gemini for intent/entity tasks.
@@ -568,20 +729,23 @@ class GeminiAgentAdapter(AgentAdapter):
         "\"confidence\": 0.0 to 1.0}. No other text."
     )
 
-    _ENTITY_PROMPT_TEMPLATE = (
-        "Today is {today}. Extract booking details from this email. "
+    # Static (cacheable) instructions; today's date goes into the user message
+    _ENTITY_PROMPT = (
+        "Extract booking details from this email. "
         "Return ONLY a JSON object with these keys (use null when unknown): "
         "date (YYYY-MM-DD), start_time, end_time, city, participants (integer), "
         "room, name, email, type (event type like wedding/workshop - NOT room descriptors), "
         "room_type_hint (room descriptor like 'conference room', 'meeting room' - null if not mentioned), "
         "catering, phone, company, language, notes, "
-        "billing_address, products_add (array of {{name, quantity}}), "
+        "billing_address, products_add (array of {name, quantity}), "
         "products_remove (array of product names). "
         "IMPORTANT: Use the exact year mentioned (e.g., '2026'). "
         "For vague dates like 'late spring', return null for date. "
         "room_type_hint is for room descriptors only, NOT equipment like 'video conferencing'."
     )
 
+    _ANALYSIS_PROMPT = _analysis_prompt(_ENTITY_PROMPT)
+
     _ENTITY_KEYS = [
         "date", "start_time", "end_time", "city", "participants", "room",
         "name", "email", "type", "room_type_hint", "catering", "phone", "company", "language",
@@ -589,14 +753,15 @@ class GeminiAgentAdapter(AgentAdapter):
     ]
 
     def __init__(self) -> None:
-        if genai is None:
+        genai_module = _load_genai()
+        if genai_module is None:
             raise RuntimeError("google-genai package is required when AGENT_MODE=gemini")
 
         api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("gemini_key_openevent")
         if not api_key:
             raise RuntimeError("GOOGLE_API_KEY (or gemini_key_openevent) is required")
 
-        self._client = genai.Client(api_key=api_key)
+        self._client = genai_module.Client(api_key=api_key)
 
         model = os.getenv("GEMINI_AGENT_MODEL", "gemini-2.0-flash")
         self._intent_model = os.getenv("GEMINI_INTENT_MODEL", model)
@@ -611,19 +776,26 @@ class GeminiAgentAdapter(AgentAdapter):
         body: str,
         subject: str,
         model_name: str,
+        call_type: str = "analysis",
+        context: str = "",
     ) -> Dict[str, Any]:
         from google.genai import types
 
-        message = f"Subject: {subject}\n\nBody:\n{body}"
+        # Static instructions first (cacheable prefix), then context and email
+        message = f"{context}\n\n" if context else ""
+        message += f"Subject: {subject}\n\nBody:\n{body}"
+        contents = f"{prompt}\n\n{message}"
 
-        response = self._client.models.generate_content(
-            model=model_name,
-            contents=f"{prompt}\n\n{message}",
-            config=types.GenerateContentConfig(
-                temperature=0,
-                response_mime_type="application/json",
-            ),
-        )
+        with llm_call("gemini.analysis"), prompt_call(call_type, prompt, prompt_text=contents):
+            response = self._client.models.generate_content(
+                model=model_name,
+                contents=contents,
+                config=types.GenerateContentConfig(
+                    temperature=0,
+                    response_mime_type="application/json",
+                ),
+            )
+            report_gemini_usage(getattr(response, "usage_metadata", None))
 
         try:
             return json.loads(response.text or "{}")
@@ -638,6 +810,9 @@ class GeminiAgentAdapter(AgentAdapter):
         """
         error_msg = f"[GEMINI FALLBACK] {operation} failed: {type(error).__name__}: {error}"
         logger.error(error_msg)
+        # Inside a provider-router attempt the router picks the next provider
+        if router_attempt_active():
+            return "raise"
         return "stub"
 
     def route_intent(self, msg: Dict[str, Any]) -> Tuple[str, float]:
@@ -649,17 +824,9 @@ class GeminiAgentAdapter(AgentAdapter):
                 body=body,
                 subject=subject,
                 model_name=self._intent_model,
+                call_type="intent_classification",
             )
-            intent = str(payload.get("intent") or "").strip().lower()
-            if intent not in {IntentLabel.EVENT_REQUEST.value, IntentLabel.NON_EVENT.value}:
-                intent = IntentLabel.NON_EVENT.value
-            confidence_raw = payload.get("confidence")
-            try:
-                confidence = float(confidence_raw)
-            except (TypeError, ValueError):
-                confidence = 0.5
-            confidence = max(0.0, min(1.0, confidence))
-            return intent or IntentLabel.NON_EVENT.value, confidence
+            return _intent_from_payload(payload)
         except Exception as e:
             strategy = self._select_fallback_strategy(e, "intent")
             if strategy == "stub":
@@ -671,12 +838,13 @@ class GeminiAgentAdapter(AgentAdapter):
         body = msg.get("body") or ""
         try:
             today_str = date.today().strftime("%Y-%m-%d")
-            prompt = self._ENTITY_PROMPT_TEMPLATE.format(today=today_str)
             payload = self._run_completion(
-                prompt=prompt,
+                prompt=self._ENTITY_PROMPT,
                 body=body,
                 subject=subject,
                 model_name=self._entity_model,
+                call_type="entity_extraction",
+                context=f"Today is {today_str}.",
             )
             entities: Dict[str, Any] = {}
             for key in self._ENTITY_KEYS:
@@ -698,9 +866,7 @@ class GeminiAgentAdapter(AgentAdapter):
 
     def analyze_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
         """Combine intent classification and entity extraction into a single response."""
-        intent, confidence = self.route_intent(msg)
-        fields = self.extract_entities(msg)
-        return {"intent": intent, "confidence": confidence, "fields": fields}
+        return _analyze_remote(self, msg)
 
     def complete(
         self,
@@ -710,6 +876,7 @@ class GeminiAgentAdapter(AgentAdapter):
         temperature: float = 0.1,
         max_tokens: int = 1000,
         json_mode: bool = False,
+        model: Optional[str] = None,
     ) -> str:
         """Run a raw completion with Gemini."""
         from google.genai import types
@@ -729,11 +896,13 @@ class GeminiAgentAdapter(AgentAdapter):
                 config_kwargs["response_mime_type"] = "application/json"
 
             # Use client.models.generate_content (new SDK style)
-            response = self._client.models.generate_content(
-                model=self._intent_model,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(**config_kwargs),
-            )
+            with llm_call("gemini.complete"):
+                response = self._client.models.generate_content(
+                    model=model or self._intent_model,
+                    contents=full_prompt,
+                    config=types.GenerateContentConfig(**config_kwargs),
+                )
+                report_gemini_usage(getattr(response, "usage_metadata", None))
 
             return response.text if response else "{}"
         except Exception as e:
@@ -742,6 +911,46 @@ class GeminiAgentAdapter(AgentAdapter):
                 return self._fallback.complete(prompt, system_prompt=system_prompt, json_mode=json_mode)
             raise
 
+    def complete_stream(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """Stream a prose completion with Gemini.
+
+        Errors propagate (no stub fallback): the streaming verbalizer switches
+        to its deterministic fallback text instead.
+        """
+        from google.genai import types
+
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+
+        config_kwargs: Dict[str, Any] = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+        timeout = call_timeout()
+        if timeout is not None:
+            config_kwargs["http_options"] = types.HttpOptions(timeout=int(timeout * 1000))  # milliseconds
+
+        # The whole stream counts as one LLM call; every chunk is a checkpoint
+        with llm_call("gemini.complete_stream"):
+            chunks = self._client.models.generate_content_stream(
+                model=self._intent_model,
+                contents=full_prompt,
+                config=types.GenerateContentConfig(**config_kwargs),
+            )
+            for chunk in chunks:
+                check_cancelled("gemini.complete_stream")
+                text = getattr(chunk, "text", None)
+                if text:
+                    yield text
+
 _AGENT_SINGLETON: Optional[AgentAdapter] = None
 
 # Per-provider singletons for hybrid mode
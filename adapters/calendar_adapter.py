@@ -1,6 +1,9 @@
 """Adapters for reading calendar fixtures to support availability checks.
 
-The shared singleton can be reset in tests via `reset_calendar_adapter()`.
+Adapters are kept per tenant: a team with its own `calendar_data/<team_id>/`
+directory gets an adapter (and memo cache) of its own, every other team shares
+the default adapter over `calendar_data/`. The shared adapters can be reset in
+tests via `reset_calendar_adapter()`.
 """
 
 from __future__ import annotations
@@ -8,11 +11,12 @@ from __future__ import annotations
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
 from utils import json_io
 
-_CALENDAR_SINGLETON: Optional["CalendarAdapter"] = None
+_DEFAULT_TENANT = "default"
+_CALENDAR_ADAPTERS: Dict[str, "CalendarAdapter"] = {}
 
 
 class CalendarAdapter:
@@ -66,21 +70,38 @@ def ensure_calendar_dir() -> None:
     path.mkdir(exist_ok=True)
 
 
+def _current_tenant() -> str:
+    try:
+        # Imported here: adapters do not depend on the workflow layer at import time
+        from workflows.io.tenants import current_tenant_id, tenant_key
+    except ImportError:  # pragma: no cover - workflow layer not available
+        return _DEFAULT_TENANT
+    tenant = current_tenant_id()
+    return tenant_key(tenant) if tenant != _DEFAULT_TENANT else tenant
+
+
 def get_calendar_adapter(data_dir: Path | None = None) -> CalendarAdapter:
-    """Return a shared calendar adapter instance (tests may pass a custom path)."""
+    """Return the current tenant's shared calendar adapter (tests may pass a custom path)."""
 
-    global _CALENDAR_SINGLETON
     if data_dir is not None:
         return CalendarAdapter(data_dir)
-    if _CALENDAR_SINGLETON is None:
-        _CALENDAR_SINGLETON = CalendarAdapter()
-    return _CALENDAR_SINGLETON
+    tenant = _current_tenant()
+    adapter = _CALENDAR_ADAPTERS.get(tenant)
+    if adapter is not None:
+        return adapter
+    default = _CALENDAR_ADAPTERS.get(_DEFAULT_TENANT)
+    if default is None:
+        default = _CALENDAR_ADAPTERS.setdefault(_DEFAULT_TENANT, CalendarAdapter())
+    if tenant == _DEFAULT_TENANT:
+        return default
+    tenant_dir = default.data_dir / tenant
+    adapter = CalendarAdapter(tenant_dir) if tenant_dir.is_dir() else default
+    return _CALENDAR_ADAPTERS.setdefault(tenant, adapter)
 
 
 def reset_calendar_adapter() -> None:
-    """Reset the shared calendar adapter."""
+    """Reset the shared calendar adapters of every tenant."""
 
-    global _CALENDAR_SINGLETON
-    if _CALENDAR_SINGLETON is not None:
-        _CALENDAR_SINGLETON.clear_cache()
-    _CALENDAR_SINGLETON = None
+    for adapter in list(_CALENDAR_ADAPTERS.values()):
+        adapter.clear_cache()
+    _CALENDAR_ADAPTERS.clear()
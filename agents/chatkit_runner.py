@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import os
@@ -12,6 +11,12 @@ from pydantic import ValidationError
 from agents.guardrails import safe_envelope
 from agents.openevent_agent import OpenEventAgent
 from workflows.io.config_store import get_venue_name
+from ux.universal_verbalizer import (
+    VerbalizerStreamEvent,
+    is_streaming_enabled as is_verbalizer_streaming_enabled,
+    verbalizer_stream_sink,
+)
+from utils.cancellation import run_cancellable_turn
 from utils.openai_key import SECRET_NAME, load_openai_api_key
 from agents.tools.dates import (
     SuggestDatesInput,
@@ -751,11 +756,41 @@ async def _fallback_stream(
 
     agent = OpenEventAgent()
     session = agent.create_session(thread_id)
-    envelope = agent.run(session, message)
+    # Turns run like API turns (run_cancellable_turn): in a worker thread,
+    # under a cancel token with the default deadline, after taking one of
+    # the tenant's turn slots.
+    label = f"chatkit:{thread_id}"
+    streaming = is_verbalizer_streaming_enabled()
+    held: List[VerbalizerStreamEvent] = []
+
+    def _run_turn() -> Dict[str, Any]:
+        if not streaming:
+            return agent.run(session, message)
+        with verbalizer_stream_sink(held.append):
+            return agent.run(session, message)
+
+    envelope = await run_cancellable_turn(_run_turn, label=label)
     payload = safe_envelope(envelope)
+    # Verbalizer deltas are draft text. They are held until the envelope says
+    # whether the reply needs HIL review, and are only sent for replies that
+    # go out without it; a draft awaiting approval never reaches the client
+    # early. The workflow path (OpenEventAgent._run_fallback) marks every
+    # reply requires_hil, so there its text arrives with the envelope only.
+    if held and not payload.get("requires_hil"):
+        for event in held:
+            yield f"data: {json.dumps(_verbalizer_event_payload(event))}\n\n"
+    elif held:
+        logger.debug("[CHATKIT] dropped %d verbalizer events of a reply awaiting HIL review", len(held))
     yield f"data: {json.dumps(payload)}\n\n"
 
 
+def _verbalizer_event_payload(event: VerbalizerStreamEvent) -> Dict[str, Any]:
+    """SSE payload for a streamed verbalizer event (delta / reset / final)."""
+    if event.kind == "delta":
+        return {"type": "verbalizer_delta", "delta": event.text}
+    return {"type": f"verbalizer_{event.kind}", "text": event.text}
+
+
 async def run_streamed(thread_id: str, message: Dict[str, Any], state: Dict[str, Any]) -> AsyncGenerator[str, None]:
     """
     Stream the assistant response for ChatKit.
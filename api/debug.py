@@ -25,8 +25,19 @@ def debug_get_timeline(
     granularity: str = "logic",
     kinds: Optional[List[str]] = None,
     as_of_ts: Optional[float] = None,
+    after_seq: Optional[int] = None,
+    event_kinds: Optional[List[str]] = None,
+    tail: Optional[int] = None,
 ) -> Dict[str, Any]:
-    payload = collect_trace_payload(thread_id, granularity=granularity, kinds=kinds, as_of_ts=as_of_ts)
+    payload = collect_trace_payload(
+        thread_id,
+        granularity=granularity,
+        kinds=kinds,
+        as_of_ts=as_of_ts,
+        after_seq=after_seq,
+        event_kinds=event_kinds,
+        tail=tail,
+    )
     return {
         "thread_id": thread_id,
         "confirmed": payload["confirmed"],
@@ -19,9 +19,13 @@ from typing import Optional
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
+from utils.executors import register_portable_context
+
 # Request-scoped tenant context
 CURRENT_TEAM_ID: ContextVar[Optional[str]] = ContextVar("CURRENT_TEAM_ID", default=None)
 CURRENT_MANAGER_ID: ContextVar[Optional[str]] = ContextVar("CURRENT_MANAGER_ID", default=None)
+# Carried into process-pool tasks too (thread-pool tasks copy the whole context)
+register_portable_context(CURRENT_TEAM_ID, CURRENT_MANAGER_ID)
 
 
 def get_request_team_id() -> Optional[str]:
@@ -11,9 +11,10 @@ ROUTES:
     GET  /api/debug/threads/{thread_id}/llm-diagnosis - LLM-optimized diagnosis
     GET  /api/debug/live                             - List active threads with live logs
     GET  /api/debug/threads/{thread_id}/live         - Get live log content
+    GET  /api/debug/memory                           - RSS and bounded debug-state usage
 
 NOTE: These routes are conditionally registered based on DEBUG_TRACE_ENABLED.
-      When tracing is disabled, stub endpoints return 404.
+      When tracing is disabled, stub endpoints return 404 (except /memory).
 
 MIGRATION: Extracted from main.py in Phase C refactoring (2025-12-18).
 """
@@ -30,6 +31,7 @@ from api.debug import (
     render_arrow_log,
     debug_llm_diagnosis,
 )
+from debug.registry import memory_report
 from debug.settings import is_trace_enabled
 
 router = APIRouter(tags=["debug"])
@@ -44,6 +46,12 @@ def _parse_kind_filter(raw: Optional[str]) -> Optional[List[str]]:
     return [item.strip() for item in raw.split(",") if item.strip()]
 
 
+@router.get("/api/debug/memory")
+async def get_debug_memory():
+    """Process RSS plus entries, evictions and approximate bytes per debug-state registry."""
+    return memory_report()
+
+
 if DEBUG_TRACE_ENABLED:
 
     @router.get("/api/debug/threads/{thread_id}")
@@ -67,13 +75,25 @@ if DEBUG_TRACE_ENABLED:
         granularity: str = Query("logic"),
         kinds: Optional[str] = Query(None),
         as_of_ts: Optional[float] = Query(None),
+        after_seq: Optional[int] = Query(None, ge=0),
+        event_kinds: Optional[str] = Query(None),
+        tail: Optional[int] = Query(None, ge=1),
     ):
-        """Get timeline events for a thread."""
+        """
+        Get timeline events for a thread.
+
+        Pollers pass the last seen seq as `after_seq` to receive only new
+        events; `event_kinds` (e.g. DB_WRITE,GATE_FAIL) and `tail` are served
+        from the timeline offset index without reading the whole file.
+        """
         return debug_get_timeline(
             thread_id,
             granularity=granularity,
             kinds=_parse_kind_filter(kinds),
             as_of_ts=as_of_ts,
+            after_seq=after_seq,
+            event_kinds=_parse_kind_filter(event_kinds),
+            tail=tail,
         )
 
     @router.get("/api/debug/threads/{thread_id}/timeline/download")
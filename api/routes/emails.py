@@ -6,6 +6,8 @@ ENDPOINTS:
     POST /api/emails/send-to-client    - Send email to client (after HIL approval)
     POST /api/emails/send-offer        - Send offer email to client
     POST /api/emails/test              - Send test email to verify SMTP config
+    POST /api/emails/ingest            - Start batch ingestion of inbound messages
+    GET  /api/emails/ingest/{job_id}   - Batch ingestion progress and report
 
 INTEGRATION NOTE:
 These endpoints are called AFTER HIL approval to send the actual email to
@@ -20,7 +22,7 @@ In production, these integrate with:
 import logging
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -61,6 +63,13 @@ class TestEmailRequest(BaseModel):
     to_name: Optional[str] = "Test Recipient"
 
 
+class IngestBatchRequest(BaseModel):
+    """Inbound messages (process_msg payloads) to ingest in bulk."""
+    messages: List[Dict[str, Any]]
+    checkpoint: Optional[str] = None  # Reuse a name to resume a crashed run
+    workers: Optional[int] = None
+
+
 # --- Endpoints ---
 
 @router.post("/send-to-client")
@@ -326,3 +335,31 @@ def _log_sent_email(
                     break
         except Exception as e:
             logger.warning("Failed to log email to event: %s", e)
+
+
+@router.post("/ingest")
+async def ingest_batch(request: IngestBatchRequest):
+    """
+    Start a batch ingestion job (mailbox backlog, migration replay).
+
+    Messages are ordered per client thread and processed in parallel across
+    threads; see workflows/runtime/batch_ingest.py. Poll the returned job id
+    for progress, throughput and latency.
+    """
+    from workflows.runtime.batch_ingest import start_ingest_job
+
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="No messages to ingest")
+    job_id = start_ingest_job(request.messages, checkpoint_name=request.checkpoint, workers=request.workers)
+    return {"job_id": job_id, "queued": len(request.messages)}
+
+
+@router.get("/ingest/{job_id}")
+async def ingest_batch_status(job_id: str):
+    """Status and report of a batch ingestion job."""
+    from workflows.runtime.batch_ingest import get_ingest_job
+
+    job = get_ingest_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return job
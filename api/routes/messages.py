@@ -23,7 +23,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 from domain import ConversationState, EventInformation
@@ -40,6 +41,7 @@ from workflows.steps.step2_date_confirmation import compose_date_confirmation_re
 from workflows.common.prompts import append_footer
 from workflows.steps.step3_room_availability import run_availability_workflow
 from utils import json_io
+from utils.cancellation import REASON_DISCONNECT, TurnCancelled, run_cancellable_turn
 from workflow_email import (
     process_msg as wf_process_msg,
     load_db as wf_load_db,
@@ -647,8 +649,15 @@ async def start_conversation(request: StartConversationRequest):
 
 
 @router.post("/api/send-message")
-async def send_message(request: SendMessageRequest):
-    """Send a message in an existing conversation."""
+async def send_message(request: SendMessageRequest, http_request: Request = None):
+    """Send a message in an existing conversation.
+
+    The workflow turn runs in a worker thread with a cancellation token: if
+    the client disconnects (or OE_TURN_DEADLINE_S passes) the turn aborts
+    before its next LLM call without persisting anything. Turns on the same
+    database run concurrently: each save merges the records its turn
+    changed into the file (workflows.io.database.save_db).
+    """
     if request.session_id not in active_conversations:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -683,7 +692,20 @@ async def send_message(request: SendMessageRequest):
     }
 
     try:
-        wf_res = wf_process_msg(payload)
+        wf_res = await run_cancellable_turn(
+            lambda: wf_process_msg(payload),
+            http_request=http_request,
+            label=f"send_message:{request.session_id}",
+        )
+    except TurnCancelled as cancelled:
+        # The turn persisted nothing - drop the unprocessed message from the
+        # history so a resend is not recorded twice.
+        if not is_continuation and conversation_state.conversation_history:
+            conversation_state.conversation_history.pop()
+        logger.info("send_message cancelled at %s (%s)", cancelled.stage, cancelled.reason)
+        if cancelled.reason == REASON_DISCONNECT:
+            return Response(status_code=499)  # client closed request; nobody reads the body
+        raise HTTPException(status_code=504, detail="The request took too long. Please try again.")
     except Exception as exc:
         logger.exception("send_message workflow failed: %s", exc)
 
@@ -747,6 +769,7 @@ async def send_message(request: SendMessageRequest):
                 fallback_ctx
             )
         conversation_state.conversation_history.append({"role": "assistant", "content": assistant_reply})
+        active_conversations[request.session_id] = conversation_state
         return {
             "session_id": request.session_id,
             "workflow_type": conversation_state.workflow_type,
@@ -767,6 +790,7 @@ async def send_message(request: SendMessageRequest):
             conversation_state.event_id,
         )
         conversation_state.conversation_history.append({"role": "assistant", "content": assistant_reply})
+        active_conversations[request.session_id] = conversation_state
         return {
             "session_id": request.session_id,
             "workflow_type": conversation_state.workflow_type,
@@ -788,6 +812,7 @@ async def send_message(request: SendMessageRequest):
             conversation_state.event_id,
         )
         conversation_state.conversation_history.append({"role": "assistant", "content": assistant_reply})
+        active_conversations[request.session_id] = conversation_state
         return {
             "session_id": request.session_id,
             "workflow_type": conversation_state.workflow_type,
@@ -840,6 +865,7 @@ async def send_message(request: SendMessageRequest):
         conversation_state.event_id,
     )
     conversation_state.conversation_history.append({"role": "assistant", "content": assistant_reply})
+    active_conversations[request.session_id] = conversation_state
 
     pending_actions = {"type": "workflow_actions", "actions": action_items} if action_items else None
 
@@ -900,6 +926,7 @@ async def confirm_date(session_id: str, request: ConfirmDateRequest):
     assistant_reply = assistant_payload.get("body") or ""
     actions = assistant_payload.get("actions") or []
     conversation_state.conversation_history.append({"role": "assistant", "content": assistant_reply})
+    active_conversations[session_id] = conversation_state
     pending_actions = {"type": "workflow_actions", "actions": actions} if actions else None
 
     return {
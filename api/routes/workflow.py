@@ -5,6 +5,13 @@ PURPOSE: Workflow status and configuration API endpoints.
 ROUTES:
     GET  /api/workflow/health      - Health check for workflow integration
     GET  /api/workflow/hil-status  - Get HIL toggle status
+    GET  /api/workflow/turn-stats  - Turn cancellation / wasted-work counters
+    GET  /api/workflow/detection-routing - Unified detection router counters
+    GET  /api/workflow/prompt-cache - Prompt prefix reuse / cached-token ratio per call type
+    GET  /api/workflow/provider-router - Provider hedging/failover decisions and health
+    GET  /api/workflow/pricing-engine - Offer pricing memo hits/misses
+    GET  /api/workflow/executors   - Queue depth and utilization per executor pool
+    GET  /api/workflow/tenants     - Per-tenant turn slots, latency, cache and config counters
 
 MIGRATION: Extracted from main.py in Phase C refactoring (2025-12-18).
 """
@@ -13,8 +20,15 @@ import os
 
 from fastapi import APIRouter
 
+from detection.routing import detection_route_stats, get_router_mode
+from llm.prompt_cache import prompt_cache_stats
+from llm.provider_router import is_router_enabled, provider_router_metrics
+from utils.cancellation import cancellation_stats
+from utils.executors import executor_stats
 from workflow_email import DB_PATH as WF_DB_PATH
+from workflows.common.pricing_engine import pricing_engine_stats
 from workflows.io.integration.config import is_hil_all_replies_enabled
+from workflows.io.tenants import tenant_stats
 
 router = APIRouter(tags=["workflow"])
 
@@ -50,3 +64,66 @@ async def get_hil_status():
     return {
         "hil_all_replies_enabled": is_hil_all_replies_enabled(),
     }
+
+
+@router.get("/api/workflow/turn-stats")
+async def get_turn_stats():
+    """Counters for API turns run under a cancellation token.
+
+    turns_cancelled / cancelled_<reason> count aborted turns; wasted_llm_calls,
+    wasted_llm_s and wasted_turn_s measure the work spent on them before the
+    abort; turns_finished_after_cancel counts turns that completed anyway.
+    """
+    return cancellation_stats()
+
+
+@router.get("/api/workflow/detection-routing")
+async def get_detection_routing_stats():
+    """Counters for the unified detection router (detection.routing).
+
+    route_<skip|cheap|full> and reason_<rule> count decisions;
+    llm_calls_avoided / llm_calls_downgraded count applied ones;
+    shadow_agree / shadow_disagree compare skipped results with the LLM in
+    shadow mode.
+    """
+    return {"mode": get_router_mode(), "stats": detection_route_stats()}
+
+
+@router.get("/api/workflow/prompt-cache")
+async def get_prompt_cache_stats():
+    """Prompt-prefix cache telemetry per LLM call type (llm.prompt_cache).
+
+    cached_ratio is cached_tokens / prompt_tokens; sources says whether the
+    numbers came from the provider or the local prefix-cache estimate, and
+    prefix_hashes lists the recent static-prefix hashes seen.
+    """
+    return prompt_cache_stats()
+
+
+@router.get("/api/workflow/provider-router")
+async def get_provider_router_metrics():
+    """Latency-aware provider router decisions (llm.provider_router).
+
+    counters holds calls, hedges, failovers, demotions and which provider
+    served each call type; providers holds the rolling p50/p95 latency and
+    error rate per provider and call type.
+    """
+    return {"enabled": is_router_enabled(), **provider_router_metrics()}
+
+
+@router.get("/api/workflow/pricing-engine")
+async def get_pricing_engine_stats():
+    """Memoized offer quotes (workflows.common.pricing_engine): entries, hits, misses."""
+    return pricing_engine_stats()
+
+
+@router.get("/api/workflow/executors")
+async def get_executor_stats():
+    """Named executor pools (utils.executors): size, queue depth, active tasks, utilization."""
+    return executor_stats()
+
+
+@router.get("/api/workflow/tenants")
+async def get_tenant_stats():
+    """Tenant partitions (workflows.io.tenants): turns in flight/queued, p50/p95, cache quotas."""
+    return tenant_stats()
@@ -11,10 +11,13 @@ For production deployment, import directly: from app import app
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
+import asyncio
 import os
 import logging
 
+from utils import startup
+
 # Configure logging (this is acceptable at import time - just sets up handlers)
 logging.basicConfig(
     level=logging.INFO,
@@ -64,8 +67,34 @@ async def lifespan(app: FastAPI):
         logger.warning("[SECURITY] AUTH_ENABLED=0 in production - API is unprotected!")
         logger.warning("[SECURITY] Set AUTH_ENABLED=1 and configure API_KEY for production")
 
+    profile = startup.get_import_profile()
+    if profile is not None:
+        logger.info("[STARTUP] %s", profile.format_report(top=15))
+
+    # Warm-up: preload catalogs/matchers/providers before accepting requests
+    phases = startup.configured_phases()
+    if phases:
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(startup.run_warmup, phases),
+                timeout=startup.warmup_timeout(),
+            )
+        except asyncio.TimeoutError:
+            logger.warning("[STARTUP] Warm-up exceeded %.0fs; serving without it", startup.warmup_timeout())
+
     yield
-    # Shutdown logic (if any) goes here
+
+    # Flush queued client-memory summaries before the process exits
+    from services import client_memory
+    client_memory.shutdown_worker()
+
+    # Stop the session expiry sweeper
+    from legacy.session_store import shutdown_sweeper
+    shutdown_sweeper()
+
+    # Let in-flight pool tasks (I/O, LLM, ingest, CPU) finish, then stop the pools
+    from utils.executors import shutdown_executors
+    shutdown_executors()
 
 
 def create_app() -> FastAPI:
@@ -190,11 +219,14 @@ def _add_root_endpoint(app: FastAPI, is_dev: bool) -> None:
             return {
                 "status": "AI Event Manager Running",
                 "active_conversations": len(active_conversations),
-                "total_saved_events": len(database["events"])
+                "total_saved_events": len(database["events"]),
+                "startup": startup.get_startup_report().to_dict(),
             }
         return {"status": "ok"}
 
 
 # Create the default app instance
 # This is what gets imported by uvicorn (e.g., uvicorn app:app)
-app = create_app()
+# OE_IMPORT_PROFILE=1 records per-module import time for the startup report
+with startup.profile_imports() if startup.is_import_profile_enabled() else nullcontext():
+    app = create_app()
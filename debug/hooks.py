@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import re
+import sys
 from functools import wraps
-import inspect
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:  # pragma: no cover - debugger counters are optional in some environments
@@ -29,36 +29,51 @@ _CONFIRMED_VALUES: Dict[str, Dict[str, str]] = {}
 _IMMEDIATE_CONFIRM = {"email"}
 _EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 _PHONE_RE = re.compile(r"\+?\d[\d\s\-]{6,}")
+_MISSING_CALLSITE = object()
+
+
+# Resolved "module.qualname" per code object (plus owner class on Pythons
+# without co_qualname), so repeated trace calls skip the frame inspection.
+_CALLSITE_CACHE: Dict[Any, Optional[str]] = {}
+_CALLSITE_CACHE_MAX = 4096
 
 
 def _callsite_path(skip: int = 2) -> Optional[str]:
-    frame = inspect.currentframe()
     try:
-        for _ in range(skip):
-            if frame is None:
-                return None
-            frame = frame.f_back
-        if frame is None:
-            return None
-        module = inspect.getmodule(frame)
-        module_name = module.__name__ if module else None
+        # skip counts frames above this function, as with inspect.currentframe()
+        frame = sys._getframe(skip)  # pylint: disable=protected-access
+    except ValueError:
+        return None
+    try:
         code = frame.f_code
         qualname = getattr(code, "co_qualname", None)
+        owner_cls: Optional[type] = None
         if not qualname:
-            qualname = code.co_name
             owner = frame.f_locals.get("self")
             if owner is not None:
-                try:
-                    qualname = f"{owner.__class__.__name__}.{qualname}"
-                except Exception:
-                    pass
+                owner_cls = owner.__class__
             else:
                 cls = frame.f_locals.get("cls")
                 if isinstance(cls, type):
-                    qualname = f"{cls.__name__}.{qualname}"
+                    owner_cls = cls
+        key = (code, owner_cls) if owner_cls is not None else code
+        cached = _CALLSITE_CACHE.get(key, _MISSING_CALLSITE)
+        if cached is not _MISSING_CALLSITE:
+            return cached
+
+        module_name = frame.f_globals.get("__name__")
+        if not qualname:
+            qualname = code.co_name
+            if owner_cls is not None:
+                qualname = f"{owner_cls.__name__}.{qualname}"
         if module_name and qualname:
-            return f"{module_name}.{qualname}"
-        return module_name or qualname
+            path: Optional[str] = f"{module_name}.{qualname}"
+        else:
+            path = module_name or qualname
+        if len(_CALLSITE_CACHE) >= _CALLSITE_CACHE_MAX:
+            _CALLSITE_CACHE.clear()
+        _CALLSITE_CACHE[key] = path
+        return path
     finally:
         del frame
 
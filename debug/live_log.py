@@ -19,6 +19,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .registry import BoundedRegistry
 from .settings import is_trace_enabled
 
 
@@ -31,8 +32,8 @@ def _root_dir() -> Path:
 
 ROOT = _root_dir()
 
-# Track which threads have been initialized
-_INITIALIZED: set[str] = set()
+# Track which threads have been initialized (bounded; see debug.registry)
+_INITIALIZED = BoundedRegistry("live_log.initialized")
 
 
 def _ensure_dir() -> None:
@@ -183,9 +184,11 @@ def append_log(thread_id: str, event: Dict[str, Any]) -> None:
     _ensure_dir()
 
     # Auto-initialize on first event for this thread
-    if thread_id not in _INITIALIZED:
-        write_header(thread_id)
-        _INITIALIZED.add(thread_id)
+    if _INITIALIZED.get(thread_id) is None:
+        # An evicted thread keeps appending to its existing log
+        if not _log_path(thread_id).exists():
+            write_header(thread_id)
+        _INITIALIZED[thread_id] = True
 
     line = _format_event(event)
     path = _log_path(thread_id)
@@ -228,7 +231,7 @@ API endpoint: /api/debug/threads/{thread_id}/llm-diagnosis
 def close_log(thread_id: str, reason: str = "closed") -> Optional[Path]:
     """Close and delete the live log file for this thread."""
     # Remove from initialized set
-    _INITIALIZED.discard(thread_id)
+    _INITIALIZED.pop(thread_id, None)
 
     path = _log_path(thread_id)
     if not path.exists():
@@ -0,0 +1,252 @@
+"""
+Bounded per-thread debug state.
+
+Tracing keeps a little state per conversation thread (sequence counters,
+summary chips, HIL flag, recent events, debug snapshots). Without eviction a
+long-running server holds that state for every thread it has ever seen.
+`BoundedRegistry` is an LRU mapping with an idle TTL: touching a key moves
+it to the most-recent end, and inserts evict the least recently used keys
+beyond `max_entries` as well as keys idle for longer than `ttl_s`.
+
+Evicted entries are handed to an `on_evict(key, value, reason)` callback.
+The trace registries use it to flush the thread's buffered timeline writes,
+so an evicted thread stays readable from the on-disk timeline and its
+sequence counter resumes from `timeline.last_seq()` if it comes back.
+
+Every registry registers itself by name; `registry_stats()` reports entry
+counts, evictions and an approximate size for the memory endpoint.
+
+Environment:
+    DEBUG_STATE_MAX_THREADS: Threads kept per registry (default: 1000)
+    DEBUG_STATE_TTL_S: Seconds a thread may stay idle before eviction (default: 21600)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EvictCallback = Callable[[str, Any, str], None]
+
+_SIZE_SAMPLE = 32
+_MISSING = object()
+_REGISTRIES: Dict[str, "BoundedRegistry"] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate retained size of obj in bytes (containers, slots and __dict__)."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    for slot in getattr(type(obj), "__slots__", ()):
+        size += deep_sizeof(getattr(obj, slot, None), seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class BoundedRegistry:
+    """Thread-safe LRU mapping with idle TTL and an eviction hand-off callback."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+        on_evict: Optional[EvictCallback] = None,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries or _env_int("DEBUG_STATE_MAX_THREADS", 1000)
+        self.ttl_s = ttl_s if ttl_s is not None else _env_float("DEBUG_STATE_TTL_S", 21600.0)
+        self._on_evict = on_evict
+        self._lock = threading.RLock()
+        # key -> (value, last touched monotonic time)
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.evictions = {"lru": 0, "ttl": 0}
+        with _REGISTRIES_LOCK:
+            _REGISTRIES[name] = self
+
+    # -- mapping API ------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            self._data[key] = (entry[0], time.monotonic())
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def setdefault(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Value for key, creating it with factory() (and evicting) when missing."""
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = factory()
+                self._insert(key, value)
+            return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._insert(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._data)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    # -- eviction ---------------------------------------------------------------
+
+    def _insert(self, key: str, value: Any) -> None:
+        now = time.monotonic()
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        evicted = []
+        # Oldest entries sit at the front; stop at the first one still fresh
+        while self._data:
+            key, (value, touched) = next(iter(self._data.items()))
+            if self.ttl_s > 0 and now - touched > self.ttl_s:
+                reason = "ttl"
+            elif len(self._data) > self.max_entries:
+                reason = "lru"
+            else:
+                break
+            del self._data[key]
+            self.evictions[reason] += 1
+            evicted.append((key, value, reason))
+        for key, value, reason in evicted:
+            self._hand_off(key, value, reason)
+
+    def expire(self) -> int:
+        """Evict idle entries now (inserts do this too); returns how many were evicted."""
+        with self._lock:
+            before = len(self._data)
+            self._evict(time.monotonic())
+            return before - len(self._data)
+
+    def _hand_off(self, key: str, value: Any, reason: str) -> None:
+        if self._on_evict is None:
+            return
+        try:
+            self._on_evict(key, value, reason)
+        except Exception as exc:  # pragma: no cover - eviction must never break tracing
+            logger.debug("[DEBUG_STATE] %s hand-off for %s failed: %s", self.name, key, exc)
+
+    # -- accounting -------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [value for value, _ in self._data.values()]
+        sample = values[-_SIZE_SAMPLE:]
+        sampled = sum(deep_sizeof(value) for value in sample)
+        approx = int(sampled * len(values) / len(sample)) if sample else 0
+        return {
+            "entries": len(values),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "evictions": dict(self.evictions),
+            "approx_bytes": approx,
+        }
+
+
+def registry_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every BoundedRegistry in the process, by name."""
+    with _REGISTRIES_LOCK:
+        registries = dict(_REGISTRIES)
+    return {name: registry.stats() for name, registry in sorted(registries.items())}
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (None where unavailable)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def memory_report() -> Dict[str, Any]:
+    """RSS plus per-registry accounting, for the debug memory endpoint."""
+    registries = registry_stats()
+    return {
+        "rss_bytes": process_rss_bytes(),
+        "debug_state_bytes": sum(item["approx_bytes"] for item in registries.values()),
+        "registries": registries,
+    }
+
+
+__all__ = [
+    "BoundedRegistry",
+    "deep_sizeof",
+    "memory_report",
+    "process_rss_bytes",
+    "registry_stats",
+]
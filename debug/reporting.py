@@ -362,6 +362,9 @@ def collect_trace_payload(
     granularity: str = "logic",
     kinds: Optional[Sequence[str]] = None,
     as_of_ts: Optional[float] = None,
+    after_seq: Optional[int] = None,
+    event_kinds: Optional[Sequence[str]] = None,
+    tail: Optional[int] = None,
 ) -> Dict[str, Any]:
     raw_events = BUS.get(thread_id)
     live_state = get_thread_state(thread_id) or {}
@@ -387,12 +390,14 @@ def collect_trace_payload(
         time_travel_meta = {"enabled": False}
 
     filtered_events = filter_trace_events(raw_events, granularity, kinds)
+    if after_seq is not None:
+        filtered_events = [ev for ev in filtered_events if (ev.get("seq") or 0) > after_seq]
     return {
         "thread_id": thread_id,
         "state": state_snapshot,
         "confirmed": confirmed,
         "trace": filtered_events,
-        "timeline": timeline.snapshot(thread_id),
+        "timeline": timeline.read(thread_id, after_seq=after_seq, kinds=event_kinds, tail=tail),
         "summary": summary,
         "time_travel": time_travel_meta,
     }
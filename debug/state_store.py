@@ -3,13 +3,16 @@ from __future__ import annotations
 import threading
 from typing import Any, Dict, Optional
 
+from .registry import BoundedRegistry
+
 
 class _InMemoryStateStore:
-    """Thread-safe container for workflow debug snapshots."""
+    """Thread-safe container for workflow debug snapshots (LRU/TTL-bounded per thread)."""
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._payload: Dict[str, Dict[str, Any]] = {}
+        # STATE_SNAPSHOT trace events keep the history of evicted threads on disk
+        self._payload = BoundedRegistry("debug.state_store")
 
     def get(self, thread_id: Optional[str]) -> Dict[str, Any]:
         if not thread_id:
@@ -1,11 +1,42 @@
+"""
+Per-thread debug timeline storage.
+
+Each thread gets a JSONL file of trace events plus a sidecar offset index
+(`<thread>.idx`). Writes go through a buffered writer that keeps one open
+handle per thread and flushes in batches, so tracing can stay enabled without
+paying an open/write/flush per event. A background thread flushes records
+older than the flush interval, so the last events of a turn reach the file
+even when no further event follows.
+
+Records are compact: separators without spaces, fields equal to the
+TraceEvent defaults dropped, and `payload` omitted when it duplicates `data`.
+Readers expand them back to full events, and plain (legacy) lines still parse.
+
+Index entries are fixed-size `(seq, byte offset, kind hash)` tuples, so range
+and kind-filtered reads only seek to the matching lines:
+
+    read(thread_id, after_seq=120)            # events after a polling cursor
+    read(thread_id, kinds=["DB_WRITE"], tail=20)
+
+Environment:
+    DEBUG_TRACE_DIR: storage root (default: <repo>/../tmp-debug/sessions)
+    DEBUG_TRACE_FLUSH_EVERY: buffered records per thread before a flush (default 32)
+    DEBUG_TRACE_FLUSH_INTERVAL: max seconds a record stays buffered (default 0.5)
+"""
+
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import shutil
+import struct
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 
 def _root_dir() -> Path:
@@ -18,6 +49,46 @@ def _root_dir() -> Path:
 ROOT = _root_dir()
 ARCH = ROOT / "archive"
 
+# (seq, byte offset into the JSONL file, crc32(kind) & 0xFFFF)
+_INDEX_ENTRY = struct.Struct("<QQH")
+_COMPACT_MARKER = "_c"
+# Open handle pairs kept at once; least recently written threads are closed first
+_MAX_OPEN_THREADS = 64
+
+# Field defaults of TraceEvent; compact records omit values equal to these
+_EVENT_DEFAULTS: Dict[str, Any] = {
+    "step": None,
+    "owner_step": None,
+    "entity": None,
+    "actor": None,
+    "step_major": None,
+    "step_minor": None,
+    "event": None,
+    "details": None,
+    "detail": None,
+    "subject": None,
+    "status": None,
+    "summary": None,
+    "payload": {},
+    "data": {},
+    "captured_additions": [],
+    "confirmed_now": [],
+    "loop": False,
+    "detour_to_step": None,
+    "wait_state": None,
+    "granularity": "verbose",
+    "gate": None,
+    "io": None,
+    "prompt_preview": None,
+    "hash_status": None,
+    "hash_help": None,
+    "entity_context": None,
+    "db": None,
+    "detour": None,
+    "draft": None,
+    "subloop": None,
+}
+
 
 def _ensure_dirs() -> None:
     ROOT.mkdir(parents=True, exist_ok=True)
@@ -33,6 +104,10 @@ def _live_path(thread_id: str) -> Path:
     return ROOT / f"{_sanitise(thread_id)}.jsonl"
 
 
+def _index_path(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+
 def _archived_paths(thread_id: str) -> List[Path]:
     safe = _sanitise(thread_id)
     pattern = f"__{safe}.jsonl"
@@ -45,42 +120,342 @@ def _archived_paths(thread_id: str) -> List[Path]:
     return candidates
 
 
+def _kind_hash(kind: Any) -> int:
+    return zlib.crc32(str(kind or "").encode("utf-8")) & 0xFFFF
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# =============================================================================
+# Record format
+# =============================================================================
+
+def encode_record(event: Dict[str, Any]) -> str:
+    """Serialise an event as a compact JSONL line (without newline)."""
+    record: Dict[str, Any] = {_COMPACT_MARKER: 1}
+    data = event.get("data")
+    for key, value in event.items():
+        if key == "payload":
+            if value == data:
+                continue
+        elif key in _EVENT_DEFAULTS and value == _EVENT_DEFAULTS[key]:
+            continue
+        record[key] = value
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def decode_record(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one JSONL line, expanding compact records to full events."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    if not record.pop(_COMPACT_MARKER, None):
+        return record
+    event: Dict[str, Any] = {}
+    for key in ("thread_id", "ts", "seq", "row_id", "kind", "lane"):
+        if key in record:
+            event[key] = record.pop(key)
+    for key, default in _EVENT_DEFAULTS.items():
+        if key in record:
+            event[key] = record.pop(key)
+        elif key == "payload":
+            event[key] = dict(event.get("data") or record.get("data") or {})
+        else:
+            event[key] = default.copy() if isinstance(default, (dict, list)) else default
+    event.update(record)
+    return event
+
+
+# =============================================================================
+# Buffered writer
+# =============================================================================
+
+class _ThreadFiles:
+    """Open JSONL + index handles and pending records for one thread."""
+
+    __slots__ = ("data", "index", "offset", "pending", "first_pending_at")
+
+    def __init__(self, path: Path) -> None:
+        self.data: IO[bytes] = path.open("ab")
+        self.index: IO[bytes] = _index_path(path).open("ab")
+        self.offset = self.data.seek(0, os.SEEK_END)
+        self.pending: List[Tuple[int, int, bytes]] = []
+        self.first_pending_at = 0.0
+
+    def close(self) -> None:
+        for handle in (self.data, self.index):
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+
+class TimelineWriter:
+    """Buffered, thread-safe appender for per-thread timeline files."""
+
+    def __init__(
+        self,
+        flush_every: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_open: int = _MAX_OPEN_THREADS,
+    ) -> None:
+        self.flush_every = max(1, flush_every or int(_env_float("DEBUG_TRACE_FLUSH_EVERY", 32)))
+        self.flush_interval = (
+            _env_float("DEBUG_TRACE_FLUSH_INTERVAL", 0.5) if flush_interval is None else flush_interval
+        )
+        self.max_open = max(1, max_open)
+        self._files: "OrderedDict[str, _ThreadFiles]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def append(self, thread_id: str, event: Dict[str, Any]) -> None:
+        line = (encode_record(event) + "\n").encode("utf-8")
+        with self._lock:
+            files = self._open(thread_id)
+            if not files.pending:
+                files.first_pending_at = time.monotonic()
+            files.pending.append((_as_int(event.get("seq")), _kind_hash(event.get("kind")), line))
+            if (
+                len(files.pending) >= self.flush_every
+                or time.monotonic() - files.first_pending_at >= self.flush_interval
+            ):
+                self._flush_files(files)
+            elif self._flusher is None:
+                self._start_flusher()
+
+    def flush(self, thread_id: Optional[str] = None) -> None:
+        """Write buffered records for one thread (or all threads) to disk."""
+        with self._lock:
+            if thread_id is None:
+                targets = list(self._files.values())
+            else:
+                files = self._files.get(thread_id)
+                targets = [files] if files else []
+            for files in targets:
+                self._flush_files(files)
+
+    def flush_due(self) -> None:
+        """Write the records that have been buffered for flush_interval or longer."""
+        now = time.monotonic()
+        with self._lock:
+            for files in self._files.values():
+                if files.pending and now - files.first_pending_at >= self.flush_interval:
+                    self._flush_files(files)
+
+    def close(self, thread_id: Optional[str] = None) -> None:
+        """Flush and release handles for one thread (or all threads)."""
+        with self._lock:
+            if thread_id is None:
+                self._stop.set()
+                self._flusher = None
+            keys = list(self._files) if thread_id is None else [thread_id]
+            for key in keys:
+                files = self._files.pop(key, None)
+                if files is not None:
+                    self._flush_files(files)
+                    files.close()
+
+    def _start_flusher(self) -> None:
+        if self.flush_interval <= 0:
+            return
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._run_flusher, args=(self._stop,), name="timeline-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self, stop: threading.Event) -> None:
+        while not stop.wait(self.flush_interval):
+            try:
+                self.flush_due()
+            except Exception:  # pragma: no cover - tracing must never raise
+                pass
+
+    def _open(self, thread_id: str) -> _ThreadFiles:
+        files = self._files.get(thread_id)
+        if files is not None:
+            self._files.move_to_end(thread_id)
+            return files
+        _ensure_dirs()
+        files = _ThreadFiles(_live_path(thread_id))
+        self._files[thread_id] = files
+        while len(self._files) > self.max_open:
+            _, evicted = self._files.popitem(last=False)
+            self._flush_files(evicted)
+            evicted.close()
+        return files
+
+    @staticmethod
+    def _flush_files(files: _ThreadFiles) -> None:
+        if not files.pending:
+            return
+        chunks: List[bytes] = []
+        entries: List[bytes] = []
+        offset = files.offset
+        for seq, kind_hash, line in files.pending:
+            chunks.append(line)
+            entries.append(_INDEX_ENTRY.pack(seq, offset, kind_hash))
+            offset += len(line)
+        files.pending = []
+        # Data first: an index entry must never point past the end of the file
+        files.data.write(b"".join(chunks))
+        files.data.flush()
+        files.index.write(b"".join(entries))
+        files.index.flush()
+        files.offset = offset
+
+
+_WRITER = TimelineWriter()
+atexit.register(_WRITER.close)
+
+
+def get_writer() -> TimelineWriter:
+    """Get the process-wide timeline writer."""
+    return _WRITER
+
+
 def append(thread_id: str, event: Dict) -> None:
-    _ensure_dirs()
-    path = _live_path(thread_id)
-    line = json.dumps(event, ensure_ascii=False)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(line + "\n")
-        handle.flush()
+    _WRITER.append(thread_id, event)
 
 
-def snapshot(thread_id: str) -> List[Dict]:
+def flush(thread_id: Optional[str] = None) -> None:
+    _WRITER.flush(thread_id)
+
+
+# =============================================================================
+# Readers
+# =============================================================================
+
+def _source_path(thread_id: str) -> Optional[Path]:
     live = _live_path(thread_id)
-    source: Optional[Path]
     if live.exists():
-        source = live
-    else:
-        archived = _archived_paths(thread_id)
-        source = archived[-1] if archived else None
-    if not source or not source.exists():
+        return live
+    archived = _archived_paths(thread_id)
+    return archived[-1] if archived else None
+
+
+def _read_index(path: Path) -> Optional[List[Tuple[int, int, int]]]:
+    index = _index_path(path)
+    try:
+        raw = index.read_bytes()
+    except FileNotFoundError:
+        return None
+    usable = len(raw) - len(raw) % _INDEX_ENTRY.size
+    return list(_INDEX_ENTRY.iter_unpack(raw[:usable]))
+
+
+def _read_lines_at(path: Path, offsets: Iterable[int]) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    with path.open("rb") as handle:
+        for offset in offsets:
+            handle.seek(offset)
+            record = decode_record(handle.readline().decode("utf-8", errors="replace"))
+            if record is not None:
+                records.append(record)
+    return records
+
+
+def _scan_all(path: Path) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = decode_record(line)
+            if record is not None:
+                records.append(record)
+    return records
+
+
+def read(
+    thread_id: str,
+    *,
+    after_seq: Optional[int] = None,
+    kinds: Optional[Sequence[str]] = None,
+    tail: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read timeline events for a thread.
+
+    Args:
+        thread_id: Thread to read (live file, else latest archive)
+        after_seq: Only events with seq greater than this cursor
+        kinds: Only events whose kind is in this list
+        tail: Only the last N matching events
+    """
+    _WRITER.flush(thread_id)
+    source = _source_path(thread_id)
+    if source is None:
         return []
-    records: List[Dict] = []
+    kind_set = set(kinds) if kinds else None
     try:
-        with source.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    records.append(json.loads(line))
-                except Exception:
-                    continue
+        entries = _read_index(source)
+        if entries is None:
+            # Legacy file without an index: parse everything and filter in memory
+            records = _scan_all(source)
+            if after_seq is not None:
+                records = [r for r in records if _as_int(r.get("seq")) > after_seq]
+            if kind_set is not None:
+                records = [r for r in records if r.get("kind") in kind_set]
+            return records[-tail:] if tail else records
+
+        if after_seq is not None:
+            entries = [entry for entry in entries if entry[0] > after_seq]
+        if kind_set is not None:
+            hashes = {_kind_hash(kind) for kind in kind_set}
+            entries = [entry for entry in entries if entry[2] in hashes]
+        if tail and kind_set is None:
+            entries = entries[-tail:]
+        records = _read_lines_at(source, (entry[1] for entry in entries))
     except FileNotFoundError:
         return []
+    if kind_set is not None:
+        # Hash collisions are possible; the decoded kind is authoritative
+        records = [r for r in records if r.get("kind") in kind_set]
+        if tail:
+            records = records[-tail:]
     return records
 
 
+def snapshot(thread_id: str) -> List[Dict]:
+    return read(thread_id)
+
+
+def last_seq(thread_id: str) -> int:
+    """Highest seq persisted for a live thread (0 if none), read from the index tail."""
+    index = _index_path(_live_path(thread_id))
+    try:
+        with index.open("rb") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            usable = size - size % _INDEX_ENTRY.size
+            if usable <= 0:
+                return 0
+            handle.seek(usable - _INDEX_ENTRY.size)
+            seq, _, _ = _INDEX_ENTRY.unpack(handle.read(_INDEX_ENTRY.size))
+            return seq
+    except FileNotFoundError:
+        return 0
+
+
 def mark_closed(thread_id: str, reason: str = "closed") -> str:
+    _WRITER.close(thread_id)
     live = _live_path(thread_id)
     if not live.exists():
         return ""
@@ -98,20 +473,33 @@ def mark_closed(thread_id: str, reason: str = "closed") -> str:
 
     try:
         shutil.move(str(live), str(destination))
-        return str(destination)
     except Exception:
         # If move fails, leave live file untouched
         return ""
+    live_index = _index_path(live)
+    if live_index.exists():
+        try:
+            shutil.move(str(live_index), str(_index_path(destination)))
+        except Exception:
+            pass
+    return str(destination)
 
 
 def resolve_path(thread_id: str) -> Optional[Path]:
-    live = _live_path(thread_id)
-    if live.exists():
-        return live
-    archived = _archived_paths(thread_id)
-    if archived:
-        return archived[-1]
-    return None
+    _WRITER.flush(thread_id)
+    return _source_path(thread_id)
 
 
-__all__ = ["append", "snapshot", "mark_closed", "resolve_path"]
+__all__ = [
+    "TimelineWriter",
+    "append",
+    "decode_record",
+    "encode_record",
+    "flush",
+    "get_writer",
+    "last_seq",
+    "mark_closed",
+    "read",
+    "resolve_path",
+    "snapshot",
+]
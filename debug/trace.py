@@ -3,8 +3,9 @@ from __future__ import annotations
 import threading
 import time
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional
 
+from .registry import BoundedRegistry
 from .settings import is_trace_enabled
 
 TraceKind = Literal[
@@ -47,14 +48,8 @@ LANE_BY_KIND: Dict[TraceKind, Lane] = {
     "AGENT_PROMPT_OUT": "prompt",
 }
 
-_SEQ_COUNTER: Dict[str, int] = {}
-_STEP_MINOR_STATE: Dict[str, Tuple[Optional[int], int]] = {}
-_TRACE_SUMMARY: Dict[str, Dict[str, Any]] = {}
 _SUMMARY_LOCK = threading.Lock()
 _HIL_LOCK = threading.Lock()
-_LAST_ENTITY_LABEL: Dict[str, Optional[str]] = {}
-_HIL_OPEN: Dict[str, bool] = {}
-_SUBLOOP_CONTEXT: Dict[str, Optional[str]] = {}
 REQUIREMENTS_MATCH_HELP = "Deterministic digest of date, pax, and constraints. 'Match' means inputs didn’t change since the last evaluation."
 
 
@@ -98,10 +93,48 @@ class TraceEvent:
     subloop: Optional[str] = None
 
 
+class ThreadTrace:
+    """Compact per-thread trace state (sequence, step minor, summary chips, HIL, subloop)."""
+
+    __slots__ = ("seq", "minor_major", "minor_count", "summary", "last_entity", "hil_open", "subloop")
+
+    def __init__(self) -> None:
+        self.seq: Optional[int] = None  # None until resumed from the on-disk timeline
+        self.minor_major: Optional[int] = None
+        self.minor_count = 0
+        self.summary: Optional[Dict[str, Any]] = None
+        self.last_entity: Optional[str] = None
+        self.hil_open = False
+        self.subloop: Optional[str] = None
+
+
+def _flush_timeline(thread_id: str, _value: Any, _reason: str) -> None:
+    """Eviction hand-off: persist buffered timeline writes of an evicted thread."""
+    from . import timeline  # pylint: disable=import-outside-toplevel
+
+    timeline.flush(thread_id)
+
+
+_THREADS = BoundedRegistry("trace.threads", on_evict=_flush_timeline)
+
+
+def _thread(thread_id: str) -> ThreadTrace:
+    return _THREADS.setdefault(thread_id, ThreadTrace)
+
+
 def _next_sequence(thread_id: str) -> int:
-    seq = _SEQ_COUNTER.get(thread_id, 0) + 1
-    _SEQ_COUNTER[thread_id] = seq
-    return seq
+    record = _thread(thread_id)
+    if record.seq is None:
+        # Continue after events persisted by an earlier process (or before
+        # this thread was evicted) so timeline `after_seq` cursors stay monotonic.
+        try:
+            from . import timeline  # pylint: disable=import-outside-toplevel
+
+            record.seq = timeline.last_seq(thread_id)
+        except Exception:
+            record.seq = 0
+    record.seq += 1
+    return record.seq
 
 
 def _derive_step_major(step_label: Optional[str]) -> Optional[int]:
@@ -123,12 +156,11 @@ def _derive_step_major(step_label: Optional[str]) -> Optional[int]:
 def _next_step_minor(thread_id: str, major: Optional[int]) -> Optional[int]:
     if not major:
         return None
-    current_major, counter = _STEP_MINOR_STATE.get(thread_id, (None, 0))
-    if current_major != major:
-        counter = 0
-    counter += 1
-    _STEP_MINOR_STATE[thread_id] = (major, counter)
-    return counter
+    record = _thread(thread_id)
+    if record.minor_major != major:
+        record.minor_major, record.minor_count = major, 0
+    record.minor_count += 1
+    return record.minor_count
 
 
 def _record_summary(
@@ -139,7 +171,10 @@ def _record_summary(
     hash_status: Optional[str],
 ) -> None:
     with _SUMMARY_LOCK:
-        summary = _TRACE_SUMMARY.setdefault(thread_id, {})
+        record = _thread(thread_id)
+        if record.summary is None:
+            record.summary = {}
+        summary = record.summary
         if step_major:
             summary["current_step_major"] = step_major
         if wait_state is not None:
@@ -152,18 +187,17 @@ def _record_summary(
 
 def get_trace_summary(thread_id: str) -> Dict[str, Any]:
     with _SUMMARY_LOCK:
-        summary = _TRACE_SUMMARY.get(thread_id, {})
-        result = dict(summary)
+        record = _THREADS.get(thread_id)
+        result = dict(record.summary or {}) if record is not None else {}
         result.setdefault("hil_open", has_open_hil(thread_id))
         return result
 
 
 def set_hil_open(thread_id: str, is_open: bool) -> None:
     with _HIL_LOCK:
-        if is_open:
-            _HIL_OPEN[thread_id] = True
-        else:
-            _HIL_OPEN.pop(thread_id, None)
+        record = _thread(thread_id) if is_open else _THREADS.get(thread_id)
+        if record is not None:
+            record.hil_open = is_open
     if not is_trace_enabled():
         return
     try:  # pragma: no cover - defensive guard to avoid circular failures
@@ -181,44 +215,50 @@ def set_hil_open(thread_id: str, is_open: bool) -> None:
 
 def has_open_hil(thread_id: str) -> bool:
     with _HIL_LOCK:
-        return _HIL_OPEN.get(thread_id, False)
+        record = _THREADS.get(thread_id)
+        return bool(record and record.hil_open)
 
 
 def set_subloop_context(thread_id: str, subloop: Optional[str]) -> None:
-    if subloop:
-        _SUBLOOP_CONTEXT[thread_id] = subloop
-    else:
-        _SUBLOOP_CONTEXT.pop(thread_id, None)
+    record = _thread(thread_id) if subloop else _THREADS.get(thread_id)
+    if record is not None:
+        record.subloop = subloop or None
 
 
 def clear_subloop_context(thread_id: str) -> None:
-    _SUBLOOP_CONTEXT.pop(thread_id, None)
+    set_subloop_context(thread_id, None)
 
 
 def get_subloop_context(thread_id: str) -> Optional[str]:
-    return _SUBLOOP_CONTEXT.get(thread_id)
+    record = _THREADS.get(thread_id)
+    return record.subloop if record is not None else None
 
 
 class TraceBus:
-    def __init__(self, max_events: int = 2000) -> None:
-        self._buf: Dict[str, List[TraceEvent]] = {}
+    """Recent events per thread: max_events per thread, LRU/TTL-bounded thread count.
+
+    Evicted threads remain readable through the on-disk timeline.
+    """
+
+    def __init__(self, max_events: int = 2000, *, name: str = "trace.events") -> None:
+        self._buf = BoundedRegistry(name, on_evict=_flush_timeline)
         self._lock = threading.Lock()
         self._max = max_events
 
     def emit(self, ev: TraceEvent) -> None:
         with self._lock:
-            buf = self._buf.setdefault(ev.thread_id, [])
+            buf = self._buf.setdefault(ev.thread_id, list)
             buf.append(ev)
             if len(buf) > self._max:
                 del buf[: len(buf) - self._max]
 
     def get(self, thread_id: str) -> List[Dict[str, Any]]:
         with self._lock:
-            return [asdict(ev) for ev in self._buf.get(thread_id, [])]
+            return [asdict(ev) for ev in self._buf.get(thread_id) or []]
 
     def list_threads(self) -> List[str]:
         with self._lock:
-            return list(self._buf.keys())
+            return self._buf.keys()
 
 
 BUS = TraceBus()
@@ -303,9 +343,9 @@ def emit(
         if wait_state:
             effective_entity = entity_label or "Waiting"
         else:
-            effective_entity = entity_label or _LAST_ENTITY_LABEL.get(thread_id)
+            effective_entity = entity_label or _thread(thread_id).last_entity
     elif effective_entity is None:
-        effective_entity = _LAST_ENTITY_LABEL.get(thread_id)
+        effective_entity = _thread(thread_id).last_entity
 
     current_subloop = get_subloop_context(thread_id)
     if current_subloop and isinstance(payload, dict):
@@ -350,7 +390,7 @@ def emit(
         subloop=current_subloop,
     )
     if event.entity and event.entity != "Waiting":
-        _LAST_ENTITY_LABEL[thread_id] = event.entity
+        _thread(thread_id).last_entity = event.entity
     BUS.emit(event)
     _record_summary(
         thread_id,
@@ -358,10 +398,11 @@ def emit(
         wait_state=wait_state,
         hash_status=event.hash_status,
     )
+    event_dict = asdict(event)
     try:
         from . import timeline  # pylint: disable=import-outside-toplevel
 
-        timeline.append(thread_id, asdict(event))
+        timeline.append(thread_id, event_dict)
     except Exception:
         pass
 
@@ -369,7 +410,7 @@ def emit(
     try:
         from . import live_log  # pylint: disable=import-outside-toplevel
 
-        live_log.append_log(thread_id, asdict(event))
+        live_log.append_log(thread_id, event_dict)
     except Exception:
         pass
 
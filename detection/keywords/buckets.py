@@ -70,6 +70,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+from workflows.common.turn_memo import turn_memoized
+
 
 # =============================================================================
 # DETOUR MODE (how the change was initiated)
@@ -513,6 +515,7 @@ class ChangeIntentResult:
 # DETECTION FUNCTIONS
 # =============================================================================
 
+@turn_memoized()
 def detect_language(text: str) -> str:
     """Detect if text is primarily English, German, French, Italian, Spanish or mixed."""
     text_lower = text.lower()
@@ -598,6 +601,7 @@ def _match_verb_groups(text: str, verb_groups: Dict[str, List[str]]) -> Tuple[Li
     return matches, boost
 
 
+@turn_memoized()
 def has_revision_signal(text: str, language: str = "mixed") -> Tuple[bool, List[str], float]:
     """
     Check if text contains revision signals (change verbs or revision markers).
@@ -223,6 +223,23 @@ BILLING_PATTERNS = [
 # PRE-FILTER FUNCTIONS
 # =============================================================================
 
+def duplicate_check_exempt(event_entry: Optional[Dict[str, Any]]) -> bool:
+    """Whether a repeated client message is expected and must still be processed.
+
+    During a detour (caller_step set) or while billing details for an accepted
+    offer are awaited, clients legitimately resend the same text. Shared by the
+    pre-filter, check_duplicate_message and the detection router.
+    """
+    if not event_entry:
+        return False
+    in_billing_flow = bool(
+        event_entry.get("offer_accepted")
+        and (event_entry.get("billing_requirements") or {}).get("awaiting_billing_for_accept")
+    )
+    in_detour = event_entry.get("caller_step") is not None
+    return in_billing_flow or in_detour
+
+
 def run_pre_filter(
     message: str,
     last_message: Optional[str] = None,
@@ -255,17 +272,10 @@ def run_pre_filter(
         if text_lower == last_lower:
             result.is_duplicate = True
             result.matched_patterns.append("duplicate_exact_match")
-            # Check bypass conditions
-            if event_entry:
-                # Don't flag as duplicate in special flows
-                in_billing_flow = (
-                    event_entry.get("offer_accepted") and
-                    (event_entry.get("billing_requirements") or {}).get("awaiting_billing_for_accept")
-                )
-                in_detour = event_entry.get("caller_step") is not None
-                if in_billing_flow or in_detour:
-                    result.is_duplicate = False
-                    result.matched_patterns.append("duplicate_bypassed_special_flow")
+            # Don't flag as duplicate in special flows
+            if duplicate_check_exempt(event_entry):
+                result.is_duplicate = False
+                result.matched_patterns.append("duplicate_bypassed_special_flow")
 
     # -------------------------------------------------------------------------
     # 2. Language Detection
@@ -527,14 +537,8 @@ def run_pre_filter_legacy(
         if text_lower == last_lower:
             result.is_duplicate = True
             # Check bypass conditions
-            if event_entry:
-                in_billing_flow = (
-                    event_entry.get("offer_accepted") and
-                    (event_entry.get("billing_requirements") or {}).get("awaiting_billing_for_accept")
-                )
-                in_detour = event_entry.get("caller_step") is not None
-                if in_billing_flow or in_detour:
-                    result.is_duplicate = False
+            if duplicate_check_exempt(event_entry):
+                result.is_duplicate = False
 
     # NOTE: Manager/Escalation Signals are now detected via LLM semantic detection
     # in unified.py rather than regex keywords here. This prevents false positives
@@ -35,6 +35,7 @@ import time
 from typing import Any, Dict, Optional
 
 from llm.client import get_openai_client, is_llm_available
+from workflows.common.turn_memo import turn_memoized
 from workflows.common.types import WorkflowState
 
 # Import consolidated pattern from keyword_buckets (single source of truth)
@@ -163,6 +164,7 @@ def _is_action_request(msg_text: str) -> bool:
     return any(re.search(pattern, lowered) for pattern in _ACTION_PATTERNS)
 
 
+@turn_memoized()
 def heuristic_flags(msg_text: str) -> Dict[str, Any]:
     text = (msg_text or "").strip()
     lowered = text.lower()
@@ -233,6 +235,7 @@ def parse_constraints(msg_text: str) -> Dict[str, Any]:
     }
 
 
+@turn_memoized()
 def quick_general_qna_scan(msg_text: str) -> Dict[str, Any]:
     """
     Lightweight detector that flags potential general Q&A without LLM calls.
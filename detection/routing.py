@@ -0,0 +1,447 @@
+"""
+Adaptive Routing for Unified Detection
+
+Unified detection costs one LLM call per message, even for replies whose
+meaning is already settled by the $0 pre-filter and the workflow state: a
+"Yes, please" while step 2 waits for a date confirmation, an exact duplicate
+of the previous message. This module decides per message whether the
+unified LLM call is needed:
+
+- "skip":  the deterministic signals are conclusive; a UnifiedDetectionResult
+           is synthesized from them and no LLM call is made
+- "cheap": the reply has a simple, expected shape (short confirmation,
+           billing address while awaiting billing); detection runs on a
+           cheaper model when one is configured, otherwise on the full model
+- "full":  everything else
+
+The decision is made by a small rule-based calibrator: each rule has a base
+confidence that is adjusted by penalties for risky features (digits,
+question marks, change/rejection/manager wording, long messages). A rule
+only skips when the calibrated confidence reaches DETECTION_ROUTER_SKIP_MIN
+and only downgrades when it reaches DETECTION_ROUTER_CHEAP_MIN.
+
+Every decision is recorded in state.extras["detection_route"] and in
+process-wide counters (`detection_route_stats()`). In shadow mode the full
+LLM detection still runs for skipped messages and the synthesized result is
+compared with it, which measures the router's agreement on live traffic
+before enabling it. scripts/tools/eval_detection_router.py runs the same
+comparison offline on a labelled corpus.
+
+Toggle: Use DETECTION_ROUTER environment variable:
+- "on": skip/downgrade according to the decision (default)
+- "shadow": decide and record, but always run the full detection
+- "off": always run the full detection, record nothing
+
+Environment:
+    DETECTION_ROUTER: on | shadow | off (default: on)
+    DETECTION_ROUTER_SKIP_MIN: Minimum confidence to skip the LLM (default: 0.9)
+    DETECTION_ROUTER_CHEAP_MIN: Minimum confidence to use the cheap model (default: 0.6)
+    OPENAI_DETECTION_CHEAP_MODEL / GEMINI_DETECTION_CHEAP_MODEL: Model used
+        for the "cheap" route per provider (unset: cheap falls back to full)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from detection.keywords.buckets import RESUME_PHRASES
+from detection.pre_filter import PreFilterResult, duplicate_check_exempt
+from detection.response.matchers import matches_acceptance_pattern
+from detection.unified import UnifiedDetectionResult
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+ROUTE_SKIP = "skip"
+ROUTE_CHEAP = "cheap"
+ROUTE_FULL = "full"
+
+# Expected reply shapes derived from the workflow state
+SHAPE_DATE_CHOICE = "awaiting_date_choice"
+SHAPE_OFFER_DECISION = "awaiting_offer_decision"
+SHAPE_BILLING = "awaiting_billing"
+
+
+def get_router_mode() -> str:
+    """Get the detection router mode (on | shadow | off)."""
+    mode = os.getenv("DETECTION_ROUTER", "on").strip().lower()
+    return mode if mode in ("on", "shadow", "off") else "on"
+
+
+def _threshold(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def cheap_detection_model(provider: Optional[str]) -> Optional[str]:
+    """Model for the cheap route of the given provider, if one is configured."""
+    if not provider or provider == "stub":
+        return None
+    return os.getenv(f"{provider.upper()}_DETECTION_CHEAP_MODEL") or None
+
+
+# =============================================================================
+# FEATURES
+# =============================================================================
+
+# German short confirmations (RESUME_PHRASES covers English)
+_CONFIRMATIONS_DE = {
+    "ja", "ja bitte", "ja gerne", "gerne", "passt", "passt so", "einverstanden",
+    "in ordnung", "alles klar", "ok danke", "okay danke", "klingt gut",
+}
+_CONFIRMATION_PHRASES = {phrase.replace(",", "") for phrase in RESUME_PHRASES} | _CONFIRMATIONS_DE
+
+_TRAILING_THANKS = re.compile(
+    r"(?:[\s,]+(?:thanks|thank you|many thanks|danke|vielen dank|danke schön))+$"
+)
+_HEDGE_WORDS = re.compile(
+    r"\b(?:but|however|unless|only if|although|except|aber|jedoch|ausser|außer|nur wenn)\b"
+)
+_MANAGER_WORDS = re.compile(
+    r"\b(?:manager|someone|somebody|person|human|supervisor|jemand|mitarbeiter|vorgesetzte\w*)\b"
+)
+_NEGATION_WORDS = re.compile(
+    r"\b(?:no|not|don't|dont|never|cancel|decline|nein|nicht|kein\w*|absagen|stornieren)\b"
+)
+
+
+def normalize_reply(message: str) -> str:
+    """Lowercase, strip punctuation/whitespace and a trailing "thanks"."""
+    text = (message or "").strip().lower()
+    text = text.replace("’", "'")
+    text = re.sub(r"[!.…]+$", "", text).strip()
+    text = _TRAILING_THANKS.sub("", text).strip(" ,.!")
+    return re.sub(r"\s+", " ", text.replace(",", ""))
+
+
+def expected_reply_shape(event_entry: Optional[Dict[str, Any]]) -> Optional[str]:
+    """What the workflow is waiting for from the client, if it is unambiguous."""
+    if not event_entry:
+        return None
+    billing = event_entry.get("billing_requirements") or {}
+    if isinstance(billing, dict) and billing.get("awaiting_billing_for_accept"):
+        return SHAPE_BILLING
+    if event_entry.get("caller_step") is not None:
+        return None  # detour in progress: the reply belongs to another step
+    step = event_entry.get("current_step")
+    if step == 2 and not event_entry.get("date_confirmed"):
+        return SHAPE_DATE_CHOICE
+    offer_status = str(event_entry.get("offer_status") or "").lower()
+    if step == 5 and offer_status not in ("accepted", "declined") and not event_entry.get("offer_accepted"):
+        return SHAPE_OFFER_DECISION
+    return None
+
+
+def extract_route_features(
+    message: str,
+    pre_result: PreFilterResult,
+    event_entry: Optional[Dict[str, Any]] = None,
+    *,
+    reply_text: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Deterministic features the calibrator scores ($0, no LLM).
+
+    message is the full text the detection sees (subject + body) and feeds
+    the risk features; reply_text (the body, defaults to message) is what
+    is matched against short confirmation phrases.
+    """
+    text = (message or "").strip()
+    lowered = text.lower()
+    reply = (reply_text if reply_text is not None else text).strip()
+    normalized = normalize_reply(reply)
+    accept_match, accept_conf, _ = matches_acceptance_pattern(reply.lower())
+    step = (event_entry or {}).get("current_step")
+    return {
+        "words": len(normalized.split()),
+        "chars": len(text),
+        "exact_confirmation": normalized in _CONFIRMATION_PHRASES,
+        "acceptance_confidence": round(accept_conf, 3) if accept_match else 0.0,
+        "has_digits": bool(re.search(r"\d", lowered)),
+        "has_question_mark": "?" in lowered,
+        "has_hedge": bool(_HEDGE_WORDS.search(lowered)),
+        "has_manager_words": bool(_MANAGER_WORDS.search(lowered)),
+        "has_negation": bool(_NEGATION_WORDS.search(lowered)),
+        "question_signal": pre_result.has_question_signal,
+        "change_signal": pre_result.has_change_signal,
+        "billing_signal": pre_result.has_billing_signal,
+        "urgency_signal": pre_result.has_urgency_signal,
+        "is_duplicate": pre_result.is_duplicate,
+        "duplicate_exempt": duplicate_check_exempt(event_entry),
+        "pre_filter_confirmation": pre_result.can_skip_intent_llm,
+        "language": pre_result.language,
+        "current_step": step if isinstance(step, int) else None,
+        "shape": expected_reply_shape(event_entry),
+    }
+
+
+# =============================================================================
+# CALIBRATOR
+# =============================================================================
+
+# Penalties subtracted from a rule's base confidence when a feature is present
+_PENALTIES: Dict[str, float] = {
+    "has_question_mark": 0.5,
+    "question_signal": 0.3,
+    "change_signal": 0.5,
+    "has_hedge": 0.4,
+    "has_manager_words": 0.5,
+    "has_negation": 0.4,
+    "has_digits": 0.3,
+    "urgency_signal": 0.1,
+}
+
+
+@dataclass
+class RouteDecision:
+    """Routing decision for one message's unified detection call."""
+    route: str = ROUTE_FULL
+    reason: str = "default"
+    confidence: float = 0.0
+    shape: Optional[str] = None
+    model: Optional[str] = None
+    applied: bool = False
+    features: Dict[str, Any] = field(default_factory=dict)
+    penalties: List[str] = field(default_factory=list)
+    shadow_agreement: Optional[bool] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging/telemetry."""
+        return {
+            "route": self.route,
+            "reason": self.reason,
+            "confidence": round(self.confidence, 3),
+            "shape": self.shape,
+            "model": self.model,
+            "applied": self.applied,
+            "penalties": list(self.penalties),
+            "shadow_agreement": self.shadow_agreement,
+            "features": dict(self.features),
+        }
+
+
+def _calibrate(base: float, features: Dict[str, Any], *, ignore: Tuple[str, ...] = ()) -> Tuple[float, List[str]]:
+    penalties = [name for name in _PENALTIES if name not in ignore and features.get(name)]
+    confidence = base - sum(_PENALTIES[name] for name in penalties)
+    if "long_message" not in ignore and features.get("words", 0) > 6:
+        penalties.append("long_message")
+        confidence -= 0.05 * (features["words"] - 6)
+    return max(0.0, min(1.0, confidence)), penalties
+
+
+def decide_detection_route(
+    message: str,
+    pre_result: PreFilterResult,
+    event_entry: Optional[Dict[str, Any]] = None,
+    *,
+    reply_text: Optional[str] = None,
+    provider: Optional[str] = None,
+) -> RouteDecision:
+    """Decide whether unified detection can be skipped or run on a cheaper model."""
+    features = extract_route_features(message, pre_result, event_entry, reply_text=reply_text)
+    shape = features["shape"]
+    skip_min = _threshold("DETECTION_ROUTER_SKIP_MIN", 0.9)
+    cheap_min = _threshold("DETECTION_ROUTER_CHEAP_MIN", 0.6)
+
+    # (rule, base confidence, may skip) - first applicable rule wins
+    if (
+        features["is_duplicate"]
+        and not features["duplicate_exempt"]
+        and features["chars"] >= 30
+        and (features["current_step"] or 0) >= 2
+    ):
+        # check_duplicate_message answers this turn with the "same message" reply
+        # (same exemptions: detours and the billing flow are processed normally)
+        rule, base, can_skip = "duplicate", 0.99, True
+        ignore: Tuple[str, ...] = tuple(_PENALTIES) + ("long_message",)
+    elif shape == SHAPE_BILLING and features["billing_signal"]:
+        # Structured address extraction is still needed, but it is the expected reply
+        rule, base, can_skip, ignore = "billing_reply", 0.85, False, ("has_digits",)
+    elif features["exact_confirmation"] or features["acceptance_confidence"] >= 0.85:
+        base = 0.97 if features["exact_confirmation"] else features["acceptance_confidence"]
+        can_skip = shape in (SHAPE_DATE_CHOICE, SHAPE_OFFER_DECISION)
+        rule, ignore = f"confirmation_{shape or 'unexpected'}", ()
+        if not can_skip:
+            base -= 0.2  # no expected shape to resolve what "yes" refers to
+    elif features["pre_filter_confirmation"]:
+        rule, base, can_skip, ignore = "pre_filter_confirmation", 0.7, False, ()
+    else:
+        return RouteDecision(features=features, shape=shape)
+
+    confidence, penalties = _calibrate(base, features, ignore=ignore)
+    decision = RouteDecision(
+        reason=rule, confidence=confidence, shape=shape, features=features, penalties=penalties
+    )
+    if can_skip and confidence >= skip_min:
+        decision.route = ROUTE_SKIP
+    elif confidence >= cheap_min:
+        decision.model = cheap_detection_model(provider)
+        if decision.model:
+            decision.route = ROUTE_CHEAP
+        else:
+            decision.reason = f"{rule}:cheap_unavailable"
+    return decision
+
+
+# =============================================================================
+# SYNTHESIS (skip route)
+# =============================================================================
+
+def synthesize_detection(decision: RouteDecision, pre_result: PreFilterResult) -> UnifiedDetectionResult:
+    """Build the detection result for a skipped LLM call from deterministic signals."""
+    result = UnifiedDetectionResult(
+        language=pre_result.language,
+        intent="general_qna",
+        intent_confidence=round(decision.confidence, 3),
+        has_urgency=pre_result.has_urgency_signal,
+        # Same pre-filter fallback run_unified_detection merges into the LLM flags
+        is_acceptance=pre_result.has_acceptance_signal,
+        raw_response={"source": "detection_router", "reason": decision.reason},
+    )
+    if decision.reason.startswith("confirmation_"):
+        result.is_confirmation = True
+        if decision.shape == SHAPE_DATE_CHOICE:
+            result.intent = "confirm_date"
+        elif decision.shape == SHAPE_OFFER_DECISION:
+            result.intent = "accept_offer"
+            result.is_acceptance = True
+    return result
+
+
+_COMPARED_FIELDS = (
+    "intent",
+    "is_confirmation",
+    "is_acceptance",
+    "is_rejection",
+    "is_change_request",
+    "is_manager_request",
+    "is_question",
+)
+
+
+def detection_disagreements(synthesized: UnifiedDetectionResult, reference: Any) -> List[str]:
+    """Fields where the synthesized result differs from the reference detection.
+
+    reference may be a UnifiedDetectionResult or a flat dict of expected labels
+    (only the keys present are compared).
+    """
+    diffs = []
+    for name in _COMPARED_FIELDS:
+        if isinstance(reference, dict):
+            if name not in reference:
+                continue
+            expected = reference[name]
+        else:
+            expected = getattr(reference, name)
+        if getattr(synthesized, name) != expected:
+            diffs.append(name)
+    return diffs
+
+
+# =============================================================================
+# TELEMETRY
+# =============================================================================
+
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {}
+
+
+def _bump(*keys: str) -> None:
+    with _STATS_LOCK:
+        for key in keys:
+            _STATS[key] = _STATS.get(key, 0) + 1
+
+
+def detection_route_stats() -> Dict[str, int]:
+    """Process-wide routing counters (decisions, routes, LLM calls avoided, shadow agreement)."""
+    with _STATS_LOCK:
+        return dict(sorted(_STATS.items()))
+
+
+def reset_detection_route_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def route_unified_detection(
+    message: str,
+    pre_result: PreFilterResult,
+    event_entry: Optional[Dict[str, Any]],
+    run_detection: Callable[[Optional[str]], UnifiedDetectionResult],
+    *,
+    reply_text: Optional[str] = None,
+) -> Tuple[UnifiedDetectionResult, Optional[RouteDecision]]:
+    """Run unified detection through the router.
+
+    run_detection(model) performs the LLM detection (model=None: full model).
+    Returns the detection result and the decision (None when the router is off).
+    """
+    mode = get_router_mode()
+    if mode == "off":
+        return run_detection(None), None
+
+    from llm.provider_config import get_intent_provider
+
+    decision = decide_detection_route(
+        message, pre_result, event_entry, reply_text=reply_text, provider=get_intent_provider()
+    )
+    _bump("decisions", f"route_{decision.route}", f"reason_{decision.reason}")
+
+    if mode == "on" and decision.route == ROUTE_SKIP:
+        decision.applied = True
+        _bump("llm_calls_avoided")
+        result = synthesize_detection(decision, pre_result)
+    elif mode == "on" and decision.route == ROUTE_CHEAP:
+        decision.applied = True
+        _bump("llm_calls_downgraded")
+        result = run_detection(decision.model)
+    else:
+        result = run_detection(None)
+        if decision.route == ROUTE_SKIP:
+            diffs = detection_disagreements(synthesize_detection(decision, pre_result), result)
+            decision.shadow_agreement = not diffs
+            _bump("shadow_agree" if not diffs else "shadow_disagree")
+            if diffs:
+                logger.info("[DETECTION_ROUTER] shadow disagreement (%s): %s", decision.reason, diffs)
+
+    logger.debug(
+        "[DETECTION_ROUTER] mode=%s route=%s reason=%s conf=%.2f applied=%s",
+        mode, decision.route, decision.reason, decision.confidence, decision.applied,
+    )
+    return result, decision
+
+
+__all__ = [
+    "ROUTE_CHEAP",
+    "ROUTE_FULL",
+    "ROUTE_SKIP",
+    "SHAPE_BILLING",
+    "SHAPE_DATE_CHOICE",
+    "SHAPE_OFFER_DECISION",
+    "RouteDecision",
+    "cheap_detection_model",
+    "decide_detection_route",
+    "detection_disagreements",
+    "detection_route_stats",
+    "expected_reply_shape",
+    "extract_route_features",
+    "get_router_mode",
+    "normalize_reply",
+    "reset_detection_route_stats",
+    "route_unified_detection",
+    "synthesize_detection",
+]
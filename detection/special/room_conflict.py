@@ -57,6 +57,7 @@ from enum import Enum
 import logging
 
 from services.rooms import get_room
+from workflows.common.ordinal_dates import day_ordinal
 from workflows.common.time_window import TimeWindow, windows_overlap
 
 logger = logging.getLogger(__name__)
@@ -116,6 +117,8 @@ def detect_room_conflict(
     current_window: Optional[TimeWindow] = None
     if event_entry:
         current_window = TimeWindow.from_event(event_entry)
+    # Date-only fallback compares day ordinals (chosen_date is ISO, Event Date DD.MM.YYYY)
+    event_day = day_ordinal(event_date)
 
     for other_event_id, other_event in event_items:
         # Skip self
@@ -144,10 +147,8 @@ def detect_room_conflict(
                 continue  # No time overlap = no conflict
         else:
             # Fallback to date-only comparison if no time info
-            other_date = other_event.get("chosen_date") or other_event.get("Event Date")
-            if not other_date:
-                continue
-            if str(other_date) != str(event_date):
+            other_day = day_ordinal(other_event.get("chosen_date") or other_event.get("Event Date"))
+            if other_day is None or other_day != event_day:
                 continue
 
         # Found a conflict!
@@ -209,6 +210,7 @@ def get_available_rooms_on_date(
         event_items = events.items()
     else:
         event_items = [(e.get("event_id"), e) for e in events if isinstance(e, dict)]
+    event_day = day_ordinal(event_date)
 
     for other_event_id, other_event in event_items:
         if other_event_id == event_id:
@@ -227,8 +229,8 @@ def get_available_rooms_on_date(
                 continue  # No time overlap = room is available for this time
         else:
             # Fallback to date-only comparison if no time info
-            other_date = other_event.get("chosen_date") or other_event.get("Event Date")
-            if str(other_date) != str(event_date):
+            other_day = day_ordinal(other_event.get("chosen_date") or other_event.get("Event Date"))
+            if other_day != event_day:
                 continue
 
         # This event overlaps - mark its room as locked
@@ -29,6 +29,8 @@ from typing import Any, Dict, List, Optional, Tuple
 logger = logging.getLogger(__name__)
 
 from domain.vocabulary import IntentLabel
+from llm.prompt_cache import PromptLayout, prompt_call
+from llm.provider_router import ProvidersExhausted, route_provider_call
 
 
 # =============================================================================
@@ -150,24 +152,17 @@ class UnifiedDetectionResult:
 # UNIFIED DETECTION PROMPT
 # =============================================================================
 
-UNIFIED_DETECTION_PROMPT = """Analyze this client message for a venue booking system. Extract ALL information in one pass.
-
-MESSAGE:
-{message}
-
-CONTEXT (if available):
-- Today's date: {today}
-- Current workflow step: {current_step}
-- Event has date confirmed: {date_confirmed}
-- Event has room locked: {room_locked}
-- Last assistant message topic: {last_topic}
+# Static part first (instructions, schema, rules) so every call shares the
+# same prefix and provider-side prompt caching can hit; per-turn context and
+# the message go last.
+UNIFIED_DETECTION_PREFIX = """Analyze this client message for a venue booking system. Extract ALL information in one pass. The message and its context follow the rules below.
 
 Return a JSON object with this exact structure:
-{{
+{
   "language": "en" or "de" (CRITICAL: Look at the VERB/GRAMMAR of the main request, NOT proper nouns or addresses. Examples: "Please send invoice to Firma Müller, München" = "en" (verb "send" is English). "Bitte senden Sie an Firma Müller" = "de" (verb "senden" is German). Ignore company names, street names, city names when determining language),
   "intent": one of ["event_request", "confirm_date", "edit_date", "edit_room", "edit_requirements", "accept_offer", "decline_offer", "counter_offer", "message_manager", "general_qna", "non_event"],
   "intent_confidence": 0.0 to 1.0,
-  "signals": {{
+  "signals": {
     "is_confirmation": true ONLY for simple unconditional affirmations like "yes", "ok", "sounds good". FALSE if followed by "but", conditions, or hesitation (e.g., "yes but I need to check..." = false),
     "is_acceptance": true if accepting an offer/proposal FOR THE BOOKING,
     "is_rejection": true ONLY if client explicitly wants to CANCEL/ABORT THE ENTIRE BOOKING or decline the venue offer. False for: unrelated uses of "decline" (like "decline to comment"), removing single items (use is_change_request), or general negativity,
@@ -176,8 +171,8 @@ Return a JSON object with this exact structure:
     "is_manager_request": true ONLY if client is REQUESTING to speak with a human/manager/supervisor. Must be a REQUEST, not a statement. FALSE for job titles like "I'm the Event Manager" or "Manager John here". TRUE examples: "Can I speak to someone?", "I want to talk to a real person", "Please escalate this",
     "is_question": true ONLY if asking for INFORMATION (e.g., "Do you have parking?", "What's the capacity?"). NOT for action requests like "Could you send me..." or "Please confirm...",
     "has_urgency": true if time-sensitive (urgent, asap, deadline)
-  }},
-  "entities": {{
+  },
+  "entities": {
     "date": "YYYY-MM-DD" or null (convert relative dates like "next Tuesday" to ISO),
     "date_text": original date text from message or null,
     "participants": integer or null,
@@ -186,20 +181,57 @@ Return a JSON object with this exact structure:
     "end_time": "HH:MM" (24h format) or null - extract if client mentions end time. If only start given, infer end as start + 4 hours,
     "room_preference": room name or null,
     "products": ["catering", "projector", ...] or [],
-    "billing_address": {{"name_or_company": "", "street": "", "postal_code": "", "city": "", "country": ""}} or null,
+    "billing_address": {"name_or_company": "", "street": "", "postal_code": "", "city": "", "country": ""} or null,
     "site_visit_room": room mentioned for site visit or null (if different from main event room),
     "site_visit_date": date mentioned for site visit or null (YYYY-MM-DD format)
-  }},
+  },
   "qna_types": list of applicable types from ["free_dates", "room_features", "catering_for", "products_for", "site_visit_overview", "site_visit_request", "parking", "check_availability", "check_capacity"],
   "step_anchor": suggested workflow step or null
-}}
+}
 
 IMPORTANT:
 - Be precise with intent classification
 - Extract ALL entities mentioned, even if implicit
 - For dates, convert to ISO format based on context (assume current year if not specified)
 - For "is_confirmation", only true for simple affirmations (yes, ok, sounds good) NOT detailed responses
-- Return valid JSON only, no markdown or explanation"""
+- Return valid JSON only, no markdown or explanation
+
+"""
+
+UNIFIED_DETECTION_SUFFIX = """CONTEXT (if available):
+- Today's date: {today}
+- Current workflow step: {current_step}
+- Event has date confirmed: {date_confirmed}
+- Event has room locked: {room_locked}
+- Last assistant message topic: {last_topic}
+
+MESSAGE:
+{message}"""
+
+UNIFIED_DETECTION_SYSTEM_PROMPT = "You are a precise JSON extraction assistant. Return only valid JSON."
+
+
+def build_unified_detection_prompt(
+    message: str,
+    *,
+    current_step: Optional[int] = None,
+    date_confirmed: bool = False,
+    room_locked: bool = False,
+    last_topic: Optional[str] = None,
+) -> PromptLayout:
+    """Build the unified detection prompt as static prefix + per-turn suffix."""
+    return PromptLayout(
+        call_type="unified_detection",
+        prefix=UNIFIED_DETECTION_PREFIX,
+        suffix=UNIFIED_DETECTION_SUFFIX.format(
+            message=message,
+            today=date.today().isoformat(),
+            current_step=current_step or "unknown",
+            date_confirmed=date_confirmed,
+            room_locked=room_locked,
+            last_topic=last_topic or "unknown",
+        ),
+    )
 
 
 # =============================================================================
@@ -247,6 +279,23 @@ def _merge_signal_flags(
     }
 
 
+def _strip_json_fence(response_text: str) -> str:
+    """Drop a markdown code fence around a JSON response."""
+    json_text = response_text.strip()
+    if json_text.startswith("```"):
+        json_text = re.sub(r"```(?:json)?\n?", "", json_text)
+        json_text = json_text.rstrip("`").strip()
+    return json_text
+
+
+def _is_json_response(response_text: str) -> bool:
+    try:
+        json.loads(_strip_json_fence(response_text or ""))
+    except ValueError:
+        return False
+    return True
+
+
 def run_unified_detection(
     message: str,
     *,
@@ -254,6 +303,7 @@ def run_unified_detection(
     date_confirmed: bool = False,
     room_locked: bool = False,
     last_topic: Optional[str] = None,
+    model: Optional[str] = None,
 ) -> UnifiedDetectionResult:
     """
     Run unified detection on a message using a single LLM call.
@@ -264,49 +314,56 @@ def run_unified_detection(
         date_confirmed: Whether date is already confirmed
         room_locked: Whether room is already locked
         last_topic: Topic of last assistant message
+        model: Override the provider's intent model (cheaper model chosen
+            by detection.routing); fallback providers use their default
 
     Returns:
         UnifiedDetectionResult with all extracted information
     """
     from adapters.agent_adapter import get_adapter_for_provider
-    from llm.provider_config import get_intent_provider
+    from llm.provider_config import get_fallback_providers, get_intent_provider
     from detection.pre_filter import pre_filter
 
     # Run pre-filter first to get keyword-based signals
     # These signals (especially acceptance) are critical and must not be lost
     pre_filter_result = pre_filter(message)
 
-    # Build the prompt
-    prompt = UNIFIED_DETECTION_PROMPT.format(
-        message=message,
-        today=date.today().isoformat(),
-        current_step=current_step or "unknown",
+    # Build the prompt (static prefix first for provider-side prompt caching)
+    layout = build_unified_detection_prompt(
+        message,
+        current_step=current_step,
         date_confirmed=date_confirmed,
         room_locked=room_locked,
-        last_topic=last_topic or "unknown",
+        last_topic=last_topic,
     )
+    prompt = layout.text
 
     # Get adapter for intent detection (respects hybrid mode config)
     intent_provider = get_intent_provider()
-    adapter = get_adapter_for_provider(intent_provider)
+
+    def _complete(provider: str) -> str:
+        # The routing model override only applies to the configured provider
+        overrides = {"model": model} if model and provider == intent_provider else {}
+        with prompt_call(layout.call_type, layout.prefix, prompt_text=prompt):
+            return get_adapter_for_provider(provider).complete(
+                prompt=prompt,
+                system_prompt=UNIFIED_DETECTION_SYSTEM_PROMPT,
+                temperature=0.1,  # Low temperature for consistent extraction
+                max_tokens=2000,
+                **overrides,
+            )
 
     try:
-        # Make the LLM call
-        response_text = adapter.complete(
-            prompt=prompt,
-            system_prompt="You are a precise JSON extraction assistant. Return only valid JSON.",
-            temperature=0.1,  # Low temperature for consistent extraction
-            max_tokens=2000,
+        # Make the LLM call (hedged/failed over across providers by the router)
+        _, response_text = route_provider_call(
+            "unified_detection",
+            _complete,
+            primary=intent_provider,
+            fallbacks=get_fallback_providers(intent_provider),
+            validate=_is_json_response,
         )
 
-        # Parse JSON response
-        # Handle potential markdown code blocks
-        json_text = response_text.strip()
-        if json_text.startswith("```"):
-            json_text = re.sub(r"```(?:json)?\n?", "", json_text)
-            json_text = json_text.rstrip("`").strip()
-
-        data = json.loads(json_text)
+        data = json.loads(_strip_json_fence(response_text))
 
         # Build result from parsed data
         signals = data.get("signals", {})
@@ -366,25 +423,30 @@ def run_unified_detection(
 
         return result
 
+    except ProvidersExhausted as e:
+        # The router already tried every provider in the fallback chain
+        logger.warning("[UNIFIED_DETECTION] %s", e)
+        return UnifiedDetectionResult(
+            intent="general_qna",
+            intent_confidence=0.3,
+            is_question="?" in message or pre_filter_result.has_question_signal,
+            is_acceptance=pre_filter_result.has_acceptance_signal,
+        )
     except json.JSONDecodeError as e:
         logger.warning("[UNIFIED_DETECTION] JSON parse error with %s: %s", intent_provider, e)
         # Try fallback providers on JSON parse failure
-        from llm.provider_config import get_fallback_providers
         for fallback in get_fallback_providers(intent_provider):
             try:
                 logger.info("[UNIFIED_DETECTION] Trying fallback provider: %s", fallback)
                 fallback_adapter = get_adapter_for_provider(fallback)
-                response_text = fallback_adapter.complete(
-                    prompt=prompt,
-                    system_prompt="You are a precise JSON extraction assistant. Return only valid JSON.",
-                    temperature=0.1,
-                    max_tokens=2000,
-                )
-                json_text = response_text.strip()
-                if json_text.startswith("```"):
-                    json_text = re.sub(r"```(?:json)?\n?", "", json_text)
-                    json_text = json_text.rstrip("`").strip()
-                data = json.loads(json_text)
+                with prompt_call(layout.call_type, layout.prefix, prompt_text=prompt):
+                    response_text = fallback_adapter.complete(
+                        prompt=prompt,
+                        system_prompt=UNIFIED_DETECTION_SYSTEM_PROMPT,
+                        temperature=0.1,
+                        max_tokens=2000,
+                    )
+                data = json.loads(_strip_json_fence(response_text))
                 # Success with fallback - return result
                 signals = data.get("signals", {})
                 entities = data.get("entities", {})
@@ -431,17 +493,17 @@ def run_unified_detection(
     except Exception as e:
         logger.warning("[UNIFIED_DETECTION] Error with %s: %s", intent_provider, e)
         # Try fallback on any error
-        from llm.provider_config import get_fallback_providers
         for fallback in get_fallback_providers(intent_provider):
             try:
                 logger.info("[UNIFIED_DETECTION] Trying fallback provider: %s", fallback)
                 fallback_adapter = get_adapter_for_provider(fallback)
-                response_text = fallback_adapter.complete(
-                    prompt=prompt,
-                    system_prompt="You are a precise JSON extraction assistant. Return only valid JSON.",
-                    temperature=0.1,
-                    max_tokens=2000,
-                )
+                with prompt_call(layout.call_type, layout.prefix, prompt_text=prompt):
+                    response_text = fallback_adapter.complete(
+                        prompt=prompt,
+                        system_prompt=UNIFIED_DETECTION_SYSTEM_PROMPT,
+                        temperature=0.1,
+                        max_tokens=2000,
+                    )
                 data = json.loads(response_text.strip())
                 signals = data.get("signals", {})
                 entities = data.get("entities", {})
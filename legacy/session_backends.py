@@ -0,0 +1,510 @@
+"""
+Durable session storage for chat conversations.
+
+`active_conversations` used to be an in-process dict, so chats were lost on
+restart and could not be shared between workers. `SessionStore` keeps the
+same mapping API (`in`, `[]`, `[] =`, `del`, `len`) on top of a pluggable
+backend that stores each `ConversationState` as a compact blob:
+
+- memory: process-local dict (default; matches the old behaviour)
+- sqlite: one WAL-mode SQLite file, shared by workers on the same host and
+  kept across restarts
+- redis: any client with get/set(ex=)/expire/delete/scan_iter; `LocalRedis`
+  is an in-process stand-in used when no URL is configured
+
+Blobs are the state's JSON without default-valued fields, zlib-compressed
+once they pass `COMPRESS_MIN_BYTES`. A one-byte marker says which.
+
+Expiry is sliding (writes and reads push `expires_at` forward) and stale
+sessions are removed by a background sweeper thread, never on access; reads
+only refuse to return entries past their expiry. In front of the backend sits
+a small read-through cache of deserialized states so the `in` check and the
+lookup that follows it in one request cost one backend read. Handlers that
+mutate a state write it back with `store[session_id] = state`.
+
+The cache is only on by default for the memory backend. SQLite and Redis are
+shared between workers, and a cached state would hide another worker's
+write for up to the cache TTL (that worker's turn would then be overwritten
+by the next save), so for them every read goes to the backend unless
+OE_SESSION_CACHE_TTL_S is set explicitly.
+
+Environment:
+    OE_SESSION_BACKEND: memory | sqlite | redis (default: memory)
+    OE_SESSION_DB: SQLite file (default: <repo>/tmp-cache/sessions.sqlite3)
+    OE_SESSION_REDIS_URL: Redis URL; unset uses the in-process LocalRedis
+    OE_SESSION_CACHE_TTL_S: Seconds a cached state is served without a backend read
+        (default: 5 for memory, 0 for the shared sqlite/redis backends)
+    OE_SESSION_CACHE_SIZE: States kept in the read-through cache (default: 512)
+    OE_SESSION_SWEEP_S: Seconds between expiry sweeps (default: 300)
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from domain import ConversationState
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = 1024
+_RAW = b"j"
+_ZLIB = b"z"
+_MISSING = object()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+
+def encode_state(state: ConversationState) -> bytes:
+    """Compact blob for a ConversationState (JSON minus defaults, zlib when large)."""
+    payload = state.model_dump(mode="json", exclude_defaults=True)
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(raw, 6)
+    return _RAW + raw
+
+
+def decode_state(blob: bytes) -> ConversationState:
+    """Inverse of encode_state."""
+    marker, body = blob[:1], blob[1:]
+    if marker == _ZLIB:
+        body = zlib.decompress(body)
+    elif marker != _RAW:
+        raise ValueError(f"unknown session blob marker {marker!r}")
+    return ConversationState.model_validate(json.loads(body))
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+class SessionBackend:
+    """Blob storage keyed by session id, with an absolute expiry per entry."""
+
+    name = "base"
+    # True when other processes write the same entries (no read-through cache by default)
+    shared = False
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Blob for key, or None when missing or past its expiry."""
+        raise NotImplementedError
+
+    def save(self, key: str, blob: bytes, ttl_s: float) -> None:
+        raise NotImplementedError
+
+    def touch(self, key: str, ttl_s: float) -> None:
+        """Push the expiry of an existing entry to now + ttl_s."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Remove key; True when it existed."""
+        raise NotImplementedError
+
+    def keys(self) -> List[str]:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        return len(self.keys())
+
+    def sweep(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySessionBackend(SessionBackend):
+    """Process-local backend (the old in-memory behaviour)."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def save(self, key: str, blob: bytes, ttl_s: float) -> None:
+        with self._lock:
+            self._data[key] = (blob, time.time() + ttl_s)
+
+    def touch(self, key: str, ttl_s: float) -> None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data[key] = (entry[0], time.time() + ttl_s)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def keys(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            return [key for key, (_, expires_at) in self._data.items() if expires_at > now]
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._data.items() if expires_at <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+
+def default_db_path() -> Path:
+    override = os.getenv("OE_SESSION_DB")
+    if override:
+        return Path(override)
+    return Path(__file__).resolve().parent.parent / "tmp-cache" / "sessions.sqlite3"
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """Sessions in one SQLite file (WAL), shared across workers and restarts."""
+
+    name = "sqlite"
+    shared = True
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else default_db_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " expires_at REAL NOT NULL,"
+            " blob BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def load(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM sessions WHERE session_id = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def save(self, key: str, blob: bytes, ttl_s: float) -> None:
+        self._execute(
+            "INSERT INTO sessions (session_id, expires_at, blob) VALUES (?, ?, ?)"
+            " ON CONFLICT(session_id) DO UPDATE SET expires_at = excluded.expires_at, blob = excluded.blob",
+            (key, time.time() + ttl_s, sqlite3.Binary(blob)),
+        )
+
+    def touch(self, key: str, ttl_s: float) -> None:
+        self._execute("UPDATE sessions SET expires_at = ? WHERE session_id = ?", (time.time() + ttl_s, key))
+
+    def delete(self, key: str) -> bool:
+        return self._execute("DELETE FROM sessions WHERE session_id = ?", (key,)).rowcount > 0
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT session_id FROM sessions WHERE expires_at > ?", (time.time(),)).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def sweep(self) -> int:
+        return self._execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of the redis-py client the backend uses."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            # Redis expires keys itself; mirror that here
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return False
+            self._data[key] = (entry[0], time.time() + seconds)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._live(key) is not None and self._data.pop(key, None) is not None)
+
+    def scan_iter(self, match: str = "*") -> Iterator[str]:
+        with self._lock:
+            keys = [key for key in list(self._data) if self._live(key) is not None]
+        return iter([key for key in keys if fnmatch.fnmatchcase(key, match)])
+
+
+class RedisSessionBackend(SessionBackend):
+    """Sessions as Redis keys with native expiry (the sweeper has nothing to do)."""
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, client: Any, *, prefix: str = "oe:session:") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    def load(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def save(self, key: str, blob: bytes, ttl_s: float) -> None:
+        self._client.set(self._prefix + key, blob, ex=max(1, int(ttl_s)))
+
+    def touch(self, key: str, ttl_s: float) -> None:
+        self._client.expire(self._prefix + key, max(1, int(ttl_s)))
+
+    def delete(self, key: str) -> bool:
+        return bool(self._client.delete(self._prefix + key))
+
+    def keys(self) -> List[str]:
+        start = len(self._prefix)
+        keys = []
+        for raw in self._client.scan_iter(match=self._prefix + "*"):
+            key = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+            keys.append(key[start:])
+        return keys
+
+
+def backend_from_env() -> SessionBackend:
+    """Backend selected by OE_SESSION_BACKEND (memory when unset or unknown)."""
+    kind = os.getenv("OE_SESSION_BACKEND", "memory").strip().lower()
+    if kind == "sqlite":
+        return SQLiteSessionBackend()
+    if kind == "redis":
+        url = os.getenv("OE_SESSION_REDIS_URL", "").strip()
+        if not url:
+            logger.warning("[SessionStore] OE_SESSION_REDIS_URL not set; using process-local LocalRedis")
+            return RedisSessionBackend(LocalRedis())
+        try:
+            import redis  # pylint: disable=import-outside-toplevel
+        except ImportError as exc:
+            raise RuntimeError("OE_SESSION_BACKEND=redis requires the 'redis' package") from exc
+        return RedisSessionBackend(redis.Redis.from_url(url))
+    if kind != "memory":
+        logger.warning("[SessionStore] Unknown OE_SESSION_BACKEND=%r; using memory", kind)
+    return MemorySessionBackend()
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+
+class SessionStore:
+    """Mapping of session id -> ConversationState over a SessionBackend.
+
+    Reads go through a small LRU of deserialized states (fresh for
+    `cache_ttl_s`, 0 disables it); writes go straight to the backend and
+    refresh the cache.
+    """
+
+    def __init__(
+        self,
+        backend: SessionBackend,
+        *,
+        ttl_s: float,
+        cache_ttl_s: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        sweep_interval_s: Optional[float] = None,
+    ) -> None:
+        self.backend = backend
+        self.ttl_s = ttl_s
+        if cache_ttl_s is None:
+            cache_ttl_s = _env_float("OE_SESSION_CACHE_TTL_S", 0.0 if backend.shared else 5.0)
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_size = cache_size or int(_env_float("OE_SESSION_CACHE_SIZE", 512))
+        self.sweep_interval_s = (
+            sweep_interval_s if sweep_interval_s is not None else _env_float("OE_SESSION_SWEEP_S", 300.0)
+        )
+        # session id -> (state, cached at monotonic)
+        self._cache: "OrderedDict[str, Tuple[ConversationState, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats_counters = {"hits": 0, "misses": 0, "writes": 0, "swept": 0}
+
+    # -- mapping API ------------------------------------------------------------
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None and now - entry[1] < self.cache_ttl_s:
+                self._cache.move_to_end(session_id)
+                self.stats_counters["hits"] += 1
+                return entry[0]
+            self.stats_counters["misses"] += 1
+        blob = self.backend.load(session_id)
+        if blob is None:
+            with self._lock:
+                self._cache.pop(session_id, None)
+            return default
+        state = decode_state(blob)
+        # Reading a session counts as activity for the sliding expiry
+        self.backend.touch(session_id, self.ttl_s)
+        self._remember(session_id, state, now)
+        return state
+
+    def __getitem__(self, session_id: str) -> ConversationState:
+        state = self.get(session_id, _MISSING)
+        if state is _MISSING:
+            raise KeyError(session_id)
+        return state
+
+    def __contains__(self, session_id: object) -> bool:
+        return isinstance(session_id, str) and self.get(session_id, _MISSING) is not _MISSING
+
+    def __setitem__(self, session_id: str, state: ConversationState) -> None:
+        self.backend.save(session_id, encode_state(state), self.ttl_s)
+        self._remember(session_id, state, time.monotonic())
+        with self._lock:
+            self.stats_counters["writes"] += 1
+        self._ensure_sweeper()
+
+    def __delitem__(self, session_id: str) -> None:
+        with self._lock:
+            self._cache.pop(session_id, None)
+        if not self.backend.delete(session_id):
+            raise KeyError(session_id)
+
+    def pop(self, session_id: str, default: Any = None) -> Any:
+        state = self.get(session_id, _MISSING)
+        if state is _MISSING:
+            return default
+        del self[session_id]
+        return state
+
+    def __len__(self) -> int:
+        return self.backend.count()
+
+    def keys(self) -> List[str]:
+        return self.backend.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+        for session_id in self.backend.keys():
+            self.backend.delete(session_id)
+
+    def _remember(self, session_id: str, state: ConversationState, now: float) -> None:
+        with self._lock:
+            self._cache[session_id] = (state, now)
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # -- expiry -----------------------------------------------------------------
+
+    def sweep(self) -> int:
+        """Remove expired sessions from the backend now; returns how many."""
+        removed = self.backend.sweep()
+        if removed:
+            with self._lock:
+                self.stats_counters["swept"] += removed
+            logger.info("[SessionStore] Expired %d stale sessions", removed)
+        return removed
+
+    def _ensure_sweeper(self) -> None:
+        if self.sweep_interval_s <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop.clear()
+            self._sweeper = threading.Thread(target=self._run_sweeper, name="session-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while not self._stop.wait(self.sweep_interval_s):
+            try:
+                self.sweep()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.warning("[SessionStore] sweep failed: %s", exc)
+
+    def shutdown(self) -> None:
+        """Stop the sweeper thread (app shutdown, tests)."""
+        with self._lock:
+            thread, self._sweeper = self._sweeper, None
+        self._stop.set()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=5.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.stats_counters)
+            cached = len(self._cache)
+        return {"backend": self.backend.name, "sessions": len(self), "cached": cached, **counters}
+
+
+__all__ = [
+    "COMPRESS_MIN_BYTES",
+    "LocalRedis",
+    "MemorySessionBackend",
+    "RedisSessionBackend",
+    "SQLiteSessionBackend",
+    "SessionBackend",
+    "SessionStore",
+    "backend_from_env",
+    "decode_state",
+    "default_db_path",
+    "encode_state",
+]
@@ -0,0 +1,216 @@
+"""
+Stable-Prefix Prompt Layout and Prefix-Cache Telemetry
+
+Provider-side prompt caching (OpenAI automatic caching, Gemini implicit
+caching) only discounts the longest *identical leading* part of a request.
+Prompt builders therefore put the static part first - venue config, rules,
+output schema, few-shot examples - and every per-turn value (message text,
+dates, names, facts, locale) after it:
+
+    layout = PromptLayout("unified_detection", prefix=STATIC_RULES, suffix=turn_part)
+    layout.prefix_hash      # identical for every call sharing the static part
+
+Builders expose the hash of their static prefix (as `prefix_hash` on the
+returned payload or via PromptLayout), so a changed hash in telemetry points
+at a prompt edit or at per-turn data leaking into the prefix.
+
+Each LLM call made inside `prompt_call(call_type, prefix)` is recorded per
+call type: prompt tokens, cached tokens and the cached-token ratio. Adapters
+report the provider's usage numbers via `report_usage()`. Providers that do
+not report cache usage, including the stub adapter used in tests, fall back
+to a local prefix cache: a prefix seen before counts as cached, with the
+token count estimated from its length (~4 characters per token).
+
+Environment:
+    OE_PROMPT_CACHE_TELEMETRY: Set to 0 to disable recording (default: 1)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+_LOCAL_PREFIXES_MAX = 256
+
+_ACTIVE: ContextVar[Optional["PromptCall"]] = ContextVar("PROMPT_CALL", default=None)
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, Dict[str, Any]] = {}
+_LOCAL_PREFIXES: "OrderedDict[str, None]" = OrderedDict()
+
+
+def _enabled() -> bool:
+    return os.getenv("OE_PROMPT_CACHE_TELEMETRY", "1") != "0"
+
+
+def prefix_hash(prefix: str) -> str:
+    """Short stable hash identifying a prompt prefix."""
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for providers without usage data."""
+    return (len(text) + 3) // 4
+
+
+@dataclass(frozen=True)
+class PromptLayout:
+    """A prompt split into its static prefix and per-turn suffix."""
+    call_type: str
+    prefix: str
+    suffix: str
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.suffix
+
+    @property
+    def prefix_hash(self) -> str:
+        return prefix_hash(self.prefix)
+
+
+@dataclass
+class PromptCall:
+    """Usage of one LLM call, filled in by the adapter that makes it."""
+    call_type: str
+    prefix_hash: str
+    prefix_tokens: int
+    prompt_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    source: str = "local"
+
+
+def _observe_local_prefix(key: str) -> bool:
+    """Local stand-in for a provider prefix cache: True when key was seen before."""
+    with _STATS_LOCK:
+        if key in _LOCAL_PREFIXES:
+            _LOCAL_PREFIXES.move_to_end(key)
+            return True
+        _LOCAL_PREFIXES[key] = None
+        while len(_LOCAL_PREFIXES) > _LOCAL_PREFIXES_MAX:
+            _LOCAL_PREFIXES.popitem(last=False)
+        return False
+
+
+@contextmanager
+def prompt_call(call_type: str, prefix: str, *, prompt_text: Optional[str] = None) -> Iterator[PromptCall]:
+    """Record the LLM call(s) made in this block under call_type.
+
+    prefix is the static leading part of the prompt; prompt_text the full
+    prompt (used to estimate prompt tokens when the provider reports none).
+    """
+    call = PromptCall(call_type=call_type, prefix_hash=prefix_hash(prefix), prefix_tokens=estimate_tokens(prefix))
+    handle = _ACTIVE.set(call)
+    try:
+        yield call
+    finally:
+        _ACTIVE.reset(handle)
+    if not _enabled():
+        return
+    # The local cache always observes the prefix so "prefix reuse" is
+    # tracked even when the provider reports its own cache numbers
+    reused = _observe_local_prefix(f"{call_type}:{call.prefix_hash}")
+    if call.prompt_tokens is None:
+        call.prompt_tokens = estimate_tokens(prompt_text) if prompt_text is not None else call.prefix_tokens
+    if call.cached_tokens is None:
+        call.cached_tokens = min(call.prefix_tokens, call.prompt_tokens) if reused else 0
+    _record(call, reused)
+
+
+def report_usage(
+    *,
+    prompt_tokens: Optional[int] = None,
+    cached_tokens: Optional[int] = None,
+    source: str = "provider",
+) -> None:
+    """Attach provider usage numbers to the active prompt_call (no-op outside one)."""
+    call = _ACTIVE.get()
+    if call is None:
+        return
+    if prompt_tokens is not None:
+        call.prompt_tokens = int(prompt_tokens)
+    if cached_tokens is not None:
+        call.cached_tokens = int(cached_tokens)
+        call.source = source
+
+
+def report_openai_usage(usage: Any) -> None:
+    """report_usage() from an OpenAI usage object (chat completions or responses API)."""
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None)
+    details = getattr(usage, "prompt_tokens_details", None) or getattr(usage, "input_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    report_usage(
+        prompt_tokens=prompt_tokens if isinstance(prompt_tokens, int) else None,
+        cached_tokens=cached if isinstance(cached, int) else None,
+        source="openai",
+    )
+
+
+def report_gemini_usage(usage_metadata: Any) -> None:
+    """report_usage() from a Gemini usage_metadata object."""
+    if usage_metadata is None:
+        return
+    prompt_tokens = getattr(usage_metadata, "prompt_token_count", None)
+    cached = getattr(usage_metadata, "cached_content_token_count", None)
+    report_usage(
+        prompt_tokens=prompt_tokens if isinstance(prompt_tokens, int) else None,
+        cached_tokens=cached if isinstance(cached, int) else None,
+        source="gemini",
+    )
+
+
+def _record(call: PromptCall, reused: bool) -> None:
+    with _STATS_LOCK:
+        entry = _STATS.setdefault(
+            call.call_type,
+            {"calls": 0, "prefix_reuse": 0, "prompt_tokens": 0, "cached_tokens": 0, "prefix_hashes": [], "sources": {}},
+        )
+        entry["calls"] += 1
+        entry["prefix_reuse"] += int(reused)
+        entry["prompt_tokens"] += call.prompt_tokens or 0
+        entry["cached_tokens"] += call.cached_tokens or 0
+        if call.prefix_hash not in entry["prefix_hashes"]:
+            entry["prefix_hashes"] = (entry["prefix_hashes"] + [call.prefix_hash])[-8:]
+        entry["sources"][call.source] = entry["sources"].get(call.source, 0) + 1
+
+
+def prompt_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per call type: calls, prefix reuse, prompt/cached tokens and cached-token ratio."""
+    with _STATS_LOCK:
+        report = {}
+        for call_type, entry in sorted(_STATS.items()):
+            prompt_tokens = entry["prompt_tokens"]
+            report[call_type] = dict(
+                entry,
+                prefix_hashes=list(entry["prefix_hashes"]),
+                sources=dict(entry["sources"]),
+                cached_ratio=round(entry["cached_tokens"] / prompt_tokens, 3) if prompt_tokens else 0.0,
+            )
+        return report
+
+
+def reset_prompt_cache_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+        _LOCAL_PREFIXES.clear()
+
+
+__all__ = [
+    "PromptCall",
+    "PromptLayout",
+    "estimate_tokens",
+    "prefix_hash",
+    "prompt_cache_stats",
+    "prompt_call",
+    "report_gemini_usage",
+    "report_openai_usage",
+    "report_usage",
+    "reset_prompt_cache_stats",
+]
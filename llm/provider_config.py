@@ -19,7 +19,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 Provider = Literal["openai", "gemini", "stub"]
 
@@ -46,8 +46,8 @@ def get_fallback_providers(primary: Provider) -> list:
     return PROVIDER_FALLBACK_CHAIN.get(primary, ["stub"])
 
 
-# Cache to avoid repeated database reads
-_cached_settings: Optional[LLMProviderSettings] = None
+# Cache to avoid repeated database reads, one entry per tenant
+_cached_settings: Dict[str, LLMProviderSettings] = {}
 
 
 def get_llm_providers(*, force_reload: bool = False) -> LLMProviderSettings:
@@ -55,7 +55,7 @@ def get_llm_providers(*, force_reload: bool = False) -> LLMProviderSettings:
     Get the current LLM provider configuration.
 
     Checks in order:
-    1. Database config (allows runtime toggle)
+    1. Database config of the current tenant (allows runtime toggle)
     2. Environment variables
     3. Defaults (hybrid mode)
 
@@ -65,27 +65,23 @@ def get_llm_providers(*, force_reload: bool = False) -> LLMProviderSettings:
     Returns:
         LLMProviderSettings with current provider for each operation type
     """
-    global _cached_settings
+    from workflows.io.tenants import current_tenant_id, tenant_config_section
 
-    if _cached_settings is not None and not force_reload:
-        return _cached_settings
+    tenant = current_tenant_id()
+    cached = _cached_settings.get(tenant)
+    if cached is not None and not force_reload:
+        return cached
 
     # Try database first
-    try:
-        from workflows.io.database import load_db
-        db = load_db()
-        llm_config = db.get("config", {}).get("llm_provider", {})
-
-        if llm_config.get("intent_provider") or llm_config.get("entity_provider"):
-            _cached_settings = LLMProviderSettings(
-                intent_provider=llm_config.get("intent_provider", "gemini"),
-                entity_provider=llm_config.get("entity_provider", "gemini"),
-                verbalization_provider=llm_config.get("verbalization_provider", "openai"),
-                source="database",
-            )
-            return _cached_settings
-    except Exception:
-        pass  # Database not available, use env/defaults
+    llm_config = tenant_config_section("llm_provider", tenant)
+    if llm_config.get("intent_provider") or llm_config.get("entity_provider"):
+        settings = _cached_settings[tenant] = LLMProviderSettings(
+            intent_provider=llm_config.get("intent_provider", "gemini"),
+            entity_provider=llm_config.get("entity_provider", "gemini"),
+            verbalization_provider=llm_config.get("verbalization_provider", "openai"),
+            source="database",
+        )
+        return settings
 
     # Fall back to environment variables
     agent_mode = os.getenv("AGENT_MODE", "").lower()
@@ -96,19 +92,18 @@ def get_llm_providers(*, force_reload: bool = False) -> LLMProviderSettings:
     else:
         default_extraction = "gemini"  # Default: Gemini for extraction
 
-    _cached_settings = LLMProviderSettings(
+    settings = _cached_settings[tenant] = LLMProviderSettings(
         intent_provider=os.getenv("INTENT_PROVIDER", default_extraction),
         entity_provider=os.getenv("ENTITY_PROVIDER", default_extraction),
         verbalization_provider=os.getenv("VERBALIZER_PROVIDER", "openai"),
         source="environment",
     )
-    return _cached_settings
+    return settings
 
 
 def clear_provider_cache() -> None:
-    """Clear the cached provider settings. Call after config changes."""
-    global _cached_settings
-    _cached_settings = None
+    """Clear the cached provider settings of every tenant. Call after config changes."""
+    _cached_settings.clear()
 
 
 def get_intent_provider() -> Provider:
@@ -192,9 +187,8 @@ def is_hybrid_enforcement_enabled() -> bool:
 
     # Check database config
     try:
-        from workflows.io.database import load_db
-        db = load_db()
-        enforcement_config = db.get("config", {}).get("hybrid_enforcement", {})
+        from workflows.io.tenants import tenant_config_section
+        enforcement_config = tenant_config_section("hybrid_enforcement")
         if "enabled" in enforcement_config:
             return enforcement_config.get("enabled", True)
     except Exception:
@@ -0,0 +1,368 @@
+"""
+Latency-Aware Provider Router with Hedged Requests
+
+PROVIDER_FALLBACK_CHAIN (llm.provider_config) only switches providers after
+the primary *raises*; a slow-but-alive provider drags every turn to its
+timeout. The router keeps a rolling window of latency and errors per
+(provider, call type) and uses it in three ways:
+
+1. Hedging: for latency-critical calls, once the primary has been running
+   longer than its own p95 latency, the same call is issued to the next
+   provider; the first valid result wins and the other attempt is
+   abandoned (cancelled if it has not started; an in-flight HTTP call
+   cannot be interrupted, so its result is discarded).
+2. Failover: an error or invalid result from one provider moves on to the
+   next immediately.
+3. Health ordering: a primary whose error rate in the window is above
+   OE_ROUTER_MAX_ERROR_RATE is demoted behind a healthier provider; every
+   OE_ROUTER_PROBE_EVERY-th call still goes to it first so it can recover.
+
+While a router attempt runs, the agent adapters raise provider errors
+instead of quietly answering with the heuristic StubAgentAdapter, so the
+router sees real failures (see `router_attempt_active()`).
+
+Decisions are exported as counters and per-provider percentiles via
+`provider_router_metrics()`.
+
+    provider, text = route_provider_call(
+        "unified_detection",
+        lambda provider: get_adapter_for_provider(provider).complete(prompt),
+        primary="gemini",
+        fallbacks=["openai"],
+        validate=is_json,
+    )
+
+Environment:
+    OE_PROVIDER_ROUTER: Set to 0 to call only the primary, as before (default: 1)
+    OE_ROUTER_WINDOW: Samples kept per provider and call type (default: 50)
+    OE_ROUTER_MIN_SAMPLES: Samples needed before p95/error rate are trusted (default: 10)
+    OE_ROUTER_HEDGE_AFTER_S: Hedge delay before enough samples exist (default: 6.0)
+    OE_ROUTER_HEDGE_FLOOR_S: Lower bound for the p95 hedge delay (default: 0.5)
+    OE_ROUTER_MAX_ERROR_RATE: Error rate that demotes a primary (default: 0.5)
+    OE_ROUTER_PROBE_EVERY: Keep a demoted primary first every N calls (default: 10)
+
+Attempts run on the shared `llm` pool of the executor service
+(utils.executors; size OE_LLM_WORKERS, falling back to OE_ROUTER_WORKERS).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from utils.executors import POOL_LLM, submit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ATTEMPT: ContextVar[bool] = ContextVar("PROVIDER_ROUTER_ATTEMPT", default=False)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def is_router_enabled() -> bool:
+    return os.getenv("OE_PROVIDER_ROUTER", "1") != "0"
+
+
+def router_attempt_active() -> bool:
+    """True inside a routed attempt: adapters should raise instead of using the stub."""
+    return _ATTEMPT.get()
+
+
+@contextmanager
+def _attempt_scope() -> Iterator[None]:
+    handle = _ATTEMPT.set(True)
+    try:
+        yield
+    finally:
+        _ATTEMPT.reset(handle)
+
+
+class ProvidersExhausted(RuntimeError):
+    """Every provider failed or returned an invalid result."""
+
+    def __init__(self, call_type: str, errors: Dict[str, str]) -> None:
+        super().__init__(f"all providers failed for {call_type}: {errors}")
+        self.call_type = call_type
+        self.errors = errors
+
+
+class _InvalidResult(ValueError):
+    pass
+
+
+# =============================================================================
+# HEALTH TRACKING
+# =============================================================================
+
+def _percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ProviderHealth:
+    """Rolling latency/error window for one provider and call type."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+
+    def record(self, latency_s: float, ok: bool) -> None:
+        self._samples.append((latency_s, ok))
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        return _percentile([latency for latency, ok in self._samples if ok], fraction)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "samples": self.samples,
+            "error_rate": round(self.error_rate(), 3),
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p95_s": round(p95, 3) if p95 is not None else None,
+        }
+
+
+# =============================================================================
+# ROUTER
+# =============================================================================
+
+class ProviderRouter:
+    """Routes one logical LLM call across providers using their health."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._health: Dict[Tuple[str, str], ProviderHealth] = {}
+        self._counters: Dict[str, int] = {}
+        self._calls_per_type: Dict[str, int] = {}
+
+    # -- bookkeeping ----------------------------------------------------------
+
+    def _bump(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._counters[key] = self._counters.get(key, 0) + 1
+
+    def health(self, provider: str, call_type: str) -> ProviderHealth:
+        with self._lock:
+            key = (provider, call_type)
+            if key not in self._health:
+                self._health[key] = ProviderHealth(_env_int("OE_ROUTER_WINDOW", 50))
+            return self._health[key]
+
+    def _record(self, provider: str, call_type: str, latency_s: float, ok: bool) -> None:
+        health = self.health(provider, call_type)
+        with self._lock:
+            health.record(latency_s, ok)
+
+    def hedge_delay(self, provider: str, call_type: str) -> float:
+        """Seconds to wait on provider before hedging: its p95, once trusted."""
+        health = self.health(provider, call_type)
+        with self._lock:
+            p95 = health.percentile(0.95) if health.samples >= _env_int("OE_ROUTER_MIN_SAMPLES", 10) else None
+        if p95 is None:
+            return _env_float("OE_ROUTER_HEDGE_AFTER_S", 6.0)
+        return max(p95, _env_float("OE_ROUTER_HEDGE_FLOOR_S", 0.5))
+
+    def order(self, call_type: str, providers: Sequence[str]) -> List[str]:
+        """Providers in call order: a primary with a bad error rate is demoted."""
+        ordered = list(dict.fromkeys(providers))
+        if len(ordered) < 2:
+            return ordered
+        with self._lock:
+            count = self._calls_per_type.get(call_type, 0) + 1
+            self._calls_per_type[call_type] = count
+        if count % _env_int("OE_ROUTER_PROBE_EVERY", 10) == 0:
+            return ordered
+        primary = self.health(ordered[0], call_type)
+        min_samples = _env_int("OE_ROUTER_MIN_SAMPLES", 10)
+        max_error_rate = _env_float("OE_ROUTER_MAX_ERROR_RATE", 0.5)
+        with self._lock:
+            demote = primary.samples >= min_samples and primary.error_rate() >= max_error_rate
+            if demote:
+                healthier = [
+                    name for name in ordered[1:]
+                    if self._health.get((name, call_type)) is None
+                    or self._health[(name, call_type)].error_rate() < primary.error_rate()
+                ]
+        if demote and healthier:
+            self._bump(f"{call_type}.demoted.{ordered[0]}")
+            return healthier[:1] + [ordered[0]] + [name for name in ordered[1:] if name != healthier[0]]
+        return ordered
+
+    # -- calls ----------------------------------------------------------------
+
+    def _attempt(
+        self,
+        provider: str,
+        call_type: str,
+        fn: Callable[[str], T],
+        validate: Optional[Callable[[T], bool]],
+    ) -> T:
+        started = time.monotonic()
+        ok = False
+        try:
+            with _attempt_scope():
+                result = fn(provider)
+            if validate is not None and not validate(result):
+                raise _InvalidResult(f"{provider} returned an invalid result")
+            ok = True
+            return result
+        finally:
+            self._record(provider, call_type, time.monotonic() - started, ok)
+
+    def call(
+        self,
+        call_type: str,
+        fn: Callable[[str], T],
+        *,
+        primary: str,
+        fallbacks: Sequence[str] = (),
+        validate: Optional[Callable[[T], bool]] = None,
+        hedge: bool = True,
+    ) -> Tuple[str, T]:
+        """Run fn(provider) on the best provider; returns (provider, result).
+
+        Raises ProvidersExhausted when every provider failed or was invalid.
+        """
+        providers = self.order(call_type, [primary, *fallbacks])
+        self._bump(f"{call_type}.calls")
+        if providers[0] != primary:
+            self._bump(f"{call_type}.rerouted")
+
+        pending: Dict[Future, str] = {}
+        errors: Dict[str, str] = {}
+        queue = list(providers)
+
+        def _launch() -> None:
+            provider = queue.pop(0)
+            future = submit(POOL_LLM, self._attempt, provider, call_type, fn, validate)
+            pending[future] = provider
+
+        _launch()
+        while pending:
+            leader = next(iter(pending.values()))
+            timeout = self.hedge_delay(leader, call_type) if hedge and queue and len(pending) == 1 else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary slower than its p95: hedge with the next provider
+                self._bump(f"{call_type}.hedged", f"{call_type}.hedged_to.{queue[0]}")
+                logger.info("[PROVIDER_ROUTER] %s: %s slower than p95, hedging to %s", call_type, leader, queue[0])
+                _launch()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    errors[provider] = f"{type(exc).__name__}: {exc}"
+                    self._bump(f"{call_type}.errors.{provider}")
+                    if queue and not pending:
+                        self._bump(f"{call_type}.failover")
+                        _launch()
+                    continue
+                for loser, loser_provider in pending.items():
+                    loser.cancel()
+                    self._bump(f"{call_type}.abandoned.{loser_provider}")
+                won_by = "primary" if provider == primary else "secondary"
+                self._bump(f"{call_type}.won_by_{won_by}", f"{call_type}.served_by.{provider}")
+                return provider, result
+            if not pending and queue:
+                _launch()
+
+        self._bump(f"{call_type}.exhausted")
+        raise ProvidersExhausted(call_type, errors)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "providers": {
+                    f"{provider}/{call_type}": health.snapshot()
+                    for (provider, call_type), health in sorted(self._health.items())
+                },
+            }
+
+
+_ROUTER: Optional[ProviderRouter] = None
+_ROUTER_LOCK = threading.Lock()
+
+
+def get_provider_router() -> ProviderRouter:
+    global _ROUTER
+    with _ROUTER_LOCK:
+        if _ROUTER is None:
+            _ROUTER = ProviderRouter()
+        return _ROUTER
+
+
+def reset_provider_router() -> None:
+    """Drop all health data and counters (intended for tests)."""
+    global _ROUTER
+    with _ROUTER_LOCK:
+        _ROUTER = None
+
+
+def route_provider_call(
+    call_type: str,
+    fn: Callable[[str], T],
+    *,
+    primary: str,
+    fallbacks: Sequence[str] = (),
+    validate: Optional[Callable[[T], bool]] = None,
+    hedge: bool = True,
+) -> Tuple[str, T]:
+    """Route fn(provider) through the shared router (primary only when disabled)."""
+    if not is_router_enabled():
+        return primary, fn(primary)
+    return get_provider_router().call(
+        call_type, fn, primary=primary, fallbacks=fallbacks, validate=validate, hedge=hedge
+    )
+
+
+def provider_router_metrics() -> Dict[str, Any]:
+    return get_provider_router().metrics()
+
+
+__all__ = [
+    "ProviderHealth",
+    "ProviderRouter",
+    "ProvidersExhausted",
+    "get_provider_router",
+    "is_router_enabled",
+    "provider_router_metrics",
+    "reset_provider_router",
+    "route_provider_call",
+    "router_attempt_active",
+]
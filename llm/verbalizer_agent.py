@@ -7,6 +7,7 @@ import re
 from typing import Any, Dict, List, Optional, Tuple
 
 from llm.client import get_openai_client, is_llm_available
+from llm.prompt_cache import prefix_hash, prompt_call, report_openai_usage
 from ux.verb_rubric import enforce as enforce_rubric
 from workflows.io.config_store import get_currency_code
 
@@ -173,6 +174,24 @@ def _split_required_sections(text: str) -> List[Tuple[str, List[str]]]:
     return sections
 
 
+# Static system prompt (cacheable prefix); the per-draft header list goes
+# into the user message
+_GUI_REPLY_SYSTEM_PROMPT = (
+    "You are OpenEvent's professional event manager. Rewrite the provided draft in a direct, "
+    "competent tone while preserving all factual content and workflow structure.\n\n"
+    "Style Guidelines:\n"
+    "- Be concise and confident. No fluff.\n"
+    "- Avoid 'AI-isms' (delve, underscore, seamless, tapestry).\n"
+    "- Do NOT use over-enthusiastic openers like 'Great news!'.\n\n"
+    "Rules:\n"
+    "1. Preserve the headers listed in the user message exactly when they appear.\n"
+    "2. Do not reorder or alter the bullet lines immediately after each header.\n"
+    "3. Keep monetary amounts, times (including 18:00–22:00), and room names exactly as given.\n"
+    "4. You may add one professional lead-in sentence before the first header.\n"
+    "5. Never invent new information."
+)
+
+
 def _build_prompt_payload(
     drafts: List[Dict[str, Any]],
     fallback_text: str,
@@ -191,26 +210,17 @@ def _build_prompt_payload(
         ],
     }
     return {
-        "system": (
-            "You are OpenEvent's professional event manager. Rewrite the provided draft in a direct, "
-            "competent tone while preserving all factual content and workflow structure.\n\n"
-            "Style Guidelines:\n"
-            "- Be concise and confident. No fluff.\n"
-            "- Avoid 'AI-isms' (delve, underscore, seamless, tapestry).\n"
-            "- Do NOT use over-enthusiastic openers like 'Great news!'.\n\n"
-            "Rules:\n"
-            "1. Preserve the following headers exactly when they appear:\n"
-            f"{preserve_instructions or '- (none)'}\n"
-            "2. Do not reorder or alter the bullet lines immediately after each header.\n"
-            "3. Keep monetary amounts, times (including 18:00–22:00), and room names exactly as given.\n"
-            "4. You may add one professional lead-in sentence before the first header.\n"
-            "5. Never invent new information."
-        ),
+        "system": _GUI_REPLY_SYSTEM_PROMPT,
         "user": (
+            "Headers to preserve exactly (rule 1):\n"
+            f"{preserve_instructions or '- (none)'}\n\n"
             "Use the facts below to compose the reply.\n"
             "Return only the final message text.\n"
             f"Facts JSON:\n{json.dumps(facts, ensure_ascii=False)}"
         ),
+        "call_type": "gui_reply_verbalizer",
+        "prefix": _GUI_REPLY_SYSTEM_PROMPT,
+        "prefix_hash": prefix_hash(_GUI_REPLY_SYSTEM_PROMPT),
     }
 
 
@@ -219,14 +229,20 @@ def _call_verbalizer(payload: Dict[str, Any]) -> str:
     temperature = 0.0 if deterministic else 0.2
 
     client = get_openai_client()
-    response = client.responses.create(
-        model=os.getenv("OPENAI_VERBALIZER_MODEL", "gpt-4o-mini"),
-        input=[
-            {"role": "system", "content": payload["system"]},
-            {"role": "user", "content": payload["user"]},
-        ],
-        temperature=temperature,
-    )
+    with prompt_call(
+        payload.get("call_type", "verbalizer"),
+        payload.get("prefix", payload["system"]),
+        prompt_text=f"{payload['system']}\n{payload['user']}",
+    ):
+        response = client.responses.create(
+            model=os.getenv("OPENAI_VERBALIZER_MODEL", "gpt-4o-mini"),
+            input=[
+                {"role": "system", "content": payload["system"]},
+                {"role": "user", "content": payload["user"]},
+            ],
+            temperature=temperature,
+        )
+        report_openai_usage(getattr(response, "usage", None))
     return getattr(response, "output_text", "").strip()
 
 
@@ -332,9 +348,11 @@ def _build_room_offer_prompt(
     # Get currency code from venue config
     currency = get_currency_code()
 
+    # Static part only (currency is venue config); locale and facts are
+    # per-turn and go into the user message so the system prompt is cacheable
     system_content = f"""You are OpenEvent's professional event manager for a premium venue.
 
-{locale_instruction}Your task is to present room options and offer details to a client in a concise, competent, and direct tone.
+Your task is to present room options and offer details to a client in a concise, competent, and direct tone.
 
 STYLE GUIDELINES:
 - **Tone:** Professional and confident. Avoid marketing-heavy language or over-enthusiasm.
@@ -357,7 +375,7 @@ Keep the response concise (under 120 words)."""
 
     facts_json = json.dumps(facts.to_dict(), ensure_ascii=False, indent=2)
 
-    user_content = f"""Please compose a client-facing message based on these facts:
+    user_content = f"""{locale_instruction}Please compose a client-facing message based on these facts:
 
 {facts_json}
 
@@ -366,6 +384,9 @@ Return only the message text, starting with a greeting."""
     return {
         "system": system_content,
         "user": user_content,
+        "call_type": "room_offer_verbalizer",
+        "prefix": system_content,
+        "prefix_hash": prefix_hash(system_content),
     }
 
 
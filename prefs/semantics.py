@@ -3,6 +3,8 @@ from __future__ import annotations
 import re
 from typing import Iterable, List, Sequence, Set
 
+from workflows.common.turn_memo import turn_memoized
+
 __all__ = [
     "CATERING_SYNONYMS",
     "PRODUCTS_SYNONYMS",
@@ -117,6 +119,7 @@ def normalize_catering(value: str | Sequence[str] | None) -> List[str]:
     return sorted(dict.fromkeys(matches))
 
 
+@turn_memoized()
 def normalize_products(value: str | Sequence[str] | None) -> List[str]:
     """Normalise product/layout requests to canonical tokens."""
 
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark room availability: formatted-string scans vs day-ordinal index.
+
+Builds a synthetic events database (--events bookings spread over --rooms
+rooms and a year of dates), then answers the Step 3 question "which of these
+--dates candidate dates is each room free on" two ways:
+
+- legacy: format each ISO date to DD.MM.YYYY and scan every event per
+  room x date, comparing "Event Date" strings (the previous
+  room_status_on_date / available_dates_for_rooms path)
+- ordinal: available_dates_for_rooms() as shipped, backed by RoomDayIndex
+
+and checks that both produce the same availability map.
+
+Usage:
+    python scripts/tools/bench_availability_dates.py --events 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from workflows.common.sorting import RankedRoom
+from workflows.steps.step3_room_availability.trigger.room_ranking import available_dates_for_rooms
+
+STATUSES = ["Lead", "Option", "Confirmed", "Cancelled"]
+
+
+def build_db(events: int, rooms: int, seed: int = 11) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    start = date.today()
+    records = []
+    for n in range(events):
+        day = start + timedelta(days=rng.randrange(365))
+        records.append({
+            "event_id": f"evt-{n}",
+            "status": rng.choice(STATUSES),
+            "chosen_date": day.isoformat(),
+            "locked_room_id": f"Room {rng.randrange(rooms)}",
+            "event_data": {"Event Date": day.strftime("%d.%m.%Y")},
+        })
+    return {"events": records}
+
+
+def _legacy_status(db: Dict[str, Any], date_ddmmyyyy: str, room_name: str) -> str:
+    room_lc = room_name.lower()
+    status_found = "Available"
+    for event in db.get("events", []):
+        data = event.get("event_data", {})
+        if data.get("Event Date") != date_ddmmyyyy:
+            continue
+        stored_room = data.get("Preferred Room") or event.get("locked_room_id")
+        if not stored_room or stored_room.lower() != room_lc:
+            continue
+        normalized = (event.get("status") or data.get("Status") or "").lower()
+        if normalized == "confirmed":
+            return "Confirmed"
+        if normalized in {"option", "lead"}:
+            status_found = "Option"
+    return status_found
+
+
+def legacy(db: Dict[str, Any], ranked: List[RankedRoom], candidates: List[str]) -> Dict[str, List[str]]:
+    availability: Dict[str, List[str]] = {}
+    for entry in ranked:
+        dates = []
+        for iso_date in candidates:
+            display_date = datetime.fromisoformat(iso_date).strftime("%d.%m.%Y")
+            if _legacy_status(db, display_date, entry.room).lower() in {"available", "option"}:
+                dates.append(iso_date)
+        availability[entry.room] = dates
+    return availability
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000, help="bookings in the synthetic db (default: 2000)")
+    parser.add_argument("--rooms", type=int, default=6, help="rooms (default: 6)")
+    parser.add_argument("--dates", type=int, default=30, help="candidate dates per request (default: 30)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions (default: 5)")
+    args = parser.parse_args()
+
+    db = build_db(args.events, args.rooms)
+    ranked = [RankedRoom(room=f"Room {n}", status="Available", score=0.0, hint="", capacity_ok=True)
+              for n in range(args.rooms)]
+    today = date.today()
+    candidates = [(today + timedelta(days=3 * n)).isoformat() for n in range(args.dates)]
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = legacy(db, ranked, candidates)
+    legacy_s = (time.perf_counter() - started) / args.repeat
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        actual = available_dates_for_rooms(db, ranked, candidates, None)
+    ordinal_s = (time.perf_counter() - started) / args.repeat
+
+    print(f"events={args.events} rooms={args.rooms} candidate dates={args.dates}")
+    print(f"legacy:  {legacy_s * 1000:9.2f} ms/request")
+    print(f"ordinal: {ordinal_s * 1000:9.2f} ms/request")
+    print(f"speedup: {legacy_s / ordinal_s:9.1f}x  identical={expected == actual}")
+    return 0 if expected == actual else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Soak test: RSS of the debug trace state over many synthetic threads.
+
+Emits a few trace events (step enter, gate, entity capture, snapshot) for
+each of --threads synthetic conversation threads and updates the debug
+STATE_STORE, the way a long-running server sees one-off conversations.
+RSS and the bounded registries' sizes are sampled every --sample threads;
+with LRU/TTL eviction the RSS curve flattens once the registries are full
+instead of growing with every thread ever seen.
+
+Timeline and live-log files go to a temporary directory that is removed
+afterwards.
+
+Usage:
+    python scripts/tools/bench_debug_state_soak.py --threads 100000
+    python scripts/tools/bench_debug_state_soak.py --threads 100000 --max-threads 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _mb(value: int | None) -> str:
+    return f"{value / 1_048_576:8.1f}" if value is not None else "     n/a"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=10_000)
+    parser.add_argument("--max-threads", type=int, default=None, help="DEBUG_STATE_MAX_THREADS override")
+    parser.add_argument("--tolerance-mb", type=float, default=32.0, help="allowed RSS growth over the second half")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="oe-soak-")
+    os.environ["DEBUG_TRACE"] = "1"
+    os.environ["DEBUG_TRACE_DIR"] = str(Path(workdir) / "sessions")
+    if args.max_threads:
+        os.environ["DEBUG_STATE_MAX_THREADS"] = str(args.max_threads)
+
+    from debug import live_log
+    from debug.registry import memory_report, process_rss_bytes
+    from debug.state_store import STATE_STORE
+    from debug.trace import emit
+
+    live_log.ROOT = Path(workdir) / "live"
+    samples = []
+    started = time.perf_counter()
+    try:
+        print(f"{'threads':>8} {'rss MB':>8} {'state MB':>8} {'entries':>8} {'evicted':>8}")
+        for n in range(1, args.threads + 1):
+            thread_id = f"soak-{n}"
+            emit(thread_id, "STEP_ENTER", step="Step1_Intake", detail="intake")
+            emit(thread_id, "GATE_PASS", step="Step1_Intake", gate={"label": "intent", "inputs": {"n": n}})
+            emit(thread_id, "ENTITY_CAPTURE", step="Step1_Intake", entity={"key": "participants", "value": n % 90})
+            emit(thread_id, "STATE_SNAPSHOT", step="Step1_Intake", data={"current_step": 1}, wait_state="Awaiting Client")
+            STATE_STORE.update(thread_id, {"current_step": 1, "thread_state": "Awaiting Client"})
+            if n % args.sample == 0 or n == args.threads:
+                report = memory_report()
+                registries = report["registries"]
+                entries = sum(item["entries"] for item in registries.values())
+                evicted = sum(sum(item["evictions"].values()) for item in registries.values())
+                samples.append((n, process_rss_bytes()))
+                print(f"{n:>8} {_mb(report['rss_bytes'])} {_mb(report['debug_state_bytes'])} {entries:>8} {evicted:>8}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{args.threads} threads in {elapsed:.1f}s ({args.threads / elapsed:,.0f} threads/s)")
+    half = [rss for n, rss in samples if n >= args.threads // 2 and rss is not None]
+    if len(half) < 2:
+        print("not enough RSS samples to judge growth")
+        return 0
+    growth_mb = (half[-1] - half[0]) / 1_048_576
+    flat = growth_mb <= args.tolerance_mb
+    print(f"RSS growth over the second half: {growth_mb:.1f} MB ({'flat' if flat else 'GROWING'})")
+    return 0 if flat else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark wish -> product matching: per-room SequenceMatcher sweep vs FuzzyIndex.
+
+Scales the real product catalog by --scale (synthetic product copies with
+perturbed names and synonyms in every room), then scores the same wishes with
+the previous per-room sweep and with the shared index, checking that both
+produce identical top matches.
+
+Usage:
+    python scripts/tools/bench_preference_matching.py --scale 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from workflows.common.fuzzy_index import MIN_CONTAINMENT_LEN, FuzzyIndex
+from workflows.nlu.preferences import _normalise_phrase, _room_catalog
+
+WISHES = [
+    "projector", "beamer", "flip chart", "coffe break", "wifi", "sound sytem",
+    "latte art", "vegan lunch", "stage", "hdmi cable", "parking", "u shape",
+    "theatre seating", "acoustic panels", "apero", "standing dinner",
+]
+
+
+def _sweep_ratio(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if len(a) >= MIN_CONTAINMENT_LEN and len(b) >= MIN_CONTAINMENT_LEN and (a in b or b in a):
+        return 0.92
+    return SequenceMatcher(a=a, b=b).ratio()
+
+
+def _top(scored: List[Tuple[float, str]]) -> List[Tuple[float, str]]:
+    # Ratios below 0.5 are not reported by the preference scorer
+    scored = [(ratio if ratio >= 0.5 else 0.0, product) for ratio, product in scored]
+    scored.sort(key=lambda entry: entry[0], reverse=True)
+    return [(round(ratio, 6), product) for ratio, product in scored[:3] if ratio > 0.0]
+
+
+def sweep(rooms: Sequence[Dict[str, List[str]]], wishes: Sequence[str]):
+    results = []
+    for variants_map in rooms:
+        for wish in wishes:
+            needle = _normalise_phrase(wish)
+            scored = [
+                (max(_sweep_ratio(needle, variant) for variant in variants), product)
+                for product, variants in variants_map.items() if variants
+            ]
+            results.append(_top(scored))
+    return results
+
+
+def indexed(
+    rooms: Sequence[Dict[str, List[str]]],
+    wishes: Sequence[str],
+    index: FuzzyIndex,
+    max_candidates: Optional[int] = None,
+):
+    scores = {
+        wish: index.scores(_normalise_phrase(wish), 0.5, max_candidates=max_candidates)
+        for wish in wishes
+    }
+    results = []
+    for variants_map in rooms:
+        for wish in wishes:
+            wish_scores = scores[wish]
+            scored = [
+                (max(wish_scores.get(variant, 0.0) for variant in variants), product)
+                for product, variants in variants_map.items() if variants
+            ]
+            results.append(_top(scored))
+    return results
+
+
+def build_catalog(scale: int, seed: int = 7) -> List[Dict[str, List[str]]]:
+    rng = random.Random(seed)
+    base_rooms = [entry.get("product_variants") or {} for entry in _room_catalog().values()]
+    rooms: List[Dict[str, List[str]]] = []
+    for base in base_rooms:
+        variants_map: Dict[str, List[str]] = {}
+        for product, variants in base.items():
+            for n in range(scale):
+                name = product if n == 0 else f"{product} {n}"
+                extra = [f"{variant} {rng.choice('abcdefgh')}{n}" for variant in variants] if n else []
+                variants_map[name] = list(variants) + extra
+        rooms.append(variants_map)
+    return rooms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10, help="catalog multiplier (default: 10)")
+    parser.add_argument(
+        "--max-candidates", type=int, default=None,
+        help="also time approximate trigram-candidate search with this bound",
+    )
+    args = parser.parse_args()
+
+    rooms = build_catalog(args.scale)
+    started = time.perf_counter()
+    index = FuzzyIndex(variant for room in rooms for variants in room.values() for variant in variants)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = sweep(rooms, WISHES)
+    sweep_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = indexed(rooms, WISHES, index)
+    index_s = time.perf_counter() - started
+
+    products = sum(len(room) for room in rooms)
+    print(f"rooms={len(rooms)} room-products={products} unique variants={len(index)} wishes={len(WISHES)}")
+    print(f"sweep:   {sweep_s * 1000:9.1f} ms")
+    print(f"indexed: {index_s * 1000:9.1f} ms  (+{build_s * 1000:.1f} ms one-off build)")
+    print(f"speedup: {sweep_s / index_s:9.1f}x  identical={expected == actual}")
+    if args.max_candidates:
+        started = time.perf_counter()
+        approximate = indexed(rooms, WISHES, index, args.max_candidates)
+        approx_s = time.perf_counter() - started
+        agreement = sum(a == b for a, b in zip(expected, approximate)) / len(expected)
+        print(
+            f"trigram top-{args.max_candidates}: {approx_s * 1000:9.1f} ms  "
+            f"speedup {sweep_s / approx_s:.1f}x  agreement={agreement:.1%}"
+        )
+    return 0 if expected == actual else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
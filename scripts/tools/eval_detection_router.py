@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Offline evaluation of the unified detection router (detection.routing).
+
+Routes a labelled corpus of client replies (built-in cases plus an optional
+JSONL file) and reports how many unified detection LLM calls would be skipped
+or downgraded, and whether every skipped message's synthesized detection
+matches its labels. Exits with 1 when a skipped message disagrees, so the
+script can gate changes to the router rules or thresholds.
+
+With --live the labels are replaced by the full-model detection of each
+message (requires provider keys), and cheap-route messages are also run on
+the cheap model and compared with the full model.
+
+JSONL records: {"subject": "...", "body": "...", "event_entry": {...},
+"expected": {"intent": "...", "is_confirmation": true, ...}}; only the
+expected keys present are compared.
+
+Usage:
+    python scripts/tools/eval_detection_router.py
+    python scripts/tools/eval_detection_router.py --corpus replies.jsonl --live
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("AGENT_MODE", "stub")
+
+_STEP2 = {"current_step": 2, "date_confirmed": False}
+_STEP3 = {"current_step": 3, "date_confirmed": True}
+_STEP5 = {"current_step": 5, "date_confirmed": True, "locked_room_id": "Room A", "offer_status": "Sent"}
+_BILLING = {
+    "current_step": 5,
+    "offer_accepted": True,
+    "offer_status": "Accepted",
+    "billing_requirements": {"awaiting_billing_for_accept": True},
+}
+_DUPLICATE = (
+    "We would like to book Room A for 30 people on 14.05.2027, "
+    "with a coffee break in the afternoon."
+)
+_CONFIRM = {"intent": "confirm_date", "is_confirmation": True, "is_question": False, "is_change_request": False}
+_ACCEPT = {
+    "intent": "accept_offer",
+    "is_confirmation": True,
+    "is_acceptance": True,
+    "is_question": False,
+    "is_change_request": False,
+    "is_rejection": False,
+}
+
+# (subject, body, event_entry, expected labels)
+CASES = [
+    ("Re: Date options", "Yes, please.", _STEP2, _CONFIRM),
+    ("Re: Date options", "Sounds good, thanks!", _STEP2, _CONFIRM),
+    ("Re: Date options", "ok", _STEP2, _CONFIRM),
+    ("Re: Terminvorschläge", "Ja, gerne", _STEP2, dict(_CONFIRM)),
+    ("Re: Date options", "Yes but can we do the 21st instead?", _STEP2,
+     {"intent": "edit_date", "is_change_request": True}),
+    ("Re: Date options", "The first date works for us", _STEP2, {"intent": "confirm_date"}),
+    ("Re: Date options", "Can I speak to a manager?", _STEP2, {"intent": "message_manager", "is_manager_request": True}),
+    ("Re: Offer", "We accept the offer.", _STEP5, _ACCEPT),
+    ("Re: Offer", "Yes please", _STEP5, _ACCEPT),
+    ("Re: Offer", "Go ahead", _STEP5, _ACCEPT),
+    ("Re: Offer", "Please proceed", _STEP5, _ACCEPT),
+    ("Re: Offer", "ok but the price is too high", _STEP5, {"intent": "counter_offer", "is_acceptance": False}),
+    ("Re: Offer", "No, that's too expensive for us.", _STEP5, {"is_acceptance": False}),
+    ("Re: Offer", "Looks good. Do you have parking?", _STEP5, {"is_question": True}),
+    ("Re: Offer", "Could we move it to 21.05.2027?", _STEP5, {"intent": "edit_date", "is_change_request": True}),
+    ("Re: Rooms", "Yes please", _STEP3, {"is_confirmation": True}),
+    ("Re: Rooms", "Room B sounds good", _STEP3, {"intent": "edit_room"}),
+    ("Re: Billing", "Acme AG, Bahnhofstrasse 1, 8001 Zürich, Switzerland", _BILLING,
+     {"is_question": False, "is_change_request": False}),
+    # Answered by the duplicate guard; nothing downstream reads the labels
+    ("Workshop", _DUPLICATE, dict(_STEP3, last_client_message=f"Workshop\n{_DUPLICATE}"), {}),
+]
+
+
+def _load_corpus(path: Path):
+    cases = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            record = json.loads(line)
+            cases.append((record.get("subject", ""), record["body"], record.get("event_entry") or {},
+                          record.get("expected") or {}))
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="additional JSONL cases")
+    parser.add_argument("--only-corpus", action="store_true", help="skip the built-in cases")
+    parser.add_argument("--live", action="store_true", help="compare against live full-model detection")
+    args = parser.parse_args()
+
+    from detection.pre_filter import pre_filter
+    from detection.routing import (
+        ROUTE_CHEAP,
+        ROUTE_SKIP,
+        decide_detection_route,
+        detection_disagreements,
+        synthesize_detection,
+    )
+    from detection.unified import run_unified_detection
+    from llm.provider_config import get_intent_provider
+
+    cases = [] if args.only_corpus else list(CASES)
+    if args.corpus:
+        cases.extend(_load_corpus(args.corpus))
+
+    provider = get_intent_provider()
+    routes: Counter = Counter()
+    failures = 0
+    cheap_diffs = 0
+    for subject, body, event_entry, expected in cases:
+        combined = "\n".join(part for part in (subject.strip(), body.strip()) if part)
+        pre_result = pre_filter(combined, last_message=event_entry.get("last_client_message"), event_entry=event_entry)
+        decision = decide_detection_route(combined, pre_result, event_entry, reply_text=body, provider=provider)
+        routes[decision.route] += 1
+
+        reference = expected
+        kwargs = dict(
+            current_step=event_entry.get("current_step"),
+            date_confirmed=bool(event_entry.get("date_confirmed")),
+            room_locked=event_entry.get("locked_room_id") is not None,
+        )
+        if args.live:
+            reference = run_unified_detection(combined, **kwargs)
+
+        note = ""
+        if decision.route == ROUTE_SKIP:
+            diffs = detection_disagreements(synthesize_detection(decision, pre_result), reference)
+            if diffs:
+                failures += 1
+                note = f"  MISMATCH {diffs}"
+        elif decision.route == ROUTE_CHEAP and args.live:
+            diffs = detection_disagreements(run_unified_detection(combined, model=decision.model, **kwargs), reference)
+            if diffs:
+                cheap_diffs += 1
+                note = f"  cheap differs {diffs}"
+        print(f"{decision.route:5} {decision.confidence:4.2f} {decision.reason:38} {body[:48]!r}{note}")
+
+    total = len(cases) or 1
+    llm_calls = routes["cheap"] + routes["full"]
+    print()
+    print(f"cases: {len(cases)}  skip: {routes['skip']}  cheap: {routes['cheap']}  full: {routes['full']}")
+    print(f"unified LLM calls per turn: 1.00 -> {llm_calls / total:.2f} ({routes['cheap']} on the cheap model)")
+    print(f"skipped messages disagreeing with {'live detection' if args.live else 'labels'}: {failures}")
+    if args.live:
+        print(f"cheap-route messages differing from the full model: {cheap_diffs}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
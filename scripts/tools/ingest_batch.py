@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Ingest a backlog of inbound emails through the workflow.
+
+Reads a JSONL/JSON file, a single .eml, or a directory of .eml/.json/.jsonl
+files, processes client threads in parallel (messages within a thread in
+order) and checkpoints each processed message. Rerunning with the same
+--checkpoint resumes after a crash without reprocessing.
+
+Usage:
+    python scripts/tools/ingest_batch.py backlog.jsonl --checkpoint backlog
+    python scripts/tools/ingest_batch.py mails/ --workers 8 --db /tmp/replay.json
+    python scripts/tools/ingest_batch.py backlog.jsonl --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="JSONL/JSON/.eml file or directory")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint name (under OE_INGEST_DIR) or .jsonl path")
+    parser.add_argument("--workers", type=int, default=None, help="OE_INGEST_WORKERS override")
+    parser.add_argument("--db", type=Path, default=None, help="workflow database (default: events_database.json)")
+    parser.add_argument("--dry-run", action="store_true", help="print the partition plan and exit")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    from workflows.runtime.batch_ingest import ingest_batch, load_messages, plan_partitions
+
+    messages = load_messages(args.source)
+    if args.dry_run:
+        for key, group in sorted(plan_partitions(messages).items(), key=lambda item: -len(item[1])):
+            print(f"{len(group):>5}  {key}")
+        return 0
+
+    report = ingest_batch(messages, workers=args.workers, checkpoint=args.checkpoint, db_path=args.db)
+    print(json.dumps(report.summary(), indent=2) if args.json else report.format())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Profile turn-memo hit rates over a short stub-mode conversation.
+
+Runs a few client messages through workflow_email.process_msg (AGENT_MODE=stub,
+throwaway database) and prints, per @turn_memoized function, how often a turn
+was served from the memo and the estimated time saved.
+
+Usage:
+    python scripts/tools/profile_turn_memo.py --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("AGENT_MODE", "stub")
+
+MESSAGES = [
+    ("Workshop inquiry", "Hello, we'd like to book a room for 25 people on 14.05.2027 "
+                         "from 09:00 to 17:00. Do you have a projector and coffee breaks?"),
+    ("Re: Workshop inquiry", "Room A sounds good. Could we change the date to 21.05.2027 instead? "
+                             "Also, is there parking nearby?"),
+    ("Re: Workshop inquiry", "Please add a vegetarian lunch and a flip chart. What would the total be?"),
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1, help="times to replay the conversation (default: 1)")
+    args = parser.parse_args()
+
+    from workflow_email import process_msg
+    from workflows.common.turn_memo import format_memo_report, registered_functions, reset_memo_totals
+
+    reset_memo_totals()
+    with tempfile.TemporaryDirectory() as tmp:
+        for round_no in range(args.rounds):
+            db_path = Path(tmp) / f"events_{round_no}.json"
+            thread_id = f"memo-profile-{round_no}"
+            for index, (subject, body) in enumerate(MESSAGES):
+                process_msg(
+                    {
+                        "msg_id": f"{thread_id}-{index}",
+                        "from_name": "Laura Meier",
+                        "from_email": f"laura{round_no}@example.com",
+                        "subject": subject,
+                        "body": body,
+                        "thread_id": thread_id,
+                        "ts": "2027-01-10T09:00:00Z",
+                    },
+                    db_path=db_path,
+                )
+
+    print(f"registered: {', '.join(registered_functions())}")
+    print(f"turns: {args.rounds * len(MESSAGES)}")
+    print(format_memo_report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
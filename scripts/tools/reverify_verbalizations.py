@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Re-verify stored verbalizations against their hard facts in bulk.
+
+Usage:
+    python scripts/tools/reverify_verbalizations.py drafts.jsonl tmp-debug/sessions --workers 8
+    python scripts/tools/reverify_verbalizations.py drafts.jsonl --json > report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from ux.verbalizer_batch import iter_cases, run_batch
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="JSONL files or directories of *.jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    report = run_batch(iter_cases(args.paths), workers=args.workers, chunk_size=args.chunk_size)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(report.format_text())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -134,20 +134,18 @@ def calendar_free(room_identifier: str, window: Dict[str, Any], db: Optional[Dic
     if db is not None:
         date_iso = window.get("date_iso")
         if date_iso:
-            from workflows.common.timeutils import format_iso_date_to_ddmmyyyy
-            date_ddmmyyyy = format_iso_date_to_ddmmyyyy(date_iso)
-            if date_ddmmyyyy:
+            from workflows.common.ordinal_dates import day_ordinal, event_day_ordinal, event_room, event_status
+
+            day = day_ordinal(date_iso)
+            if day is not None:
                 room_lower = room_identifier.lower()
                 for event in db.get("events", []):
-                    event_data = event.get("event_data", {})
-                    if event_data.get("Event Date") != date_ddmmyyyy:
+                    if event_day_ordinal(event) != day:
                         continue
-                    stored_room = event_data.get("Preferred Room") or event.get("locked_room_id")
-                    if not stored_room or stored_room.lower() != room_lower:
+                    if event_room(event) != room_lower:
                         continue
-                    # Use canonical event["status"], fall back to event_data["Status"] for legacy
-                    status = (event.get("status") or event_data.get("Status") or "").lower()
-                    if status in ("option", "confirmed"):
+                    # Canonical event["status"], legacy event_data["Status"] fallback
+                    if event_status(event) in ("option", "confirmed"):
                         return False  # Room blocked by existing booking
 
     # Check 2: Calendar busy slots (legacy, for external calendar integration)
@@ -6,20 +6,44 @@ Stores and retrieves client-specific context for personalized responses:
 - Profile enrichment (preferences, language, notes)
 - Summary generation for prompt injection
 
+History and summaries live in services.client_memory_store (append-only
+per-client segments), not in the events DB: the client record only keeps
+{"memory": {"store_key": ...}}, so enabling memory does not grow the
+document save_db rewrites each turn. Legacy in-record histories are moved to
+the store the first time a client is touched. Store keys are namespaced by
+tenant, so two teams with the same client email keep separate histories;
+clients without an email get no stored history at all.
+
+Summaries are refreshed every CLIENT_MEMORY_SUMMARY_INTERVAL messages by a
+background worker; the request path only enqueues the client. The default
+summarizer is rule-based; set CLIENT_MEMORY_LLM_SUMMARY=1 to use the agent
+adapter's complete(), or install one with set_summarizer().
+
 See docs/reports/CLIENT_MEMORY_PLAN_2026_01_03.md for full specification.
 
 Config toggles (environment variables):
 - CLIENT_MEMORY_ENABLED=0|1 (default: 0)
 - CLIENT_MEMORY_MAX_MESSAGES=50 (cap history length)
 - CLIENT_MEMORY_SUMMARY_INTERVAL=10 (re-summarize every N messages)
+- CLIENT_MEMORY_LLM_SUMMARY=0|1 (default: 0, rule-based summaries)
+- CLIENT_MEMORY_DIR (store location, see services.client_memory_store)
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from services.client_memory_store import (
+    DEFAULT_NAMESPACE,
+    ClientMemoryStore,
+    SummaryWorker,
+    namespace_of,
+    store_key_for,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +51,16 @@ logger = logging.getLogger(__name__)
 CLIENT_MEMORY_ENABLED = os.getenv("CLIENT_MEMORY_ENABLED", "0") == "1"
 CLIENT_MEMORY_MAX_MESSAGES = int(os.getenv("CLIENT_MEMORY_MAX_MESSAGES", "50"))
 CLIENT_MEMORY_SUMMARY_INTERVAL = int(os.getenv("CLIENT_MEMORY_SUMMARY_INTERVAL", "10"))
+CLIENT_MEMORY_LLM_SUMMARY = os.getenv("CLIENT_MEMORY_LLM_SUMMARY", "0") == "1"
+
+Summarizer = Callable[[Dict[str, Any]], Optional[str]]
+
+_STORE: Optional[ClientMemoryStore] = None
+_WORKER: Optional[SummaryWorker] = None
+_SUMMARIZER: Optional[Summarizer] = None
+_STATE_LOCK = threading.Lock()
+# store key -> client record for queued summaries (the worker reads its profile)
+_PENDING_CLIENTS: Dict[str, Dict[str, Any]] = {}
 
 
 def is_enabled() -> bool:
@@ -39,23 +73,107 @@ def _normalize_email(email: str) -> str:
     return (email or "").strip().lower()
 
 
-def _ensure_memory_structure(client: Dict[str, Any]) -> Dict[str, Any]:
-    """Ensure client dict has memory-related fields."""
+def get_store() -> ClientMemoryStore:
+    """Process-wide memory store (created on first use)."""
+    global _STORE
+    with _STATE_LOCK:
+        if _STORE is None:
+            _STORE = ClientMemoryStore(max_messages=CLIENT_MEMORY_MAX_MESSAGES)
+        return _STORE
+
+
+def configure_store(store: Optional[ClientMemoryStore]) -> None:
+    """Swap the store (tests, alternative roots); None recreates the default lazily."""
+    global _STORE
+    shutdown_worker()
+    with _STATE_LOCK:
+        _STORE = store
+        _PENDING_CLIENTS.clear()
+
+
+def set_summarizer(summarizer: Optional[Summarizer]) -> None:
+    """Install the summary function run by the worker; None restores the default."""
+    global _SUMMARIZER
+    _SUMMARIZER = summarizer
+
+
+def _get_worker() -> SummaryWorker:
+    global _WORKER
+    with _STATE_LOCK:
+        if _WORKER is None:
+            _WORKER = SummaryWorker(_summarize_key)
+        return _WORKER
+
+
+def wait_for_summaries() -> None:
+    """Block until queued background summaries have been written."""
+    if _WORKER is not None:
+        _WORKER.drain()
+
+
+def shutdown_worker() -> None:
+    """Stop the background summary thread (app shutdown, tests)."""
+    global _WORKER
+    with _STATE_LOCK:
+        worker, _WORKER = _WORKER, None
+    if worker is not None:
+        worker.shutdown()
+
+
+def _current_namespace() -> str:
+    """Store namespace of the current tenant (lazy import to avoid circular deps)."""
+    try:
+        from workflows.io.tenants import DEFAULT_TENANT, current_tenant_id, tenant_key
+    except ImportError:
+        return DEFAULT_NAMESPACE
+    tenant = current_tenant_id()
+    return tenant_key(tenant) if tenant != DEFAULT_TENANT else DEFAULT_NAMESPACE
+
+
+def _ensure_memory_structure(client: Dict[str, Any], client_id: Optional[str] = None) -> Optional[str]:
+    """Ensure client dict has profile fields and a store pointer; return the store key.
+
+    Returns None when the client has no store key yet and no email to derive
+    one from: nothing is stored for it.
+    """
     # Extend profile with memory fields
     profile = client.setdefault("profile", {})
     profile.setdefault("language", None)
     profile.setdefault("preferences", [])
     profile.setdefault("notes", [])
 
-    # Memory-specific fields
-    client.setdefault("memory", {
-        "conversation_history": [],  # Full message history for memory
-        "summary": None,             # LLM-generated personalization summary
-        "last_updated": None,
-        "message_count": 0,
-    })
-
-    return client
+    memory = client.get("memory")
+    if not isinstance(memory, dict):
+        memory = {}
+    namespace = _current_namespace()
+    key = memory.get("store_key")
+    if key and namespace_of(key) != namespace:
+        # Key from before tenant namespaces (or another tenant's): never reuse it
+        key = None
+    email = _normalize_email(client_id or "")
+    store = get_store()
+    if not key:
+        if not email:
+            return None
+        key = store.key_for_email(email, namespace) or store_key_for(email, namespace)
+        _migrate_legacy_memory(store, key, memory)
+        client["memory"] = {"store_key": key}
+    if email:
+        store.register(email, key)
+    return key
+
+
+def _migrate_legacy_memory(store: ClientMemoryStore, key: str, memory: Dict[str, Any]) -> None:
+    """Move a pre-store in-record history and summary into the store."""
+    for entry in memory.get("conversation_history") or []:
+        store.append(key, entry)
+    if memory.get("summary"):
+        store.write_meta(
+            key,
+            summary=memory["summary"],
+            summarized_at=store.message_count(key),
+            summary_stale=bool(memory.get("summary_stale")),
+        )
 
 
 def append_message(
@@ -63,6 +181,8 @@ def append_message(
     role: str,
     text: str,
     metadata: Optional[Dict[str, Any]] = None,
+    *,
+    client_id: Optional[str] = None,
 ) -> None:
     """
     Append a message to client's conversation history.
@@ -72,12 +192,15 @@ def append_message(
         role: "client" or "assistant"
         text: Message content
         metadata: Optional extra data (intent, step, etc.)
+        client_id: Client email; keys the store so history survives the
+            client record being rebuilt
     """
     if not CLIENT_MEMORY_ENABLED:
         return
 
-    _ensure_memory_structure(client)
-    memory = client["memory"]
+    key = _ensure_memory_structure(client, client_id)
+    if key is None:
+        return  # No client email: nothing to key the history by
 
     # Create message entry
     entry = {
@@ -88,31 +211,19 @@ def append_message(
     if metadata:
         entry["metadata"] = metadata
 
-    # Append to history
-    history = memory["conversation_history"]
-    history.append(entry)
-
-    # Enforce max length (FIFO eviction)
-    while len(history) > CLIENT_MEMORY_MAX_MESSAGES:
-        history.pop(0)
-
-    # Update counters
-    memory["message_count"] = memory.get("message_count", 0) + 1
-    memory["last_updated"] = datetime.utcnow().isoformat()
+    count = get_store().append(key, entry)
 
-    # Check if summary needs refresh
-    if memory["message_count"] % CLIENT_MEMORY_SUMMARY_INTERVAL == 0:
-        _mark_summary_stale(memory)
-
-
-def _mark_summary_stale(memory: Dict[str, Any]) -> None:
-    """Mark summary as needing refresh (actual refresh is lazy)."""
-    memory["summary_stale"] = True
+    # Refresh summary off the request path
+    if CLIENT_MEMORY_SUMMARY_INTERVAL > 0 and count % CLIENT_MEMORY_SUMMARY_INTERVAL == 0:
+        _PENDING_CLIENTS[key] = client
+        _get_worker().submit(key)
 
 
 def get_memory_context(
     client: Dict[str, Any],
     max_messages: int = 10,
+    *,
+    client_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Get client memory context for prompt injection.
@@ -127,17 +238,18 @@ def get_memory_context(
     if not CLIENT_MEMORY_ENABLED:
         return {}
 
-    _ensure_memory_structure(client)
-    memory = client.get("memory", {})
-    profile = client.get("profile", {})
+    key = _ensure_memory_structure(client, client_id)
+    return _context_for_key(key, client, max_messages)
+
 
-    # Get recent messages
-    history = memory.get("conversation_history", [])
-    recent = history[-max_messages:] if history else []
+def _context_for_key(key: Optional[str], client: Dict[str, Any], max_messages: int) -> Dict[str, Any]:
+    store = get_store()
+    meta = store.read_meta(key) if key else {}
+    profile = client.get("profile", {})
 
     return {
-        "summary": memory.get("summary"),
-        "recent_messages": recent,
+        "summary": meta.get("summary"),
+        "recent_messages": store.recent(key, max_messages) if key else [],
         "profile": {
             "name": profile.get("name"),
             "company": profile.get("org"),
@@ -145,11 +257,16 @@ def get_memory_context(
         },
         "preferences": profile.get("preferences", []),
         "notes": profile.get("notes", []),
-        "message_count": memory.get("message_count", 0),
+        "message_count": store.message_count(key) if key else 0,
     }
 
 
-def format_memory_for_prompt(client: Dict[str, Any], max_messages: int = 5) -> str:
+def format_memory_for_prompt(
+    client: Dict[str, Any],
+    max_messages: int = 5,
+    *,
+    client_id: Optional[str] = None,
+) -> str:
     """
     Format client memory as a string for LLM prompt injection.
 
@@ -158,7 +275,7 @@ def format_memory_for_prompt(client: Dict[str, Any], max_messages: int = 5) -> s
     if not CLIENT_MEMORY_ENABLED:
         return ""
 
-    context = get_memory_context(client, max_messages=max_messages)
+    context = get_memory_context(client, max_messages=max_messages, client_id=client_id)
     if not context:
         return ""
 
@@ -229,43 +346,84 @@ def update_profile(
         profile["notes"] = existing[-10:]  # Keep last 10
 
 
-def generate_summary(client: Dict[str, Any]) -> Optional[str]:
-    """
-    Generate a personalization summary from conversation history.
-
-    This is a placeholder for LLM-based summarization.
-    For now, returns a simple rule-based summary.
-    """
-    if not CLIENT_MEMORY_ENABLED:
-        return None
-
-    _ensure_memory_structure(client)
-    memory = client.get("memory", {})
-    profile = client.get("profile", {})
-
-    # Simple rule-based summary (LLM version would go here)
+def _rule_based_summary(context: Dict[str, Any]) -> Optional[str]:
     parts = []
 
-    if profile.get("name"):
-        parts.append(f"Returning client: {profile['name']}")
+    name = (context.get("profile") or {}).get("name")
+    if name:
+        parts.append(f"Returning client: {name}")
 
-    msg_count = memory.get("message_count", 0)
+    msg_count = context.get("message_count", 0)
     if msg_count > 10:
         parts.append(f"Active correspondent ({msg_count} messages)")
     elif msg_count > 0:
         parts.append(f"Recent contact ({msg_count} messages)")
 
-    prefs = profile.get("preferences", [])
+    prefs = context.get("preferences", [])
     if prefs:
         parts.append(f"Preferences: {', '.join(prefs[:3])}")
 
-    if parts:
-        summary = ". ".join(parts) + "."
-        memory["summary"] = summary
-        memory["summary_stale"] = False
-        return summary
+    return ". ".join(parts) + "." if parts else None
+
+
+def _llm_summary(context: Dict[str, Any]) -> Optional[str]:
+    from adapters.agent_adapter import get_agent_adapter  # pylint: disable=import-outside-toplevel
+
+    transcript = "\n".join(
+        f"[{msg.get('role', '?')}] {msg.get('text', '')}" for msg in context.get("recent_messages", [])
+    )
+    prompt = (
+        "Summarize what a venue coordinator should remember about this client "
+        "in at most three short sentences (preferences, constraints, tone).\n\n"
+        f"Known profile: {context.get('profile')}\n"
+        f"Known preferences: {context.get('preferences')}\n\n"
+        f"Conversation:\n{transcript}"
+    )
+    text = get_agent_adapter().complete(prompt, temperature=0.2, max_tokens=200)
+    return text.strip() or None
+
+
+def _default_summarizer(context: Dict[str, Any]) -> Optional[str]:
+    if CLIENT_MEMORY_LLM_SUMMARY:
+        try:
+            summary = _llm_summary(context)
+            if summary:
+                return summary
+        except Exception as exc:
+            logger.warning("[ClientMemory] LLM summary failed, using rule-based: %s", exc)
+    return _rule_based_summary(context)
+
+
+def _summarize_key(key: str, client: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    if client is None:
+        client = _PENDING_CLIENTS.pop(key, {})
+    context = _context_for_key(key, client, CLIENT_MEMORY_MAX_MESSAGES)
+    summary = (_SUMMARIZER or _default_summarizer)(context)
+    if summary:
+        get_store().write_meta(
+            key,
+            summary=summary,
+            summarized_at=context["message_count"],
+            summary_stale=False,
+        )
+    return summary
 
-    return None
+
+def generate_summary(client: Dict[str, Any]) -> Optional[str]:
+    """
+    Generate a personalization summary from conversation history now.
+
+    append_message() schedules this on the background worker every
+    CLIENT_MEMORY_SUMMARY_INTERVAL messages; call it directly only where a
+    fresh summary is needed synchronously.
+    """
+    if not CLIENT_MEMORY_ENABLED:
+        return None
+
+    key = _ensure_memory_structure(client)
+    if key is None:
+        return None
+    return _summarize_key(key, client)
 
 
 def clear_memory(client: Dict[str, Any]) -> None:
@@ -274,7 +432,13 @@ def clear_memory(client: Dict[str, Any]) -> None:
 
     Preserves profile data, only clears conversation history and summary.
     """
-    if "memory" in client:
+    memory = client.get("memory")
+    if not isinstance(memory, dict):
+        return
+    key = memory.get("store_key")
+    if key:
+        get_store().clear(key)
+    else:
         client["memory"] = {
             "conversation_history": [],
             "summary": None,
@@ -291,6 +455,11 @@ __all__ = [
     "update_profile",
     "generate_summary",
     "clear_memory",
+    "get_store",
+    "configure_store",
+    "set_summarizer",
+    "wait_for_summaries",
+    "shutdown_worker",
     "CLIENT_MEMORY_ENABLED",
     "CLIENT_MEMORY_MAX_MESSAGES",
 ]
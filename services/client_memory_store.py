@@ -0,0 +1,301 @@
+"""
+Client Memory Store - per-client conversation history outside the events DB.
+
+Client memory used to live in db["clients"][email]["memory"], so every
+message made the JSON document that save_db rewrites each turn larger. This
+store keeps it on disk per client instead; the client record only carries a
+constant-size pointer ({"store_key": ...}).
+
+Layout under CLIENT_MEMORY_DIR, one directory per tenant so two teams with
+the same client email never share history (store key = <tenant>/<hash>):
+
+    <tenant>/index.json                 email -> store key (written when a client is added)
+    <tenant>/<hash>/00000000.jsonl      append-only segments of SEGMENT_SIZE messages,
+    <tenant>/<hash>/00000025.jsonl      named by the sequence number of their first message
+    <tenant>/<hash>/meta.json           summary, summarized_at, summary_stale
+
+- Appends write one JSONL line; nothing else is rewritten.
+- History is bounded: whole segments are dropped once the newer segments
+  already hold max_messages.
+- Reads are lazy: recent() opens only the newest segments it needs.
+- SummaryWorker runs summarization on a background thread so the request
+  path only enqueues a client key.
+
+Environment:
+    CLIENT_MEMORY_DIR: Storage root (default: $XDG_CACHE_HOME/openevent/client_memory,
+        /tmp/client_memory on Vercel)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SIZE = 25
+_META_FILE = "meta.json"
+_INDEX_FILE = "index.json"
+
+
+DEFAULT_NAMESPACE = "default"
+
+
+def default_root() -> Path:
+    custom = os.getenv("CLIENT_MEMORY_DIR")
+    if custom:
+        return Path(custom).expanduser().resolve()
+    if os.getenv("VERCEL") == "1":
+        return Path("/tmp/client_memory")
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home).expanduser().resolve() / "openevent" / "client_memory"
+
+
+def store_key_for(email: str, namespace: str = DEFAULT_NAMESPACE) -> str:
+    """Stable store key <namespace>/<hash> for a normalized email (no PII in paths)."""
+    return f"{namespace}/{hashlib.sha1(email.encode('utf-8')).hexdigest()[:20]}"
+
+
+def namespace_of(key: str) -> str:
+    """Namespace (tenant directory) of a store key; "" for keys without one."""
+    return key.split("/", 1)[0] if "/" in key else ""
+
+
+@dataclass
+class _ClientState:
+    """Cached per-client cursor, loaded from disk on first touch."""
+
+    path: Path
+    segments: List[int] = field(default_factory=list)  # start seq of each segment, oldest first
+    next_seq: int = 0
+
+
+class ClientMemoryStore:
+    """Append-only, segment-bounded message history keyed by store key."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        *,
+        max_messages: int = 50,
+        segment_size: int = SEGMENT_SIZE,
+    ) -> None:
+        self.root = Path(root) if root is not None else default_root()
+        self.max_messages = max(1, max_messages)
+        self.segment_size = max(1, segment_size)
+        self._states: Dict[str, _ClientState] = {}
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _load_index(self, namespace: str) -> Dict[str, str]:
+        index = self._indexes.get(namespace)
+        if index is None:
+            try:
+                index = json.loads((self.root / namespace / _INDEX_FILE).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                index = {}
+            self._indexes[namespace] = index
+        return index
+
+    def register(self, email: str, key: str) -> None:
+        """Record email -> key in the key's namespace index (only written for new emails)."""
+        if not email:
+            return
+        namespace = namespace_of(key)
+        with self._lock:
+            index = self._load_index(namespace)
+            if index.get(email) == key:
+                return
+            index[email] = key
+            directory = self.root / namespace
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = directory / f"{_INDEX_FILE}.tmp"
+            tmp_path.write_text(json.dumps(index, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, directory / _INDEX_FILE)
+
+    def key_for_email(self, email: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[str]:
+        with self._lock:
+            return self._load_index(namespace).get(email)
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _state(self, key: str) -> _ClientState:
+        state = self._states.get(key)
+        if state is not None:
+            return state
+        path = self.root / key
+        state = _ClientState(path=path)
+        if path.is_dir():
+            state.segments = sorted(
+                int(entry.stem) for entry in path.glob("*.jsonl") if entry.stem.isdigit()
+            )
+            if state.segments:
+                last = state.segments[-1]
+                with (path / f"{last:08d}.jsonl").open("rb") as handle:
+                    state.next_seq = last + sum(1 for line in handle if line.strip())
+        self._states[key] = state
+        return state
+
+    def append(self, key: str, entry: Dict[str, Any]) -> int:
+        """Append one message; returns the total number of messages ever stored."""
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            state = self._state(key)
+            if not state.segments or state.next_seq - state.segments[-1] >= self.segment_size:
+                state.segments.append(state.next_seq)
+                self._drop_old_segments(state)
+            state.path.mkdir(parents=True, exist_ok=True)
+            with (state.path / f"{state.segments[-1]:08d}.jsonl").open("a", encoding="utf-8") as handle:
+                handle.write(line)
+            state.next_seq += 1
+            return state.next_seq
+
+    def _drop_old_segments(self, state: _ClientState) -> None:
+        # Oldest segment is redundant once the ones after it can hold max_messages
+        while len(state.segments) > 1 and state.next_seq - state.segments[1] >= self.max_messages:
+            oldest = state.segments.pop(0)
+            try:
+                (state.path / f"{oldest:08d}.jsonl").unlink()
+            except FileNotFoundError:
+                pass
+
+    def message_count(self, key: str) -> int:
+        with self._lock:
+            return self._state(key).next_seq
+
+    def recent(self, key: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Last `limit` messages (capped at max_messages), oldest first."""
+        limit = self.max_messages if limit is None else min(limit, self.max_messages)
+        if limit <= 0:
+            return []
+        with self._lock:
+            state = self._state(key)
+            collected: List[Dict[str, Any]] = []
+            for start in reversed(state.segments):
+                try:
+                    lines = (state.path / f"{start:08d}.jsonl").read_text(encoding="utf-8").splitlines()
+                except FileNotFoundError:
+                    continue
+                entries = []
+                for raw in lines:
+                    try:
+                        entries.append(json.loads(raw))
+                    except ValueError:
+                        continue  # torn write at crash time
+                collected = entries + collected
+                if len(collected) >= limit:
+                    break
+        return collected[-limit:]
+
+    # ------------------------------------------------------------------
+    # Summary metadata
+    # ------------------------------------------------------------------
+
+    def read_meta(self, key: str) -> Dict[str, Any]:
+        try:
+            return json.loads((self.root / key / _META_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def write_meta(self, key: str, **updates: Any) -> Dict[str, Any]:
+        with self._lock:
+            meta = self.read_meta(key)
+            meta.update(updates)
+            path = self.root / key
+            path.mkdir(parents=True, exist_ok=True)
+            tmp_path = path / f"{_META_FILE}.tmp"
+            tmp_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path / _META_FILE)
+            return meta
+
+    def clear(self, key: str) -> None:
+        """Delete a client's history and summary (GDPR / tests)."""
+        with self._lock:
+            state = self._state(key)
+            for start in state.segments:
+                try:
+                    (state.path / f"{start:08d}.jsonl").unlink()
+                except FileNotFoundError:
+                    pass
+            try:
+                (state.path / _META_FILE).unlink()
+            except FileNotFoundError:
+                pass
+            self._states.pop(key, None)
+
+
+class SummaryWorker:
+    """Daemon thread that runs `job(key)` for enqueued client keys.
+
+    Keys already waiting are not queued twice, so a burst of messages from one
+    client produces a single summarization.
+    """
+
+    def __init__(self, job: Callable[[str], None], *, name: str = "client-memory-summary") -> None:
+        self._job = job
+        self._name = name
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, key: str) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+        self._queue.put(key)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            key = self._queue.get()
+            try:
+                if key is None:
+                    return
+                with self._lock:
+                    self._pending.discard(key)
+                try:
+                    self._job(key)
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.warning("[ClientMemory] summary for %s failed: %s", key, exc)
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Block until every queued summary has run."""
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout=5.0)
+
+
+__all__ = [
+    "ClientMemoryStore",
+    "DEFAULT_NAMESPACE",
+    "SummaryWorker",
+    "SEGMENT_SIZE",
+    "default_root",
+    "namespace_of",
+    "store_key_for",
+]
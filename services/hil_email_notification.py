@@ -16,9 +16,6 @@ For testing, use EVENT_MANAGER_EMAIL env var or /api/config/hil-email endpoint.
 from __future__ import annotations
 
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from typing import Any, Dict, Optional
 from zoneinfo import ZoneInfo
@@ -328,6 +325,11 @@ def send_hil_notification(
     if not config["smtp_user"] or not config["smtp_password"]:
         return {"success": False, "error": "SMTP credentials not configured"}
 
+    # SMTP/MIME modules are loaded only when an email is actually sent
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     try:
         # Build email - use config store with env var override
         frontend_url = os.getenv("FRONTEND_URL") or get_frontend_url()
@@ -418,6 +420,11 @@ def send_client_email(
     if not config["smtp_user"] or not config["smtp_password"]:
         return {"success": False, "error": "SMTP credentials not configured"}
 
+    # SMTP/MIME modules are loaded only when an email is actually sent
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
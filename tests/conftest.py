@@ -10,3 +10,7 @@ if PROJECT_ROOT not in sys.path:
 
 # Force plain verbalizer tone for deterministic test output
 os.environ.setdefault("VERBALIZER_TONE", "plain")
+
+# Disable the verbalization cache so mocked LLM calls are not served from
+# earlier tests (cache tests opt back in explicitly)
+os.environ.setdefault("VERBALIZER_CACHE", "0")
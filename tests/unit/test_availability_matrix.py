@@ -0,0 +1,113 @@
+"""
+Test: room x date availability matrix (step3 condition.availability_matrix)
+
+- Matrix cells match room_status_on_date for every room and date.
+- The turn matrix is reused until this turn writes a booking through
+  update_event_metadata or the db is reloaded, then rebuilt; saves by
+  other turns do not invalidate it.
+- Calendar lookups run once per room on the shared I/O pool.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from utils.async_tools import run_io_tasks
+from workflows.common.turn_memo import turn_scope
+from workflows.io.database import save_db, update_event_metadata
+from workflows.steps.step3_room_availability.condition.availability_matrix import (
+    build_availability_matrix,
+    turn_availability_matrix,
+)
+from workflows.steps.step3_room_availability.condition.room_status_checker import room_status_on_date
+
+ROOMS = ["Room A", "Room B", "Room C"]
+DATES = ["2027-05-01", "2027-05-02", "2027-05-03"]
+
+
+def _db():
+    return {
+        "events": [
+            {"event_id": "e1", "status": "Option", "locked_room_id": "Room A",
+             "event_data": {"Event Date": "01.05.2027"}},
+            {"event_id": "e2", "status": "Confirmed", "locked_room_id": "Room B",
+             "event_data": {"Event Date": "02.05.2027"}},
+            {"event_id": "e3", "status": "Lead", "locked_room_id": "Room C",
+             "event_data": {"Event Date": "03.05.2027"}},
+        ]
+    }
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize("exclude", [None, "e1"])
+def test_matrix_matches_room_status_on_date(exclude):
+    db = _db()
+    matrix = build_availability_matrix(db, ROOMS, DATES, exclude_event_id=exclude)
+    for room in ROOMS:
+        for iso_date in DATES:
+            assert matrix.status(room, iso_date) == room_status_on_date(
+                db, iso_date, room, exclude_event_id=exclude
+            )
+    assert matrix.free_dates("Room B", DATES) == ["2027-05-01", "2027-05-03"]
+
+
+@pytest.mark.v4
+def test_turn_matrix_is_reused_until_bookings_change(tmp_path):
+    state = SimpleNamespace(db=_db(), turn_notes={})
+    with turn_scope():
+        first = turn_availability_matrix(state, ROOMS, DATES[:1])
+        again = turn_availability_matrix(state, ROOMS[:1], DATES)
+        assert again is first and first.covers(ROOMS, DATES[:1])
+
+        # Another turn saving its own db leaves this turn's matrix alone
+        with turn_scope():
+            other = _db()
+            update_event_metadata(other["events"][0], status="Cancelled")
+            save_db(other, path=tmp_path / "events.json")
+        assert turn_availability_matrix(state, ROOMS, DATES) is first
+
+        update_event_metadata(state.db["events"][1], status="Cancelled")
+        rebuilt = turn_availability_matrix(state, ROOMS, DATES)
+        assert rebuilt is not first
+        assert rebuilt.status("Room B", "02.05.2027") == "Available"
+
+        # A reloaded db is a different object and never reuses the old matrix
+        state.db = _db()
+        assert turn_availability_matrix(state, ROOMS, DATES) is not rebuilt
+
+
+@pytest.mark.v4
+def test_calendar_lookups_run_per_room_on_shared_pool(monkeypatch):
+    from services import rooms as rooms_service
+
+    calls = []
+
+    class FakeCalendar:
+        def get_busy(self, calendar_id, start_iso, end_iso):
+            calls.append((calendar_id, start_iso[:10], end_iso[:10], threading.current_thread().name))
+            if calendar_id == "cal-a":
+                return [{"start": "2027-05-02T10:00:00", "end": "2027-05-02T12:00:00"}]
+            return []
+
+    monkeypatch.setattr(
+        rooms_service, "get_room",
+        lambda name: SimpleNamespace(calendar_id=f"cal-{name[-1].lower()}"),
+    )
+    matrix = build_availability_matrix(_db(), ROOMS, DATES, include_calendar=True, calendar_adapter=FakeCalendar())
+
+    assert sorted(call[0] for call in calls) == ["cal-a", "cal-b", "cal-c"]
+    assert {call[1:3] for call in calls} == {("2027-05-01", "2027-05-04")}
+    assert all(call[3].startswith("oe-io") for call in calls)
+    assert matrix.calendar_busy("Room A", "02.05.2027")
+    assert not matrix.calendar_busy("Room A", "2027-05-01")
+
+
+@pytest.mark.v4
+def test_run_io_tasks_keeps_order_and_runs_nested_calls_inline():
+    def nested():
+        return run_io_tasks([lambda: threading.current_thread().name, lambda: 2])
+
+    results = run_io_tasks([lambda: 1, nested, lambda: 3], max_workers=2)
+    assert results[0] == 1 and results[2] == 3
+    assert results[1][0].startswith("oe-io") and results[1][1] == 2
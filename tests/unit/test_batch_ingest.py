@@ -0,0 +1,203 @@
+"""
+Test: batch inbound-email ingestion
+
+- Messages of one client run in timestamp order; different clients run in parallel.
+- A failed message blocks the rest of its partition; a rerun with the same
+  checkpoint resumes there without reprocessing anything.
+- Saves merge the records a turn changed instead of overwriting: partitions
+  and an API turn running at the same time keep each other's records.
+  Inside owned_records() a write to another client's record that changed
+  meanwhile is dropped and logged.
+- Two partitions holding the same room and day: the later save is refused
+  under the lock and its message re-runs on the fresh database.
+- .eml files parse into process_msg payloads threaded by References.
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from workflows.common.ordinal_dates import RoomDayIndex, day_ordinal
+from workflows.io.database import load_db, owned_records, save_db
+from workflows.runtime.batch_ingest import ingest_batch, load_messages
+
+DELAY_S = 0.05
+
+
+def _messages(clients=4, per_client=3):
+    msgs = []
+    # Interleaved and newest first, so ordering has to come from the timestamps
+    for n in reversed(range(per_client)):
+        for c in range(clients):
+            msgs.append({
+                "from_email": f"client{c}@example.com",
+                "subject": f"msg {n}",
+                "body": f"body {n}",
+                "ts": f"2026-03-0{n + 1}T09:00:00Z",
+            })
+    return msgs
+
+
+@pytest.mark.v4
+def test_per_client_order_and_cross_client_parallelism(tmp_path):
+    seen = {}
+    lock = threading.Lock()
+
+    def handler(msg):
+        time.sleep(DELAY_S)
+        with lock:
+            seen.setdefault(msg["from_email"], []).append(msg["subject"])
+
+    report = ingest_batch(_messages(), handler=handler, workers=4, checkpoint=tmp_path / "cp.jsonl")
+
+    assert report.processed == 12 and report.partitions == 4
+    assert all(order == ["msg 0", "msg 1", "msg 2"] for order in seen.values())
+    assert report.elapsed_s < 12 * DELAY_S * 0.6  # sequential would be 12 * DELAY_S
+    assert report.summary()["latency_ms"]["p50"] >= DELAY_S * 1000 * 0.8
+
+
+@pytest.mark.v4
+def test_checkpoint_resumes_after_failure(tmp_path):
+    calls = []
+    fail_once = {"client1@example.com:msg 1"}
+
+    def handler(msg):
+        key = f"{msg['from_email']}:{msg['subject']}"
+        if key in fail_once:
+            fail_once.discard(key)
+            raise RuntimeError("provider down")
+        calls.append(key)
+
+    first = ingest_batch(_messages(), handler=handler, workers=2, checkpoint=tmp_path / "cp.jsonl")
+    assert (first.processed, first.failed, first.blocked) == (10, 1, 1)
+    assert "client1@example.com:msg 2" not in calls
+
+    calls.clear()
+    second = ingest_batch(_messages(), handler=handler, workers=2, checkpoint=tmp_path / "cp.jsonl")
+    assert (second.processed, second.skipped, second.failed) == (2, 10, 0)
+    assert calls == ["client1@example.com:msg 1", "client1@example.com:msg 2"]
+
+
+@pytest.mark.v4
+def test_owned_saves_merge_per_client(tmp_path):
+    path = tmp_path / "events.json"
+    save_db({"events": [], "clients": {}, "tasks": []}, path)
+    # Both turns load before either saves
+    turns = {email: load_db(path) for email in ("a@example.com", "b@example.com")}
+    for email, db in turns.items():
+        db["events"].append({"event_id": email, "event_data": {"Email": email}})
+        db["clients"][email] = {"profile": {}, "history": [], "event_ids": [email]}
+        with owned_records(email):
+            save_db(db, path)
+
+    merged = load_db(path)
+    assert sorted(e["event_id"] for e in merged["events"]) == ["a@example.com", "b@example.com"]
+    assert sorted(merged["clients"]) == ["a@example.com", "b@example.com"]
+
+
+@pytest.mark.v4
+def test_write_to_other_clients_changed_record_is_dropped_and_logged(tmp_path, caplog):
+    path = tmp_path / "events.json"
+    save_db({"events": [{"event_id": "evt-b", "event_data": {"Email": "b@example.com"}, "notes": "b"}]}, path)
+    with owned_records("a@example.com"):
+        db = load_db(path)
+    db["events"][0]["notes"] = "overwritten by a"
+
+    # b saves its own change between a's load and a's save
+    other = load_db(path)
+    other["events"][0]["notes"] = "b2"
+    save_db(other, path)
+    with owned_records("a@example.com"), caplog.at_level(logging.WARNING, logger="workflows.io.database"):
+        save_db(db, path)
+
+    assert load_db(path)["events"][0]["notes"] == "b2"
+    assert "event:evt-b" in caplog.text
+
+
+@pytest.mark.v4
+def test_api_turn_and_batch_partition_keep_each_others_records(tmp_path):
+    path = tmp_path / "events.json"
+    save_db({"events": [], "clients": {"api@example.com": {"profile": {}, "history": [], "event_ids": []}}, "tasks": []}, path)
+    both_loaded = threading.Barrier(2)
+    partition_saved = threading.Event()
+
+    def api_turn():
+        # Unscoped whole-db save, as API turns and routes make: loads first, saves last
+        db = load_db(path)
+        both_loaded.wait(5)
+        partition_saved.wait(5)
+        db["events"].append({"event_id": "evt-api", "event_data": {"Email": "api@example.com"}})
+        db["clients"]["api@example.com"]["event_ids"].append("evt-api")
+        db["tasks"].append({"task_id": "task-api", "client_id": "api@example.com"})
+        save_db(db, path)
+
+    def handler(msg):
+        db = load_db(path)
+        both_loaded.wait(5)
+        db["events"].append({"event_id": "evt-batch", "event_data": {"Email": msg["from_email"]}})
+        db["clients"][msg["from_email"]] = {"profile": {}, "history": [], "event_ids": ["evt-batch"]}
+        db["tasks"].append({"task_id": "task-batch", "client_id": msg["from_email"]})
+        save_db(db, path)
+        partition_saved.set()
+
+    api = threading.Thread(target=api_turn)
+    api.start()
+    report = ingest_batch([{"from_email": "batch@example.com", "subject": "hi", "body": "hi"}], handler=handler, workers=1)
+    api.join(10)
+
+    assert report.processed == 1
+    merged = load_db(path)
+    assert sorted(e["event_id"] for e in merged["events"]) == ["evt-api", "evt-batch"]
+    assert sorted(t["task_id"] for t in merged["tasks"]) == ["task-api", "task-batch"]
+    assert merged["clients"]["api@example.com"]["event_ids"] == ["evt-api"]
+    assert merged["clients"]["batch@example.com"]["event_ids"] == ["evt-batch"]
+
+
+@pytest.mark.v4
+def test_same_room_and_day_is_rechecked_under_the_lock(tmp_path):
+    path = tmp_path / "events.json"
+    save_db({"events": [], "clients": {}, "tasks": []}, path)
+    both_loaded = threading.Barrier(2)
+    attempts = {}
+
+    def handler(msg):
+        email = msg["from_email"]
+        db = load_db(path)
+        taken = RoomDayIndex.from_db(db).is_blocked("room a", day_ordinal("12.06.2027"))
+        attempts[email] = attempts.get(email, 0) + 1
+        if attempts[email] == 1:
+            both_loaded.wait(5)  # both partitions see Room A free
+        db["events"].append({
+            "event_id": email,
+            "status": "Confirmed",
+            "locked_room_id": "Room B" if taken else "Room A",
+            "chosen_date": "12.06.2027",
+            "event_data": {"Email": email, "Event Date": "12.06.2027"},
+        })
+        save_db(db, path)
+
+    msgs = [{"from_email": email, "subject": "book", "body": "Room A please"} for email in ("a@example.com", "b@example.com")]
+    report = ingest_batch(msgs, handler=handler, workers=2)
+
+    assert (report.processed, report.failed, report.conflicts) == (2, 0, 1)
+    rooms = sorted(event["locked_room_id"] for event in load_db(path)["events"])
+    assert rooms == ["Room A", "Room B"]
+    assert sorted(attempts.values()) == [1, 2]
+
+
+@pytest.mark.v4
+def test_eml_directory_is_threaded(tmp_path):
+    (tmp_path / "1.eml").write_text(
+        "From: Ana Client <ana@example.com>\nSubject: Workshop\nDate: Tue, 03 Mar 2026 09:00:00 +0100\n"
+        "Message-ID: <root@example.com>\n\nWe are 25 people.\n"
+    )
+    (tmp_path / "2.eml").write_text(
+        "From: ana@example.com\nSubject: Re: Workshop\nDate: Wed, 04 Mar 2026 09:00:00 +0100\n"
+        "Message-ID: <reply@example.com>\nReferences: <root@example.com>\n\nMake it 30.\n"
+    )
+    first, second = load_messages(tmp_path)
+    assert first["thread_id"] == second["thread_id"] == "root@example.com"
+    assert first["from_email"] == "ana@example.com" and first["ts"] == "2026-03-03T08:00:00Z"
+    assert second["body"] == "Make it 30."
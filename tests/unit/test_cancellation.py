@@ -0,0 +1,244 @@
+"""
+Test: per-turn cancellation tokens (utils.cancellation)
+
+- Checkpoints are no-ops outside a scope and raise once the token is cancelled or expired.
+- TurnCancelled is not swallowed by `except Exception` fallbacks.
+- Provider retries stop as soon as the turn is cancelled.
+- A cancelled process_msg persists nothing.
+- run_cancellable_turn cancels on client disconnect and records wasted work.
+- A turn whose deadline passes while it waits for a tenant turn slot (or
+  behind the same client's running turn) stops waiting.
+- Concurrent send_message turns for different clients keep each other's writes.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.cancellation import (
+    REASON_DEADLINE,
+    REASON_DISCONNECT,
+    CancelToken,
+    TurnCancelled,
+    call_timeout,
+    cancel_scope,
+    cancellation_stats,
+    check_cancelled,
+    llm_call,
+    reset_cancellation_stats,
+    run_cancellable_turn,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    reset_cancellation_stats()
+    yield
+    reset_cancellation_stats()
+
+
+@pytest.mark.v4
+def test_checkpoints_and_deadline():
+    check_cancelled("outside")  # no token bound: no-op
+    assert call_timeout(30.0) == 30.0
+
+    token = CancelToken(deadline_s=0.05)
+    with pytest.raises(TurnCancelled) as raised:
+        with cancel_scope(token):
+            check_cancelled("early")
+            assert call_timeout(30.0) == 0.5  # capped by the time left (floor 0.5s)
+            time.sleep(0.06)
+            try:
+                check_cancelled("late")
+            except Exception:  # pragma: no cover - must not be reached
+                pytest.fail("TurnCancelled was swallowed by except Exception")
+    assert raised.value.reason == REASON_DEADLINE
+    assert token.aborted_stage == "late"
+    assert cancellation_stats()["cancelled_deadline"] == 1
+
+
+@pytest.mark.v4
+def test_llm_calls_are_counted_as_wasted_work():
+    token = CancelToken()
+    with pytest.raises(TurnCancelled):
+        with cancel_scope(token):
+            with llm_call("first"):
+                pass
+            token.cancel()
+            with llm_call("second"):
+                pytest.fail("call after cancel must not run")
+    stats = cancellation_stats()
+    assert stats["turns_cancelled"] == 1
+    assert stats["wasted_llm_calls"] == 1
+
+
+@pytest.mark.v4
+def test_provider_retries_stop_when_cancelled(monkeypatch):
+    from workflows.llm import adapter as llm_adapter
+
+    token = CancelToken()
+    calls = []
+
+    class FailingProvider:
+        def classify_extract(self, text):
+            calls.append(text)
+            token.cancel()
+            raise RuntimeError("provider timeout")
+
+    monkeypatch.setattr(llm_adapter, "get_provider", lambda: FailingProvider())
+    with pytest.raises(TurnCancelled) as raised:
+        with cancel_scope(token):
+            llm_adapter._invoke_provider_with_retry({"subject": "", "body": "hi"}, "analysis")
+    assert len(calls) == 1
+    assert raised.value.stage == "analysis.attempt2"
+
+
+@pytest.mark.v4
+def test_cancelled_turn_persists_nothing(monkeypatch, tmp_path):
+    monkeypatch.setenv("AGENT_MODE", "stub")
+    from workflow_email import process_msg
+
+    db_path = tmp_path / "events.json"
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(TurnCancelled) as raised:
+        with cancel_scope(token):
+            process_msg(
+                {
+                    "msg_id": "m1",
+                    "from_email": "client@example.com",
+                    "subject": "Workshop",
+                    "body": "We would like to book a room for 20 people on 14.05.2027.",
+                    "thread_id": "cancel-test",
+                },
+                db_path=db_path,
+            )
+    assert raised.value.stage == "intake"
+    assert not db_path.exists()
+
+
+@pytest.mark.v4
+def test_run_cancellable_turn_cancels_on_disconnect():
+    class DisconnectedRequest:
+        async def is_disconnected(self):
+            return True
+
+    def slow_turn():
+        for _ in range(100):
+            check_cancelled("loop")
+            time.sleep(0.01)
+        return "done"
+
+    async def scenario():
+        return await run_cancellable_turn(
+            slow_turn, http_request=DisconnectedRequest(), deadline_s=None, poll_interval_s=0.01
+        )
+
+    with pytest.raises(TurnCancelled) as raised:
+        asyncio.run(scenario())
+    assert raised.value.reason == REASON_DISCONNECT
+    assert cancellation_stats()["cancelled_client_disconnected"] == 1
+
+    assert asyncio.run(run_cancellable_turn(lambda: "ok", deadline_s=None)) == "ok"
+
+
+@pytest.mark.v4
+def test_queued_turn_leaves_the_queue_at_its_deadline(monkeypatch):
+    monkeypatch.setenv("OE_TENANT_MAX_TURNS", "1")
+    from workflows.io.tenants import reset_tenants
+
+    reset_tenants()
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(
+            run_cancellable_turn(lambda: release.wait(10), tenant_id="t", deadline_s=None, poll_interval_s=0.01)
+        )
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(TurnCancelled) as raised:
+                await run_cancellable_turn(lambda: "late", tenant_id="t", deadline_s=0.1, poll_interval_s=0.01)
+            # The slot is still held: the queued turn did not wait for it
+            assert not busy.done()
+            return raised.value
+        finally:
+            release.set()
+            await busy
+
+    cancelled = asyncio.run(scenario())
+    reset_tenants()
+    assert (cancelled.reason, cancelled.stage) == (REASON_DEADLINE, "queued")
+    assert cancellation_stats()["cancelled_deadline"] == 1
+
+
+@pytest.mark.v4
+def test_turn_waiting_behind_same_client_is_cancellable():
+    from workflows.io.database import owned_records
+
+    holding, release = threading.Event(), threading.Event()
+
+    def running_turn():
+        with owned_records("a@example.com"):
+            holding.set()
+            release.wait(10)
+
+    runner = threading.Thread(target=running_turn)
+    runner.start()
+    holding.wait(5)
+    try:
+        with owned_records("b@example.com"):
+            pass  # other clients do not wait
+        with pytest.raises(TurnCancelled) as raised:
+            with cancel_scope(CancelToken(deadline_s=0.1)):
+                with owned_records("A@example.com"):
+                    pytest.fail("must not run while the client's turn is running")
+        assert raised.value.stage == "client_turn"
+    finally:
+        release.set()
+        runner.join(5)
+
+
+@pytest.mark.v4
+def test_concurrent_turns_keep_each_others_writes(monkeypatch, tmp_path):
+    monkeypatch.setenv("AGENT_MODE", "stub")
+    # Both turns run at once; their saves must merge instead of overwriting
+    monkeypatch.setenv("OE_TENANT_MAX_TURNS", "4")
+    import workflow_email
+    from workflows.io.tenants import reset_tenants
+
+    reset_tenants()
+    db_path = tmp_path / "events.json"
+    load_db = workflow_email.db_io.load_db
+
+    def slow_load(*args, **kwargs):
+        db = load_db(*args, **kwargs)
+        time.sleep(0.2)  # widen the load-to-save window
+        return db
+
+    monkeypatch.setattr(workflow_email.db_io, "load_db", slow_load)
+
+    def turn(email):
+        # Same call send_message makes, on a test database
+        payload = {
+            "msg_id": f"m-{email}",
+            "from_email": email,
+            "subject": "Workshop",
+            "body": "We would like to book a room for 20 people on 14.05.2027.",
+            "thread_id": email,
+            "session_id": email,
+        }
+        return run_cancellable_turn(
+            lambda: workflow_email.process_msg(payload, db_path=db_path), deadline_s=None, poll_interval_s=0.01
+        )
+
+    async def scenario():
+        await asyncio.gather(turn("first@example.com"), turn("second@example.com"))
+
+    asyncio.run(scenario())
+    reset_tenants()
+    db = load_db(db_path)
+    assert {"first@example.com", "second@example.com"} <= set(db["clients"])
+    emails = {(event.get("event_data") or {}).get("Email") for event in db["events"]}
+    assert {"first@example.com", "second@example.com"} <= emails
@@ -0,0 +1,126 @@
+"""
+Test: client memory store and background summarization (services.client_memory)
+
+- History lives in per-client segments; the client record keeps only a pointer.
+- History is bounded by CLIENT_MEMORY_MAX_MESSAGES via whole-segment drops.
+- Summaries run on the worker every CLIENT_MEMORY_SUMMARY_INTERVAL messages.
+- Legacy in-record histories migrate to the store on first touch.
+- Histories are namespaced by tenant; clients without an email store nothing.
+"""
+
+import json
+
+import pytest
+
+from services import client_memory
+from workflows.io import tenants
+from services.client_memory_store import ClientMemoryStore
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(client_memory, "CLIENT_MEMORY_ENABLED", True)
+    monkeypatch.setattr(client_memory, "CLIENT_MEMORY_SUMMARY_INTERVAL", 4)
+    store = ClientMemoryStore(tmp_path, max_messages=10, segment_size=4)
+    client_memory.configure_store(store)
+    yield store
+    client_memory.set_summarizer(None)
+    client_memory.configure_store(None)
+
+
+@pytest.mark.v4
+def test_append_keeps_client_record_constant_size(memory):
+    client = {"profile": {"name": "Ana"}}
+    client_memory.append_message(client, "client", "first", client_id="Ana@Example.com")
+    size = len(json.dumps(client))
+    for n in range(8):
+        client_memory.append_message(client, "assistant", f"reply {n}", client_id="ana@example.com")
+
+    assert len(json.dumps(client)) == size
+    key = client["memory"]["store_key"]
+    assert memory.key_for_email("ana@example.com") == key
+    assert [msg["text"] for msg in memory.recent(key, 2)] == ["reply 6", "reply 7"]
+
+
+@pytest.mark.v4
+def test_history_is_bounded_by_segments(memory):
+    client = {}
+    for n in range(30):
+        client_memory.append_message(client, "client", f"m{n}", client_id="b@example.com")
+    key = client["memory"]["store_key"]
+
+    assert memory.message_count(key) == 30
+    assert [msg["text"] for msg in memory.recent(key)] == [f"m{n}" for n in range(20, 30)]
+    # Only the segments needed to cover max_messages remain on disk
+    assert len(list((memory.root / key).glob("*.jsonl"))) <= 4
+    # A fresh store instance recovers the cursor from disk
+    assert ClientMemoryStore(memory.root, max_messages=10, segment_size=4).message_count(key) == 30
+
+
+@pytest.mark.v4
+def test_summary_runs_in_background_with_stub_llm(memory):
+    calls = []
+
+    def stub_llm(context):
+        calls.append(context["message_count"])
+        return f"{context['profile']['name']} sent {context['message_count']} messages"
+
+    client_memory.set_summarizer(stub_llm)
+    client = {"profile": {"name": "Ana"}}
+    for n in range(8):
+        client_memory.append_message(client, "client", f"m{n}", client_id="c@example.com")
+    client_memory.wait_for_summaries()
+
+    assert calls and calls[-1] == 8
+    prompt = client_memory.format_memory_for_prompt(client)
+    assert "Client summary: Ana sent 8 messages" in prompt
+    assert "[client]: m7" in prompt
+
+
+@pytest.mark.v4
+def test_legacy_history_migrates_and_clear_removes_it(memory):
+    client = {
+        "memory": {
+            "conversation_history": [{"role": "client", "text": "old"}],
+            "summary": "Legacy summary.",
+            "message_count": 1,
+        }
+    }
+    context = client_memory.get_memory_context(client, client_id="legacy@example.com")
+
+    assert set(client["memory"]) == {"store_key"}
+    assert context["summary"] == "Legacy summary."
+    assert [msg["text"] for msg in context["recent_messages"]] == ["old"]
+
+    client_memory.clear_memory(client)
+    assert client_memory.get_memory_context(client)["recent_messages"] == []
+
+
+@pytest.mark.v4
+def test_same_email_in_two_tenants_keeps_separate_histories(memory, monkeypatch):
+    records = {}
+    for tenant in ("acme", "globex"):
+        monkeypatch.setattr(tenants, "current_tenant_id", lambda tenant=tenant: tenant)
+        records[tenant] = {}
+        client_memory.append_message(records[tenant], "client", f"hello from {tenant}", client_id="ana@example.com")
+
+    acme_key = records["acme"]["memory"]["store_key"]
+    assert acme_key.startswith("acme/") and (memory.root / "acme" / "index.json").exists()
+    assert memory.key_for_email("ana@example.com", "acme") == acme_key
+    context = client_memory.get_memory_context(records["globex"])
+    assert [msg["text"] for msg in context["recent_messages"]] == ["hello from globex"]
+
+    # A record carrying another tenant's key is re-keyed, not read
+    copied = {"memory": {"store_key": acme_key}}
+    client_memory.append_message(copied, "client", "moved", client_id="ana@example.com")
+    assert copied["memory"]["store_key"] == records["globex"]["memory"]["store_key"]
+
+
+@pytest.mark.v4
+def test_client_without_email_stores_nothing(memory):
+    client = {}
+    client_memory.append_message(client, "client", "anonymous")
+
+    assert "memory" not in client
+    assert client_memory.get_memory_context(client)["recent_messages"] == []
+    assert not any(memory.root.iterdir())
@@ -0,0 +1,110 @@
+"""
+Test: concurrent / fused analyze_message in the OpenAI and Gemini adapters
+
+- Intent and entity calls run concurrently on the llm pool: latency is the
+  max, not the sum.
+- The fused single-call schema returns the same payload as the two calls (parity).
+- A malformed fused response falls back to the two concurrent calls.
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from adapters.agent_adapter import GeminiAgentAdapter, OpenAIAgentAdapter, StubAgentAdapter
+
+DELAY_S = 0.2
+MESSAGE = {
+    "subject": "Workshop booking",
+    "body": "Hello, we'd like to book a room for 25 people on 14.05.2027 from 09:00 to 17:00.",
+}
+INTENT = {"intent": "event_request", "confidence": 0.92}
+ENTITIES = {"date": "2027-05-14", "start_time": "09:00", "end_time": "17:00", "participants": 25, "type": "workshop"}
+THREADS = []  # provider call threads, for the pool check
+
+
+def _respond(prompt, adapter_cls, *, fused_ok=True):
+    """Canned provider behaviour keyed by the static system prompt."""
+    THREADS.append(threading.current_thread().name)
+    if prompt.startswith(adapter_cls._ANALYSIS_PROMPT):
+        return dict(INTENT, fields=ENTITIES) if fused_ok else {"intent": "event_request"}
+    time.sleep(DELAY_S)
+    if prompt.startswith(adapter_cls._INTENT_PROMPT):
+        return INTENT
+    return ENTITIES
+
+
+def _openai(fused_ok=True):
+    adapter = OpenAIAgentAdapter.__new__(OpenAIAgentAdapter)
+    adapter._intent_model = adapter._entity_model = "test-model"
+    adapter._fallback = StubAgentAdapter()
+    calls = []
+
+    def create(**kwargs):
+        system = kwargs["messages"][0]["content"]
+        calls.append(system)
+        content = json.dumps(_respond(system, OpenAIAgentAdapter, fused_ok=fused_ok))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    adapter._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return adapter, calls
+
+
+def _gemini():
+    pytest.importorskip("google.genai")  # warm the lazy SDK import outside the timed call
+    adapter = GeminiAgentAdapter.__new__(GeminiAgentAdapter)
+    adapter._intent_model = adapter._entity_model = "test-model"
+    adapter._fallback = StubAgentAdapter()
+    calls = []
+
+    def generate_content(*, model, contents, config):
+        calls.append(contents)
+        text = json.dumps(_respond(contents, GeminiAgentAdapter))
+        return SimpleNamespace(text=text, usage_metadata=None)
+
+    adapter._client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    return adapter, calls
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize("factory", [_openai, _gemini])
+def test_two_calls_run_concurrently(factory, monkeypatch):
+    monkeypatch.delenv("OE_FUSED_ANALYSIS", raising=False)
+    adapter, calls = factory()
+    THREADS.clear()
+    started = time.perf_counter()
+    result = adapter.analyze_message(MESSAGE)
+    elapsed = time.perf_counter() - started
+
+    assert len(calls) == 2
+    assert all(name.startswith("oe-llm") for name in THREADS)
+    assert elapsed < DELAY_S * 1.75  # sequential calls would take 2 * DELAY_S
+    assert result["intent"] == "event_request"
+    assert result["fields"]["participants"] == 25
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize("factory", [_openai, _gemini])
+def test_fused_call_matches_two_call_results(factory, monkeypatch):
+    monkeypatch.delenv("OE_FUSED_ANALYSIS", raising=False)
+    two_call = factory()[0].analyze_message(MESSAGE)
+
+    monkeypatch.setenv("OE_FUSED_ANALYSIS", "1")
+    adapter, calls = factory()
+    fused = adapter.analyze_message(MESSAGE)
+
+    assert len(calls) == 1
+    assert fused == two_call
+
+
+@pytest.mark.v4
+def test_malformed_fused_response_falls_back(monkeypatch):
+    monkeypatch.setenv("OE_FUSED_ANALYSIS", "1")
+    adapter, calls = _openai(fused_ok=False)
+    result = adapter.analyze_message(MESSAGE)
+    assert len(calls) == 3  # fused attempt + intent + entities
+    assert result["confidence"] == pytest.approx(0.92)
+    assert result["fields"]["date"] == "2027-05-14"
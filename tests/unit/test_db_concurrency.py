@@ -1,13 +1,12 @@
 """
 Test: Database concurrency behavior (F-02 finding)
 
-This test documents the race condition in JSON database updates:
-- The FileLock only wraps individual I/O operations (load/save)
-- It does NOT wrap the entire "load → process → save" transaction
-- Concurrent workers can load the same snapshot and overwrite each other
-
-This is an INFORMATIONAL test - it documents known behavior, not a regression guard.
-When the underlying concurrency issue is fixed, this test should be updated.
+The FileLock only wraps individual I/O operations (load/save), not the
+whole "load → process → save" transaction. save_db therefore merges the
+records a copy changed since its load into the file:
+- Concurrent workers that load the same snapshot keep each other's events.
+- Deletions and edits merge per record; untouched records take the file's version.
+- A db built from scratch still replaces the file.
 """
 
 import json
@@ -23,18 +22,15 @@ from workflows.io.database import load_db, save_db
 
 
 @pytest.mark.v4
-def test_concurrent_updates_can_lose_data():
+def test_concurrent_updates_keep_both_events():
     """
-    Demonstrate that concurrent load→modify→save cycles can lose updates.
+    Concurrent load→modify→save cycles keep both updates.
 
     Scenario:
     - Worker A loads DB, adds event "A"
     - Worker B loads DB (same snapshot), adds event "B"
     - Worker A saves → DB has event "A"
-    - Worker B saves → DB has only event "B" (A's update is lost!)
-
-    This test PASSES when data loss occurs (documenting the current behavior).
-    When the bug is fixed, this test should FAIL and be rewritten.
+    - Worker B saves → its new event is merged in, event "A" stays
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test_db.json"
@@ -78,7 +74,7 @@ def test_concurrent_updates_can_lose_data():
             # Delay to ensure A saves first
             time.sleep(0.1)
 
-            # Save (this overwrites A's changes)
+            # Save (merged with A's saved changes)
             save_db(db, db_path)
 
         # Run both workers concurrently
@@ -95,22 +91,32 @@ def test_concurrent_updates_can_lose_data():
         final_db = load_db(db_path)
         event_ids = [e["event_id"] for e in final_db.get("events", [])]
 
-        # Document the race condition: B's save overwrites A's changes
-        # Expected (if bug exists): only event-B is present
-        # Expected (if bug fixed): both event-A and event-B are present
-
-        if "event-A" in event_ids and "event-B" in event_ids:
-            pytest.fail(
-                "GOOD NEWS: Both events preserved! The concurrency bug may be fixed. "
-                "Update this test to be a regression guard."
-            )
-        else:
-            # This documents the current buggy behavior
-            assert "event-B" in event_ids, "Event B should be present (last writer wins)"
-            assert "event-A" not in event_ids, (
-                "Event A is lost due to race condition (F-02). "
-                "This test documents the known behavior."
-            )
+        # Regression guard (F-02): B's save used to overwrite A's event
+        assert sorted(event_ids) == ["event-A", "event-B"]
+
+
+@pytest.mark.v4
+def test_concurrent_edits_and_deletions_merge_per_record(tmp_path):
+    db_path = tmp_path / "test_db.json"
+    save_db({"events": [{"event_id": "e1", "notes": ""}, {"event_id": "e2", "notes": ""}],
+             "tasks": [{"task_id": "t1"}, {"task_id": "t2"}], "config": {"venue": "old"}}, db_path)
+    first, second = load_db(db_path), load_db(db_path)
+
+    first["events"][0]["notes"] = "first"
+    first["tasks"] = [t for t in first["tasks"] if t["task_id"] != "t1"]
+    save_db(first, db_path)
+    second["events"][1]["notes"] = "second"
+    second["config"]["venue"] = "new"
+    save_db(second, db_path)
+
+    final_db = load_db(db_path)
+    assert [e["notes"] for e in final_db["events"]] == ["first", "second"]
+    assert [t["task_id"] for t in final_db["tasks"]] == ["t2"]
+    assert final_db["config"] == {"venue": "new"}
+
+    # A db that was not loaded from the file replaces it
+    save_db({"events": [], "clients": {}, "tasks": []}, db_path)
+    assert load_db(db_path)["events"] == []
 
 
 @pytest.mark.v4
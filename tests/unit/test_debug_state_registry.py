@@ -0,0 +1,87 @@
+"""
+Test: bounded per-thread debug state (debug.registry)
+
+- The registry evicts least recently used threads beyond max_entries and idle threads past the TTL.
+- Evicted trace threads flush their buffered timeline writes; their sequence resumes from disk.
+- Per-thread trace state is a compact __slots__ record; the memory report accounts for it.
+"""
+
+import pytest
+
+from debug import registry, timeline, trace
+from debug.registry import BoundedRegistry, memory_report
+
+
+@pytest.fixture
+def trace_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEBUG_TRACE", "1")
+    monkeypatch.setattr(timeline, "ROOT", tmp_path)
+    monkeypatch.setattr(timeline, "ARCH", tmp_path / "archive")
+    writer = timeline.TimelineWriter(flush_every=1000, flush_interval=3600)
+    monkeypatch.setattr(timeline, "_WRITER", writer)
+    yield tmp_path
+    writer.close()
+
+
+@pytest.fixture
+def small_trace_state(monkeypatch):
+    threads = BoundedRegistry("test.trace.threads", max_entries=2, on_evict=trace._flush_timeline)
+    bus = trace.TraceBus(name="test.trace.events")
+    bus._buf.max_entries = 2
+    monkeypatch.setattr(trace, "_THREADS", threads)
+    monkeypatch.setattr(trace, "BUS", bus)
+    yield threads
+    for name in ("test.trace.threads", "test.trace.events"):
+        registry._REGISTRIES.pop(name, None)
+
+
+@pytest.mark.v4
+def test_lru_and_ttl_eviction_hand_off(monkeypatch):
+    evicted = []
+    clock = [100.0]
+    monkeypatch.setattr(registry.time, "monotonic", lambda: clock[0])
+    reg = BoundedRegistry("test.lru", max_entries=2, ttl_s=60, on_evict=lambda *args: evicted.append(args))
+    try:
+        reg["a"], reg["b"] = 1, 2
+        reg.get("a")  # a becomes most recently used
+        reg["c"] = 3
+        assert evicted == [("b", 2, "lru")]
+        assert reg.keys() == ["a", "c"]
+
+        clock[0] += 61
+        reg["d"] = 4
+        assert [key for key, _, reason in evicted if reason == "ttl"] == ["a", "c"]
+        assert reg.stats()["evictions"] == {"lru": 1, "ttl": 2}
+    finally:
+        registry._REGISTRIES.pop("test.lru", None)
+
+
+@pytest.mark.v4
+def test_evicted_trace_thread_is_flushed_and_resumes(trace_dir, small_trace_state):
+    for n in range(2):
+        trace.emit("t-old", "STEP_ENTER", step="Step1_Intake")
+    assert (trace_dir / "t-old.jsonl").read_bytes() == b""  # still buffered
+
+    trace.emit("t-2", "STEP_ENTER", step="Step1_Intake")
+    trace.emit("t-3", "STEP_ENTER", step="Step1_Intake")
+    assert "t-old" not in small_trace_state
+    assert "t-old" not in trace.BUS.list_threads()
+    assert [event["seq"] for event in timeline.read("t-old")] == [1, 2]
+
+    trace.emit("t-old", "STEP_ENTER", step="Step1_Intake")
+    assert trace.BUS.get("t-old")[-1]["seq"] == 3
+
+
+@pytest.mark.v4
+def test_thread_record_is_compact_and_accounted(trace_dir, small_trace_state):
+    trace.set_hil_open("t-1", True)
+    trace.emit("t-1", "STEP_ENTER", step="Step2_Date", entity_label="Date")
+    record = small_trace_state.get("t-1")
+    assert not hasattr(record, "__dict__")
+    assert record.hil_open and record.last_entity == "Date" and record.seq == 1
+    assert trace.get_trace_summary("t-1")["hil_open"] is True
+
+    report = memory_report()
+    assert report["registries"]["test.trace.threads"]["entries"] == 1
+    assert report["registries"]["test.trace.events"]["approx_bytes"] > 0
+    assert report["debug_state_bytes"] > 0
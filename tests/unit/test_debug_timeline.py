@@ -0,0 +1,119 @@
+"""
+Test: buffered, indexed debug timeline storage (debug.timeline)
+
+- Events are buffered and written as compact records with an offset index.
+- The background flusher writes records older than the flush interval
+  without waiting for another event.
+- Readers expand compact records and support after_seq / kind / tail queries.
+- Legacy JSONL files without an index still read.
+"""
+
+import json
+import time
+
+import pytest
+
+from debug import timeline
+from debug.hooks import _callsite_path
+
+
+@pytest.fixture
+def trace_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeline, "ROOT", tmp_path)
+    monkeypatch.setattr(timeline, "ARCH", tmp_path / "archive")
+    writer = timeline.TimelineWriter(flush_every=1000, flush_interval=3600)
+    monkeypatch.setattr(timeline, "_WRITER", writer)
+    yield tmp_path
+    writer.close()
+
+
+def _event(seq: int, kind: str = "STEP_ENTER", **extra):
+    event = {
+        "thread_id": "t-1",
+        "ts": 1000.0 + seq,
+        "seq": seq,
+        "row_id": f"1000.{seq:04d}",
+        "kind": kind,
+        "lane": "step",
+        "step": "Step1_Intake",
+        "payload": {"n": seq},
+        "data": {"n": seq},
+        "captured_additions": [],
+        "loop": False,
+        "granularity": "logic",
+        "gate": None,
+    }
+    event.update(extra)
+    return event
+
+
+@pytest.mark.v4
+def test_writes_are_buffered_until_flush(trace_dir):
+    timeline.append("t-1", _event(1))
+    assert (trace_dir / "t-1.jsonl").read_bytes() == b""
+
+    timeline.flush("t-1")
+    line = (trace_dir / "t-1.jsonl").read_text().strip()
+    record = json.loads(line)
+    # Compact: no defaults, no duplicated payload
+    assert "payload" not in record and "gate" not in record and " " not in line
+
+
+@pytest.mark.v4
+def test_last_events_are_flushed_without_another_append(trace_dir):
+    writer = timeline.TimelineWriter(flush_every=1000, flush_interval=0.05)
+    try:
+        writer.append("t-2", _event(1))
+        writer.append("t-2", _event(2))
+        assert (trace_dir / "t-2.jsonl").read_bytes() == b""
+        deadline = time.monotonic() + 5
+        while not (trace_dir / "t-2.jsonl").read_bytes() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len((trace_dir / "t-2.jsonl").read_text().splitlines()) == 2
+    finally:
+        writer.close()
+
+@pytest.mark.v4
+def test_compact_records_round_trip(trace_dir):
+    original = _event(1, gate={"met": 1, "required": 2})
+    timeline.append("t-1", original)
+    (restored,) = timeline.snapshot("t-1")
+    for key, value in original.items():
+        assert restored[key] == value
+    assert restored["confirmed_now"] == [] and restored["detour"] is None
+
+
+@pytest.mark.v4
+def test_range_kind_and_tail_reads(trace_dir):
+    for seq in range(1, 11):
+        timeline.append("t-1", _event(seq, kind="DB_WRITE" if seq % 3 == 0 else "STEP_ENTER"))
+
+    assert [e["seq"] for e in timeline.read("t-1", after_seq=7)] == [8, 9, 10]
+    assert [e["seq"] for e in timeline.read("t-1", kinds=["DB_WRITE"])] == [3, 6, 9]
+    assert [e["seq"] for e in timeline.read("t-1", kinds=["DB_WRITE"], tail=1)] == [9]
+    assert [e["seq"] for e in timeline.read("t-1", tail=2)] == [9, 10]
+    assert timeline.last_seq("t-1") == 10
+
+
+@pytest.mark.v4
+def test_mark_closed_archives_file_and_index(trace_dir):
+    timeline.append("t-1", _event(1))
+    destination = timeline.mark_closed("t-1")
+    assert destination.endswith("__t-1.jsonl")
+    assert [e["seq"] for e in timeline.read("t-1", after_seq=0)] == [1]
+    assert list((trace_dir / "archive").glob("*.idx"))
+
+
+@pytest.mark.v4
+def test_legacy_file_without_index(trace_dir):
+    path = trace_dir / "t-1.jsonl"
+    path.write_text("\n".join(json.dumps(_event(seq)) for seq in (1, 2, 3)) + "\n")
+    assert [e["seq"] for e in timeline.read("t-1", after_seq=1)] == [2, 3]
+
+
+@pytest.mark.v4
+def test_callsite_path_is_cached_per_code_object():
+    def traced():
+        return _callsite_path(skip=1)
+
+    assert traced() == traced() == f"{__name__}.test_callsite_path_is_cached_per_code_object.<locals>.traced"
@@ -0,0 +1,154 @@
+"""
+Test: adaptive routing of unified detection (detection.routing)
+
+- Short confirmations skip the LLM only where the expected reply shape resolves them.
+- Risky wording (questions, hedges, digits) keeps the full LLM call.
+- The cheap route needs a configured cheap model; otherwise it falls back to full.
+- Shadow mode always runs the LLM and records agreement.
+- Repeated messages skip detection only where check_duplicate_message
+  answers them: never during a detour or the billing flow.
+- The pre-route pipeline records the decision and uses the synthesized result.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from detection.pre_filter import pre_filter
+from detection.routing import (
+    ROUTE_CHEAP,
+    ROUTE_FULL,
+    ROUTE_SKIP,
+    SHAPE_DATE_CHOICE,
+    decide_detection_route,
+    detection_route_stats,
+    reset_detection_route_stats,
+    route_unified_detection,
+)
+from detection.unified import UnifiedDetectionResult
+
+STEP2 = {"current_step": 2, "date_confirmed": False}
+STEP5 = {"current_step": 5, "date_confirmed": True, "offer_status": "Sent"}
+BILLING = {"current_step": 5, "offer_accepted": True, "billing_requirements": {"awaiting_billing_for_accept": True}}
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.delenv("DETECTION_ROUTER", raising=False)
+    monkeypatch.delenv("OPENAI_DETECTION_CHEAP_MODEL", raising=False)
+    reset_detection_route_stats()
+    yield
+    reset_detection_route_stats()
+
+
+def _decide(body, event_entry, *, provider="openai"):
+    combined = f"Re: Booking\n{body}"
+    return decide_detection_route(
+        combined, pre_filter(combined, event_entry=event_entry), event_entry, reply_text=body, provider=provider
+    )
+
+
+@pytest.mark.v4
+def test_confirmations_skip_only_with_expected_shape():
+    decision = _decide("Yes, please!", STEP2)
+    assert decision.route == ROUTE_SKIP
+    assert decision.shape == SHAPE_DATE_CHOICE
+    assert _decide("Go ahead, thanks", STEP5).route == ROUTE_SKIP
+    # Step 3: nothing tells us what the "yes" refers to
+    assert _decide("Yes please", {"current_step": 3}).route == ROUTE_FULL
+    # Detour in progress
+    assert _decide("Yes please", dict(STEP2, caller_step=4)).route == ROUTE_FULL
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize(
+    "body",
+    ["Yes but can we do the 21st instead?", "ok, is parking included?", "Yes, 14.05.2027", "Can I speak to a manager?"],
+)
+def test_risky_messages_keep_full_detection(body):
+    assert _decide(body, STEP2).route == ROUTE_FULL
+
+
+def _decide_repeat(event_entry):
+    body = "Please send me the updated offer with the new catering."
+    combined = f"Re: Booking\n{body}"
+    # Duplicate flag as set without event context; the router applies the exemptions itself
+    repeated = pre_filter(combined, last_message=combined)
+    assert repeated.is_duplicate
+    return decide_detection_route(combined, repeated, event_entry, reply_text=body, provider="openai")
+
+
+@pytest.mark.v4
+def test_duplicate_skips_outside_detours_and_billing():
+    decision = _decide_repeat(STEP5)
+    assert (decision.route, decision.reason) == (ROUTE_SKIP, "duplicate")
+
+
+@pytest.mark.v4
+def test_duplicate_during_detour_runs_detection():
+    decision = _decide_repeat(dict(STEP5, current_step=3, caller_step=5))
+    assert decision.reason != "duplicate"
+    assert decision.route != ROUTE_SKIP
+
+
+@pytest.mark.v4
+def test_duplicate_during_billing_flow_runs_detection():
+    decision = _decide_repeat(BILLING)
+    assert decision.reason != "duplicate"
+    assert decision.route != ROUTE_SKIP
+
+
+@pytest.mark.v4
+def test_cheap_route_requires_configured_model(monkeypatch):
+    address = "Acme AG, Bahnhofstrasse 1, 8001 Zürich"
+    fallback = _decide(address, BILLING)
+    assert fallback.route == ROUTE_FULL
+    assert fallback.reason == "billing_reply:cheap_unavailable"
+
+    monkeypatch.setenv("OPENAI_DETECTION_CHEAP_MODEL", "small-model")
+    decision = _decide(address, BILLING)
+    assert (decision.route, decision.model) == (ROUTE_CHEAP, "small-model")
+    assert _decide(address, BILLING, provider="stub").route == ROUTE_FULL
+
+
+@pytest.mark.v4
+def test_shadow_mode_runs_llm_and_records_agreement(monkeypatch):
+    calls = []
+
+    def run(model):
+        calls.append(model)
+        return UnifiedDetectionResult(intent="confirm_date", is_confirmation=True)
+
+    body = "Sounds good"
+    pre_result = pre_filter(body, event_entry=STEP2)
+    result, decision = route_unified_detection(body, pre_result, STEP2, run)
+    assert calls == [] and decision.applied
+    assert result.intent == "confirm_date" and result.is_confirmation
+
+    monkeypatch.setenv("DETECTION_ROUTER", "shadow")
+    _, shadow = route_unified_detection(body, pre_result, STEP2, run)
+    assert calls == [None]
+    assert shadow.route == ROUTE_SKIP and not shadow.applied and shadow.shadow_agreement is True
+
+    stats = detection_route_stats()
+    assert stats["llm_calls_avoided"] == 1
+    assert stats["shadow_agree"] == 1
+
+
+@pytest.mark.v4
+def test_pre_route_uses_router(monkeypatch):
+    from workflows.runtime import pre_route
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("unified detection LLM must be skipped")
+
+    monkeypatch.setattr(pre_route, "run_unified_detection", fail)
+    state = SimpleNamespace(
+        event_entry=dict(STEP2),
+        extras={},
+        message=SimpleNamespace(subject="Re: Dates", body="Yes please"),
+    )
+    _, unified = pre_route.run_unified_pre_filter(state, "Re: Dates\nYes please")
+    assert unified.intent == "confirm_date"
+    assert state.extras["detection_route"]["route"] == ROUTE_SKIP
+    assert state.extras["unified_detection"]["signals"]["confirmation"] is True
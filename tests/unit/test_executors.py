@@ -0,0 +1,103 @@
+"""
+Test: shared executor service with named pools
+
+- Repeated run_io_tasks() calls reuse the same long-lived io pool threads.
+- Thread-pool tasks see the submitter's tenant, thread id and span.
+- Process-pool tasks get the registered portable context values.
+- Queue depth, active tasks and utilization are reported per pool.
+- Shutdown stops the pools; the next submission starts a fresh one.
+"""
+
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from utils.async_tools import run_io_tasks
+from utils.executors import (
+    POOL_CPU,
+    POOL_IO,
+    ExecutorService,
+    PoolSpec,
+    current_span,
+    current_thread_id,
+    get_executor_service,
+    register_portable_context,
+    span,
+    thread_scope,
+)
+
+# Stand-in for api.middleware.tenant_context.CURRENT_TEAM_ID (registered the same way)
+CURRENT_TEAM_ID = ContextVar("TEST_TEAM_ID", default=None)
+register_portable_context(CURRENT_TEAM_ID)
+
+
+def _portable_probe():
+    return CURRENT_TEAM_ID.get(), current_thread_id(), current_span()
+
+
+@pytest.mark.v4
+def test_io_pool_is_reused_across_calls():
+    names = set()
+    for _ in range(5):
+        names.update(run_io_tasks([lambda: threading.current_thread().name] * 4, max_workers=4))
+    pool = get_executor_service().pool(POOL_IO)
+    assert all(name.startswith("oe-io") for name in names)
+    assert len(names) <= pool.size
+
+
+@pytest.mark.v4
+def test_thread_tasks_see_submitter_context():
+    service = ExecutorService()
+    token = CURRENT_TEAM_ID.set("team-7")
+    try:
+        with thread_scope("thread-42"), span("turn"), span("step3"):
+            results = service.run_tasks(POOL_IO, [_portable_probe, _portable_probe])
+    finally:
+        CURRENT_TEAM_ID.reset(token)
+        service.shutdown()
+    assert results == [("team-7", "thread-42", "turn/step3")] * 2
+    assert current_thread_id() is None and current_span() == ""
+
+
+@pytest.mark.v4
+def test_process_tasks_get_portable_context():
+    service = ExecutorService({POOL_CPU: PoolSpec(POOL_CPU, "process", (), 1)})
+    token = CURRENT_TEAM_ID.set("team-7")
+    try:
+        with thread_scope("thread-42"), span("batch"):
+            result = service.submit(POOL_CPU, _portable_probe).result(timeout=60)
+    finally:
+        CURRENT_TEAM_ID.reset(token)
+        service.shutdown()
+    assert result == ("team-7", "thread-42", "batch")
+    assert service.stats()[POOL_CPU]["started"] is False
+
+
+@pytest.mark.v4
+def test_queue_depth_and_utilization():
+    service = ExecutorService({"slow": PoolSpec("slow", "thread", (), 1)})
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    futures = [service.submit("slow", blocker)]
+    assert started.wait(5)
+    futures += [service.submit("slow", blocker) for _ in range(2)]
+    busy = service.stats()["slow"]
+    assert (busy["active"], busy["queue_depth"], busy["max_queue_depth"]) == (1, 2, 2)
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    done = service.stats()["slow"]
+    assert (done["submitted"], done["completed"], done["queue_depth"], done["active"]) == (3, 3, 0, 0)
+    assert 0 < done["utilization"] <= 1
+
+    service.shutdown()
+    assert service.submit("slow", lambda: 1).result(timeout=5) == 1
+    assert service.stats()["slow"]["submitted"] == 1
+    service.shutdown()
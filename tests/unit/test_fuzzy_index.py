@@ -0,0 +1,53 @@
+"""
+Test: trigram fuzzy-match index (workflows.common.fuzzy_index)
+
+- Exact search returns the same ratios as a full SequenceMatcher sweep.
+- Trigram candidate search is bounded and ranks by shared trigrams.
+- Preference scoring still finds features, products and alternatives.
+"""
+
+from difflib import SequenceMatcher
+
+import pytest
+
+from workflows.common.fuzzy_index import CONTAINMENT_RATIO, FuzzyIndex, bounded_ratio
+from workflows.nlu.preferences import _score_rooms_by_products
+
+PHRASES = ["projector", "flipchart", "sound system", "coffee break", "latte art", "beamer", "wifi"]
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize("needle", ["projecter", "flip chart", "sound sytem", "cofee", "art", "wify"])
+def test_exact_search_matches_full_sweep(needle):
+    index = FuzzyIndex(PHRASES)
+    expected = {}
+    for phrase in PHRASES:
+        if len(needle) >= 5 and len(phrase) >= 5 and (needle in phrase or phrase in needle):
+            ratio = CONTAINMENT_RATIO
+        else:
+            ratio = SequenceMatcher(a=needle, b=phrase).ratio()
+        if ratio >= 0.5:
+            expected[phrase] = ratio
+    assert index.scores(needle, 0.5) == expected
+
+
+@pytest.mark.v4
+def test_candidate_search_is_bounded():
+    index = FuzzyIndex(PHRASES)
+    assert index.candidates("projecter", limit=1) == ["projector"]
+    assert [phrase for phrase, _ in index.search("projecter", 0.5, max_candidates=2)] == ["projector"]
+
+
+@pytest.mark.v4
+def test_bounded_ratio_prunes_below_floor():
+    assert bounded_ratio("projector", "wifi", 0.5) == 0.0
+    assert bounded_ratio("projector", "projecter") == SequenceMatcher(a="projector", b="projecter").ratio()
+
+
+@pytest.mark.v4
+def test_preference_scoring_uses_features_and_products():
+    recommendations = _score_rooms_by_products(["projector", "flip chart"])
+    assert recommendations
+    top = recommendations[0]
+    assert top["missing"] == []
+    assert {entry["wish"] for entry in top["matches_detail"]} == {"projector", "flip chart"}
@@ -0,0 +1,133 @@
+"""
+Test: hash-guarded result cache (workflows.common.guarded_results)
+
+- Stored results are served while requirements and bookings are unchanged.
+- A booking change on a guarded date invalidates the entry; other dates do not.
+- Lookups never modify the event, stale or not; the next store replaces it.
+- The catalog version is computed once per process.
+- Step 3 ranking round-trips RankedRoom entries through the stored payload
+  and is recomputed after a room catalog change.
+"""
+
+import copy
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from workflows.common.guarded_results import (
+    STEP3_RANKING,
+    catalog_version,
+    guard_key,
+    inventory_version,
+    load_guarded,
+    store_guarded,
+)
+from workflows.common.sorting import RankedRoom
+from workflows.steps.step3_room_availability.trigger.room_ranking import guarded_room_ranking
+
+
+def _db():
+    return {
+        "events": [
+            {"event_id": "own", "status": "Lead", "locked_room_id": "Room A",
+             "event_data": {"Event Date": "01.05.2027"}},
+            {"event_id": "e1", "status": "Option", "locked_room_id": "Room B",
+             "event_data": {"Event Date": "01.05.2027"}},
+            {"event_id": "e2", "status": "Confirmed", "locked_room_id": "Room C",
+             "event_data": {"Event Date": "09.05.2027"}},
+        ]
+    }
+
+
+@pytest.mark.v4
+def test_entry_served_until_booking_on_guarded_date_changes():
+    db = _db()
+    event = db["events"][0]
+    key = guard_key("req-1", {"x": 1})
+    store_guarded(event, STEP3_RANKING, key, {"rooms": ["Room A"]}, db=db, dates=["2027-05-01"])
+
+    assert load_guarded(event, STEP3_RANKING, key, db) == {"rooms": ["Room A"]}
+    assert load_guarded(event, STEP3_RANKING, guard_key("req-2", {"x": 1}), db) is None
+
+    event["status"] = "Option"  # own status changes do not invalidate
+    db["events"][2]["status"] = "Cancelled"  # other date
+    assert load_guarded(event, STEP3_RANKING, key, db) is not None
+
+    db["events"][1]["status"] = "Cancelled"
+    before = copy.deepcopy(event["guarded_results"])
+    assert load_guarded(event, STEP3_RANKING, key, db) is None
+    assert load_guarded(event, STEP3_RANKING, key, db, version="other") is None
+    assert event["guarded_results"] == before
+
+    store_guarded(event, STEP3_RANKING, key, {"rooms": ["Room B"]}, db=db, dates=["2027-05-01"])
+    assert load_guarded(event, STEP3_RANKING, key, db) == {"rooms": ["Room B"]}
+
+
+@pytest.mark.v4
+def test_inventory_version_reacts_to_new_bookings():
+    db = _db()
+    before = inventory_version(db, ["2027-05-01"])
+    db["events"].append({"event_id": "e3", "status": "Lead", "locked_room_id": "Room D",
+                         "event_data": {"Event Date": "01.05.2027"}})
+    assert inventory_version(db, ["01.05.2027"]) != before
+
+
+@pytest.mark.v4
+def test_slot_keeps_most_recent_entries(monkeypatch):
+    monkeypatch.setenv("OE_GUARD_CACHE_SIZE", "2")
+    db = _db()
+    event = db["events"][0]
+    for index in range(3):
+        store_guarded(event, STEP3_RANKING, f"k{index}", index, db=db, dates=["2027-05-01"])
+    assert list(event["guarded_results"][STEP3_RANKING]) == ["k1", "k2"]
+
+
+@pytest.mark.v4
+def test_catalog_version_is_computed_once(monkeypatch):
+    catalog_version.cache_clear()
+    calls = []
+    real_stat = Path.stat
+
+    def counting_stat(self, *args, **kwargs):
+        calls.append(self.name)
+        return real_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", counting_stat)
+    try:
+        assert catalog_version() == catalog_version()
+        assert sorted(calls) == ["products.json", "rooms.json"]
+    finally:
+        catalog_version.cache_clear()
+
+
+@pytest.mark.v4
+def test_room_ranking_round_trips_through_cache(monkeypatch):
+    state = SimpleNamespace(db=_db(), turn_notes={})
+    event = state.db["events"][0]
+    kwargs = dict(
+        requirements_hash="req-1",
+        status_map={"Room A": "Available", "Room B": "Option"},
+        chosen_date="01.05.2027",
+        participants=20,
+        preferred_room=None,
+        preferences={},
+        catering_tokens=[],
+        product_tokens=[],
+        range_detected=False,
+        vague_month=None,
+        vague_weekday=None,
+    )
+    fresh, fresh_cached = guarded_room_ranking(state, event, **kwargs)
+    again, again_cached = guarded_room_ranking(state, event, **kwargs)
+
+    assert (fresh_cached, again_cached) == (False, True)
+    assert all(isinstance(entry, RankedRoom) for entry in again["ranked_rooms"])
+    assert again["ranked_rooms"] == fresh["ranked_rooms"]
+    assert again["available_dates_map"] == fresh["available_dates_map"]
+    assert again["profile_entries"] == fresh["profile_entries"]
+
+    monkeypatch.setattr(
+        "workflows.steps.step3_room_availability.trigger.room_ranking.catalog_version", lambda *args: "edited"
+    )
+    assert guarded_room_ranking(state, event, **kwargs)[1] is False
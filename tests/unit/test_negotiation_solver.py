@@ -0,0 +1,137 @@
+"""
+Test: step 5 what-if solver for budget counter-offers
+
+- Budgets are parsed from common phrasings; headcounts are not budgets.
+- Alternatives within budget come first, closest to the budget, and are
+  priced exactly like the offer would be; no half-day rate variants.
+- Room swaps only use rooms with enough capacity that are free on the date.
+- The event itself is never modified; an offer already within budget yields none.
+- A reply naming one of the options is parsed; applying it re-prices the
+  event at the option's total.
+"""
+
+import copy
+
+import pytest
+
+from workflows.common.pricing_engine import price_event
+from workflows.steps.step5_negotiation.trigger.whatif_solver import (
+    apply_alternative,
+    format_alternatives,
+    parse_budget,
+    parse_option_choice,
+    room_still_free,
+    solve_alternatives,
+)
+
+
+def _event():
+    return {
+        "event_id": "evt-1",
+        "locked_room_id": "Room B",
+        "chosen_date": "12.06.2027",
+        "status": "Option",
+        "event_data": {"Event Date": "12.06.2027"},
+        "requirements": {"number_of_participants": 30},
+        "pricing_inputs": {},
+        "products": [
+            {"name": "Premium Lunch Package", "quantity": 30, "unit_price": 42.0, "unit": "per_person"},
+            {"name": "Projector", "quantity": 1, "unit_price": 75.0, "unit": "per_event"},
+            {"name": "Flipchart", "quantity": 2, "unit_price": 15.0, "unit": "per_unit"},
+        ],
+    }
+
+
+def _db(event):
+    booked = {"event_id": "evt-2", "locked_room_id": "Room A", "chosen_date": "12.06.2027", "status": "Confirmed",
+              "event_data": {"Event Date": "12.06.2027"}}
+    return {"events": [event, booked]}
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("Our budget is CHF 2,500.", 2500.0),
+        ("We can't go above 3'000 CHF.", 3000.0),
+        ("Max 1800.50 please", 1800.5),
+        ("We have a 2500 CHF budget", 2500.0),
+        ("Our budget for 30 people is 2000 CHF", 2000.0),
+        ("Can you lower the price?", None),
+    ],
+)
+def test_parse_budget(text, expected):
+    assert parse_budget(text) == expected
+
+
+@pytest.mark.v4
+def test_alternatives_ranked_by_closeness_to_budget():
+    event = _event()
+    snapshot = copy.deepcopy(event)
+    assert price_event(event).total == 2115.0
+
+    options = solve_alternatives(event, _db(event), budget=1900, limit=3)
+    assert [option.total for option in options] == [1860.0, 1695.0, 855.0]
+    assert all(option.within_budget for option in options)
+    assert options[0].label == "Switch to Room F; Remove Projector; Remove Flipchart (not available in Room F)"
+    assert options[1].label == "Lunch Package instead of Premium Lunch Package"
+    assert options[1].saving == 420.0
+    # Half-day rates would need a shorter booking, so they are never offered
+    assert not any("Half-day" in option.label for option in options)
+    assert event == snapshot
+
+    text = format_alternatives(1900, 2115.0, options)
+    assert "2. Lunch Package instead of Premium Lunch Package — CHF 1,695.00 (saves CHF 420.00)" in text
+
+
+@pytest.mark.v4
+def test_room_swaps_respect_capacity_and_availability():
+    event = _event()
+    options = solve_alternatives(event, _db(event), budget=2000, limit=10)
+    rooms = {option.room for option in options}
+    # Room A is booked that day, Room D seats 26; Room F is free and cheaper
+    assert "Room A" not in rooms and "Room D" not in rooms
+    swap = next(option for option in options if option.room == "Room F")
+    # Flipcharts are not offered in Room F
+    assert "Remove Flipchart (not available in Room F)" in swap.changes
+
+
+@pytest.mark.v4
+def test_offer_within_budget_has_no_alternatives():
+    event = _event()
+    assert solve_alternatives(event, _db(event), budget=2500) == []
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("Option 2 please", 2),
+        ("2", 2),
+        ("We'll take the second one.", 2),
+        ("#3 works for us", 3),
+        ("Our budget is 3000", None),
+        ("Option 7", None),
+        ("2 rooms please", None),
+    ],
+)
+def test_parse_option_choice(text, expected):
+    assert parse_option_choice(text, 3) == expected
+
+
+@pytest.mark.v4
+def test_applied_alternative_prices_at_its_total():
+    event = _event()
+    db = _db(event)
+    options = [option.to_dict() for option in solve_alternatives(event, db, budget=1900, limit=3)]
+
+    for option in options:
+        chosen = copy.deepcopy(event)
+        apply_alternative(chosen, option)
+        assert price_event(chosen).total == option["total"]
+
+    substituted = copy.deepcopy(event)
+    apply_alternative(substituted, options[1])
+    names = [product["name"] for product in substituted["products"]]
+    assert "Premium Lunch Package" not in names and "Lunch Package" in names
+    assert room_still_free(event, db, "Room F") and not room_still_free(event, db, "Room A")
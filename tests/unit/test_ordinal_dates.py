@@ -0,0 +1,107 @@
+"""
+Test: canonical day-ordinal date layer (workflows.common.ordinal_dates)
+
+- DD.MM.YYYY, ISO dates and ISO timestamps map to the same integer day.
+- RoomDayIndex derives Available/Option/Confirmed per room and day.
+- Availability and conflict fallbacks match across both stored formats.
+- A booking's day is its event_data["Event Date"]; chosen_date alone does
+  not hold a room, with or without a prebuilt index.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from detection.special.room_conflict import get_available_rooms_on_date
+from workflows.common.ordinal_dates import (
+    DayWindow,
+    RoomDayIndex,
+    day_ordinal,
+    minute_of_day,
+    ordinal_to_ddmmyyyy,
+    ordinal_to_iso,
+)
+from workflows.steps.step3_room_availability.condition.room_status_checker import room_status_on_date
+
+
+def _db():
+    return {
+        "rooms": {"Room A": {}, "Room B": {}},
+        "events": [
+            {"event_id": "e1", "status": "Option", "chosen_date": "2027-03-14",
+             "locked_room_id": "Room A", "event_data": {"Event Date": "14.03.2027"}},
+            {"event_id": "e2", "status": "Confirmed", "chosen_date": "2027-03-15",
+             "event_data": {"Event Date": "15.03.2027", "Preferred Room": "room b"}},
+            {"event_id": "e3", "status": "Cancelled", "chosen_date": "2027-03-14",
+             "locked_room_id": "Room B", "event_data": {"Event Date": "14.03.2027"}},
+        ],
+    }
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize(
+    "value",
+    ["14.03.2027", "2027-03-14", "2027-03-14T18:00:00+01:00", date(2027, 3, 14), datetime(2027, 3, 14, 9)],
+)
+def test_day_ordinal_accepts_every_stored_format(value):
+    assert day_ordinal(value) == date(2027, 3, 14).toordinal()
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize("value", [None, "", "Not specified", "31.02.2027", "2027/03/14"])
+def test_day_ordinal_rejects_invalid(value):
+    assert day_ordinal(value) is None
+
+
+@pytest.mark.v4
+def test_formatting_round_trip_and_minutes():
+    day = day_ordinal("2027-03-04")
+    assert ordinal_to_iso(day) == "2027-03-04"
+    assert ordinal_to_ddmmyyyy(day) == "04.03.2027"
+    assert minute_of_day("18:30") == 18 * 60 + 30
+    assert minute_of_day("9.15") == 9 * 60 + 15
+    assert minute_of_day("Not specified") is None
+
+
+@pytest.mark.v4
+def test_day_window_overlap():
+    evening = DayWindow.build("14.03.2027", "18:00", "22:00")
+    morning = DayWindow.build("2027-03-14", "08:00", "12:00")
+    all_day = DayWindow.build("2027-03-14")
+    assert not evening.overlaps(morning)
+    assert all_day.overlaps(evening) and all_day.overlaps(morning)
+    assert sorted([evening, morning], key=DayWindow.sort_key) == [morning, evening]
+
+
+@pytest.mark.v4
+def test_room_day_index_statuses():
+    index = RoomDayIndex.from_db(_db())
+    day14, day15 = day_ordinal("2027-03-14"), day_ordinal("2027-03-15")
+    assert index.status_on("room a", day14) == "Option"
+    assert index.status_on("Room A", day14, exclude_event_id="e1") == "Available"
+    assert index.status_on("Room B", day14) == "Available"
+    assert index.status_on("Room B", day15) == "Confirmed"
+    assert index.status_on("Room B", None) == "Unavailable"
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize("requested", ["14.03.2027", "2027-03-14"])
+def test_room_status_on_date_accepts_iso_and_ddmmyyyy(requested):
+    assert room_status_on_date(_db(), requested, "Room A") == "Option"
+
+
+@pytest.mark.v4
+def test_conflict_fallback_compares_days_across_formats():
+    # Stored chosen_date is ISO; the caller asks with DD.MM.YYYY
+    assert get_available_rooms_on_date(_db(), "e9", "14.03.2027") == ["Room B"]
+
+
+@pytest.mark.v4
+def test_booking_day_is_event_date_only():
+    db = {"events": [{"event_id": "e4", "status": "Confirmed", "chosen_date": "2027-03-16",
+                      "locked_room_id": "Room A", "event_data": {}}]}
+    assert room_status_on_date(db, "16.03.2027", "Room A") == "Available"
+    assert room_status_on_date(db, "16.03.2027", "Room A", index=RoomDayIndex.from_db(db)) == "Available"
+    db["events"][0]["event_data"]["Event Date"] = "16.03.2027"
+    assert room_status_on_date(db, "2027-03-16", "Room A") == "Confirmed"
+    assert room_status_on_date(db, "2027-03-16", "Room A", index=RoomDayIndex.from_db(db)) == "Confirmed"
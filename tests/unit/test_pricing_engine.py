@@ -0,0 +1,93 @@
+"""
+Test: offer pricing engine (compiled price table + memoized quotes)
+
+- Totals and line items match the previous product-by-product computation.
+- Quotes are memoized by the pricing-inputs fingerprint.
+- what_if reprices a counter-offer (discount, participants, dropped lines)
+  without touching the event.
+"""
+
+import copy
+
+import pytest
+
+from workflows.common.pricing import derive_room_rate, normalise_rate
+from workflows.common.pricing_engine import (
+    compile_price_table,
+    price,
+    price_event,
+    pricing_engine_stats,
+    reset_pricing_engine,
+    what_if,
+)
+from workflows.common.product_utils import menu_name_set, normalise_product_fields
+from workflows.steps.step4_offer.trigger.compose import _determine_offer_total
+
+DEPOSIT = {"deposit_enabled": True, "deposit_type": "percentage", "deposit_percentage": 30}
+
+
+def _event():
+    return {
+        "event_id": "evt-1",
+        "locked_room_id": "Room A",
+        "requirements": {"number_of_participants": 20},
+        "pricing_inputs": {},
+        "products": [
+            {"name": "Coffee break", "quantity": 20, "unit_price": 7.5, "unit": "per_person"},
+            {"name": "Projector", "quantity": "2", "unit_price": "45.10"},
+            {"name": "Flipchart", "quantity": None, "unit_price": 12.35},
+        ],
+    }
+
+
+def _legacy_total(event_entry):
+    total = 0.0
+    base_rate = normalise_rate((event_entry.get("pricing_inputs") or {}).get("base_rate"))
+    if base_rate is None:
+        base_rate = derive_room_rate(event_entry)
+    if base_rate is not None:
+        total += base_rate
+    for product in event_entry.get("products", []):
+        row = normalise_product_fields(product, menu_names=menu_name_set())
+        total += float(row["quantity"]) * float(row["unit_price"])
+    return round(total, 2)
+
+
+@pytest.mark.v4
+def test_totals_match_previous_computation():
+    event = _event()
+    quote = price_event(event)
+    assert quote.total == _legacy_total(event)
+    assert _determine_offer_total(event, 0.0) == _legacy_total(event)
+    assert [item["amount"] for item in quote.line_items()] == [150.0, 90.2, 12.35]
+    assert quote.vat_included == round(quote.total * 0.081 / 1.081, 2)
+
+
+@pytest.mark.v4
+def test_quotes_are_memoized_by_inputs():
+    reset_pricing_engine()
+    event = _event()
+    price_event(event)
+    price_event(copy.deepcopy(event))
+    event["products"][1]["quantity"] = 3
+    price_event(event)
+    stats = pricing_engine_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+@pytest.mark.v4
+def test_what_if_counter_offer():
+    event = _event()
+    snapshot = copy.deepcopy(event)
+    table = compile_price_table(event, deposit_config=DEPOSIT)
+    base = price(table)
+
+    discounted = what_if(table, discount_pct=10)
+    assert discounted.total == round(base.total - round(base.total * 0.1, 2), 2)
+    assert discounted.deposit_amount == round(discounted.total * 0.3, 2)
+
+    smaller = what_if(table, participants=10, drop=["flipchart"])
+    assert smaller.names == ("Coffee break", "Projector")
+    assert smaller.quantities[0] == 10.0
+    assert smaller.total == round(base.base_rate + 75.0 + 90.2, 2)
+    assert event == snapshot
@@ -0,0 +1,77 @@
+"""
+Test: stable-prefix prompt layout and prefix-cache telemetry (llm.prompt_cache)
+
+- Prompt builders keep per-turn data out of the static prefix (same hash for different turns).
+- The stub provider path reports prefix reuse through the local prefix cache.
+- Provider usage numbers override the local estimate.
+"""
+
+import pytest
+
+from detection.unified import build_unified_detection_prompt, run_unified_detection
+from llm.prompt_cache import (
+    prompt_cache_stats,
+    prompt_call,
+    report_openai_usage,
+    reset_prompt_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_prompt_cache_stats()
+    yield
+    reset_prompt_cache_stats()
+
+
+@pytest.mark.v4
+def test_builders_keep_turn_data_out_of_prefix():
+    first = build_unified_detection_prompt("Can we book Room A on 14.05.2027?", current_step=2)
+    second = build_unified_detection_prompt("Yes please", current_step=5, room_locked=True)
+    assert first.prefix_hash == second.prefix_hash
+    assert "Room A" not in first.prefix and "Room A" in first.suffix
+    assert first.text.startswith(first.prefix)
+
+    from llm.verbalizer_agent import _build_prompt_payload
+
+    one = _build_prompt_payload([], "OFFER:\n- a", [("OFFER:", ["- a"])], "a@example.com")
+    two = _build_prompt_payload([], "NEXT STEP:\n- b", [("NEXT STEP:", ["- b"])], "b@example.com")
+    assert one["system"] == two["system"]
+    assert one["prefix_hash"] == two["prefix_hash"]
+    assert "OFFER:" in one["user"]
+
+    from adapters.agent_adapter import GeminiAgentAdapter, OpenAIAgentAdapter
+
+    for adapter_cls in (OpenAIAgentAdapter, GeminiAgentAdapter):
+        assert "{today}" not in adapter_cls._ENTITY_PROMPT and "Today is" not in adapter_cls._ENTITY_PROMPT
+
+
+@pytest.mark.v4
+def test_stub_provider_reports_prefix_reuse(monkeypatch):
+    monkeypatch.setattr("llm.provider_config.get_intent_provider", lambda: "stub")
+    run_unified_detection("Do you have parking?", current_step=2)
+    run_unified_detection("We would like Room B instead.", current_step=3)
+
+    stats = prompt_cache_stats()["unified_detection"]
+    assert stats["calls"] == 2
+    assert stats["prefix_reuse"] == 1
+    assert len(stats["prefix_hashes"]) == 1
+    assert 0.3 < stats["cached_ratio"] < 1.0
+    assert stats["sources"] == {"local": 2}
+
+
+@pytest.mark.v4
+def test_provider_usage_overrides_estimate():
+    class Details:
+        cached_tokens = 1024
+
+    class Usage:
+        prompt_tokens = 2000
+        prompt_tokens_details = Details()
+
+    with prompt_call("entity_extraction", "static rules"):
+        report_openai_usage(Usage())
+    stats = prompt_cache_stats()["entity_extraction"]
+    assert (stats["prompt_tokens"], stats["cached_tokens"]) == (2000, 1024)
+    assert stats["cached_ratio"] == 0.512
+    assert stats["sources"] == {"openai": 1}
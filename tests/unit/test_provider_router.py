@@ -0,0 +1,119 @@
+"""
+Test: latency-aware provider routing with hedged requests (llm.provider_router)
+
+- A primary slower than its p95 is hedged; the faster secondary wins.
+- Errors and invalid results fail over to the next provider immediately.
+- A primary with a high error rate is demoted behind a healthier provider.
+- All providers failing raises ProvidersExhausted; the decisions show up in the metrics.
+- With the router disabled only the primary is called.
+"""
+
+import time
+
+import pytest
+
+from llm.provider_router import (
+    ProvidersExhausted,
+    get_provider_router,
+    provider_router_metrics,
+    reset_provider_router,
+    route_provider_call,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    for name in ("OE_PROVIDER_ROUTER", "OE_ROUTER_HEDGE_AFTER_S", "OE_ROUTER_PROBE_EVERY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("OE_ROUTER_MIN_SAMPLES", "5")
+    monkeypatch.setenv("OE_ROUTER_HEDGE_FLOOR_S", "0.01")
+    reset_provider_router()
+    yield
+    reset_provider_router()
+
+
+def _providers(**behaviour):
+    """Stub providers: name -> (delay_s, result or exception)."""
+    calls = []
+
+    def run(provider):
+        calls.append(provider)
+        delay, outcome = behaviour[provider]
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return run, calls
+
+
+def _warm(run, provider, n=5):
+    for _ in range(n):
+        route_provider_call("detect", run, primary=provider, hedge=False)
+
+
+@pytest.mark.v4
+def test_slow_primary_is_hedged_and_secondary_wins():
+    run, calls = _providers(gemini=(0.02, "primary"), openai=(0.02, "secondary"))
+    _warm(run, "gemini")
+
+    slow, _ = _providers(gemini=(0.5, "primary"), openai=(0.02, "secondary"))
+    started = time.perf_counter()
+    provider, result = route_provider_call("detect", slow, primary="gemini", fallbacks=["openai"])
+    assert (provider, result) == ("openai", "secondary")
+    assert time.perf_counter() - started < 0.4
+
+    counters = provider_router_metrics()["counters"]
+    assert counters["detect.hedged"] == 1
+    assert counters["detect.won_by_secondary"] == 1
+    assert counters["detect.abandoned.gemini"] == 1
+
+
+@pytest.mark.v4
+def test_fast_primary_is_not_hedged():
+    run, calls = _providers(gemini=(0.0, "primary"), openai=(0.0, "secondary"))
+    assert route_provider_call("detect", run, primary="gemini", fallbacks=["openai"]) == ("gemini", "primary")
+    assert calls == ["gemini"]
+    assert "detect.hedged" not in provider_router_metrics()["counters"]
+
+
+@pytest.mark.v4
+def test_errors_and_invalid_results_fail_over():
+    run, calls = _providers(gemini=(0.0, RuntimeError("quota")), openai=(0.0, "{}"))
+    assert route_provider_call("detect", run, primary="gemini", fallbacks=["openai"]) == ("openai", "{}")
+
+    run, calls = _providers(gemini=(0.0, "not json"), openai=(0.0, "{}"))
+    provider, _ = route_provider_call(
+        "detect", run, primary="gemini", fallbacks=["openai"], validate=lambda text: text.startswith("{")
+    )
+    assert provider == "openai" and calls == ["gemini", "openai"]
+    assert provider_router_metrics()["counters"]["detect.failover"] == 2
+
+    run, _ = _providers(gemini=(0.0, RuntimeError("down")), openai=(0.0, RuntimeError("down")))
+    with pytest.raises(ProvidersExhausted) as excinfo:
+        route_provider_call("detect", run, primary="gemini", fallbacks=["openai"])
+    assert set(excinfo.value.errors) == {"gemini", "openai"}
+
+
+@pytest.mark.v4
+def test_unhealthy_primary_is_demoted():
+    run, calls = _providers(gemini=(0.0, RuntimeError("500")), openai=(0.0, "ok"))
+    for _ in range(5):
+        route_provider_call("detect", run, primary="gemini", fallbacks=["openai"])
+    calls.clear()
+
+    assert route_provider_call("detect", run, primary="gemini", fallbacks=["openai"]) == ("openai", "ok")
+    assert calls == ["openai"]
+    metrics = provider_router_metrics()
+    assert metrics["counters"]["detect.demoted.gemini"] == 1
+    assert metrics["providers"]["gemini/detect"]["error_rate"] == 1.0
+    assert get_provider_router().hedge_delay("openai", "detect") >= 0.01
+
+
+@pytest.mark.v4
+def test_disabled_router_calls_only_primary(monkeypatch):
+    monkeypatch.setenv("OE_PROVIDER_ROUTER", "0")
+    run, calls = _providers(gemini=(0.0, RuntimeError("down")), openai=(0.0, "ok"))
+    with pytest.raises(RuntimeError):
+        route_provider_call("detect", run, primary="gemini", fallbacks=["openai"])
+    assert calls == ["gemini"]
@@ -0,0 +1,132 @@
+"""
+Test: durable session store behind active_conversations
+
+- Each backend (memory, SQLite, Redis stand-in) round-trips a ConversationState.
+- Large histories are stored compressed and still decode to the same state.
+- The background sweeper removes expired sessions without any access.
+- A second store over the same SQLite file sees sessions (restart / other worker).
+- Reads within the cache window are served without a backend read.
+- Shared backends (SQLite, Redis) read through by default, so a write by
+  another worker is seen on the next read.
+"""
+
+import time
+
+import pytest
+
+from domain import ConversationState, EventInformation
+from legacy.session_backends import (
+    LocalRedis,
+    MemorySessionBackend,
+    RedisSessionBackend,
+    SQLiteSessionBackend,
+    SessionStore,
+    decode_state,
+    encode_state,
+)
+
+
+def _state(session_id="s-1", turns=1):
+    history = []
+    for n in range(turns):
+        history.append({"role": "user", "content": f"We are 25 people, message {n}"})
+        history.append({"role": "assistant", "content": f"Noted, reply {n}"})
+    return ConversationState(
+        session_id=session_id,
+        event_info=EventInformation(date_email_received="14.05.2027", email="client@example.com"),
+        conversation_history=history,
+        event_id="evt-1",
+    )
+
+
+def _backends(tmp_path):
+    return [
+        MemorySessionBackend(),
+        SQLiteSessionBackend(tmp_path / "sessions.sqlite3"),
+        RedisSessionBackend(LocalRedis()),
+    ]
+
+
+@pytest.mark.v4
+def test_backends_round_trip(tmp_path):
+    for backend in _backends(tmp_path):
+        store = SessionStore(backend, ttl_s=60, cache_ttl_s=0, sweep_interval_s=0)
+        state = _state()
+        store["s-1"] = state
+        assert "s-1" in store and "other" not in store
+        assert store["s-1"].model_dump() == state.model_dump(), backend.name
+        assert len(store) == 1
+        del store["s-1"]
+        assert "s-1" not in store and len(store) == 0
+
+
+@pytest.mark.v4
+def test_large_state_is_compressed():
+    state = _state(turns=200)
+    blob = encode_state(state)
+    assert blob[:1] == b"z"
+    assert len(blob) < len(state.model_dump_json()) / 4
+    assert decode_state(blob).model_dump() == state.model_dump()
+
+
+@pytest.mark.v4
+def test_sweeper_expires_without_access(tmp_path):
+    backend = SQLiteSessionBackend(tmp_path / "sessions.sqlite3")
+    store = SessionStore(backend, ttl_s=0.2, cache_ttl_s=0, sweep_interval_s=0.1)
+    try:
+        store["s-1"] = _state()
+        deadline = time.monotonic() + 3.0
+        while store.stats_counters["swept"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert store.stats_counters["swept"] == 1
+        rows = backend._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        assert rows == 0
+    finally:
+        store.shutdown()
+
+
+@pytest.mark.v4
+def test_sqlite_sessions_survive_new_store(tmp_path):
+    path = tmp_path / "sessions.sqlite3"
+    first = SessionStore(SQLiteSessionBackend(path), ttl_s=60, sweep_interval_s=0)
+    state = _state()
+    first["s-1"] = state
+    state.conversation_history.append({"role": "user", "content": "Add a projector"})
+    first["s-1"] = state
+
+    second = SessionStore(SQLiteSessionBackend(path), ttl_s=60, sweep_interval_s=0)
+    assert second["s-1"].conversation_history[-1]["content"] == "Add a projector"
+
+
+@pytest.mark.v4
+def test_read_through_cache_skips_backend():
+    class CountingBackend(MemorySessionBackend):
+        loads = 0
+
+        def load(self, key):
+            CountingBackend.loads += 1
+            return super().load(key)
+
+    store = SessionStore(CountingBackend(), ttl_s=60, cache_ttl_s=30, sweep_interval_s=0)
+    store["s-1"] = _state()
+    assert "s-1" in store
+    assert store["s-1"] is store["s-1"]
+    assert CountingBackend.loads == 0
+    assert store.stats()["hits"] == 3
+
+
+@pytest.mark.v4
+def test_shared_backends_see_other_workers_writes(tmp_path, monkeypatch):
+    monkeypatch.delenv("OE_SESSION_CACHE_TTL_S", raising=False)
+    path = tmp_path / "sessions.sqlite3"
+    redis = LocalRedis()
+    for make in (lambda: SQLiteSessionBackend(path), lambda: RedisSessionBackend(redis)):
+        ours, theirs = (SessionStore(make(), ttl_s=60, sweep_interval_s=0) for _ in range(2))
+        ours["s-1"] = _state()
+        assert "s-1" in ours
+        state = theirs["s-1"]
+        state.conversation_history.append({"role": "user", "content": "Add a projector"})
+        theirs["s-1"] = state
+        assert ours["s-1"].conversation_history[-1]["content"] == "Add a projector"
+
+    assert SessionStore(MemorySessionBackend(), ttl_s=60, sweep_interval_s=0).cache_ttl_s == 5.0
@@ -0,0 +1,104 @@
+"""
+Test: site-visit slot planner (workflows.common.site_visit_planner)
+
+- Weekday, min-days-ahead and blocked-date masks shape the ranked candidate dates.
+- Booked visits and the room occupancy grid remove individual slots.
+- One calendar lookup per room; no room evaluation per slot.
+- The handler builds one plan per turn from state.db without re-loading the database.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from services.rooms import RoomRecord
+from workflows.common import site_visit_handler, site_visit_planner
+from workflows.common.site_visit_planner import SiteVisitPlan
+from workflows.common.turn_memo import TurnMemo
+
+TODAY = datetime(2026, 3, 2)  # Monday
+EVENT = {"event_id": "EVT-1", "chosen_date": "20.03.2026"}
+DB = {
+    "events": [
+        {"event_id": "EVT-2", "chosen_date": "17.03.2026", "status": "Option"},
+        {
+            "event_id": "EVT-3",
+            "chosen_date": "30.04.2026",
+            "site_visit_state": {"status": "scheduled", "date_iso": "2026-03-16", "time_slot": "14:00"},
+        },
+    ]
+}
+
+
+class _Calendar:
+    def __init__(self):
+        self.lookups = []
+
+    def get_busy(self, calendar_id, start_iso, end_iso):
+        self.lookups.append(calendar_id)
+        return [{"start": "2026-03-13T09:00:00+00:00", "end": "2026-03-13T12:00:00+00:00"}]
+
+
+def _room(name):
+    return RoomRecord(
+        room_id=name, name=name, calendar_id=f"cal-{name}", capacity_max=40,
+        capacity_by_layout={}, features=[], buffer_before_min=0, buffer_after_min=0,
+    )
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+    cal = _Calendar()
+    monkeypatch.setattr(site_visit_planner, "get_site_visit_slots", lambda: [10, 14])
+    monkeypatch.setattr(site_visit_planner, "get_site_visit_weekdays_only", lambda: True)
+    monkeypatch.setattr(site_visit_planner, "get_site_visit_min_days_ahead", lambda: 1)
+    monkeypatch.setattr(site_visit_planner, "get_site_visit_blocked_dates", lambda: [])
+    monkeypatch.setattr("services.rooms.load_room_catalog", lambda: [_room("Room A"), _room("Room B")])
+    monkeypatch.setattr("adapters.calendar_adapter.get_calendar_adapter", lambda: cal)
+
+    def no_room_eval(*_args, **_kwargs):
+        raise AssertionError("planner must not evaluate rooms per slot")
+
+    monkeypatch.setattr("services.room_eval.evaluate_rooms", no_room_eval)
+    return cal
+
+
+@pytest.mark.v4
+def test_masks_and_grid_rank_slots(calendar):
+    plan = SiteVisitPlan.build(EVENT, DB, today=TODAY)
+
+    # From event - 7 days; weekend and the other event's day masked; never the event day
+    assert plan.candidates == ["2026-03-13", "2026-03-16", "2026-03-18", "2026-03-19"]
+    assert plan.date_time_slots() == {
+        "2026-03-13": ["14:00"],  # both rooms busy at 10:00
+        "2026-03-16": ["10:00"],  # 14:00 taken by another site visit
+        "2026-03-18": ["10:00", "14:00"],
+    }
+    assert plan.available_dates() == ["2026-03-13", "2026-03-16", "2026-03-18"]
+    assert plan.ranked_slots(3) == [("2026-03-13", "10:00"), ("2026-03-13", "14:00"), ("2026-03-16", "10:00")]
+    assert not plan.is_slot_free("2026-03-17", "10:00")
+    assert calendar.lookups == ["cal-Room A", "cal-Room B"]
+
+
+@pytest.mark.v4
+def test_handler_builds_one_plan_per_turn_from_state_db(calendar, monkeypatch):
+    def no_reload():
+        raise AssertionError("site-visit turn must use state.db")
+
+    monkeypatch.setattr(site_visit_handler, "_load_database", no_reload)
+    builds = []
+    original = SiteVisitPlan.build.__func__
+
+    def counting_build(cls, *args, **kwargs):
+        builds.append(args)
+        return original(cls, *args, **kwargs)
+
+    monkeypatch.setattr(SiteVisitPlan, "build", classmethod(counting_build))
+    state = SimpleNamespace(db=DB, memo=TurnMemo())
+
+    first = site_visit_handler._site_visit_plan(state, EVENT)
+    second = site_visit_handler._site_visit_plan(state, EVENT)
+    assert first is second and len(builds) == 1
+    assert "2026-03-17" in first.blocked_dates
+    assert ("2026-03-16", "14:00") in first.booked_slots
@@ -0,0 +1,73 @@
+"""
+Test: startup import profiling and warm-up (utils.startup)
+
+- The import profiler records self/cumulative time for first-time imports.
+- OE_WARMUP selects phases; a failing phase never aborts warm-up.
+- Heavy optional SDKs (google-genai) are not imported with the adapters.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from utils import startup
+
+
+@pytest.mark.v4
+def test_profile_imports_records_nested_modules(tmp_path, monkeypatch):
+    (tmp_path / "warm_parent.py").write_text("import warm_child\n")
+    (tmp_path / "warm_child.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    with startup.profile_imports() as profiler:
+        import warm_parent  # noqa: F401
+
+    records = {record.name: record for record in profiler.records}
+    assert records["warm_child"].depth == 1
+    assert records["warm_parent"].cumulative_us >= records["warm_child"].cumulative_us
+    assert "warm_parent" in profiler.format_report()
+    assert startup.get_import_profile() is profiler
+    monkeypatch.delitem(sys.modules, "warm_parent")
+    monkeypatch.delitem(sys.modules, "warm_child")
+
+
+@pytest.mark.v4
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (None, list(startup.WARMUP_PHASES)),
+        ("off", []),
+        ("matchers, catalogs, bogus", ["catalogs", "matchers"]),
+    ],
+)
+def test_configured_phases(monkeypatch, raw, expected):
+    if raw is None:
+        monkeypatch.delenv("OE_WARMUP", raising=False)
+    else:
+        monkeypatch.setenv("OE_WARMUP", raw)
+    assert startup.configured_phases() == expected
+
+
+@pytest.mark.v4
+def test_failing_phase_is_reported_not_raised(monkeypatch):
+    def _broken() -> str:
+        raise RuntimeError("catalog missing")
+
+    monkeypatch.setitem(startup._PHASE_RUNNERS, "catalogs", _broken)
+    report = startup.run_warmup(["catalogs", "stub_turn"])
+
+    assert report.ready
+    assert [(phase.name, phase.ok) for phase in report.phases] == [("catalogs", False), ("stub_turn", True)]
+    assert startup.get_startup_report() is report
+
+
+@pytest.mark.v4
+def test_agent_adapter_defers_genai_import():
+    code = "import sys, adapters.agent_adapter; print('google.genai' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    assert result.stdout.strip() == "False"
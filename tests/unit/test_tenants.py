@@ -0,0 +1,163 @@
+"""
+Test: tenant partitions (storage, config snapshots, quota caches, turn slots)
+
+- A tenant filling its cache quota only evicts its own entries.
+- Tenant databases live next to the default one; their config sections
+  overlay the default's and the snapshot is reloaded only when the file changes.
+- Snapshot overflow cleanup keeps MAX_SNAPSHOTS per tenant.
+- The verbalizer prompt cache serves each tenant its own prompt overrides.
+- Load test: a noisy tenant flooding the message executor runs several
+  turns at once but does not keep a quiet tenant's turn from running
+  (checked on queue state, not timings).
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import page_snapshots
+from utils.cancellation import run_cancellable_turn
+from ux import universal_verbalizer
+from workflows.io import tenants
+from workflows.io.tenants import (
+    TenantQuotaCache,
+    reset_tenants,
+    tenant_partition,
+    tenant_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tenants():
+    reset_tenants()
+    yield
+    reset_tenants()
+
+
+@pytest.mark.v4
+def test_quota_cache_evicts_only_own_entries():
+    cache = TenantQuotaCache("test_quota", quota=3)
+    cache.put("q", "quiet", tenant_id="quiet")
+    for index in range(10):
+        cache.put(f"k{index}", index, tenant_id="noisy")
+
+    assert cache.get("q", tenant_id="quiet") == "quiet"
+    assert cache.get("k0", tenant_id="noisy") is None
+    assert cache.get("k9", tenant_id="noisy") == 9
+    # Keys are partitioned too: one tenant never reads another's entry
+    assert cache.get("q", tenant_id="noisy") is None
+
+    stats = tenant_stats()["tenants"]
+    assert stats["noisy"]["caches"]["test_quota"] == {"entries": 3, "quota": 3, "hits": 1, "misses": 2, "evictions": 7}
+    assert stats["quiet"]["caches"]["test_quota"]["evictions"] == 0
+
+
+def _write(path, config):
+    path.write_text(json.dumps({"events": [], "clients": {}, "tasks": [], "config": config}), encoding="utf-8")
+
+
+@pytest.mark.v4
+def test_config_snapshot_overlays_default_and_reloads_on_change(tmp_path):
+    base = tmp_path / "events_database.json"
+    _write(base, {"venue": {"name": "The Atelier"}, "prompts": {"system_prompt": "shared"}})
+    _write(tmp_path / "events_acme.json", {"venue": {"name": "Acme Hall"}})
+
+    acme = tenant_partition("acme", base_path=base)
+    assert acme.db_path.name == "events_acme.json"
+    assert tenant_partition("default", base_path=base).db_path == base
+    assert acme.config()["venue"] == {"name": "Acme Hall"}
+    assert acme.config()["prompts"] == {"system_prompt": "shared"}
+    assert acme.config_loads == 1 and acme.config_hits == 1
+
+    section = acme.config_section("venue")
+    section["name"] = "mutated"
+    assert acme.config()["venue"]["name"] == "Acme Hall"
+
+    _write(tmp_path / "events_acme.json", {"venue": {"name": "Acme Hall 2"}})
+    os.utime(tmp_path / "events_acme.json", ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert acme.config()["venue"] == {"name": "Acme Hall 2"}
+    assert acme.config_loads == 2
+
+
+@pytest.mark.v4
+def test_snapshot_overflow_is_per_tenant(monkeypatch):
+    monkeypatch.setattr(page_snapshots, "MAX_SNAPSHOTS", 2)
+    snapshots = {
+        f"{tenant}-{index}": {"tenant_id": tenant, "created_at": f"2026-01-0{index}"}
+        for tenant in ("noisy", "quiet")
+        for index in range(1, 5 if tenant == "noisy" else 2)
+    }
+    kept = page_snapshots._cleanup_overflow(snapshots)
+    assert sorted(kept) == ["noisy-3", "noisy-4", "quiet-1"]
+
+
+@pytest.mark.v4
+def test_prompt_cache_is_per_tenant(tmp_path, monkeypatch):
+    base = tmp_path / "events_database.json"
+    _write(base, {"prompts": {"system_prompt": "shared prompt"}})
+    _write(tmp_path / "events_acme.json", {"prompts": {"system_prompt": "acme prompt", "step_prompts": {"3": "acme rooms"}}})
+    monkeypatch.setattr(tenants, "_default_paths", lambda: (base, tmp_path / ".events_db.lock"))
+    monkeypatch.setattr(universal_verbalizer, "_PROMPT_CACHE", {})
+
+    prompts = {}
+    for tenant in ("default", "acme", "globex", "acme"):
+        monkeypatch.setattr(tenants, "current_tenant_id", lambda tenant=tenant: tenant)
+        prompts[tenant] = universal_verbalizer._get_effective_prompts()
+
+    assert prompts["acme"][0] == "acme prompt"
+    assert prompts["acme"][1][3] == "acme rooms"
+    # A tenant without its own overrides falls back to the shared ones
+    assert prompts["default"][0] == prompts["globex"][0] == "shared prompt"
+    assert prompts["globex"][1][3] != "acme rooms"
+    assert set(universal_verbalizer._PROMPT_CACHE) == {"default", "acme", "globex"}
+
+
+async def _flood(max_workers: int, noisy_turns: int, timeout: float) -> bool:
+    """Park noisy turns on an event, then run one quiet turn; True if it finished first."""
+
+    release = threading.Event()
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
+    noisy = [
+        asyncio.ensure_future(
+            run_cancellable_turn(lambda: release.wait(10), tenant_id="noisy", deadline_s=None, poll_interval_s=0.01)
+        )
+        for _ in range(noisy_turns)
+    ]
+    while tenant_stats()["tenants"].get("noisy", {}).get("turns", {}).get("active", 0) < min(noisy_turns, int(os.environ["OE_TENANT_MAX_TURNS"])):
+        await asyncio.sleep(0.01)
+    try:
+        await asyncio.wait_for(
+            run_cancellable_turn(lambda: "quiet", tenant_id="quiet", deadline_s=None, poll_interval_s=0.01), timeout=timeout
+        )
+        finished_first = not any(turn.done() for turn in noisy)
+    except asyncio.TimeoutError:
+        finished_first = False
+    release.set()
+    await asyncio.gather(*noisy)
+    return finished_first
+
+
+@pytest.mark.v4
+def test_noisy_tenant_does_not_block_quiet_tenant(monkeypatch):
+    # Four worker threads, eight noisy turns that never finish on their own;
+    # two of them run at once (_flood waits for both to be active)
+    monkeypatch.setenv("OE_TENANT_MAX_TURNS", "2")
+    assert asyncio.run(_flood(max_workers=4, noisy_turns=8, timeout=30))
+
+    turns = tenant_stats()["tenants"]
+    assert turns["quiet"]["turns"]["completed"] == 1
+    assert (turns["noisy"]["turns"]["completed"], turns["noisy"]["turns"]["queued"]) == (8, 0)
+
+
+@pytest.mark.v4
+def test_without_turn_slots_noisy_tenant_holds_every_thread(monkeypatch):
+    # Control: with slots for every noisy turn, they occupy all worker threads
+    monkeypatch.setenv("OE_TENANT_MAX_TURNS", "8")
+    assert not asyncio.run(_flood(max_workers=4, noisy_turns=8, timeout=0.5))
+
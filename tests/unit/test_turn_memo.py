@@ -0,0 +1,84 @@
+"""
+Test: turn-scoped memoization (workflows.common.turn_memo)
+
+- Registered functions are computed once per argument fingerprint per turn.
+- Outside a turn the wrapper calls straight through.
+- Mutable results are copied so callers cannot poison the memo.
+- Turn stats fold into process-wide totals.
+"""
+
+import pytest
+
+from detection.keywords.buckets import detect_language
+from workflows.common.datetime_parse import parse_all_dates
+from workflows.common.turn_memo import (
+    memo_totals,
+    registered_functions,
+    reset_memo_totals,
+    turn_memoized,
+    turn_scope,
+)
+
+CALLS = []
+
+
+@turn_memoized("test.tokens")
+def _tokens(text, *, options=None):
+    CALLS.append(text)
+    return {"tokens": text.split(), "options": options}
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    CALLS.clear()
+    reset_memo_totals()
+    yield
+    reset_memo_totals()
+
+
+@pytest.mark.v4
+def test_memoized_within_turn_only():
+    with turn_scope() as memo:
+        _tokens("a b", options={"x": [1, 2]})
+        _tokens("a b", options={"x": [1, 2]})
+        _tokens("a c")
+    _tokens("a b")
+    _tokens("a b")
+
+    assert CALLS == ["a b", "a c", "a b", "a b"]
+    assert memo.stats["test.tokens"].hits == 1
+    assert memo.stats["test.tokens"].misses == 2
+    assert len(memo) == 0  # values are dropped when the turn ends
+
+
+@pytest.mark.v4
+def test_results_are_copied():
+    with turn_scope():
+        first = _tokens("a b")
+        first["tokens"].append("mutated")
+        assert _tokens("a b")["tokens"] == ["a", "b"]
+
+
+@pytest.mark.v4
+def test_totals_accumulate_across_turns():
+    for _ in range(2):
+        with turn_scope():
+            _tokens("same")
+            _tokens("same")
+    assert memo_totals()["test.tokens"]["hits"] == 2
+    assert memo_totals()["test.tokens"]["misses"] == 2
+
+
+@pytest.mark.v4
+def test_detectors_are_registered():
+    registered = registered_functions()
+    assert "detection.keywords.buckets.detect_language" in registered
+    assert "workflows.common.datetime_parse.parse_all_dates" in registered
+    with turn_scope() as memo:
+        assert detect_language("Hallo, wir möchten einen Raum buchen") == detect_language(
+            "Hallo, wir möchten einen Raum buchen"
+        )
+        parse_all_dates("14.05.2027 or 21.05.2027")
+        parse_all_dates("14.05.2027 or 21.05.2027")
+    assert memo.stats["detection.keywords.buckets.detect_language"].hits == 1
+    assert memo.stats["workflows.common.datetime_parse.parse_all_dates"].hits == 1
@@ -0,0 +1,191 @@
+"""
+Test: multi-tenant UUID caches in workflows.io.integration.uuid_adapter
+
+- Room/product registries are loaded lazily per team and refreshed on TTL
+  or explicit invalidation (change notification).
+- Email -> client UUID lookups are cached per team in a bounded LRU, with
+  short-lived negative entries for unknown senders.
+- supabase upsert_client serves a cached client UUID without a select and
+  still selects (never blindly inserts) for a cached miss.
+"""
+
+from typing import Dict, List
+
+import pytest
+
+from workflows.io.integration import supabase_adapter, uuid_adapter
+from workflows.io.integration.uuid_adapter import (
+    ClientUUIDCache,
+    TeamEntityRegistryCache,
+)
+
+ROOM_A = "550e8400-e29b-41d4-a716-446655440000"
+ROOM_B = "6ba7b810-9dad-41d1-80b4-00c04fd430c8"
+CLIENT = "9f3c1a2b-4d5e-4f60-8a7b-1c2d3e4f5a6b"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def registry_loader(monkeypatch):
+    calls: List[str] = []
+    rows: Dict[str, str] = {"team-1": ROOM_A, "team-2": ROOM_B}
+
+    def _loader(team_id: str):
+        calls.append(team_id)
+        return [{"id": rows[team_id], "name": "Room A"}], []
+
+    monkeypatch.setattr(uuid_adapter, "_registry_loader", _loader)
+    return calls, rows
+
+
+@pytest.mark.v4
+def test_registry_loads_lazily_per_team(registry_loader):
+    calls, _ = registry_loader
+    cache = TeamEntityRegistryCache(ttl_seconds=60, clock=FakeClock())
+
+    assert calls == []
+    assert cache.get("team-1").get_room_uuid("room a") == ROOM_A
+    assert cache.get("team-2").get_room_uuid("Room A") == ROOM_B
+    # Second access within TTL is served from memory
+    cache.get("team-1")
+    assert calls == ["team-1", "team-2"]
+
+
+@pytest.mark.v4
+def test_registry_refreshes_after_ttl_and_invalidate(registry_loader):
+    calls, rows = registry_loader
+    clock = FakeClock()
+    cache = TeamEntityRegistryCache(ttl_seconds=60, clock=clock)
+
+    cache.get("team-1")
+    rows["team-1"] = ROOM_B
+    clock.now += 61
+    assert cache.get("team-1").get_room_uuid("room a") == ROOM_B
+
+    rows["team-1"] = ROOM_A
+    cache.invalidate("team-1")
+    assert cache.get("team-1").get_room_uuid("room a") == ROOM_A
+    assert calls == ["team-1", "team-1", "team-1"]
+
+
+@pytest.mark.v4
+def test_registry_keeps_stale_mappings_when_reload_fails(monkeypatch, registry_loader):
+    clock = FakeClock()
+    cache = TeamEntityRegistryCache(ttl_seconds=60, clock=clock)
+    cache.get("team-1")
+
+    def _broken(team_id: str):
+        raise RuntimeError("supabase down")
+
+    monkeypatch.setattr(uuid_adapter, "_registry_loader", _broken)
+    clock.now += 61
+    assert cache.get("team-1").get_room_uuid("room a") == ROOM_A
+
+
+@pytest.mark.v4
+def test_client_cache_is_scoped_per_team_and_bounded():
+    cache = ClientUUIDCache(max_size=2, negative_ttl=30, clock=FakeClock())
+
+    cache.set("Client@Example.com", CLIENT, "team-1")
+    assert cache.get("client@example.com", "team-1") == CLIENT
+    assert cache.lookup("client@example.com", "team-2") == (False, None)
+
+    cache.set("b@example.com", CLIENT, "team-1")
+    cache.set("c@example.com", CLIENT, "team-1")
+    # Least recently used entry was evicted
+    assert len(cache) == 2
+    assert cache.lookup("client@example.com", "team-1") == (False, None)
+
+
+@pytest.mark.v4
+def test_lookup_client_uuid_caches_misses(monkeypatch):
+    clock = FakeClock()
+    cache = ClientUUIDCache(max_size=16, negative_ttl=30, clock=clock)
+    calls: List[str] = []
+
+    def _lookup(email: str, team_id: str):
+        calls.append(email)
+        return None
+
+    monkeypatch.setattr(uuid_adapter, "_client_uuid_cache", cache)
+    monkeypatch.setattr(uuid_adapter, "_supabase_client_lookup", _lookup)
+
+    assert uuid_adapter.lookup_client_uuid("new@example.com", "team-1") is None
+    assert uuid_adapter.lookup_client_uuid("new@example.com", "team-1") is None
+    assert calls == ["new@example.com"]
+
+    # Negative entry expires, next lookup goes back to Supabase
+    clock.now += 31
+    uuid_adapter.lookup_client_uuid("new@example.com", "team-1")
+    assert calls == ["new@example.com", "new@example.com"]
+
+
+class FakeClientsTable:
+    def __init__(self, rows: List[Dict[str, str]]) -> None:
+        self.rows = rows
+        self.calls: List[str] = []
+        self._email = ""
+        self._inserted = None
+
+    def select(self, _columns):
+        self.calls.append("select")
+        return self
+
+    def insert(self, record):
+        self.calls.append("insert")
+        self._inserted = dict(record, id=CLIENT)
+        return self
+
+    def eq(self, column, value):
+        if column == "email":
+            self._email = value
+        return self
+
+    def maybe_single(self):
+        return self
+
+    def execute(self):
+        if self._inserted is not None:
+            self.rows.append(self._inserted)
+            self._inserted = None
+            return _Result([self.rows[-1]])
+        return _Result(next((row for row in self.rows if row["email"] == self._email), None))
+
+
+class FakeSupabase:
+    def __init__(self, clients: FakeClientsTable) -> None:
+        self.clients = clients
+
+    def table(self, name):
+        assert name == "clients"
+        return self.clients
+
+
+class _Result:
+    def __init__(self, data) -> None:
+        self.data = data
+
+
+@pytest.mark.v4
+def test_upsert_client_skips_select_for_cached_uuid(monkeypatch):
+    cache = ClientUUIDCache(max_size=16, negative_ttl=30, clock=FakeClock())
+    table = FakeClientsTable([])
+    monkeypatch.setattr(supabase_adapter, "get_client_uuid_cache", lambda: cache)
+    monkeypatch.setattr(supabase_adapter, "get_supabase_client", lambda: FakeSupabase(table))
+    monkeypatch.setattr(supabase_adapter, "get_team_id", lambda: "team-1")
+    monkeypatch.setattr(supabase_adapter, "get_system_user_id", lambda: "user-1")
+
+    cache.set_missing("new@example.com", "team-1")
+    created = supabase_adapter.upsert_client("New@Example.com", "New Client")
+    assert created["id"] == CLIENT and table.calls == ["select", "insert"]
+
+    again = supabase_adapter.upsert_client("new@example.com", "New Client")
+    assert again == {"id": CLIENT, "email": "new@example.com", "team_id": "team-1"}
+    assert table.calls == ["select", "insert"]
@@ -0,0 +1,197 @@
+"""Tests for streaming verbalization with incremental fact verification."""
+
+import time
+from types import SimpleNamespace
+from typing import Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from utils.cancellation import CancelToken, TurnCancelled, cancel_scope
+from ux.universal_verbalizer import (
+    IncrementalFactVerifier,
+    MessageContext,
+    VerbalizerStreamEvent,
+    stream_verbalize_message,
+    verbalize_message,
+    verbalizer_stream_sink,
+)
+
+FALLBACK = "Room A is available on 15.03.2026 for 30 guests. The total is CHF 500.00."
+
+
+def _context() -> MessageContext:
+    return MessageContext(
+        step=4,
+        topic="offer_draft",
+        event_date="15.03.2026",
+        participants_count=30,
+        room_name="Room A",
+        total_amount=500.00,
+    )
+
+
+def _fake_stream(*deltas: str):
+    def _stream(payload) -> Iterator[str]:
+        yield from deltas
+    return _stream
+
+
+def _run(*deltas: str) -> List[VerbalizerStreamEvent]:
+    with patch("ux.universal_verbalizer._bypass_text", return_value=None), \
+         patch("ux.universal_verbalizer._call_llm_stream", _fake_stream(*deltas)):
+        return list(stream_verbalize_message(FALLBACK, _context()))
+
+
+class TestIncrementalFactVerifier:
+    def test_partial_amount_is_not_judged_early(self):
+        verifier = IncrementalFactVerifier(_context().extract_hard_facts())
+        assert verifier.feed("The total is CHF 5")
+        assert verifier.feed("00.00 for everything ")
+        assert verifier.invented == []
+
+    def test_invented_amount_flagged_once_settled(self):
+        verifier = IncrementalFactVerifier(_context().extract_hard_facts())
+        assert verifier.feed("The total is CHF 750.00")
+        assert not verifier.feed(" for everything")
+        assert verifier.invented == ["amount:CHF 750.00"]
+
+    def test_number_spans_are_held_until_checked(self):
+        verifier = IncrementalFactVerifier(_context().extract_hard_facts())
+        assert verifier.feed("The total is CHF 5")
+        assert verifier.releasable() == "The total is CHF"
+        assert verifier.feed("00.00 for ")
+        # Not enough plain words after the amount yet
+        assert verifier.releasable() == " "
+        assert verifier.feed("the whole day, ")
+        assert verifier.releasable() == "500.00 for the whole day,"
+        assert verifier.remainder() == " "
+
+
+class TestStreamVerbalizeMessage:
+    def test_valid_stream_yields_deltas_then_final(self):
+        deltas = ("Great news! ", "Room A is free on 15.03.2026 ", "for 30 guests, ", "total CHF 500.00.")
+        events = _run(*deltas)
+        assert [e.kind for e in events] == ["delta"] * 4 + ["final"]
+        assert events[-1].text == "".join(deltas)
+        assert "".join(e.text for e in events[:-1]) == events[-1].text
+        # The date is only sent once the words after it were checked
+        assert events[1].text == " Room A is free on "
+
+    def test_invented_fact_switches_to_fallback_mid_stream(self):
+        consumed: List[str] = []
+
+        def _stream(payload):
+            for delta in ("Room A on 15.03.2026 ", "for 30 guests costs CHF 990.00 ", "in total", " never sent"):
+                consumed.append(delta)
+                yield delta
+
+        with patch("ux.universal_verbalizer._bypass_text", return_value=None), \
+             patch("ux.universal_verbalizer._call_llm_stream", _stream):
+            events = list(stream_verbalize_message(FALLBACK, _context()))
+
+        assert [e.kind for e in events] == ["delta", "reset", "final"]
+        assert events[-1].text == FALLBACK
+        # The invented amount was held back and never reached the client
+        assert not any("990" in e.text for e in events if e.kind == "delta")
+        # The LLM stream is abandoned as soon as the invented amount settles
+        assert " never sent" not in consumed
+
+    def test_missing_fact_at_end_falls_back(self):
+        events = _run("Room A is free ", "for 30 guests.")
+        assert events[-2].kind == "reset"
+        assert events[-1].text == FALLBACK
+
+    def test_cancelled_turn_stops_the_stream(self):
+        token = CancelToken()
+        consumed: List[str] = []
+
+        def _stream(payload):
+            for delta in ("Room A is free ", "on 15.03.2026 ", "for 30 guests."):
+                consumed.append(delta)
+                token.cancel()  # client went away after the first chunk
+                yield delta
+
+        with patch("ux.universal_verbalizer._bypass_text", return_value=None), \
+             patch("ux.universal_verbalizer._call_llm_stream", _stream), \
+             pytest.raises(TurnCancelled) as raised, cancel_scope(token):
+            list(stream_verbalize_message(FALLBACK, _context()))
+
+        assert raised.value.stage == "verbalizer.stream"
+        assert consumed == ["Room A is free "]
+
+    def test_bypass_yields_only_final(self):
+        with patch("ux.universal_verbalizer._bypass_text", return_value=FALLBACK):
+            events = list(stream_verbalize_message(FALLBACK, _context()))
+        assert events == [VerbalizerStreamEvent("final", FALLBACK)]
+
+
+class TestStreamSink:
+    def test_verbalize_message_streams_into_registered_sink(self):
+        received: List[VerbalizerStreamEvent] = []
+        deltas = ("Room A on 15.03.2026 ", "for 30 guests: ", "CHF 500.00.")
+        with patch("ux.universal_verbalizer._bypass_text", return_value=None), \
+             patch("ux.universal_verbalizer._call_llm_stream", _fake_stream(*deltas)), \
+             verbalizer_stream_sink(received.append):
+            result = verbalize_message(FALLBACK, _context())
+
+        assert result == "".join(deltas)
+        assert [e.kind for e in received][-1] == "final"
+        assert "".join(e.text for e in received if e.kind == "delta") == result
+
+
+def _openai_streaming(chunks, seen):
+    from adapters.agent_adapter import OpenAIAgentAdapter
+
+    adapter = OpenAIAgentAdapter.__new__(OpenAIAgentAdapter)
+    adapter._intent_model = "test-model"
+
+    def create(**kwargs):
+        seen.append(kwargs.get("timeout"))
+        return iter(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=c))]) for c in chunks())
+
+    adapter._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return adapter
+
+
+def _gemini_streaming(chunks, seen):
+    pytest.importorskip("google.genai")
+    from adapters.agent_adapter import GeminiAgentAdapter
+
+    adapter = GeminiAgentAdapter.__new__(GeminiAgentAdapter)
+    adapter._intent_model = "test-model"
+
+    def generate_content_stream(*, model, contents, config):
+        seen.append(config.http_options.timeout / 1000 if config.http_options else None)
+        return (SimpleNamespace(text=c) for c in chunks())
+
+    adapter._client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=generate_content_stream))
+    return adapter
+
+
+class TestProviderStreams:
+    @pytest.mark.parametrize("factory", [_openai_streaming, _gemini_streaming])
+    def test_stream_is_one_timed_call_checkpointed_per_chunk(self, factory):
+        token = CancelToken(deadline_s=60)
+        produced: List[str] = []
+
+        def chunks():
+            for text in ("Room A ", "is free ", "on 15.03.2026."):
+                produced.append(text)
+                time.sleep(0.02)
+                if len(produced) == 2:
+                    token.cancel()
+                yield text
+
+        seen: List = []
+        adapter = factory(chunks, seen)
+        received: List[str] = []
+        with pytest.raises(TurnCancelled), cancel_scope(token):
+            for delta in adapter.complete_stream("prompt"):
+                received.append(delta)
+
+        assert received == ["Room A "]
+        assert produced == ["Room A ", "is free "]
+        # The deadline caps the request timeout, and iteration time is recorded
+        assert seen and 0 < seen[0] <= 60
+        assert token.llm_calls == 1 and token.llm_seconds >= 0.04
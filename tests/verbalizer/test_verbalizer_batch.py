@@ -0,0 +1,66 @@
+"""Tests for batch re-verification of verbalized output."""
+
+import json
+
+from ux.verbalizer_batch import case_from_record, iter_cases, run_batch
+
+HARD_FACTS = {"dates": ["15.03.2026"], "amounts": ["CHF 500.00"], "room_names": ["Room A"], "counts": ["30"]}
+GOOD = "Room A is yours on 15.03.2026 for 30 guests at CHF 500.00."
+INVENTED = "Room A is yours on 15.03.2026 for 30 guests at CHF 650.00."
+
+ROOM_OFFER_FACTS = {
+    "event_date": "15.03.2026",
+    "participants_count": 30,
+    "rooms": [{"name": "Room A", "status": "Available", "capacity_max": 40}],
+}
+
+
+def _write_corpus(path, n: int = 40) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for i in range(n):
+            text = GOOD if i % 4 else INVENTED
+            handle.write(json.dumps({"step": 4, "topic": "offer_draft", "hard_facts": HARD_FACTS, "llm_text": text}) + "\n")
+        # Timeline-style event wrapping a room-offer case
+        handle.write(json.dumps({
+            "kind": "VERBALIZATION",
+            "subject": "room_offer",
+            "data": {"step": 3, "room_offer_facts": ROOM_OFFER_FACTS, "llm_text": "Room A on 15.03.2026 for 30 people."},
+        }) + "\n")
+        # Unrelated timeline events and junk are skipped
+        handle.write(json.dumps({"kind": "STEP_ENTER", "data": {}}) + "\n")
+        handle.write("not json\n")
+
+
+def test_context_records_build_hard_facts():
+    case = case_from_record(
+        {"topic": "room_avail_result", "context": {"room_name": "Room A", "participants_count": 30}, "llm_text": "x"},
+        default_id="c1",
+    )
+    assert case.hard_facts["room_names"] == ["Room A"]
+    assert case.hard_facts["counts"] == ["30"]
+
+
+def test_batch_aggregates_failures_by_step_and_topic(tmp_path):
+    corpus = tmp_path / "drafts.jsonl"
+    _write_corpus(corpus)
+
+    report = run_batch(iter_cases([corpus]), workers=1)
+
+    assert report.total == 41
+    assert report.failed == 10
+    offer = report.groups["step 4 / offer_draft"]
+    assert offer["failed"] == 10
+    assert offer["invented"] == {"amount": 10}
+    assert report.groups["step 3 / room_offer"]["failed"] == 0
+
+
+def test_process_pool_matches_inline(tmp_path):
+    corpus = tmp_path / "drafts.jsonl"
+    _write_corpus(corpus, n=60)
+    cases = list(iter_cases([tmp_path]))
+
+    inline = run_batch(cases, workers=1)
+    pooled = run_batch(cases, workers=2, chunk_size=16)
+
+    assert pooled.to_dict()["groups"] == inline.to_dict()["groups"]
+    assert pooled.failed == inline.failed == 15
@@ -0,0 +1,85 @@
+"""Tests for the verbalization result cache."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ux.universal_verbalizer import MessageContext, verbalize_message
+from ux.verbalizer_cache import VerbalizationCache, get_verbalization_cache
+
+FALLBACK = "Room A is available on 15.03.2026 for 30 guests."
+VERIFIED = "Good news: Room A is free on 15.03.2026 for your 30 guests."
+
+
+def _context(**overrides) -> MessageContext:
+    values = dict(
+        step=3,
+        topic="room_avail_result",
+        event_date="15.03.2026",
+        participants_count=30,
+        room_name="Room A",
+    )
+    values.update(overrides)
+    return MessageContext(**values)
+
+
+@pytest.fixture(autouse=True)
+def _enabled_cache():
+    get_verbalization_cache().clear()
+    with patch.dict(os.environ, {"VERBALIZER_CACHE": "1"}), \
+         patch("ux.universal_verbalizer._bypass_text", return_value=None), \
+         patch("ux.universal_verbalizer._get_effective_prompts", return_value=("system", {3: "step 3"})):
+        yield
+    get_verbalization_cache().clear()
+
+
+class TestVerbalizeMessageCache:
+    def test_repeated_rendering_skips_llm(self):
+        with patch("ux.universal_verbalizer._call_llm", return_value=VERIFIED) as llm:
+            first = verbalize_message(FALLBACK, _context())
+            second = verbalize_message("Room A is available on  15.03.2026\nfor 30 guests.", _context())
+
+        assert first == second == VERIFIED
+        assert llm.call_count == 1
+        assert get_verbalization_cache().stats()["hits"] == 1
+
+    def test_different_facts_miss(self):
+        with patch("ux.universal_verbalizer._call_llm", return_value=VERIFIED) as llm:
+            verbalize_message(FALLBACK, _context())
+            verbalize_message(FALLBACK, _context(participants_count=31))
+        assert llm.call_count == 2
+
+    def test_prompt_change_invalidates(self):
+        with patch("ux.universal_verbalizer._call_llm", return_value=VERIFIED) as llm:
+            verbalize_message(FALLBACK, _context())
+            with patch("ux.universal_verbalizer._get_effective_prompts", return_value=("new system", {3: "step 3"})):
+                verbalize_message(FALLBACK, _context())
+        assert llm.call_count == 2
+
+    def test_failed_verification_is_not_cached(self):
+        with patch("ux.universal_verbalizer._call_llm", return_value="Room A is free.") as llm:
+            assert verbalize_message(FALLBACK, _context()) == FALLBACK
+            verbalize_message(FALLBACK, _context())
+        assert llm.call_count == 2
+        assert len(get_verbalization_cache()) == 0
+
+
+class TestVerbalizationCacheBounds:
+    def test_lru_eviction(self):
+        cache = VerbalizationCache(max_size=2, ttl_seconds=0)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        now = [100.0]
+        cache = VerbalizationCache(max_size=4, ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", "A")
+        now[0] += 11
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
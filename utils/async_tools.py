@@ -1,36 +1,36 @@
 """Threaded helpers for lightweight parallel I/O.
 
 The helpers in this module are intentionally conservative: they use the
-standard library `concurrent.futures` primitives with a small default
-worker pool so we can overlap blocking I/O (e.g. file reads) without
-introducing new dependencies. Consumers should only dispatch tasks that
-
-
-
-are safe to run in parallel.
+standard library `concurrent.futures` primitives so we can overlap blocking
+I/O (e.g. file reads, calendar lookups) without introducing new
+dependencies. Consumers should only dispatch tasks that are safe to run in
+parallel.
+
+All callers share the long-lived `io` pool of the executor service
+(utils.executors) instead of paying for a fresh ThreadPoolExecutor per call;
+`max_workers` bounds how many of a call's tasks are in flight at once. Tasks
+dispatched from inside a pool thread run inline, so nested run_io_tasks()
+calls cannot deadlock the pool. Each task runs in a copy of the caller's
+context, so turn-scoped context variables (turn memo, cancellation token,
+thread id) are visible inside the pool.
+
+Environment:
+    OE_IO_WORKERS: Size of the shared I/O pool (default: 8)
 """
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, wait
-from typing import Callable, Iterable, List, Sequence, TypeVar
+from typing import Callable, List, Sequence, TypeVar
+
+from utils.executors import POOL_IO, run_tasks
 
 T = TypeVar("T")
 
 
 def run_io_tasks(tasks: Sequence[Callable[[], T]], max_workers: int = 4) -> List[T]:
-    """Execute blocking I/O callables concurrently and return their results."""
-
-    if not tasks:
-        return []
-    worker_count = max(1, min(int(max_workers), len(tasks)))
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
-        futures = [executor.submit(task) for task in tasks]
-        wait(futures)
-    results: List[T] = []
-    for future in futures:
-        results.append(future.result())
-    return results
+    """Execute blocking I/O callables concurrently and return their results in order."""
+
+    return run_tasks(POOL_IO, tasks, max_in_flight=max(1, int(max_workers)))
 
 
 __all__ = ["run_io_tasks"]
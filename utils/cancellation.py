@@ -0,0 +1,310 @@
+"""Per-turn cancellation tokens with deadlines.
+
+A chat turn can take tens of seconds: unified detection, entity extraction,
+verbalization, each with provider retries. When the client disconnects or
+the frontend gives up, finishing the turn only burns tokens and worker time.
+The API layer creates a CancelToken per turn (optionally with a deadline),
+binds it with `cancel_scope()` and cancels it when the client goes away.
+Expensive stages call `check_cancelled(stage)` before starting work; the
+LLM adapters also cap their request timeout to the time left
+(`call_timeout()`).
+
+    token = CancelToken(deadline_s=90)
+    with cancel_scope(token):
+        process_msg(payload)          # raises TurnCancelled once cancelled
+
+Async API handlers use `run_cancellable_turn()`, which runs the blocking turn
+in a worker thread and polls the HTTP request for a disconnect meanwhile.
+Turns first take one of their tenant's turn slots (workflows.io.tenants), so
+a team sending many messages at once queues behind itself instead of
+occupying every worker thread; a turn whose client leaves (or whose deadline
+passes) while it is still queued leaves the queue right away.
+
+TurnCancelled derives from BaseException (like asyncio.CancelledError) so the
+many `except Exception` fallbacks around LLM calls do not swallow it and
+quietly continue the turn with heuristics. Outside a scope every helper is a
+no-op, so scripts and unit tests are unaffected.
+
+Each token records the LLM calls it let through and how long they took.
+When a turn is cancelled these are added to process-wide counters
+(`cancellation_stats()`), which measure the work wasted on turns nobody
+waited for.
+
+Environment:
+    OE_TURN_DEADLINE_S: Default per-turn deadline for API requests in
+        seconds (default: 120, 0 disables the deadline)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ACTIVE: ContextVar[Optional["CancelToken"]] = ContextVar("CANCEL_TOKEN", default=None)
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, float] = {}
+
+REASON_CANCELLED = "cancelled"
+REASON_DEADLINE = "deadline"
+REASON_DISCONNECT = "client_disconnected"
+
+_FROM_ENV: Any = object()
+
+
+def default_deadline_s() -> Optional[float]:
+    """Per-turn deadline from OE_TURN_DEADLINE_S (None when disabled)."""
+
+    try:
+        value = float(os.getenv("OE_TURN_DEADLINE_S", "120"))
+    except ValueError:
+        return 120.0
+    return value if value > 0 else None
+
+
+class TurnCancelled(BaseException):
+    """Raised at a checkpoint once the turn's token is cancelled or expired."""
+
+    def __init__(self, reason: str, stage: str) -> None:
+        super().__init__(f"turn cancelled ({reason}) at {stage}")
+        self.reason = reason
+        self.stage = stage
+
+
+class CancelToken:
+    """Cancellation flag plus optional deadline for one turn."""
+
+    def __init__(self, deadline_s: Optional[float] = None, *, label: str = "") -> None:
+        self.label = label
+        self.started = time.monotonic()
+        self.deadline = self.started + deadline_s if deadline_s else None
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.aborted_stage: Optional[str] = None
+
+    def cancel(self, reason: str = REASON_CANCELLED) -> None:
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._event.is_set():
+            return self._reason
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return REASON_DEADLINE
+        return None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline (None without one)."""
+
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self, stage: str) -> None:
+        reason = self.reason
+        if reason is not None:
+            self.aborted_stage = self.aborted_stage or stage
+            raise TurnCancelled(reason, stage)
+
+    def record_llm_call(self, seconds: float) -> None:
+        self.llm_calls += 1
+        self.llm_seconds += seconds
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "reason": self.reason,
+            "aborted_stage": self.aborted_stage,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "llm_calls": self.llm_calls,
+            "llm_s": round(self.llm_seconds, 3),
+        }
+
+
+def current_token() -> Optional[CancelToken]:
+    """The token bound to this context, if any."""
+
+    return _ACTIVE.get()
+
+
+def _bump(**values: float) -> None:
+    with _STATS_LOCK:
+        for key, value in values.items():
+            _STATS[key] = _STATS.get(key, 0) + value
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken] = None) -> Iterator[CancelToken]:
+    """Bind token for the duration of a turn and account for it afterwards."""
+
+    token = token if token is not None else CancelToken()
+    handle = _ACTIVE.set(token)
+    _bump(turns=1)
+    try:
+        yield token
+    except TurnCancelled as exc:
+        token.aborted_stage = token.aborted_stage or exc.stage
+        _bump(
+            turns_cancelled=1,
+            **{f"cancelled_{exc.reason}": 1},
+            wasted_llm_calls=token.llm_calls,
+            wasted_llm_s=token.llm_seconds,
+            wasted_turn_s=time.monotonic() - token.started,
+        )
+        raise
+    finally:
+        _ACTIVE.reset(handle)
+    if token.cancelled:
+        # Finished without reaching another checkpoint after the cancel
+        _bump(turns_finished_after_cancel=1)
+
+
+def check_cancelled(stage: str) -> None:
+    """Raise TurnCancelled when the active turn was cancelled (no-op otherwise)."""
+
+    token = _ACTIVE.get()
+    if token is not None:
+        token.check(stage)
+
+
+def call_timeout(default: Optional[float] = None) -> Optional[float]:
+    """Request timeout for an outbound call: default, capped by the time left."""
+
+    token = _ACTIVE.get()
+    remaining = token.remaining() if token is not None else None
+    if remaining is None:
+        return default
+    remaining = max(remaining, 0.5)
+    return min(default, remaining) if default is not None else remaining
+
+
+@contextmanager
+def llm_call(stage: str) -> Iterator[None]:
+    """Checkpoint before an LLM call and record its duration on the token."""
+
+    token = _ACTIVE.get()
+    if token is None:
+        yield
+        return
+    token.check(stage)
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        token.record_llm_call(time.monotonic() - started)
+
+
+async def run_cancellable_turn(
+    fn: Callable[[], T],
+    *,
+    http_request: Any = None,
+    label: str = "",
+    deadline_s: Any = _FROM_ENV,
+    poll_interval_s: float = 0.25,
+    tenant_id: Optional[str] = None,
+) -> T:
+    """Run fn() in a worker thread under a fresh token; cancel it on disconnect.
+
+    deadline_s defaults to OE_TURN_DEADLINE_S (pass None for no deadline).
+    http_request is anything with an async is_disconnected() (Starlette
+    Request). tenant_id selects the turn slots to queue on (default: the
+    current tenant). Raises TurnCancelled when the turn was aborted.
+    """
+
+    # Imported here: the tenant module sits in the workflow layer
+    from workflows.io.tenants import tenant_turn_slot
+
+    token = CancelToken(default_deadline_s() if deadline_s is _FROM_ENV else deadline_s, label=label)
+    started = False
+
+    def _run() -> T:
+        with cancel_scope(token):
+            token.check("queued")
+            return fn()
+
+    async def _limited() -> T:
+        nonlocal started
+        async with tenant_turn_slot(tenant_id):
+            started = True
+            return await asyncio.to_thread(_run)
+
+    def _leave_queue() -> None:
+        # Raises TurnCancelled, accounted like any other cancelled turn
+        with cancel_scope(token):
+            token.check("queued")
+
+    if token.cancelled:
+        _leave_queue()
+    turn = asyncio.ensure_future(_limited())
+    try:
+        while True:
+            done, _ = await asyncio.wait({turn}, timeout=poll_interval_s)
+            if done:
+                break
+            if http_request is not None and not token.cancelled and await _is_disconnected(http_request):
+                logger.info("[TURN] client disconnected, cancelling turn %s", label)
+                token.cancel(REASON_DISCONNECT)
+            if token.cancelled and not started:
+                # Still waiting for a turn slot: leave the queue now
+                turn.cancel()
+                await asyncio.gather(turn, return_exceptions=True)
+                _leave_queue()
+    except asyncio.CancelledError:
+        # The request task itself was cancelled (server shutdown / disconnect)
+        token.cancel(REASON_DISCONNECT)
+        raise
+    return turn.result()
+
+
+async def _is_disconnected(http_request: Any) -> bool:
+    try:
+        return bool(await http_request.is_disconnected())
+    except Exception:  # pragma: no cover - defensive guard
+        return False
+
+
+def cancellation_stats() -> Dict[str, float]:
+    """Process-wide turn/cancellation counters (wasted work on cancelled turns)."""
+
+    with _STATS_LOCK:
+        return {key: round(value, 3) if isinstance(value, float) else value for key, value in sorted(_STATS.items())}
+
+
+def reset_cancellation_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+
+
+__all__ = [
+    "CancelToken",
+    "REASON_CANCELLED",
+    "REASON_DEADLINE",
+    "REASON_DISCONNECT",
+    "TurnCancelled",
+    "call_timeout",
+    "cancel_scope",
+    "cancellation_stats",
+    "check_cancelled",
+    "current_token",
+    "default_deadline_s",
+    "llm_call",
+    "reset_cancellation_stats",
+    "run_cancellable_turn",
+]
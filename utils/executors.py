@@ -0,0 +1,407 @@
+"""
+Process-wide executor service with named pools.
+
+Parallel work used to create its own executors: a pool per provider router,
+a pool per ingest batch, a process pool per verbalizer re-verification.
+All of it now runs on a few long-lived, named pools created on first use:
+
+    io      blocking I/O fan-out (calendar lookups, file reads)   thread
+    llm     provider calls and hedged attempts                    thread
+    ingest  batch-ingest partitions (one turn at a time each)     thread
+    cpu     CPU-bound batch work (functions must be picklable)    process
+
+    future = submit(POOL_LLM, call, provider)
+    results = run_tasks(POOL_IO, [lambda: read(a), lambda: read(b)], max_in_flight=4)
+
+Context propagation: thread-pool tasks run in a copy of the submitter's
+contextvars context, so the tenant, the workflow thread id (`thread_scope`),
+the trace span path (`span`), the turn memo and the cancellation token are
+all visible inside the task. Process-pool tasks cannot share a context; the
+values of variables registered with `register_portable_context` (tenant ids,
+thread id, span) are copied into the worker before the task runs.
+
+Each pool counts submitted/completed/failed tasks, the current queue depth
+(submitted but not started), active tasks and busy time, so
+`executor_stats()` reports queue depth and utilization (busy time over
+pool size x uptime) per pool. `shutdown_executors()` runs in the app
+lifespan shutdown and at exit.
+
+Environment:
+    OE_IO_WORKERS: Size of the io pool (default: 8)
+    OE_LLM_WORKERS: Size of the llm pool (default: OE_ROUTER_WORKERS, else 8)
+    OE_INGEST_WORKERS: Size of the ingest pool (default: 4)
+    OE_CPU_WORKERS: Processes in the cpu pool (default: CPU count)
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+POOL_IO = "io"
+POOL_LLM = "llm"
+POOL_INGEST = "ingest"
+POOL_CPU = "cpu"
+
+
+@dataclass(frozen=True)
+class PoolSpec:
+    """Kind and size settings of one named pool."""
+
+    name: str
+    kind: str  # "thread" | "process"
+    env: Tuple[str, ...]
+    default_size: Optional[int]  # None: CPU count
+
+    def size(self) -> int:
+        for name in self.env:
+            raw = os.getenv(name)
+            if raw is None:
+                continue
+            try:
+                return max(1, int(raw))
+            except ValueError:
+                break
+        return self.default_size or os.cpu_count() or 1
+
+
+POOL_SPECS: Dict[str, PoolSpec] = {
+    POOL_IO: PoolSpec(POOL_IO, "thread", ("OE_IO_WORKERS",), 8),
+    POOL_LLM: PoolSpec(POOL_LLM, "thread", ("OE_LLM_WORKERS", "OE_ROUTER_WORKERS"), 8),
+    POOL_INGEST: PoolSpec(POOL_INGEST, "thread", ("OE_INGEST_WORKERS",), 4),
+    POOL_CPU: PoolSpec(POOL_CPU, "process", ("OE_CPU_WORKERS",), None),
+}
+
+
+# =============================================================================
+# CONTEXT
+# =============================================================================
+
+CURRENT_THREAD_ID: ContextVar[Optional[str]] = ContextVar("OE_THREAD_ID", default=None)
+_SPAN: ContextVar[Tuple[str, ...]] = ContextVar("OE_SPAN", default=())
+_PORTABLE: Dict[str, ContextVar] = {}
+_LOCAL = threading.local()
+
+
+def register_portable_context(*variables: ContextVar) -> None:
+    """Copy these variables' values into process-pool workers (values must be picklable)."""
+
+    for variable in variables:
+        _PORTABLE[variable.name] = variable
+
+
+register_portable_context(CURRENT_THREAD_ID, _SPAN)
+
+
+def current_thread_id() -> Optional[str]:
+    """Workflow thread id of the turn this code runs for, if any."""
+
+    return CURRENT_THREAD_ID.get()
+
+
+@contextmanager
+def thread_scope(thread_id: Optional[str] = None) -> Iterator[None]:
+    """Bind the workflow thread id for the block (bind_thread_id() can refine it inside)."""
+
+    token = CURRENT_THREAD_ID.set(thread_id)
+    try:
+        yield
+    finally:
+        CURRENT_THREAD_ID.reset(token)
+
+
+def bind_thread_id(thread_id: Optional[str]) -> None:
+    """Set the thread id inside an enclosing thread_scope()."""
+
+    CURRENT_THREAD_ID.set(thread_id)
+
+
+@contextmanager
+def span(name: str) -> Iterator[str]:
+    """Nest a named span; yields the full span path ("turn/step3/calendar")."""
+
+    token = _SPAN.set(_SPAN.get() + (name,))
+    try:
+        yield current_span()
+    finally:
+        _SPAN.reset(token)
+
+
+def current_span() -> str:
+    return "/".join(_SPAN.get())
+
+
+def _portable_snapshot() -> Dict[str, Any]:
+    snapshot = {}
+    for name, variable in _PORTABLE.items():
+        value = variable.get(None)
+        if value is not None:
+            snapshot[name] = value
+    return snapshot
+
+
+def _run_portable(carried: Dict[str, Any], fn: Callable[..., T], args: tuple, kwargs: dict) -> Tuple[T, float]:
+    """Process-pool entry point: restore carried context, run, report busy time."""
+
+    def _call() -> T:
+        for name, value in carried.items():
+            variable = _PORTABLE.get(name)
+            if variable is not None:
+                variable.set(value)
+        return fn(*args, **kwargs)
+
+    started = time.perf_counter()
+    result = contextvars.Context().run(_call)
+    return result, time.perf_counter() - started
+
+
+# =============================================================================
+# POOLS
+# =============================================================================
+
+
+class ManagedPool:
+    """One named pool plus its queue/utilization counters."""
+
+    def __init__(self, spec: PoolSpec) -> None:
+        self.spec = spec
+        self.size = spec.size()
+        self._lock = threading.Lock()
+        self._created = time.monotonic()
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self._queued = 0
+        self._active = 0
+        self._max_queue_depth = 0
+        self._busy_s = 0.0
+        self._executor = self._create()
+
+    def _create(self) -> Executor:
+        if self.spec.kind == "process":
+            return ProcessPoolExecutor(max_workers=self.size)
+        return ThreadPoolExecutor(
+            max_workers=self.size,
+            thread_name_prefix=f"oe-{self.spec.name}",
+            initializer=self._mark_thread,
+        )
+
+    def _mark_thread(self) -> None:
+        _LOCAL.pool = self.spec.name
+
+    # -- bookkeeping ----------------------------------------------------------
+
+    def _enqueued(self) -> None:
+        with self._lock:
+            self._counters["submitted"] += 1
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth_locked())
+
+    def _started(self) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+    def _finished(self, busy_s: float) -> None:
+        with self._lock:
+            self._active -= 1
+            self._busy_s += busy_s
+
+    def _queue_depth_locked(self) -> int:
+        if self.spec.kind == "process":
+            # Start times are not visible from the parent: everything beyond the pool size waits
+            return max(0, self._queued - self.size)
+        return self._queued
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            if future.cancelled():
+                self._counters["cancelled"] += 1
+                self._queued -= 1
+            elif future.exception() is not None:
+                self._counters["failed"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    # -- submission -------------------------------------------------------------
+
+    def _run_in_thread(self, context: contextvars.Context, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        self._started()
+        started = time.perf_counter()
+        try:
+            return context.run(fn, *args, **kwargs)
+        finally:
+            self._finished(time.perf_counter() - started)
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        self._enqueued()
+        if self.spec.kind == "thread":
+            future = self._executor.submit(self._run_in_thread, contextvars.copy_context(), fn, args, kwargs)
+            future.add_done_callback(self._done)
+            return future
+
+        outer: "Future[T]" = Future()
+        inner = self._executor.submit(_run_portable, _portable_snapshot(), fn, args, kwargs)
+
+        def _relay(done: Future) -> None:
+            if done.cancelled():
+                outcome = "cancelled"
+                outer.cancel()
+            elif done.exception() is not None:
+                outcome = "failed"
+                outer.set_exception(done.exception())
+            else:
+                outcome = "completed"
+                result, busy_s = done.result()
+                with self._lock:
+                    self._busy_s += busy_s
+                outer.set_result(result)
+            with self._lock:
+                self._queued -= 1
+                self._counters[outcome] += 1
+
+        inner.add_done_callback(_relay)
+        return outer
+
+    def owns_current_thread(self) -> bool:
+        return getattr(_LOCAL, "pool", None) == self.spec.name
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = max(time.monotonic() - self._created, 1e-9)
+            in_flight = self._queued + self._active
+            active = self._active if self.spec.kind == "thread" else min(self._queued, self.size)
+            return {
+                "kind": self.spec.kind,
+                "size": self.size,
+                **self._counters,
+                "queue_depth": self._queue_depth_locked(),
+                "max_queue_depth": self._max_queue_depth,
+                "active": active,
+                "in_flight": in_flight,
+                "busy_s": round(self._busy_s, 3),
+                "utilization": round(min(1.0, self._busy_s / (self.size * uptime)), 4),
+            }
+
+    def shutdown(self, wait_for_tasks: bool = True) -> None:
+        self._executor.shutdown(wait=wait_for_tasks, cancel_futures=not wait_for_tasks)
+
+
+class ExecutorService:
+    """Named pools, created on first use."""
+
+    def __init__(self, specs: Optional[Dict[str, PoolSpec]] = None) -> None:
+        self._specs = dict(specs or POOL_SPECS)
+        self._pools: Dict[str, ManagedPool] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, name: str) -> ManagedPool:
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                if name not in self._specs:
+                    raise KeyError(f"Unknown executor pool: {name}")
+                pool = self._pools[name] = ManagedPool(self._specs[name])
+            return pool
+
+    def submit(self, name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        return self.pool(name).submit(fn, *args, **kwargs)
+
+    def run_tasks(self, name: str, tasks: Sequence[Callable[[], T]], max_in_flight: Optional[int] = None) -> List[T]:
+        """Run callables on a pool, at most max_in_flight at once; results in order.
+
+        Runs inline for a single task or when called from one of the pool's
+        own threads (nested fan-out cannot deadlock the pool).
+        """
+        if not tasks:
+            return []
+        pool = self.pool(name)
+        if len(tasks) == 1 or pool.owns_current_thread():
+            return [task() for task in tasks]
+
+        limit = max(1, int(max_in_flight or pool.size))
+        futures: List[Optional[Future]] = [None] * len(tasks)
+        in_flight = set()
+        for position, task in enumerate(tasks):
+            if len(in_flight) >= limit:
+                _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            future = pool.submit(task)
+            futures[position] = future
+            in_flight.add(future)
+        wait(in_flight)
+        return [future.result() for future in futures]  # type: ignore[union-attr]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pools = dict(self._pools)
+        return {
+            name: pools[name].stats() if name in pools else {"kind": spec.kind, "size": spec.size(), "started": False}
+            for name, spec in self._specs.items()
+        }
+
+    def shutdown(self, wait_for_tasks: bool = True) -> None:
+        """Shut every pool down; later submissions create fresh pools."""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait_for_tasks)
+
+
+_SERVICE = ExecutorService()
+
+
+def get_executor_service() -> ExecutorService:
+    return _SERVICE
+
+
+def submit(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """Run fn(*args, **kwargs) on the named pool."""
+    return _SERVICE.submit(name, fn, *args, **kwargs)
+
+
+def run_tasks(name: str, tasks: Sequence[Callable[[], T]], max_in_flight: Optional[int] = None) -> List[T]:
+    """ExecutorService.run_tasks on the shared service."""
+    return _SERVICE.run_tasks(name, tasks, max_in_flight)
+
+
+def executor_stats() -> Dict[str, Any]:
+    return _SERVICE.stats()
+
+
+def shutdown_executors(wait_for_tasks: bool = True) -> None:
+    _SERVICE.shutdown(wait_for_tasks)
+
+
+atexit.register(shutdown_executors, False)
+
+
+__all__ = [
+    "CURRENT_THREAD_ID",
+    "ExecutorService",
+    "ManagedPool",
+    "POOL_CPU",
+    "POOL_INGEST",
+    "POOL_IO",
+    "POOL_LLM",
+    "POOL_SPECS",
+    "PoolSpec",
+    "bind_thread_id",
+    "current_span",
+    "current_thread_id",
+    "executor_stats",
+    "get_executor_service",
+    "register_portable_context",
+    "run_tasks",
+    "shutdown_executors",
+    "span",
+    "submit",
+    "thread_scope",
+]
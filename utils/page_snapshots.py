@@ -33,7 +33,15 @@ def _use_supabase() -> bool:
     except ImportError:
         return False
 
-# Snapshot storage location
+
+def _current_tenant() -> str:
+    """Tenant owning new snapshots (lazy import to avoid circular deps)."""
+    try:
+        from workflows.io.tenants import DEFAULT_TENANT, current_tenant_id
+    except ImportError:
+        return "default"
+    return current_tenant_id() or DEFAULT_TENANT
+
 # Snapshot storage location
 if os.getenv("VERCEL") == "1":
     SNAPSHOTS_DIR = Path("/tmp/page_snapshots")
@@ -52,7 +60,7 @@ TTL_BY_TYPE = {
     "products": 7,     # Product/catering info (event-specific)
 }
 
-# Maximum snapshots to keep (cleanup old ones)
+# Maximum snapshots to keep per tenant (cleanup old ones)
 MAX_SNAPSHOTS = 500
 
 
@@ -99,17 +107,23 @@ def _cleanup_expired(snapshots: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _cleanup_overflow(snapshots: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove oldest snapshots if exceeding MAX_SNAPSHOTS."""
+    """Remove each tenant's oldest snapshots beyond MAX_SNAPSHOTS.
+
+    Quotas are per tenant, so a busy team cannot push another team's links out.
+    """
     if len(snapshots) <= MAX_SNAPSHOTS:
         return snapshots
 
-    # Sort by created_at and keep newest
-    sorted_snaps = sorted(
-        snapshots.items(),
-        key=lambda x: x[1].get("created_at", ""),
-        reverse=True
-    )
-    return dict(sorted_snaps[:MAX_SNAPSHOTS])
+    by_tenant: Dict[str, List[Any]] = {}
+    for item in snapshots.items():
+        by_tenant.setdefault(item[1].get("tenant_id") or "default", []).append(item)
+
+    kept: Dict[str, Any] = {}
+    for items in by_tenant.values():
+        # Sort by created_at and keep newest
+        items.sort(key=lambda x: x[1].get("created_at", ""), reverse=True)
+        kept.update(items[:MAX_SNAPSHOTS])
+    return kept
 
 
 def create_snapshot(
@@ -167,6 +181,7 @@ def create_snapshot(
         "created_at": now.isoformat(),
         "expires_at": expires.isoformat(),
         "event_id": event_id,
+        "tenant_id": _current_tenant(),
         "params": params or {},
         "data": data,
     }
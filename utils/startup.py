@@ -0,0 +1,374 @@
+"""Startup import profiling and warm-up for the FastAPI app.
+
+Two concerns live here so `app.lifespan` stays small:
+
+- Import profiling (`OE_IMPORT_PROFILE=1`): records per-module import time
+  (self and cumulative, like `python -X importtime`) while the app and its
+  routers are imported, and logs the slowest modules at startup.
+- Warm-up (`OE_WARMUP`): preloads what the first request would otherwise pay
+  for, before the app starts accepting traffic. Phases:
+
+    catalogs   rooms.json / products.json and the derived room catalogs
+    matchers   preference match indexes, keyword tables, room patterns
+    providers  LLM clients and agent adapters (only when keys are configured)
+    stub_turn  a synthetic message through the pre-filter, stub agent and
+               preference extraction (no LLM calls, no DB writes)
+
+  `OE_WARMUP` unset runs all phases; "0"/"off" disables warm-up; a comma list
+  (e.g. "catalogs,matchers") selects phases. `OE_WARMUP_TIMEOUT` bounds the
+  whole warm-up in seconds (default 30).
+
+CLI (profile an import in a fresh interpreter):
+    python -m utils.startup app --top 40
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PHASES: Tuple[str, ...] = ("catalogs", "matchers", "providers", "stub_turn")
+DEFAULT_WARMUP_TIMEOUT = 30.0
+
+_STUB_TURN_MESSAGE = {
+    "subject": "Workshop booking request",
+    "body": (
+        "Hello, we would like to book a room for a workshop with 25 participants "
+        "on 15.03.2026 from 09:00 to 17:00. We need a projector and a flipchart, "
+        "and coffee breaks would be great. Best regards, Anna"
+    ),
+}
+
+
+# =============================================================================
+# Import profiling
+# =============================================================================
+
+@dataclass
+class ImportRecord:
+    """Import timing for one module (microseconds, like -X importtime)."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class ImportProfiler:
+    """Times first-time imports by wrapping builtins.__import__."""
+
+    def __init__(self) -> None:
+        self.records: List[ImportRecord] = []
+        self._stack: List[List[int]] = []  # child time per open import
+        self._original: Optional[Callable[..., Any]] = None
+        self._lock = threading.RLock()
+
+    def start(self) -> "ImportProfiler":
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def stop(self) -> "ImportProfiler":
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+        return self
+
+    def _import(self, name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0) -> Any:
+        original = self._original or builtins.__import__
+        resolved = _resolve_import_name(name, globals, level)
+        if resolved is None or resolved in sys.modules or threading.current_thread() is not threading.main_thread():
+            return original(name, globals, locals, fromlist, level)
+        with self._lock:
+            self._stack.append([0])
+            started = time.perf_counter_ns()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = (time.perf_counter_ns() - started) // 1000
+                (children,) = self._stack.pop()
+                if self._stack:
+                    self._stack[-1][0] += elapsed
+                self.records.append(
+                    ImportRecord(resolved, max(0, elapsed - children), elapsed, len(self._stack))
+                )
+
+    def total_us(self) -> int:
+        return sum(record.cumulative_us for record in self.records if record.depth == 0)
+
+    def by_package(self) -> List[Tuple[str, int]]:
+        """Self time summed per top-level package, slowest first."""
+        totals: Counter = Counter()
+        for record in self.records:
+            totals[record.name.split(".", 1)[0]] += record.self_us
+        return totals.most_common()
+
+    def format_report(self, top: int = 25) -> str:
+        """Slowest imports by cumulative time plus per-package self time."""
+        lines = [f"Import profile: {len(self.records)} modules, {self.total_us() / 1000:.1f} ms total"]
+        lines.append("import time: self [us] | cumulative | imported package")
+        slowest = sorted(self.records, key=lambda record: record.cumulative_us, reverse=True)[:top]
+        for record in slowest:
+            lines.append(
+                f"import time: {record.self_us:>9} | {record.cumulative_us:>10} | "
+                f"{'  ' * record.depth}{record.name}"
+            )
+        lines.append("self time by package:")
+        for package, self_us in self.by_package()[:top]:
+            lines.append(f"  {package:<30} {self_us / 1000:>8.1f} ms")
+        return "\n".join(lines)
+
+    def to_dict(self, top: int = 25) -> Dict[str, Any]:
+        slowest = sorted(self.records, key=lambda record: record.cumulative_us, reverse=True)[:top]
+        return {
+            "modules": len(self.records),
+            "total_ms": round(self.total_us() / 1000, 1),
+            "slowest": [
+                {"module": r.name, "self_ms": round(r.self_us / 1000, 1), "cumulative_ms": round(r.cumulative_us / 1000, 1)}
+                for r in slowest
+            ],
+            "by_package_ms": {package: round(us / 1000, 1) for package, us in self.by_package()[:top]},
+        }
+
+
+def _resolve_import_name(name: str, globals: Any, level: int) -> Optional[str]:
+    if level == 0:
+        return name
+    if not isinstance(globals, dict):
+        return None
+    package = globals.get("__package__") or globals.get("__name__", "").rpartition(".")[0]
+    try:
+        return importlib.util.resolve_name("." * level + name, package)
+    except (ImportError, ValueError):
+        return None
+
+
+def is_import_profile_enabled() -> bool:
+    return os.getenv("OE_IMPORT_PROFILE", "0") == "1"
+
+
+_IMPORT_PROFILER: Optional[ImportProfiler] = None
+
+
+@contextmanager
+def profile_imports() -> Iterator[ImportProfiler]:
+    """Profile imports inside the block; the profiler is kept for the startup report."""
+    global _IMPORT_PROFILER
+    profiler = ImportProfiler().start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _IMPORT_PROFILER = profiler
+
+
+def get_import_profile() -> Optional[ImportProfiler]:
+    return _IMPORT_PROFILER
+
+
+# =============================================================================
+# Warm-up
+# =============================================================================
+
+@dataclass
+class PhaseResult:
+    name: str
+    ok: bool
+    duration_ms: float
+    detail: str = ""
+
+
+@dataclass
+class StartupReport:
+    """Outcome of the warm-up phases, exposed to health/debug endpoints."""
+
+    phases: List[PhaseResult] = field(default_factory=list)
+    duration_ms: float = 0.0
+    ready: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        profile = get_import_profile()
+        return {
+            "ready": self.ready,
+            "warmup_ms": round(self.duration_ms, 1),
+            "phases": [
+                {"name": p.name, "ok": p.ok, "duration_ms": round(p.duration_ms, 1), "detail": p.detail}
+                for p in self.phases
+            ],
+            "imports": profile.to_dict(top=10) if profile else None,
+        }
+
+
+_STARTUP_REPORT = StartupReport()
+
+
+def get_startup_report() -> StartupReport:
+    return _STARTUP_REPORT
+
+
+def configured_phases() -> List[str]:
+    """Warm-up phases selected by OE_WARMUP (all phases when unset)."""
+    raw = os.getenv("OE_WARMUP")
+    if raw is None or raw.strip().lower() in {"1", "true", "on", "all"}:
+        return list(WARMUP_PHASES)
+    if raw.strip().lower() in {"", "0", "false", "off", "no", "none"}:
+        return []
+    requested = [item.strip().lower() for item in raw.split(",") if item.strip()]
+    unknown = [item for item in requested if item not in WARMUP_PHASES]
+    if unknown:
+        logger.warning("[STARTUP] Ignoring unknown warm-up phases: %s", ", ".join(unknown))
+    return [phase for phase in WARMUP_PHASES if phase in requested]
+
+
+def warmup_timeout() -> float:
+    try:
+        return float(os.getenv("OE_WARMUP_TIMEOUT", DEFAULT_WARMUP_TIMEOUT))
+    except ValueError:
+        return DEFAULT_WARMUP_TIMEOUT
+
+
+def _warm_catalogs() -> str:
+    from services.products import list_product_records
+    from services.rooms import load_room_catalog
+    from workflows.common import capacity, catalog
+    from workflows.nlu import preferences
+
+    rooms = load_room_catalog()
+    products = list_product_records()
+    catalog._rooms_payload()
+    capacity._room_catalog()
+    preferences._room_catalog()
+    return f"{len(rooms)} rooms, {len(products)} products"
+
+
+def _warm_matchers() -> str:
+    from detection.response import matchers
+    from services import products
+    from workflows.nlu import preferences
+
+    preferences._room_feature_sets()
+    variants = len(preferences._variant_index())
+    features = len(preferences._feature_index())
+    products._build_category_keywords()
+    patterns = len(matchers._room_patterns_from_catalog())
+    return f"{variants} product variants, {features} features, {patterns} room patterns"
+
+
+def _provider_configured(provider: str) -> bool:
+    from llm.client import is_llm_available
+
+    if provider == "openai":
+        return is_llm_available()
+    if provider == "gemini":
+        return bool(os.getenv("GOOGLE_API_KEY") or os.getenv("gemini_key_openevent"))
+    return provider == "stub"
+
+
+def _warm_providers() -> str:
+    from adapters.agent_adapter import get_adapter_for_provider, get_agent_adapter
+    from llm.client import get_openai_client
+    from llm.provider_config import get_verbalization_provider
+
+    opened: List[str] = []
+    if _provider_configured("openai"):
+        get_openai_client()
+        opened.append("openai client")
+    agent_mode = os.getenv("AGENT_MODE", "stub").lower()
+    agent_provider = "gemini" if agent_mode == "hybrid" else agent_mode
+    if _provider_configured(agent_provider):
+        opened.append(f"agent:{type(get_agent_adapter()).__name__}")
+    verbalizer = get_verbalization_provider()
+    if verbalizer != "stub" and _provider_configured(verbalizer):
+        get_adapter_for_provider(verbalizer)
+        opened.append(f"verbalizer:{verbalizer}")
+    return ", ".join(opened) or "no provider keys configured"
+
+
+def _warm_stub_turn() -> str:
+    from adapters.agent_adapter import StubAgentAdapter
+    from detection.pre_filter import pre_filter
+    from workflows.nlu.preferences import extract_preferences
+
+    body = _STUB_TURN_MESSAGE["body"]
+    pre_filter(body)
+    analysis = StubAgentAdapter().analyze_message(dict(_STUB_TURN_MESSAGE))
+    fields = analysis.get("fields") if isinstance(analysis, dict) else None
+    extract_preferences(dict(fields or {}, wish_products=["projector", "flipchart"]), body)
+    return f"intent={analysis.get('intent') if isinstance(analysis, dict) else None}"
+
+
+_PHASE_RUNNERS: Dict[str, Callable[[], str]] = {
+    "catalogs": _warm_catalogs,
+    "matchers": _warm_matchers,
+    "providers": _warm_providers,
+    "stub_turn": _warm_stub_turn,
+}
+
+
+def run_warmup(phases: Optional[Sequence[str]] = None) -> StartupReport:
+    """Run warm-up phases in order; a failing phase is logged and skipped."""
+    global _STARTUP_REPORT
+    report = StartupReport()
+    started = time.perf_counter()
+    for name in configured_phases() if phases is None else phases:
+        runner = _PHASE_RUNNERS.get(name)
+        if runner is None:
+            continue
+        phase_started = time.perf_counter()
+        try:
+            detail = runner()
+            ok = True
+        except Exception as exc:  # warm-up must never block startup
+            detail = f"{type(exc).__name__}: {exc}"
+            ok = False
+            logger.warning("[STARTUP] Warm-up phase %s failed: %s", name, detail)
+        result = PhaseResult(name, ok, (time.perf_counter() - phase_started) * 1000, detail)
+        report.phases.append(result)
+        logger.info("[STARTUP] Warm-up %s: %.0f ms (%s)", name, result.duration_ms, detail)
+    report.duration_ms = (time.perf_counter() - started) * 1000
+    report.ready = True
+    _STARTUP_REPORT = report
+    return report
+
+
+def _main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profile module import time")
+    parser.add_argument("module", nargs="?", default="app")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+    with profile_imports() as profiler:
+        __import__(args.module)
+    print(profiler.format_report(top=args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
+
+
+__all__ = [
+    "ImportProfiler",
+    "StartupReport",
+    "WARMUP_PHASES",
+    "configured_phases",
+    "get_import_profile",
+    "get_startup_report",
+    "is_import_profile_enabled",
+    "profile_imports",
+    "run_warmup",
+    "warmup_timeout",
+]
@@ -5,6 +5,7 @@ from ux import verbalizer_payloads
 from ux import verbalizer_safety
 from ux import safety_sandwich_wiring
 from ux import universal_verbalizer
+from ux import verbalizer_cache
 
 __all__ = [
     "verb_rubric",
@@ -12,4 +13,5 @@ __all__ = [
     "verbalizer_safety",
     "safety_sandwich_wiring",
     "universal_verbalizer",
+    "verbalizer_cache",
 ]
\ No newline at end of file
@@ -29,18 +29,30 @@ Implementation:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 import re
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from dateutil import parser as dateutil_parser
 
+from llm.prompt_cache import prefix_hash, prompt_call
+from utils.cancellation import check_cancelled
 from workflows.io.config_store import get_venue_name, get_venue_city
+from ux.verbalizer_cache import (
+    build_cache_key,
+    fingerprint_facts,
+    get_verbalization_cache,
+    is_cache_enabled,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -456,39 +468,27 @@ def verbalize_message(
     if not fallback_text or not fallback_text.strip():
         return fallback_text
 
-    # Skip verbalization for structured QnA responses with tables
-    # These are already processed by qna/verbalizer.py and contain structured data
-    # that must be preserved exactly (tables, NEXT STEP blocks, etc.)
-    if _contains_structured_content(fallback_text):
-        logger.warning(
-            f"[VERBALIZER_BYPASS] Skipping structured content: step={context.step}, topic={context.topic}"
-        )
-        # Make bypass visible in dev mode
-        if os.getenv("OE_FALLBACK_DIAGNOSTICS", "").lower() in ("1", "true", "yes"):
-            return f"[VERBALIZER_BYPASS: structured_content] {fallback_text}"
-        return fallback_text
+    bypass_text = _bypass_text(fallback_text, context)
+    if bypass_text is not None:
+        return bypass_text
 
-    tone = _resolve_tone()
-    if tone == "plain":
-        logger.warning(f"[VERBALIZER_BYPASS] Plain tone mode: step={context.step}, topic={context.topic}")
-        if os.getenv("OE_FALLBACK_DIAGNOSTICS", "").lower() in ("1", "true", "yes"):
-            return f"[VERBALIZER_BYPASS: plain_tone] {fallback_text}"
-        return fallback_text
+    # Chat SSE path registered a sink: stream tokens as they are generated
+    sink = _STREAM_SINK.get()
+    if sink is not None:
+        return _verbalize_into_sink(fallback_text, context, locale, sink)
 
-    # Check if LLM is available
-    from utils.openai_key import load_openai_api_key
     from core.fallback import create_fallback_context, wrap_fallback
 
-    api_key = load_openai_api_key(required=False)
-    if not api_key:
-        ctx = create_fallback_context(
-            source="ux.verbalizer",
-            trigger="no_api_key",
-            step=context.step,
-            topic=context.topic,
-        )
-        return wrap_fallback(fallback_text, ctx)
+    # Identical rendering already verified earlier - skip the LLM call
+    cache_key = _cache_key(fallback_text, context, locale)
+    if cache_key is not None:
+        cached = get_verbalization_cache().get(cache_key)
+        if cached is not None:
+            logger.debug(f"universal_verbalizer: cache hit for step={context.step}, topic={context.topic}")
+            return cached
 
+    # Abort the turn instead of paying for a verbalization nobody will read
+    check_cancelled("verbalizer")
     try:
         prompt_payload = _build_prompt(context, fallback_text, locale)
         llm_text = _call_llm(prompt_payload)
@@ -531,6 +531,7 @@ def verbalize_message(
             logger.info(
                 f"universal_verbalizer: patched successfully for step={context.step}, topic={context.topic}"
             )
+            _cache_store(cache_key, patched_text)
             return patched_text
         else:
             # Patching didn't fully fix it - fall back to original text
@@ -544,9 +545,91 @@ def verbalize_message(
             return fallback_text
 
     logger.debug(f"universal_verbalizer: success for step={context.step}, topic={context.topic}")
+    _cache_store(cache_key, llm_text)
     return llm_text
 
 
+def _prompt_version(context: MessageContext) -> str:
+    """Hash of the prompt parts that shape the output for this step/topic."""
+    system_template, step_prompts = _get_effective_prompts()
+    material = "\x1f".join([
+        system_template,
+        step_prompts.get(context.step, ""),
+        TOPIC_HINTS.get(context.topic, ""),
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_key(fallback_text: str, context: MessageContext, locale: str) -> Optional[str]:
+    """Verbalization cache key, or None when caching is off or the key can't be built."""
+    if not is_cache_enabled():
+        return None
+    try:
+        return build_cache_key(
+            step=context.step,
+            topic=context.topic,
+            tone=_resolve_tone(),
+            locale=locale,
+            fallback_text=fallback_text,
+            fact_fingerprint=fingerprint_facts(
+                context.extract_hard_facts(), _format_facts_for_prompt(context)
+            ),
+            prompt_version=_prompt_version(context),
+        )
+    except Exception as exc:
+        logger.debug(f"universal_verbalizer: cache key unavailable: {exc}")
+        return None
+
+
+def _cache_store(cache_key: Optional[str], text: str) -> None:
+    """Store verified output (callers only pass text that passed verification)."""
+    if cache_key is not None:
+        get_verbalization_cache().put(cache_key, text)
+
+
+def _bypass_text(fallback_text: str, context: MessageContext) -> Optional[str]:
+    """
+    Return the text to send without calling the LLM, or None to verbalize.
+
+    Shared by the blocking and streaming paths: structured content, plain
+    tone and a missing API key all skip the LLM.
+    """
+    # Skip verbalization for structured QnA responses with tables
+    # These are already processed by qna/verbalizer.py and contain structured data
+    # that must be preserved exactly (tables, NEXT STEP blocks, etc.)
+    if _contains_structured_content(fallback_text):
+        logger.warning(
+            f"[VERBALIZER_BYPASS] Skipping structured content: step={context.step}, topic={context.topic}"
+        )
+        # Make bypass visible in dev mode
+        if os.getenv("OE_FALLBACK_DIAGNOSTICS", "").lower() in ("1", "true", "yes"):
+            return f"[VERBALIZER_BYPASS: structured_content] {fallback_text}"
+        return fallback_text
+
+    tone = _resolve_tone()
+    if tone == "plain":
+        logger.warning(f"[VERBALIZER_BYPASS] Plain tone mode: step={context.step}, topic={context.topic}")
+        if os.getenv("OE_FALLBACK_DIAGNOSTICS", "").lower() in ("1", "true", "yes"):
+            return f"[VERBALIZER_BYPASS: plain_tone] {fallback_text}"
+        return fallback_text
+
+    # Check if LLM is available
+    from utils.openai_key import load_openai_api_key
+    from core.fallback import create_fallback_context, wrap_fallback
+
+    api_key = load_openai_api_key(required=False)
+    if not api_key:
+        ctx = create_fallback_context(
+            source="ux.verbalizer",
+            trigger="no_api_key",
+            step=context.step,
+            topic=context.topic,
+        )
+        return wrap_fallback(fallback_text, ctx)
+
+    return None
+
+
 def _resolve_tone() -> str:
     """Determine verbalization tone from environment.
 
@@ -579,39 +662,37 @@ from pathlib import Path
 # Dynamic Prompt Loading
 # =============================================================================
 
-_PROMPT_CACHE: Dict[str, Any] = {
-    "ts": 0,
-    "data": None  # Lazy-loaded to use dynamic venue config from _build_system_prompt()
-}
+# Per-tenant entries {"ts", "data"}: each team's prompt overrides are cached separately
+_PROMPT_CACHE: Dict[str, Dict[str, Any]] = {}
 _CACHE_TTL = 30.0  # seconds
 
 def _get_effective_prompts() -> Tuple[str, Dict[int, str]]:
     """
     Load effective prompts (DB overrides merged with defaults).
-    Cached for performance.
+    Cached per tenant for performance.
 
     Uses dynamic venue config for the default system prompt.
     """
-    global _PROMPT_CACHE
+    # Avoid circular imports
+    from workflows.io.tenants import current_tenant_id, tenant_partition
+
+    tenant = current_tenant_id()
+    cached = _PROMPT_CACHE.get(tenant)
     now = time.time()
 
-    if now - _PROMPT_CACHE["ts"] < _CACHE_TTL:
-        return _PROMPT_CACHE["data"]
+    if cached and now - cached["ts"] < _CACHE_TTL:
+        return cached["data"]
 
     try:
-        # Avoid circular imports
-        from workflows.io.database import load_db
-        from workflow_email import DB_PATH
-
         # Build dynamic default prompt with current venue config
         default_system_prompt = _build_system_prompt()
 
-        # Load DB using canonical path
-        if not DB_PATH.exists():
+        # Tenant config snapshot (re-read only when the database file changes)
+        partition = tenant_partition(tenant)
+        if not partition.db_path.exists() and partition.parent is None:
             return default_system_prompt, STEP_PROMPTS
 
-        db = load_db(DB_PATH)
-        config = db.get("config", {}).get("prompts", {})
+        config = partition.config().get("prompts") or {}
 
         # Use DB override if set, otherwise use dynamic venue-aware default
         system_prompt = config.get("system_prompt") or default_system_prompt
@@ -625,7 +706,7 @@ def _get_effective_prompts() -> Tuple[str, Dict[int, str]]:
             except ValueError:
                 pass
 
-        _PROMPT_CACHE = {
+        _PROMPT_CACHE[tenant] = {
             "ts": now,
             "data": (system_prompt, step_prompts)
         }
@@ -634,7 +715,9 @@ def _get_effective_prompts() -> Tuple[str, Dict[int, str]]:
     except Exception as exc:
         logger.warning(f"universal_verbalizer: failed to load prompts config: {exc}")
         # Return fallback (potentially stale cache or hard defaults)
-        return _PROMPT_CACHE["data"]
+        if cached:
+            return cached["data"]
+        return _build_system_prompt(), STEP_PROMPTS
 
 
 # =============================================================================
@@ -663,10 +746,12 @@ def _build_prompt(
     # Locale instruction
     locale_instruction = "Write in German (Deutsch)." if locale == "de" else "Write in English."
 
+    # Layout for provider-side prompt caching: the venue/rules/examples
+    # template is identical for every call and goes first, followed by the
+    # step guidance (one per step) and the topic; locale, draft and facts
+    # are per-turn and go into the user message.
     system_content = f"""{system_template}
 
-{locale_instruction}
-
 STEP {context.step} CONTEXT:
 {step_guidance}
 
@@ -674,7 +759,9 @@ TOPIC: {context.topic}
 {f"Hint: {topic_hint}" if topic_hint else ""}
 """
 
-    user_content = f"""Transform this message into warm, human-like communication:
+    user_content = f"""{locale_instruction}
+
+Transform this message into warm, human-like communication:
 
 ORIGINAL MESSAGE:
 {fallback_text}
@@ -687,6 +774,8 @@ Return ONLY the transformed message text. Do not include explanations or metadat
     return {
         "system": system_content,
         "user": user_content,
+        "prefix": system_template,
+        "prefix_hash": prefix_hash(system_template),
     }
 
 # ... (rest of file)
@@ -761,12 +850,36 @@ def _call_llm(payload: Dict[str, Any]) -> str:
 
     # Call the adapter's complete method
     # Note: json_mode=False because verbalization outputs prose, not JSON
-    return adapter.complete(
-        prompt=prompt,
-        system_prompt=payload["system"],
-        temperature=0.3,  # Slightly higher for natural variation
-        json_mode=False,  # Verbalization outputs prose, not JSON
-    )
+    with prompt_call(
+        "universal_verbalizer",
+        payload.get("prefix", payload["system"]),
+        prompt_text=f"{payload['system']}\n{prompt}",
+    ):
+        return adapter.complete(
+            prompt=prompt,
+            system_prompt=payload["system"],
+            temperature=0.3,  # Slightly higher for natural variation
+            json_mode=False,  # Verbalization outputs prose, not JSON
+        )
+
+
+def _call_llm_stream(payload: Dict[str, Any]) -> Iterator[str]:
+    """Stream the verbalization completion as text deltas."""
+    from adapters.agent_adapter import get_adapter_for_provider
+    from llm.provider_config import get_verbalization_provider
+
+    provider = get_verbalization_provider()
+    adapter = get_adapter_for_provider(provider)
+    with prompt_call(
+        "universal_verbalizer_stream",
+        payload.get("prefix", payload["system"]),
+        prompt_text=f"{payload['system']}\n{payload['user']}",
+    ):
+        yield from adapter.complete_stream(
+            prompt=payload["user"],
+            system_prompt=payload["system"],
+            temperature=0.3,
+        )
 
 
 # =============================================================================
@@ -780,6 +893,45 @@ def _call_llm(payload: Dict[str, Any]) -> str:
 # 3. Is simpler to maintain - one parsing function handles all formats
 
 
+# Patterns that look like dates - we extract these, then let dateutil parse.
+# Compiled once at import; the verifier runs on every verbalized message and
+# in bulk via ux.verbalizer_batch.
+_DATE_CANDIDATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        # Numeric formats: DD.MM.YYYY, DD/MM/YYYY, D/M/YY
+        r'\d{1,2}[./]\d{1,2}[./]\d{2,4}',
+        # ISO format: YYYY-MM-DD
+        r'\d{4}-\d{2}-\d{2}',
+        # Month name first: July 1, 2026 / Jul 1st, 2026 / July 01 2026
+        r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|'
+        r'Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|'
+        r'Dec(?:ember)?)\.?\s+\d{1,2}(?:st|nd|rd|th)?[,\s]+\d{4}',
+        # Day first with month name: 1 July 2026 / 1st of July, 2026
+        r'\d{1,2}(?:st|nd|rd|th)?(?:\s+of)?\s+'
+        r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|'
+        r'Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|'
+        r'Dec(?:ember)?)\.?[,\s]+\d{4}',
+    )
+]
+
+# Pattern to identify ISO format (YYYY-MM-DD) - these should NOT use dayfirst
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_candidate(match: str) -> Optional[datetime]:
+    """Parse one date-like match (cached - the same strings recur across messages)."""
+    try:
+        # ISO format (YYYY-MM-DD) is unambiguous - don't use dayfirst
+        # Other formats use dayfirst=True for European preference (DD.MM.YYYY)
+        is_iso = _ISO_DATE_RE.match(match) is not None
+        return dateutil_parser.parse(match, dayfirst=not is_iso, fuzzy=False)
+    except (ValueError, OverflowError):
+        # Not a valid date, skip
+        return None
+
+
 def _extract_dates_from_text(text: str) -> List[datetime]:
     """
     Extract all date-like patterns from text and parse them to datetime objects.
@@ -796,49 +948,26 @@ def _extract_dates_from_text(text: str) -> List[datetime]:
     Returns:
         List of parsed datetime objects (may be empty if no valid dates found)
     """
-    # Patterns that look like dates - we extract these, then let dateutil parse
-    date_patterns = [
-        # Numeric formats: DD.MM.YYYY, DD/MM/YYYY, D/M/YY
-        r'\d{1,2}[./]\d{1,2}[./]\d{2,4}',
-        # ISO format: YYYY-MM-DD
-        r'\d{4}-\d{2}-\d{2}',
-        # Month name first: July 1, 2026 / Jul 1st, 2026 / July 01 2026
-        r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|'
-        r'Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|'
-        r'Dec(?:ember)?)\.?\s+\d{1,2}(?:st|nd|rd|th)?[,\s]+\d{4}',
-        # Day first with month name: 1 July 2026 / 1st of July, 2026
-        r'\d{1,2}(?:st|nd|rd|th)?(?:\s+of)?\s+'
-        r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|'
-        r'Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|'
-        r'Dec(?:ember)?)\.?[,\s]+\d{4}',
-    ]
-
     found_dates: List[datetime] = []
     seen_matches: set = set()  # Avoid parsing the same match twice
 
-    # Pattern to identify ISO format (YYYY-MM-DD) - these should NOT use dayfirst
-    iso_pattern = re.compile(r'^\d{4}-\d{2}-\d{2}$')
-
-    for pattern in date_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
+    for pattern in _DATE_CANDIDATE_PATTERNS:
+        for match in pattern.findall(text):
             if match in seen_matches:
                 continue
             seen_matches.add(match)
-            try:
-                # ISO format (YYYY-MM-DD) is unambiguous - don't use dayfirst
-                # Other formats use dayfirst=True for European preference (DD.MM.YYYY)
-                is_iso = iso_pattern.match(match) is not None
-                parsed = dateutil_parser.parse(match, dayfirst=not is_iso, fuzzy=False)
+            parsed = _parse_date_candidate(match)
+            if parsed is not None:
                 found_dates.append(parsed)
-            except ValueError:
-                # Not a valid date, skip
-                pass
 
     return found_dates
 
 
-def _verify_date_semantic(source_date_str: str, llm_text: str) -> bool:
+def _verify_date_semantic(
+    source_date_str: str,
+    llm_text: str,
+    found_dates: Optional[List[datetime]] = None,
+) -> bool:
     """
     Verify a date semantically by parsing and comparing datetime objects.
 
@@ -849,6 +978,8 @@ def _verify_date_semantic(source_date_str: str, llm_text: str) -> bool:
     Args:
         source_date_str: The source date in DD.MM.YYYY format (our internal format)
         llm_text: The LLM-generated text to verify
+        found_dates: Dates already extracted from llm_text (avoids re-parsing
+            the text once per source date)
 
     Returns:
         True if the source date appears in any valid format in the text
@@ -859,7 +990,8 @@ def _verify_date_semantic(source_date_str: str, llm_text: str) -> bool:
         source_date = source_dt.date()
 
         # Extract all dates from LLM output
-        found_dates = _extract_dates_from_text(llm_text)
+        if found_dates is None:
+            found_dates = _extract_dates_from_text(llm_text)
 
         # Check if any extracted date matches the source (same calendar day)
         for found_dt in found_dates:
@@ -877,6 +1009,11 @@ def _verify_date_semantic(source_date_str: str, llm_text: str) -> bool:
         return source_date_str in llm_text
 
 
+# Invented-fact scans in _verify_facts
+_DDMMYYYY_RE = re.compile(r"\b(\d{1,2}\.\d{1,2}\.\d{4})\b")
+_CHF_AMOUNT_RE = re.compile(r"\bCHF\s*(\d+(?:[.,]\d{1,2})?)\b", re.IGNORECASE)
+
+
 def _verify_facts(
     llm_text: str,
     hard_facts: Dict[str, List[str]],
@@ -914,8 +1051,10 @@ def _verify_facts(
     # Check dates - semantic verification (format-agnostic)
     # Uses dateutil to parse dates from LLM output and compare as datetime objects
     # This avoids maintaining a list of format variants and eliminates ambiguity
-    for date in hard_facts.get("dates", []):
-        if not _verify_date_semantic(date, llm_text):
+    expected_dates = hard_facts.get("dates", [])
+    found_dates = _extract_dates_from_text(llm_text) if expected_dates else []
+    for date in expected_dates:
+        if not _verify_date_semantic(date, llm_text, found_dates):
             missing.append(f"date:{date}")
 
     # Check room names (case-insensitive, flexible matching)
@@ -1050,10 +1189,9 @@ def _verify_facts(
 
     # Check for invented dates (be lenient - only flag if clearly wrong)
     # Skip this check if no dates were expected (empty context = nothing to invent against)
-    date_pattern = re.compile(r"\b(\d{1,2}\.\d{1,2}\.\d{4})\b")
     valid_dates = set(hard_facts.get("dates", []))
     if valid_dates:  # Only check for invented dates if we have expected dates
-        for match in date_pattern.finditer(llm_text):
+        for match in _DDMMYYYY_RE.finditer(llm_text):
             found_date = match.group(1)
             if found_date not in valid_dates:
                 # Check if it's just a reformatted version of a valid date
@@ -1073,7 +1211,6 @@ def _verify_facts(
 
     # Check for invented amounts - be more lenient
     # Use apostrophe-removed text for matching Swiss format (1'500 -> 1500)
-    amount_pattern = re.compile(r"\bCHF\s*(\d+(?:[.,]\d{1,2})?)\b", re.IGNORECASE)
     canonical_amounts = set()
     canonical_floats: List[float] = []  # For calculating valid subtotals
 
@@ -1111,7 +1248,7 @@ def _verify_facts(
     # Search in apostrophe-removed text to handle Swiss format (CHF 1'500)
     # Skip this check if no amounts were expected (empty context = nothing to invent against)
     if canonical_amounts:
-        for match in amount_pattern.finditer(text_no_apostrophe):
+        for match in _CHF_AMOUNT_RE.finditer(text_no_apostrophe):
             found_amount = match.group(1).replace(",", ".")
             found_no_decimal = re.sub(r"\.00$", "", found_amount)
             found_int = str(int(float(found_amount))) if "." in found_amount else found_amount
@@ -1255,6 +1392,277 @@ def _patch_facts(
     return (llm_text, False)
 
 
+# =============================================================================
+# Streaming Verbalization
+# =============================================================================
+# The chat SSE path registers a sink for the turn (see verbalizer_stream_sink).
+# verbalize_message then streams LLM deltas to the sink while an incremental
+# verifier watches for invented dates/amounts. Only verified text is sent, and
+# spans containing numbers are held until the words after them are checked. If
+# an invented fact appears, the LLM stream is closed and the client is switched
+# to the deterministic fallback text. Missing facts can only be judged at the
+# end of the stream. Each delta is a cancellation checkpoint. The chat path
+# only forwards deltas of replies that need no HIL review (see
+# agents.chatkit_runner._fallback_stream).
+
+
+@dataclass
+class VerbalizerStreamEvent:
+    """One event of a streamed verbalization.
+
+    kind:
+        "delta" - append `text` to the message being shown
+        "reset" - discard the streamed text and show `text` instead
+        "final" - authoritative full message (same value verbalize_message returns)
+    """
+
+    kind: str
+    text: str
+
+
+VerbalizerStreamSink = Callable[[VerbalizerStreamEvent], None]
+
+_STREAM_SINK: ContextVar[Optional[VerbalizerStreamSink]] = ContextVar(
+    "verbalizer_stream_sink", default=None
+)
+
+
+@contextmanager
+def verbalizer_stream_sink(sink: VerbalizerStreamSink) -> Iterator[None]:
+    """Stream every verbalize_message call in this context to `sink`."""
+    token = _STREAM_SINK.set(sink)
+    try:
+        yield
+    finally:
+        _STREAM_SINK.reset(token)
+
+
+def is_streaming_enabled() -> bool:
+    """Check VERBALIZER_STREAMING (off by default)."""
+    return os.getenv("VERBALIZER_STREAMING", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Invented-fact checks only need to rerun when new text has digits or a unit
+_FACT_TRIGGER_PATTERN = re.compile(r"\d|\bper\b", re.IGNORECASE)
+
+# Invented facts that cannot be patched after the fact - abort the stream early
+_HARD_INVENTED_PREFIXES = ("date:", "amount:")
+
+# Plain words that must follow a number before it is shown to the client
+_HOLD_WORDS = 3
+
+
+class IncrementalFactVerifier:
+    """
+    Verify streamed LLM text against the hard facts as it arrives.
+
+    Only the settled prefix (up to the last whitespace) is checked, so a
+    value split across deltas ("CHF 1" + "50") is never judged half-written.
+    Uses the same rules as _verify_facts, so streamed and blocking output
+    are held to the same standard.
+
+    Text is released to the client only once checked, and a span with a
+    number in it ("15th of March", "CHF 1 500") is held back until
+    _HOLD_WORDS plain words follow it: the words after a number can still
+    turn it into an invented date or amount.
+    """
+
+    def __init__(self, hard_facts: Dict[str, List[str]], topic: str = "") -> None:
+        self.hard_facts = hard_facts
+        self.topic = topic
+        self.text = ""
+        self.invented: List[str] = []
+        self._checked_upto = 0
+        self._released_upto = 0
+        self._hold_from: Optional[int] = None
+
+    def feed(self, delta: str) -> bool:
+        """Append a delta; return False once an invented date/amount is settled."""
+        self.text += delta
+        settled_end = max(self.text.rfind(" "), self.text.rfind("\n"))
+        if settled_end <= self._checked_upto:
+            return True
+        new_segment = self.text[self._checked_upto:settled_end]
+        self._checked_upto = settled_end
+        recheck = self._hold_from is not None or _FACT_TRIGGER_PATTERN.search(new_segment)
+        self._update_hold()
+        if not recheck:
+            return True
+        _, _, invented = _verify_facts(self.text[:settled_end], self.hard_facts, topic=self.topic)
+        self.invented = invented
+        return not any(item.startswith(_HARD_INVENTED_PREFIXES) for item in invented)
+
+    def _update_hold(self) -> None:
+        hold_from: Optional[int] = None
+        plain_after = 0
+        for word in re.finditer(r"\S+", self.text[self._released_upto:self._checked_upto]):
+            if _FACT_TRIGGER_PATTERN.search(word.group()):
+                if hold_from is None:
+                    hold_from = self._released_upto + word.start()
+                plain_after = 0
+            elif hold_from is not None:
+                plain_after += 1
+                if plain_after >= _HOLD_WORDS:
+                    hold_from = None
+        self._hold_from = hold_from
+
+    def releasable(self) -> str:
+        """Checked text not yet released, up to any held number span."""
+        end = self._checked_upto if self._hold_from is None else self._hold_from
+        chunk = self.text[self._released_upto:end]
+        self._released_upto = max(self._released_upto, end)
+        return chunk
+
+    def remainder(self) -> str:
+        """Everything not yet released (after finish() passed)."""
+        chunk = self.text[self._released_upto:]
+        self._released_upto = len(self.text)
+        self._hold_from = None
+        return chunk
+
+    def finish(self) -> Tuple[bool, List[str], List[str]]:
+        """Full verification of the complete text (missing + invented facts)."""
+        return _verify_facts(self.text, self.hard_facts, topic=self.topic)
+
+
+def stream_verbalize_message(
+    fallback_text: str,
+    context: MessageContext,
+    *,
+    locale: str = "en",
+) -> Iterator[VerbalizerStreamEvent]:
+    """
+    Streaming variant of verbalize_message.
+
+    Yields "delta" events while the LLM generates, a "reset" event if the
+    text must be replaced (invented fact, failed verification, LLM error),
+    and always ends with a single "final" event carrying the message text.
+    """
+    if not fallback_text or not fallback_text.strip():
+        yield VerbalizerStreamEvent("final", fallback_text)
+        return
+
+    bypass_text = _bypass_text(fallback_text, context)
+    if bypass_text is not None:
+        yield VerbalizerStreamEvent("final", bypass_text)
+        return
+
+    yield from _stream_llm_events(fallback_text, context, locale)
+
+
+def _verbalize_into_sink(
+    fallback_text: str,
+    context: MessageContext,
+    locale: str,
+    sink: VerbalizerStreamSink,
+) -> str:
+    final_text = fallback_text
+    for event in _stream_llm_events(fallback_text, context, locale):
+        try:
+            sink(event)
+        except Exception as exc:  # sink must never break the turn
+            logger.warning("universal_verbalizer: stream sink failed: %s", exc)
+        if event.kind == "final":
+            final_text = event.text
+    return final_text
+
+
+def _stream_llm_events(
+    fallback_text: str,
+    context: MessageContext,
+    locale: str,
+) -> Iterator[VerbalizerStreamEvent]:
+    from core.fallback import create_fallback_context, wrap_fallback
+
+    cache_key = _cache_key(fallback_text, context, locale)
+    if cache_key is not None:
+        cached = get_verbalization_cache().get(cache_key)
+        if cached is not None:
+            yield VerbalizerStreamEvent("final", cached)
+            return
+
+    hard_facts = context.extract_hard_facts()
+    verifier = IncrementalFactVerifier(hard_facts, topic=context.topic)
+    started = time.perf_counter()
+    streamed_any = False
+    deltas: Optional[Iterator[str]] = None
+
+    def _replace(text: str) -> Iterator[VerbalizerStreamEvent]:
+        if streamed_any:
+            yield VerbalizerStreamEvent("reset", text)
+        yield VerbalizerStreamEvent("final", text)
+
+    try:
+        deltas = _call_llm_stream(_build_prompt(context, fallback_text, locale))
+        for delta in deltas:
+            # Stop generating (and streaming) as soon as the turn is cancelled
+            check_cancelled("verbalizer.stream")
+            if not delta:
+                continue
+            if not verifier.feed(delta):
+                logger.warning(
+                    f"universal_verbalizer: invented facts mid-stream for step={context.step}, "
+                    f"topic={context.topic}, switching to fallback. Invented: {verifier.invented}",
+                )
+                yield from _replace(fallback_text)
+                return
+            released = verifier.releasable()
+            if not released:
+                continue
+            if not streamed_any:
+                logger.debug(
+                    "universal_verbalizer: first token after %.0fms (step=%s, topic=%s)",
+                    (time.perf_counter() - started) * 1000, context.step, context.topic,
+                )
+                streamed_any = True
+            yield VerbalizerStreamEvent("delta", released)
+    except Exception as exc:
+        ctx = create_fallback_context(
+            source="ux.verbalizer",
+            trigger="llm_call_failed",
+            step=context.step,
+            topic=context.topic,
+            error=exc,
+        )
+        yield from _replace(wrap_fallback(fallback_text, ctx))
+        return
+    finally:
+        close = getattr(deltas, "close", None)
+        if close is not None:
+            close()
+
+    if not verifier.text.strip():
+        ctx = create_fallback_context(
+            source="ux.verbalizer",
+            trigger="empty_llm_response",
+            step=context.step,
+            topic=context.topic,
+        )
+        yield from _replace(wrap_fallback(fallback_text, ctx))
+        return
+
+    ok, missing, invented = verifier.finish()
+    if ok:
+        _cache_store(cache_key, verifier.text)
+        remainder = verifier.remainder()
+        if remainder:
+            yield VerbalizerStreamEvent("delta", remainder)
+        yield VerbalizerStreamEvent("final", verifier.text)
+        return
+
+    patched_text, patch_success = _patch_facts(verifier.text, hard_facts, missing, invented)
+    if patch_success:
+        _cache_store(cache_key, patched_text)
+        yield from _replace(patched_text)
+        return
+
+    logger.warning(
+        f"universal_verbalizer: streamed output failed verification for step={context.step}, "
+        f"topic={context.topic}, using fallback. Missing: {missing}, Invented: {invented}",
+    )
+    yield from _replace(fallback_text)
+
+
 # =============================================================================
 # Convenience Functions for Workflow Integration
 # =============================================================================
@@ -1302,6 +1710,11 @@ def verbalize_step_message(
 
 __all__ = [
     "MessageContext",
+    "VerbalizerStreamEvent",
+    "IncrementalFactVerifier",
     "verbalize_message",
     "verbalize_step_message",
+    "stream_verbalize_message",
+    "verbalizer_stream_sink",
+    "is_streaming_enabled",
 ]
@@ -0,0 +1,301 @@
+"""
+Batch re-verification engine for the safety sandwich.
+
+Re-runs the hard-fact checks (universal_verbalizer._verify_facts and
+verbalizer_safety.verify_output) over a corpus of past (facts, LLM text)
+pairs, so a prompt, tone or fact-rule change can be validated against
+thousands of drafts before it ships.
+
+Input is JSONL, one case per line:
+    {"case_id": "...", "step": 4, "topic": "offer_draft", "llm_text": "...",
+     "hard_facts": {...}}          # MessageContext.extract_hard_facts() output
+or  {..., "context": {...}}        # MessageContext fields
+or  {..., "room_offer_facts": {...}}  # RoomOfferFacts.to_dict() -> verify_output
+
+Debug timeline JSONL is accepted too: any event whose `data` holds one of the
+shapes above is treated as a case; other events are skipped.
+
+Cases are verified on the shared `cpu` process pool (utils.executors). Each
+worker reuses the precompiled patterns and the cached date parser from
+universal_verbalizer, so repeated date strings across the corpus are parsed
+once per worker, and the workers stay warm between batches.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from utils.executors import POOL_CPU, run_tasks
+
+logger = logging.getLogger(__name__)
+
+# Failing cases kept verbatim in the report (the rest are only counted)
+MAX_REPORTED_FAILURES = 50
+
+
+@dataclass
+class VerificationCase:
+    """One (facts, LLM text) pair to re-verify."""
+
+    case_id: str
+    llm_text: str
+    step: Optional[int] = None
+    topic: str = ""
+    hard_facts: Optional[Dict[str, List[str]]] = None
+    room_offer_facts: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class CaseResult:
+    """Verification outcome for one case."""
+
+    case_id: str
+    step: Optional[int]
+    topic: str
+    checker: str  # "universal" | "room_offer"
+    ok: bool
+    missing: List[str] = field(default_factory=list)
+    invented: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "case_id": self.case_id,
+            "step": self.step,
+            "topic": self.topic,
+            "checker": self.checker,
+            "ok": self.ok,
+            "missing": self.missing,
+            "invented": self.invented,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BatchReport:
+    """Aggregated failures by step and topic."""
+
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    duration_s: float = 0.0
+    groups: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    failures: List[CaseResult] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "duration_s": round(self.duration_s, 3),
+            "cases_per_s": round(self.total / self.duration_s, 1) if self.duration_s else None,
+            "groups": self.groups,
+            "failures": [result.to_dict() for result in self.failures],
+        }
+
+    def format_text(self) -> str:
+        lines = [
+            f"Verified {self.total} cases in {self.duration_s:.2f}s: "
+            f"{self.passed} passed, {self.failed} failed, {self.errors} errors",
+            "",
+        ]
+        for group, stats in sorted(self.groups.items(), key=lambda item: -item[1]["failed"]):
+            lines.append(
+                f"{group}: {stats['failed']}/{stats['total']} failed ({stats['failure_rate']:.1%})"
+            )
+            for label in ("missing", "invented"):
+                if stats[label]:
+                    counts = ", ".join(f"{kind}={count}" for kind, count in stats[label].items())
+                    lines.append(f"    {label}: {counts}")
+        return "\n".join(lines)
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def case_from_record(record: Dict[str, Any], *, default_id: str) -> Optional[VerificationCase]:
+    """Build a case from a JSONL record (plain case or timeline event), or None."""
+    if not isinstance(record, dict):
+        return None
+    payload = record
+    if "llm_text" not in payload and isinstance(record.get("data"), dict):
+        payload = record["data"]
+    llm_text = payload.get("llm_text")
+    if not isinstance(llm_text, str):
+        return None
+
+    step = payload.get("step", record.get("step"))
+    try:
+        step = int(step) if step is not None else None
+    except (TypeError, ValueError):
+        step = None
+    topic = str(payload.get("topic") or record.get("subject") or "")
+    case_id = str(payload.get("case_id") or record.get("case_id") or default_id)
+
+    if isinstance(payload.get("room_offer_facts"), dict):
+        return VerificationCase(
+            case_id=case_id, llm_text=llm_text, step=step, topic=topic,
+            room_offer_facts=payload["room_offer_facts"],
+        )
+
+    hard_facts = payload.get("hard_facts")
+    if not isinstance(hard_facts, dict) and isinstance(payload.get("context"), dict):
+        from ux.universal_verbalizer import MessageContext
+
+        context_fields = dict(payload["context"])
+        context_fields.setdefault("step", step or 0)
+        context_fields.setdefault("topic", topic)
+        hard_facts = MessageContext(**context_fields).extract_hard_facts()
+    if not isinstance(hard_facts, dict):
+        return None
+    return VerificationCase(
+        case_id=case_id, llm_text=llm_text, step=step, topic=topic, hard_facts=hard_facts,
+    )
+
+
+def iter_cases(paths: Iterable[Path]) -> Iterator[VerificationCase]:
+    """Yield cases from JSONL files (or directories of *.jsonl files)."""
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+        for file_path in files:
+            with file_path.open("r", encoding="utf-8") as handle:
+                for line_no, line in enumerate(handle, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning("[VERIFY_BATCH] Skipping invalid JSON at %s:%d", file_path, line_no)
+                        continue
+                    case = case_from_record(record, default_id=f"{file_path.name}:{line_no}")
+                    if case is not None:
+                        yield case
+
+
+# =============================================================================
+# Verification
+# =============================================================================
+
+def verify_case(case: VerificationCase) -> CaseResult:
+    """Run the checker that matches the case's facts shape."""
+    checker = "room_offer" if case.room_offer_facts is not None else "universal"
+    result = CaseResult(case_id=case.case_id, step=case.step, topic=case.topic, checker=checker, ok=False)
+    try:
+        if case.room_offer_facts is not None:
+            from ux.verbalizer_payloads import RoomOfferFacts
+            from ux.verbalizer_safety import verify_output
+
+            outcome = verify_output(RoomOfferFacts.from_dict(case.room_offer_facts), case.llm_text)
+            result.ok = outcome.ok
+            result.missing = [f"{kind}:{value}" for kind, values in outcome.missing_facts.items() for value in values]
+            result.invented = [f"{kind}:{value}" for kind, values in outcome.invented_facts.items() for value in values]
+            if outcome.reason == "empty_output":
+                result.missing.append("text:empty")
+        else:
+            from ux.universal_verbalizer import _verify_facts
+
+            ok, missing, invented = _verify_facts(case.llm_text, case.hard_facts or {}, topic=case.topic)
+            result.ok, result.missing, result.invented = ok, missing, invented
+    except Exception as exc:  # one malformed case must not abort the batch
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def _verify_chunk(cases: Sequence[VerificationCase]) -> List[CaseResult]:
+    return [verify_case(case) for case in cases]
+
+
+def _chunks(cases: Sequence[VerificationCase], size: int) -> Iterator[Sequence[VerificationCase]]:
+    for start in range(0, len(cases), size):
+        yield cases[start:start + size]
+
+
+def run_batch(
+    cases: Iterable[VerificationCase],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 250,
+) -> BatchReport:
+    """
+    Verify all cases and aggregate the results.
+
+    Args:
+        cases: Cases to verify
+        workers: Chunks in flight on the cpu pool (default: CPU count); 1 runs inline
+        chunk_size: Cases sent to a worker per task
+    """
+    case_list = list(cases)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    started = time.perf_counter()
+
+    if workers <= 1 or len(case_list) <= chunk_size:
+        results = _verify_chunk(case_list)
+    else:
+        results = []
+        tasks = [functools.partial(_verify_chunk, chunk) for chunk in _chunks(case_list, chunk_size)]
+        for chunk_results in run_tasks(POOL_CPU, tasks, max_in_flight=workers):
+            results.extend(chunk_results)
+
+    return aggregate(results, duration_s=time.perf_counter() - started)
+
+
+def _fact_kind(item: str) -> str:
+    return item.split(":", 1)[0] if ":" in item else item
+
+
+def aggregate(results: Iterable[CaseResult], *, duration_s: float = 0.0) -> BatchReport:
+    """Group results by step/topic with per-kind missing/invented counts."""
+    report = BatchReport(duration_s=duration_s)
+    group_counters: Dict[str, Dict[str, Counter]] = {}
+
+    for result in results:
+        report.total += 1
+        group = f"step {result.step if result.step is not None else '?'} / {result.topic or 'unknown'}"
+        stats = report.groups.setdefault(group, {"total": 0, "failed": 0, "errors": 0})
+        counters = group_counters.setdefault(group, {"missing": Counter(), "invented": Counter()})
+        stats["total"] += 1
+
+        if result.error:
+            report.errors += 1
+            stats["errors"] += 1
+        if result.ok:
+            report.passed += 1
+            continue
+
+        report.failed += 1
+        stats["failed"] += 1
+        counters["missing"].update(_fact_kind(item) for item in result.missing)
+        counters["invented"].update(_fact_kind(item) for item in result.invented)
+        if len(report.failures) < MAX_REPORTED_FAILURES:
+            report.failures.append(result)
+
+    for group, stats in report.groups.items():
+        stats["failure_rate"] = stats["failed"] / stats["total"] if stats["total"] else 0.0
+        stats["missing"] = dict(group_counters[group]["missing"].most_common())
+        stats["invented"] = dict(group_counters[group]["invented"].most_common())
+    return report
+
+
+__all__ = [
+    "BatchReport",
+    "CaseResult",
+    "VerificationCase",
+    "aggregate",
+    "case_from_record",
+    "iter_cases",
+    "run_batch",
+    "verify_case",
+]
@@ -0,0 +1,169 @@
+"""
+Verbalization result cache.
+
+Many client messages are near-identical renderings of the same deterministic
+fallback text with the same facts (date proposal tables, room offers, deposit
+reminders) repeated across retries, HIL re-approvals and duplicate turns.
+This cache serves those renderings without another LLM call.
+
+Key: (step, topic, tone, locale, normalized fallback text, hard-fact
+fingerprint, prompt version). Only output that passed _verify_facts (or was
+successfully patched) is stored, so a cache hit is as safe as a fresh call.
+
+Environment:
+    VERBALIZER_CACHE: "0"/"false" disables the cache (default enabled)
+    VERBALIZER_CACHE_MAX_SIZE: max entries before LRU eviction (default 512)
+    VERBALIZER_CACHE_TTL: seconds an entry stays valid (default 3600)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def is_cache_enabled() -> bool:
+    """Check VERBALIZER_CACHE (enabled unless explicitly switched off)."""
+    return os.getenv("VERBALIZER_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_fallback_text(text: str) -> str:
+    """Collapse whitespace so cosmetic reflows map to the same entry."""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def build_cache_key(
+    *,
+    step: int,
+    topic: str,
+    tone: str,
+    locale: str,
+    fallback_text: str,
+    fact_fingerprint: str,
+    prompt_version: str,
+) -> str:
+    """Build the cache key for one verbalization request."""
+    return _digest([
+        step,
+        topic,
+        tone,
+        locale,
+        normalize_fallback_text(fallback_text),
+        fact_fingerprint,
+        prompt_version,
+    ])
+
+
+def fingerprint_facts(hard_facts: Dict[str, Any], prompt_facts: str) -> str:
+    """
+    Fingerprint the facts the LLM sees.
+
+    Combines the hard facts (what verification checks) with the rendered
+    facts block (what the prompt shows, e.g. room statuses, client name),
+    so two contexts only share an entry if the LLM got identical input.
+    """
+    return _digest({"hard": hard_facts, "prompt": prompt_facts})
+
+
+class VerbalizationCache:
+    """Bounded LRU + TTL cache for verified verbalizations, with hit metrics."""
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max(1, max_size or int(os.getenv("VERBALIZER_CACHE_MAX_SIZE", "512")))
+        self.ttl_seconds = (
+            float(os.getenv("VERBALIZER_CACHE_TTL", "3600")) if ttl_seconds is None else ttl_seconds
+        )
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, int] = {}
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self._metrics = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            text, stored_at = entry
+            if self.ttl_seconds > 0 and self._clock() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                self._metrics["expirations"] += 1
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store a verified verbalization."""
+        if not text:
+            return
+        with self._lock:
+            self._entries[key] = (text, self._clock())
+            self._entries.move_to_end(key)
+            self._metrics["stores"] += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, bounds, counters and hit rate."""
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self._metrics["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries and reset metrics (used by tests)."""
+        with self._lock:
+            self._entries.clear()
+            self._reset_metrics()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_VERBALIZATION_CACHE = VerbalizationCache()
+
+
+def get_verbalization_cache() -> VerbalizationCache:
+    """Get the process-wide verbalization cache."""
+    return _VERBALIZATION_CACHE
+
+
+__all__ = [
+    "VerbalizationCache",
+    "build_cache_key",
+    "fingerprint_facts",
+    "get_verbalization_cache",
+    "is_cache_enabled",
+    "normalize_fallback_text",
+]
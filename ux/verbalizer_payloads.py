@@ -120,6 +120,25 @@ class RoomOfferFacts:
             "status": self.status,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoomOfferFacts":
+        """Rebuild a facts bundle from to_dict() output (e.g. stored drafts)."""
+        return cls(
+            event_date=data.get("event_date") or "",
+            event_date_iso=data.get("event_date_iso"),
+            participants_count=data.get("participants_count"),
+            time_window=data.get("time_window"),
+            rooms=[RoomFact(**room) for room in data.get("rooms") or []],
+            recommended_room=data.get("recommended_room"),
+            menus=[MenuFact(**menu) for menu in data.get("menus") or []],
+            total_amount=data.get("total_amount"),
+            total_amount_numeric=data.get("total_amount_numeric"),
+            deposit_amount=data.get("deposit_amount"),
+            deposit_amount_numeric=data.get("deposit_amount_numeric"),
+            current_step=data.get("current_step"),
+            status=data.get("status"),
+        )
+
 
 def build_room_offer_facts(
     state: WorkflowState,
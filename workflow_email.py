@@ -12,11 +12,15 @@ from domain import TaskStatus, TaskType
 
 from workflows.common.types import IncomingMessage, WorkflowState
 from workflows.common.types import GroupResult
+from workflows.common.turn_memo import TurnMemo, current_memo, turn_scope
+from utils.executors import bind_thread_id, thread_scope
+from utils.cancellation import TurnCancelled, check_cancelled, current_token
 from workflows.steps import step1_intake as intake
 # Step handlers moved to runtime/router.py (W3 extraction)
 from workflows.io import database as db_io
 from workflows.io.database import update_event_metadata
 from workflows.io import tasks as task_io
+from workflows.io.tenants import current_tenant_id, tenant_db_path
 from workflows.io.integration.config import is_hil_all_replies_enabled
 from workflows.llm import adapter as llm_adapter
 # maybe_run_smart_shortcuts moved to runtime/pre_route.py (P1 extraction)
@@ -225,6 +229,9 @@ else:
     DB_PATH = Path(__file__).with_name("events_database.json")
     LOCK_PATH = Path(__file__).with_name(".events_db.lock")
 
+# Re-runs of a turn whose save was refused as a double booking
+_CONFLICT_RETRIES = 1
+
 enqueue_task = task_io.enqueue_task
 update_task_status = task_io.update_task_status
 # list_pending_tasks is now imported from workflows.runtime.hil_tasks
@@ -306,16 +313,7 @@ def _resolve_tenant_db_path(base_path: Path) -> Path:
     routes to per-team file: events_{team_id}.json
     Otherwise uses the default path.
     """
-    try:
-        from workflows.io.integration.config import get_team_id
-
-        team_id = get_team_id()
-        if team_id:
-            per_team_path = base_path.parent / f"events_{team_id}.json"
-            return per_team_path
-    except ImportError:
-        pass  # Config not available
-    return base_path
+    return tenant_db_path(base_path, current_tenant_id())
 
 
 def load_db(path: Path = DB_PATH) -> Dict[str, Any]:
@@ -369,13 +367,53 @@ def _flush_and_finalize(result: GroupResult, state: WorkflowState, path: Path, l
 def process_msg(msg: Dict[str, Any], db_path: Path = DB_PATH) -> Dict[str, Any]:
     """[Trigger] Process an inbound message through workflow groups A–C."""
 
+    # Pure detectors registered with @turn_memoized are computed once per turn;
+    # the thread id is bound for pool tasks started during the turn. Saves
+    # merge this client's records into the file (owned_records), so turns on
+    # the same database run concurrently; a save that would double-book a
+    # room confirmed meanwhile re-runs the turn on the fresh database.
+    thread_id = msg.get("thread_id") or msg.get("thread") or msg.get("session_id")
+    if db_io.record_owner() is not None:
+        # Batch ingestion scopes (and re-runs) its own turns
+        return _run_turn(msg, db_path, thread_id)
+    attempts = 0
+    while True:
+        try:
+            with db_io.owned_records(msg.get("from_email") or "", thread_id):
+                return _run_turn(msg, db_path, thread_id)
+        except db_io.BookingConflictError as exc:
+            attempts += 1
+            if attempts > _CONFLICT_RETRIES:
+                raise
+            logger.info("[WF][PERSIST] Re-running msg_id=%s after booking conflict: %s", msg.get("msg_id"), exc)
+
+
+def _run_turn(msg: Dict[str, Any], db_path: Path, thread_id: Optional[str]) -> Dict[str, Any]:
+    with turn_scope(), thread_scope(thread_id):
+        try:
+            return _process_msg(msg, db_path)
+        except TurnCancelled as exc:
+            # Nothing is flushed: the DB keeps its pre-turn state and the
+            # message is processed from scratch if the client sends it again.
+            logger.info(
+                "[WF][CANCEL] Turn aborted at %s (%s) thread=%s msg_id=%s",
+                exc.stage, exc.reason, msg.get("thread_id") or msg.get("session_id"), msg.get("msg_id"),
+            )
+            raise
+
+
+def _process_msg(msg: Dict[str, Any], db_path: Path) -> Dict[str, Any]:
+    """[Trigger] Body of process_msg, run inside the turn memo scope."""
+
     # Resolve tenant-aware path (uses X-Team-Id header when TENANT_HEADER_ENABLED=1)
     path = _resolve_tenant_db_path(Path(db_path))
     lock_path = _resolve_lock_path(path)
     db = db_io.load_db(path, lock_path=lock_path)
 
     message = IncomingMessage.from_dict(msg)
-    state = WorkflowState(message=message, db_path=path, db=db)
+    state = WorkflowState(
+        message=message, db_path=path, db=db, memo=current_memo() or TurnMemo(), cancel=current_token()
+    )
     raw_thread_id = (
         msg.get("thread_id")
         or msg.get("thread")
@@ -391,6 +429,7 @@ def process_msg(msg: Dict[str, Any], db_path: Path = DB_PATH) -> Dict[str, Any]:
             raw_thread_id,
         )
     state.thread_id = str(raw_thread_id)
+    bind_thread_id(state.thread_id)
     STATE_STORE.clear(state.thread_id)
     combined_text = "\n".join(
         part for part in ((message.subject or "").strip(), (message.body or "").strip()) if part
@@ -401,9 +440,11 @@ def process_msg(msg: Dict[str, Any], db_path: Path = DB_PATH) -> Dict[str, Any]:
         state.extras["skip_dev_choice"] = True
     classification = _ensure_general_qna_classification(state, combined_text)
     _debug_state("init", state, extra={"entity": "client"})
+    check_cancelled("intake")
     last_result = intake.process(state)
     _debug_state("post_intake", state, extra={"intent": state.intent.value if state.intent else None})
 
+    check_cancelled("pre_route")
     # Run pre-routing pipeline (P1 extraction)
     # Handles: duplicate detection, post-intake halt, guards, shortcuts, billing flow correction
     early_return, last_result = run_pre_route_pipeline(
@@ -7,6 +7,7 @@ from datetime import date, datetime, time, timedelta
 from typing import List, Optional, Tuple
 
 from workflows.common.relative_dates import resolve_relative_date
+from workflows.common.turn_memo import turn_memoized
 from workflows.io.config_store import get_timezone
 
 from zoneinfo import ZoneInfo
@@ -93,6 +94,7 @@ _TIME_RANGE = re.compile(
 _TIME_24H = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b")
 
 
+@turn_memoized()
 def parse_all_dates(
     text: str,
     *,
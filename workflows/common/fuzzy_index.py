@@ -0,0 +1,162 @@
+"""
+Approximate string matching over a fixed phrase set.
+
+Preference scoring compares every client wish against room features,
+services, layouts and product synonyms. FuzzyIndex is built once from that
+reference data and answers "which phrases score >= X against this needle":
+
+- A character trigram inverted index ranks phrases by shared trigrams.
+  `search(..., max_candidates=N)` verifies only the top N of them, which is
+  approximate (phrases sharing no trigram are never seen) but sub-linear.
+- Without max_candidates the search is exact: every phrase is checked, but a
+  length bound and difflib's real_quick_ratio()/quick_ratio() upper bounds
+  reject most phrases before SequenceMatcher.ratio() runs, and each phrase
+  keeps a prepared SequenceMatcher so its lookup tables are built only once.
+
+Scores are SequenceMatcher(a=needle, b=phrase).ratio(), with the containment
+shortcut preference scoring has always applied (0.92 when one phrase of at
+least MIN_CONTAINMENT_LEN characters contains the other).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Containment only counts when both strings are long enough to be meaningful
+# ("art" in "flipchart" must not match "latte art")
+MIN_CONTAINMENT_LEN = 5
+CONTAINMENT_RATIO = 0.92
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of a normalised phrase."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=8192)
+def bounded_ratio(a: str, b: str, floor: float = 0.0) -> float:
+    """
+    SequenceMatcher(a, b).ratio(), or 0.0 when it is provably below floor.
+
+    real_quick_ratio() and quick_ratio() are exact upper bounds, so pairs that
+    cannot reach the floor skip the full matching-blocks computation.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(a=a, b=b)
+    if floor > 0.0 and (matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor):
+        return 0.0
+    return matcher.ratio()
+
+
+def _contains(a: str, b: str) -> bool:
+    return len(a) >= MIN_CONTAINMENT_LEN and len(b) >= MIN_CONTAINMENT_LEN and (a in b or b in a)
+
+
+class FuzzyIndex:
+    """Prepared phrase set with a trigram inverted index."""
+
+    def __init__(self, phrases: Iterable[str] = ()) -> None:
+        self._phrases: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._matchers: List[SequenceMatcher] = []
+        self._postings: Dict[str, List[int]] = {}
+        # Prepared matchers are mutated by set_seq1 during a search
+        self._lock = threading.Lock()
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase: str) -> None:
+        if not phrase or phrase in self._ids:
+            return
+        phrase_id = len(self._phrases)
+        self._phrases.append(phrase)
+        self._ids[phrase] = phrase_id
+        matcher = SequenceMatcher()
+        matcher.set_seq2(phrase)
+        self._matchers.append(matcher)
+        for gram in trigrams(phrase):
+            self._postings.setdefault(gram, []).append(phrase_id)
+
+    @property
+    def phrases(self) -> List[str]:
+        """Indexed phrases in insertion order."""
+        return self._phrases
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def __contains__(self, phrase: object) -> bool:
+        return phrase in self._ids
+
+    def candidates(self, needle: str, limit: Optional[int] = None) -> List[str]:
+        """Phrases sharing trigrams with needle, most shared trigrams first."""
+        return [self._phrases[phrase_id] for phrase_id in self._candidate_ids(needle, limit)]
+
+    def _candidate_ids(self, needle: str, limit: Optional[int]) -> List[int]:
+        shared: Counter = Counter()
+        for gram in trigrams(needle):
+            for phrase_id in self._postings.get(gram, ()):
+                shared[phrase_id] += 1
+        return [phrase_id for phrase_id, _ in shared.most_common(limit)]
+
+    def search(
+        self,
+        needle: str,
+        min_ratio: float = 0.0,
+        *,
+        max_candidates: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Phrases scoring >= min_ratio against needle, best first.
+
+        Args:
+            needle: Normalised query phrase
+            min_ratio: Lowest score to return (also the pruning floor)
+            max_candidates: Verify only this many trigram candidates
+                (approximate); None checks every phrase exactly
+        """
+        if not needle:
+            return []
+        if max_candidates is None:
+            phrase_ids: Iterable[int] = range(len(self._phrases))
+        else:
+            phrase_ids = self._candidate_ids(needle, max_candidates)
+        needle_len = len(needle)
+        results: Dict[str, float] = {}
+        with self._lock:
+            for phrase_id in phrase_ids:
+                phrase = self._phrases[phrase_id]
+                if phrase == needle:
+                    results[phrase] = 1.0
+                    continue
+                if _contains(needle, phrase):
+                    if CONTAINMENT_RATIO >= min_ratio:
+                        results[phrase] = CONTAINMENT_RATIO
+                    continue
+                if 2.0 * min(needle_len, len(phrase)) / (needle_len + len(phrase)) < min_ratio:
+                    continue
+                matcher = self._matchers[phrase_id]
+                matcher.set_seq1(needle)
+                if min_ratio > 0.0 and (
+                    matcher.real_quick_ratio() < min_ratio or matcher.quick_ratio() < min_ratio
+                ):
+                    continue
+                ratio = matcher.ratio()
+                if ratio >= min_ratio and ratio > 0.0:
+                    results[phrase] = ratio
+        return sorted(results.items(), key=lambda item: (-item[1], item[0]))
+
+    def scores(self, needle: str, min_ratio: float = 0.0, *, max_candidates: Optional[int] = None) -> Dict[str, float]:
+        """search() as a phrase -> ratio map."""
+        return dict(self.search(needle, min_ratio, max_candidates=max_candidates))
+
+
+__all__ = ["FuzzyIndex", "bounded_ratio", "trigrams"]
@@ -0,0 +1,225 @@
+"""
+Hash-guarded result cache for the step 3 room ranking.
+
+The requirement hash guards (`requirements_hash`, `room_eval_hash`) tell
+step 3 whether it has to run again, but only the hash was stored: a detour
+or Q&A re-entry into step 3 still re-ranked every room and rebuilt the
+alternatives matrix. This module stores the ranking on the event entry next
+to the hashes:
+
+    event_entry["guarded_results"] = {
+        "step3_ranking": {<key>: {"requirements_hash", "inventory_version",
+                                  "version", "dates", "payload", "stored_at"},
+                          <alias>: {"alias_of": <key>}, ...},
+    }
+
+An entry is found by its key (requirements hash + a digest of the other
+inputs the computation reads) and is only served while its inventory
+version still matches: a hash of every booking (event id, room, status) on
+the dates the result depends on. Any booking created, moved, cancelled or
+re-statused on one of those dates changes the version and the entry is
+recomputed. Callers may also pass a `version` for inputs outside the db,
+such as `catalog_version()` for the room and product catalogs. Each slot
+keeps the few most recent entries so flipping back and forth between two
+dates during a detour is served from the cache. A payload that is also
+valid under other keys is stored once; the other keys are stored as aliases
+pointing to it.
+
+Lookups never modify the event: a stale entry stays until the next store
+for its key replaces it or the slot size pushes it out. Step 4 pricing is
+not stored here; it is cheap and memoized in-process by the pricing engine
+(workflows.common.pricing_engine).
+
+Payloads must be JSON-serialisable (they are persisted with the event).
+
+Environment:
+    OE_GUARD_CACHE=0          disable lookups and stores
+    OE_GUARD_CACHE_SIZE=4     entries kept per slot and event
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from workflows.common.ordinal_dates import day_ordinal, event_day_ordinal, event_room, event_status
+from workflows.common.requirements import stable_hash
+
+logger = logging.getLogger(__name__)
+
+GUARDED_RESULTS_KEY = "guarded_results"
+STEP3_RANKING = "step3_ranking"
+
+_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+CATALOG_FILES = ("rooms.json", "products.json")
+
+
+def _enabled() -> bool:
+    return os.getenv("OE_GUARD_CACHE", "1") != "0"
+
+
+def _slot_size() -> int:
+    try:
+        return max(1, int(os.getenv("OE_GUARD_CACHE_SIZE", "4")))
+    except ValueError:
+        return 4
+
+
+def inventory_version(
+    db: Dict[str, Any],
+    dates: Iterable[Any],
+    *,
+    exclude_event_id: Optional[str] = None,
+) -> str:
+    """[Condition] Hash of all bookings (event id, room, status) on the given dates.
+
+    The event the result belongs to is excluded so its own stage/status
+    transitions do not invalidate its cached results.
+    """
+
+    days = {day for day in (day_ordinal(value) for value in dates) if day is not None}
+    events = db.get("events") or []
+    if isinstance(events, dict):
+        events = events.values()
+    bookings: List[List[Any]] = []
+    if days:
+        for event in events:
+            if not isinstance(event, dict) or (exclude_event_id and event.get("event_id") == exclude_event_id):
+                continue
+            day = event_day_ordinal(event)
+            if day in days:
+                bookings.append([day, str(event.get("event_id") or ""), event_room(event) or "", event_status(event) or ""])
+    bookings.sort()
+    return stable_hash({"days": sorted(days), "bookings": bookings})
+
+
+@lru_cache(maxsize=None)
+def catalog_version(files: Sequence[str] = CATALOG_FILES) -> str:
+    """[Condition] Digest of the catalog files (size + mtime) under data/.
+
+    Room capacities, features and rates and product prices come from these
+    files, not from the db, so a catalog edit must invalidate stored results.
+    The files are stat'ed once per process, like the catalogs themselves
+    (services.rooms / services.products load them once); clear this cache
+    together with theirs to pick up an edit.
+    """
+
+    stats: List[List[Any]] = []
+    for name in files:
+        try:
+            stat = (_DATA_DIR / name).stat()
+            stats.append([name, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            stats.append([name, None, None])
+    return stable_hash(stats)[:16]
+
+
+def guard_key(requirements_hash: Optional[str], inputs: Any) -> str:
+    """[Condition] Cache key: requirements hash plus a digest of the other inputs."""
+
+    return f"{requirements_hash or '-'}:{stable_hash(inputs)[:24]}"
+
+
+def load_guarded(
+    event_entry: Dict[str, Any],
+    slot: str,
+    key: str,
+    db: Dict[str, Any],
+    *,
+    version: Optional[str] = None,
+) -> Optional[Any]:
+    """[Condition] Stored payload for key, or None when missing, the inventory moved or version differs.
+
+    Read-only: stale entries are left in place for store_guarded to replace.
+    """
+
+    if not _enabled():
+        return None
+    entries = (event_entry.get(GUARDED_RESULTS_KEY) or {}).get(slot) or {}
+    entry = entries.get(key)
+    if isinstance(entry, dict) and "alias_of" in entry:
+        key = entry["alias_of"]
+        entry = entries.get(key)
+    if not isinstance(entry, dict):
+        return None
+    if entry.get("version") != version:
+        logger.debug("[GuardCache] %s stale for %s (version changed)", slot, event_entry.get("event_id"))
+        return None
+    current = inventory_version(db, entry.get("dates") or [], exclude_event_id=event_entry.get("event_id"))
+    if entry.get("inventory_version") != current:
+        logger.debug("[GuardCache] %s stale for %s (inventory changed)", slot, event_entry.get("event_id"))
+        return None
+    logger.debug("[GuardCache] %s hit for %s", slot, event_entry.get("event_id"))
+    return entry.get("payload")
+
+
+def store_guarded(
+    event_entry: Dict[str, Any],
+    slot: str,
+    key: str,
+    payload: Any,
+    *,
+    db: Dict[str, Any],
+    dates: Iterable[Any] = (),
+    requirements_hash: Optional[str] = None,
+    version: Optional[str] = None,
+    aliases: Iterable[str] = (),
+) -> None:
+    """[Trigger] Persist payload under key, versioned by the bookings on dates.
+
+    aliases are further keys the same payload answers; they reference key
+    instead of storing another copy.
+    """
+
+    if not _enabled():
+        return
+    date_list = [value for value in dates if value]
+    entries: Dict[str, Any] = event_entry.setdefault(GUARDED_RESULTS_KEY, {}).setdefault(slot, {})
+    entries.pop(key, None)
+    entries[key] = {
+        "requirements_hash": requirements_hash,
+        "inventory_version": inventory_version(db, date_list, exclude_event_id=event_entry.get("event_id")),
+        "version": version,
+        "dates": date_list,
+        "payload": payload,
+        "stored_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+    }
+    for alias in aliases:
+        if alias != key:
+            entries.pop(alias, None)
+            entries[alias] = {"alias_of": key}
+    # Aliases do not count against the slot size; dangling ones are dropped with their target
+    while sum(1 for entry in entries.values() if "alias_of" not in entry) > _slot_size():
+        oldest = next(name for name, entry in entries.items() if "alias_of" not in entry)
+        entries.pop(oldest)
+    for name in [name for name, entry in entries.items() if entry.get("alias_of", name) not in entries]:
+        entries.pop(name)
+
+
+def clear_guarded(event_entry: Dict[str, Any], slot: Optional[str] = None) -> None:
+    """[Trigger] Drop one slot (or all guarded results) from the event entry."""
+
+    results = event_entry.get(GUARDED_RESULTS_KEY)
+    if not isinstance(results, dict):
+        return
+    if slot is None:
+        event_entry.pop(GUARDED_RESULTS_KEY, None)
+    else:
+        results.pop(slot, None)
+
+
+__all__ = [
+    "CATALOG_FILES",
+    "GUARDED_RESULTS_KEY",
+    "STEP3_RANKING",
+    "catalog_version",
+    "clear_guarded",
+    "guard_key",
+    "inventory_version",
+    "load_guarded",
+    "store_guarded",
+]
@@ -0,0 +1,241 @@
+"""
+Canonical integer representation of event dates and times.
+
+Event records carry the same day twice: `event_data["Event Date"]` as
+DD.MM.YYYY and `chosen_date` as ISO YYYY-MM-DD (sometimes with a time part).
+Comparing them used to mean formatting one side per comparison. This module
+reduces both to a proleptic Gregorian day ordinal (`date.toordinal()`) and
+times to minutes after midnight, so availability, sorting and conflict code
+compare plain integers:
+
+- `day_ordinal()` / `minute_of_day()` parse once per distinct string (cached).
+- `RoomDayIndex` buckets a database snapshot by (room, day) in one pass, so
+  "what is booked in room R on day D" is a dict lookup instead of a scan.
+- `ordinal_to_iso()` / `ordinal_to_ddmmyyyy()` format for display only.
+
+Stored records are unchanged; ordinals are derived, never persisted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Booking statuses in order of strength; "lead" holds count as an option
+_STATUS_RANK = {"lead": 1, "option": 1, "confirmed": 2}
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(text: str) -> Optional[int]:
+    if "." in text[:6]:
+        parts = text.split(".")
+        if len(parts) != 3:
+            return None
+        day_text, month_text, year_text = parts
+    else:
+        head = text[:10]
+        if len(head) != 10 or head[4] != "-" or head[7] != "-":
+            return None
+        year_text, month_text, day_text = head[:4], head[5:7], head[8:10]
+    try:
+        return date(int(year_text), int(month_text), int(day_text)).toordinal()
+    except ValueError:
+        return None
+
+
+def day_ordinal(value: Any) -> Optional[int]:
+    """
+    Day ordinal for a DD.MM.YYYY / ISO date string, date or datetime.
+
+    ISO timestamps contribute their date part. Returns None for empty or
+    unparseable values.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        # datetime is a date subclass; toordinal() ignores the time
+        return value.toordinal()
+    if isinstance(value, int):
+        return value
+    return _parse_day(str(value).strip())
+
+
+@lru_cache(maxsize=1024)
+def _parse_minutes(text: str) -> Optional[int]:
+    text = text.replace(".", ":")
+    if ":" not in text:
+        if not text.isdigit():
+            return None
+        return (int(text) % 24) * 60
+    hour_text, minute_text = text.split(":", 1)
+    try:
+        hour = int(hour_text)
+        minute = int(minute_text[:2])
+    except ValueError:
+        return None
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    return hour * 60 + minute
+
+
+def minute_of_day(label: Any) -> Optional[int]:
+    """Minutes after midnight for an "HH:MM" / "HH.MM" / "HH" label."""
+    if not label:
+        return None
+    text = str(label).strip()
+    if not text or text == "Not specified":
+        return None
+    return _parse_minutes(text)
+
+
+def ordinal_to_date(ordinal: int) -> date:
+    return date.fromordinal(ordinal)
+
+
+def ordinal_to_iso(ordinal: Optional[int]) -> Optional[str]:
+    """YYYY-MM-DD for display/storage edges."""
+    if ordinal is None:
+        return None
+    return date.fromordinal(ordinal).isoformat()
+
+
+def ordinal_to_ddmmyyyy(ordinal: Optional[int]) -> Optional[str]:
+    """DD.MM.YYYY for display/storage edges."""
+    if ordinal is None:
+        return None
+    value = date.fromordinal(ordinal)
+    return f"{value.day:02d}.{value.month:02d}.{value.year:04d}"
+
+
+def event_day_ordinal(event: Mapping[str, Any]) -> Optional[int]:
+    """Day of an event record's booking: event_data["Event Date"] only.
+
+    chosen_date is not consulted; records without an Event Date do not hold a
+    room-day, as in the string comparison this replaces.
+    """
+    event_data = event.get("event_data") or {}
+    return day_ordinal(event_data.get("Event Date"))
+
+
+def event_room(event: Mapping[str, Any]) -> Optional[str]:
+    """Lower-cased booked room: event_data["Preferred Room"], else locked_room_id."""
+    event_data = event.get("event_data") or {}
+    room = event_data.get("Preferred Room") or event.get("locked_room_id")
+    return str(room).lower() if room else None
+
+
+def event_status(event: Mapping[str, Any]) -> str:
+    """Lower-cased canonical status, falling back to legacy event_data["Status"]."""
+    event_data = event.get("event_data") or {}
+    return str(event.get("status") or event_data.get("Status") or "").lower()
+
+
+@dataclass(frozen=True)
+class DayWindow:
+    """A single-day slot as integers: day ordinal and [start_min, end_min)."""
+
+    day: int
+    start_min: int = 0
+    end_min: int = 24 * 60
+
+    @classmethod
+    def build(cls, day: Any, start: Any = None, end: Any = None) -> Optional["DayWindow"]:
+        ordinal = day_ordinal(day)
+        if ordinal is None:
+            return None
+        start_min = minute_of_day(start)
+        end_min = minute_of_day(end)
+        if start_min is None or end_min is None or end_min <= start_min:
+            return cls(ordinal)
+        return cls(ordinal, start_min, end_min)
+
+    def overlaps(self, other: "DayWindow") -> bool:
+        return (
+            self.day == other.day
+            and self.start_min < other.end_min
+            and other.start_min < self.end_min
+        )
+
+    def sort_key(self) -> Tuple[int, int]:
+        return (self.day, self.start_min)
+
+
+class RoomDayIndex:
+    """
+    Bookings of a database snapshot bucketed by (room, day ordinal).
+
+    Build once per db read with `from_db()`; lookups are O(bookings on that
+    room/day). Only lead/option/confirmed records are indexed.
+    """
+
+    def __init__(self, events: Iterable[Mapping[str, Any]] = ()) -> None:
+        # (room, day) -> [(event_id, status)]
+        self._slots: Dict[Tuple[str, int], List[Tuple[Optional[str], str]]] = {}
+        for event in events:
+            self.add(event)
+
+    @classmethod
+    def from_db(cls, db: Mapping[str, Any]) -> "RoomDayIndex":
+        events = db.get("events") or []
+        if isinstance(events, dict):
+            events = events.values()
+        return cls(event for event in events if isinstance(event, dict))
+
+    def add(self, event: Mapping[str, Any]) -> None:
+        status = event_status(event)
+        if status not in _STATUS_RANK:
+            return
+        room = event_room(event)
+        day = event_day_ordinal(event) if room else None
+        if day is None:
+            return
+        self._slots.setdefault((room, day), []).append((event.get("event_id"), status))
+
+    def bookings(
+        self, room: str, day: Optional[int], *, exclude_event_id: Optional[str] = None
+    ) -> List[str]:
+        """Statuses booked in room on day, excluding one event if given."""
+        if day is None:
+            return []
+        return [
+            status
+            for event_id, status in self._slots.get((room.lower(), day), ())
+            if not (exclude_event_id and event_id == exclude_event_id)
+        ]
+
+    def status_on(self, room: str, day: Optional[int], *, exclude_event_id: Optional[str] = None) -> str:
+        """Return "Available", "Option" or "Confirmed" ("Unavailable" without a day)."""
+        if day is None:
+            return "Unavailable"
+        strongest = max(
+            (_STATUS_RANK[status] for status in self.bookings(room, day, exclude_event_id=exclude_event_id)),
+            default=0,
+        )
+        if strongest == 2:
+            return "Confirmed"
+        if strongest == 1:
+            return "Option"
+        return "Available"
+
+    def is_blocked(self, room: str, day: Optional[int], *, exclude_event_id: Optional[str] = None) -> bool:
+        """True when an option or confirmed booking (not a lead) holds room on day."""
+        return any(
+            status in ("option", "confirmed")
+            for status in self.bookings(room, day, exclude_event_id=exclude_event_id)
+        )
+
+
+__all__ = [
+    "DayWindow",
+    "RoomDayIndex",
+    "day_ordinal",
+    "event_day_ordinal",
+    "event_room",
+    "event_status",
+    "minute_of_day",
+    "ordinal_to_date",
+    "ordinal_to_ddmmyyyy",
+    "ordinal_to_iso",
+]
@@ -7,7 +7,6 @@ from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 from utils import json_io
-from workflows.steps.step3_room_availability.db_pers import load_rooms_config
 
 
 # ---------------------------------------------------------------------------
@@ -292,6 +291,9 @@ def _room_rate_map() -> Dict[str, float]:
 
 @lru_cache(maxsize=1)
 def _room_capacity_map() -> Dict[str, int]:
+    # Imported here: the step 3 package imports this module (via Q&A) at import time
+    from workflows.steps.step3_room_availability.db_pers import load_rooms_config
+
     mapping: Dict[str, int] = {}
     for entry in load_rooms_config() or []:
         name = str(entry.get("name") or "").strip()
@@ -320,6 +322,19 @@ def _rate_from_capacity(room_name: str) -> Optional[float]:
     return normalise_rate(estimate)
 
 
+@lru_cache(maxsize=1)
+def _room_rate_table() -> Dict[str, float]:
+    """Configured rates plus capacity-derived estimates, resolved once per process."""
+
+    table = dict(_room_rate_map())
+    for name in _room_capacity_map():
+        if name not in table:
+            estimate = _rate_from_capacity(name)
+            if estimate is not None:
+                table[name] = estimate
+    return table
+
+
 def room_rate_for_name(room_name: Optional[str]) -> Optional[float]:
     """Return a daily room rate using configured or derived pricing."""
 
@@ -329,14 +344,38 @@ def room_rate_for_name(room_name: Optional[str]) -> Optional[float]:
     if not cleaned:
         return None
 
-    rate_map = _room_rate_map()
-    explicit = normalise_rate(rate_map.get(cleaned.lower()))
-    if explicit is not None:
-        return explicit
-
+    rate = _room_rate_table().get(cleaned.lower())
+    if rate is not None:
+        return rate
     return _rate_from_capacity(cleaned)
 
 
+@lru_cache(maxsize=1)
+def _half_day_rate_map() -> Dict[str, float]:
+    mapping: Dict[str, float] = {}
+    info_path = Path(__file__).resolve().parents[2] / "data" / "rooms.json"
+    if info_path.exists():
+        try:
+            with info_path.open("r", encoding="utf-8") as handle:
+                payload = json_io.load(handle)
+            for entry in payload.get("rooms") or []:
+                name = str(entry.get("name") or "").strip()
+                rate = normalise_rate(entry.get("half_day_rate"))
+                if name and rate is not None:
+                    mapping[name.lower()] = rate
+        except Exception:
+            pass
+    return mapping
+
+
+def half_day_rate_for_name(room_name: Optional[str]) -> Optional[float]:
+    """Return the configured half-day rate for a room, if it has one."""
+
+    if not room_name:
+        return None
+    return _half_day_rate_map().get(str(room_name).strip().lower())
+
+
 def derive_room_rate(event_entry: Dict[str, Any]) -> Optional[float]:
     """Lookup the room rate for the selected/locked room on the event."""
 
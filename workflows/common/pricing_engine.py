@@ -0,0 +1,306 @@
+"""
+Offer pricing engine: compiled price tables with memoized quotes.
+
+Step 4 (pricing inputs, offer total) and step 5 (offer summary, totals for
+HIL) used to walk the event's products one by one, re-normalising each and
+re-deriving the room rate on every detour or negotiation turn. The engine
+splits that into two phases:
+
+- `compile_price_table(event_entry, ...)` normalises the products once into
+  a column layout (names, units, quantities, unit prices) together with the
+  room rate, participant count and deposit policy.
+- `price(table)` computes line amounts, products total, total, VAT and
+  deposit in one pass over the columns. Quotes are memoized process-wide by
+  the table's fingerprint (a hash of every pricing input), so re-pricing an
+  unchanged offer is a dict lookup.
+
+`what_if(table, ...)` reprices a modified copy of a table (room rate,
+discount, quantity changes, dropped or added lines, participant count)
+without touching the event, for negotiation counter-offers.
+
+    table = compile_price_table(event_entry, deposit_config=config)
+    quote = price(table)                  # quote.total, quote.deposit_amount
+    what_if(table, discount_pct=10).total
+
+Totals match the previous product-by-product computation exactly: amounts
+are summed in product order and rounded to cents at the end.
+
+Environment:
+    OE_PRICING_CACHE_SIZE: Quotes kept in the memo (default: 1024)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from workflows.common.pricing import (
+    calculate_deposit_amount,
+    calculate_vat_included,
+    derive_room_rate,
+    normalise_rate,
+)
+from workflows.common.product_utils import menu_name_set, normalise_product_fields
+from workflows.common.requirements import stable_hash
+
+_DEPOSIT_KEYS = ("deposit_enabled", "deposit_type", "deposit_percentage", "deposit_fixed_amount")
+
+_MEMO: "OrderedDict[str, PriceQuote]" = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0}
+
+
+def _memo_size() -> int:
+    try:
+        return max(1, int(os.getenv("OE_PRICING_CACHE_SIZE", "1024")))
+    except ValueError:
+        return 1024
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    """Column layout of everything an offer price depends on."""
+
+    base_rate: Optional[float]
+    names: Tuple[str, ...]
+    units: Tuple[Optional[str], ...]
+    quantities: Tuple[float, ...]
+    unit_prices: Tuple[float, ...]
+    participants: Optional[int] = None
+    discount_pct: float = 0.0
+    deposit_policy: Tuple[Tuple[str, Any], ...] = ()
+    # Normalised product dicts (extra fields such as product_id/category), not priced
+    products: Tuple[Dict[str, Any], ...] = field(default=(), compare=False, repr=False)
+
+    @property
+    def fingerprint(self) -> str:
+        return stable_hash(
+            [
+                self.base_rate,
+                self.names,
+                self.units,
+                self.quantities,
+                self.unit_prices,
+                self.participants,
+                self.discount_pct,
+                self.deposit_policy,
+            ]
+        )
+
+    def normalised_products(self) -> List[Dict[str, Any]]:
+        """Product dicts with this table's quantities and prices."""
+        rows = []
+        for index, name in enumerate(self.names):
+            row = dict(self.products[index]) if index < len(self.products) else {"name": name}
+            row.update(name=name, unit=self.units[index], quantity=self.quantities[index], unit_price=self.unit_prices[index])
+            rows.append(row)
+        return rows
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """Result of pricing one table."""
+
+    fingerprint: str
+    base_rate: Optional[float]
+    names: Tuple[str, ...]
+    quantities: Tuple[float, ...]
+    unit_prices: Tuple[float, ...]
+    line_amounts: Tuple[float, ...]
+    products_total: float
+    discount_amount: float
+    total: float
+    vat_included: float
+    deposit_amount: Optional[float]
+
+    def line_items(self) -> List[Dict[str, Any]]:
+        """pricing_inputs["line_items"] rows."""
+        return [
+            {"description": name, "quantity": qty, "unit_price": unit_price, "amount": amount}
+            for name, qty, unit_price, amount in zip(self.names, self.quantities, self.unit_prices, self.line_amounts)
+        ]
+
+
+def _deposit_policy(deposit_config: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    if not deposit_config or not deposit_config.get("deposit_enabled"):
+        return ()
+    return tuple((key, deposit_config.get(key)) for key in _DEPOSIT_KEYS if key in deposit_config)
+
+
+def _participants_of(event_entry: Dict[str, Any]) -> Optional[int]:
+    requirements = event_entry.get("requirements") or {}
+    raw = requirements.get("number_of_participants")
+    if raw is None:
+        raw = (event_entry.get("event_data") or {}).get("Number of Participants")
+    try:
+        return int(str(raw).strip())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def compile_price_table(
+    event_entry: Dict[str, Any],
+    *,
+    base_rate: Any = None,
+    products: Optional[Iterable[Dict[str, Any]]] = None,
+    deposit_config: Optional[Mapping[str, Any]] = None,
+) -> PriceTable:
+    """Price table for an event.
+
+    base_rate defaults to pricing_inputs["base_rate"], then the catalog rate
+    of the locked/selected room. products defaults to event_entry["products"].
+    """
+    rate = normalise_rate(base_rate)
+    if rate is None:
+        rate = normalise_rate((event_entry.get("pricing_inputs") or {}).get("base_rate"))
+    if rate is None:
+        rate = derive_room_rate(event_entry)
+
+    menu_names = menu_name_set()
+    normalised = tuple(
+        normalise_product_fields(product, menu_names=menu_names)
+        for product in (products if products is not None else event_entry.get("products") or [])
+    )
+    return PriceTable(
+        base_rate=rate,
+        names=tuple(row["name"] for row in normalised),
+        units=tuple(row.get("unit") for row in normalised),
+        quantities=tuple(row["quantity"] for row in normalised),
+        unit_prices=tuple(row["unit_price"] for row in normalised),
+        participants=_participants_of(event_entry),
+        deposit_policy=_deposit_policy(deposit_config),
+        products=normalised,
+    )
+
+
+def _compute(table: PriceTable, fingerprint: str) -> PriceQuote:
+    line_amounts = tuple(qty * unit_price for qty, unit_price in zip(table.quantities, table.unit_prices))
+    # Same summation order as the per-product loops this replaces: room first, then products
+    running = table.base_rate if table.base_rate is not None else 0.0
+    products_total = 0.0
+    for amount in line_amounts:
+        running += amount
+        products_total += amount
+    subtotal = round(running, 2)
+    discount = round(subtotal * table.discount_pct / 100.0, 2) if table.discount_pct else 0.0
+    total = round(subtotal - discount, 2)
+    deposit = calculate_deposit_amount(total, dict(table.deposit_policy)) if table.deposit_policy else None
+    return PriceQuote(
+        fingerprint=fingerprint,
+        base_rate=table.base_rate,
+        names=table.names,
+        quantities=table.quantities,
+        unit_prices=table.unit_prices,
+        line_amounts=line_amounts,
+        products_total=round(products_total, 2),
+        discount_amount=discount,
+        total=total,
+        vat_included=calculate_vat_included(total),
+        deposit_amount=deposit,
+    )
+
+
+def price(table: PriceTable) -> PriceQuote:
+    """Quote for table, memoized by its fingerprint."""
+    fingerprint = table.fingerprint
+    with _MEMO_LOCK:
+        cached = _MEMO.get(fingerprint)
+        if cached is not None:
+            _MEMO.move_to_end(fingerprint)
+            _STATS["hits"] += 1
+            return cached
+        _STATS["misses"] += 1
+    quote = _compute(table, fingerprint)
+    with _MEMO_LOCK:
+        _MEMO[fingerprint] = quote
+        while len(_MEMO) > _memo_size():
+            _MEMO.popitem(last=False)
+    return quote
+
+
+def price_event(event_entry: Dict[str, Any], *, deposit_config: Optional[Mapping[str, Any]] = None) -> PriceQuote:
+    """price(compile_price_table(event_entry))."""
+    return price(compile_price_table(event_entry, deposit_config=deposit_config))
+
+
+def what_if(
+    table: PriceTable,
+    *,
+    base_rate: Any = None,
+    discount_pct: Optional[float] = None,
+    quantities: Optional[Mapping[str, float]] = None,
+    unit_prices: Optional[Mapping[str, float]] = None,
+    drop: Iterable[str] = (),
+    add: Iterable[Mapping[str, Any]] = (),
+    participants: Optional[int] = None,
+) -> PriceQuote:
+    """Quote for a modified copy of table (the event is not touched).
+
+    quantities/unit_prices/drop are keyed by product name (case-insensitive).
+    add appends product rows (name, unit, quantity, unit_price) after the
+    remaining lines. A new participant count rescales per-person lines that
+    had one unit per participant.
+    """
+    qty_by_name = {name.lower(): float(value) for name, value in (quantities or {}).items()}
+    price_by_name = {name.lower(): float(value) for name, value in (unit_prices or {}).items()}
+    dropped = {name.lower() for name in drop}
+
+    rows = []
+    for index, name in enumerate(table.names):
+        key = name.lower()
+        if key in dropped:
+            continue
+        unit = table.units[index]
+        qty = table.quantities[index]
+        if key in qty_by_name:
+            qty = qty_by_name[key]
+        elif participants and unit == "per_person" and table.participants and qty == table.participants:
+            qty = float(participants)
+        rows.append((name, unit, qty, price_by_name.get(key, table.unit_prices[index])))
+    for extra in add:
+        rows.append((
+            str(extra["name"]),
+            extra.get("unit"),
+            float(extra.get("quantity") or 1),
+            float(extra.get("unit_price") or 0.0),
+        ))
+
+    rate = normalise_rate(base_rate)
+    variant = replace(
+        table,
+        base_rate=rate if rate is not None else table.base_rate,
+        names=tuple(row[0] for row in rows),
+        units=tuple(row[1] for row in rows),
+        quantities=tuple(row[2] for row in rows),
+        unit_prices=tuple(row[3] for row in rows),
+        participants=participants or table.participants,
+        discount_pct=float(discount_pct) if discount_pct is not None else table.discount_pct,
+        products=(),
+    )
+    return price(variant)
+
+
+def pricing_engine_stats() -> Dict[str, Any]:
+    with _MEMO_LOCK:
+        return {"entries": len(_MEMO), "max_entries": _memo_size(), **_STATS}
+
+
+def reset_pricing_engine() -> None:
+    with _MEMO_LOCK:
+        _MEMO.clear()
+        _STATS.update(hits=0, misses=0)
+
+
+__all__ = [
+    "PriceQuote",
+    "PriceTable",
+    "compile_price_table",
+    "price",
+    "price_event",
+    "pricing_engine_stats",
+    "reset_pricing_engine",
+    "what_if",
+]
@@ -17,6 +17,9 @@ Flow:
     3. Offer available time slots
     4. Once date is confirmed → scheduled
 
+Slot availability comes from one SiteVisitPlan per turn
+(workflows.common.site_visit_planner), built from state.db.
+
 This module can be called from:
 - Step 2 (Date Confirmation)
 - Step 3 (Room Availability)
@@ -31,12 +34,17 @@ import logging
 import re
 
 logger = logging.getLogger(__name__)
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from detection.unified import UnifiedDetectionResult
 from workflows.common.prompts import append_footer
+from workflows.common.site_visit_planner import (
+    SiteVisitPlan,
+    collect_blocked_dates,
+    collect_booked_slots,
+)
 from workflows.common.site_visit_state import (
     confirm_pending_site_visit,
     get_site_visit_state,
@@ -48,16 +56,9 @@ from workflows.common.site_visit_state import (
     set_time_pending,
     start_site_visit_flow,
 )
-from workflows.io.config_store import (
-    get_site_visit_blocked_dates,
-    get_site_visit_slots,
-    get_site_visit_weekdays_only,
-    get_site_visit_min_days_ahead,
-)
 from workflows.common.types import GroupResult, WorkflowState
 from workflows.io.database import (
     append_audit_entry,
-    get_event_dates,
     load_db,
     update_event_metadata,
 )
@@ -251,10 +252,9 @@ def _offer_date_slots(
     can pick in one go.
     """
     sv_state = get_site_visit_state(event_entry)
-    blocked_dates = _get_blocked_dates(event_entry)
 
-    # Generate dates with their available time slots
-    date_time_slots = _generate_date_time_slots(event_entry, blocked_dates)
+    # Dates with their available time slots (not booked, at least one room free)
+    date_time_slots = _site_visit_plan(state, event_entry).date_time_slots()
     sv_state["proposed_dates"] = list(date_time_slots.keys())
     # Store all proposed slots for validation
     all_proposed_slots: List[str] = []
@@ -301,8 +301,9 @@ def _check_date_conflict(
     1. Date blocked entirely (event day) - hard block
     2. Specific time slot already booked - offer alternative times
     """
-    blocked_dates = _get_blocked_dates(event_entry)
-    booked_slots = _get_booked_site_visit_slots(event_entry)
+    plan = _site_visit_plan(state, event_entry)
+    blocked_dates = plan.blocked_dates
+    booked_slots = plan.booked_slots
 
     # Parse date and time
     date_iso, time_slot = parse_slot_string(requested_date)
@@ -336,10 +337,9 @@ def _date_conflict_response(
     Stay in date_pending state so client can pick another date.
     """
     sv_state = get_site_visit_state(event_entry)
-    blocked_dates = _get_blocked_dates(event_entry)
 
     # Generate alternative dates (staying in date_pending)
-    dates = _generate_available_dates(event_entry, blocked_dates)
+    dates = _site_visit_plan(state, event_entry).available_dates()
     sv_state["proposed_dates"] = dates
 
     # Format dates for display
@@ -381,13 +381,11 @@ def _slot_conflict_response(
     on the same day or nearby days.
     """
     sv_state = get_site_visit_state(event_entry)
-    blocked_dates = _get_blocked_dates(event_entry)
-    times = get_site_visit_slots()
+    plan = _site_visit_plan(state, event_entry)
 
     # Find alternative times on the same day
     same_day_alternatives: List[str] = []
-    for hour in times:
-        alt_time = f"{hour:02d}:00"
+    for alt_time in plan.times:
         if alt_time != time_slot and (date_iso, alt_time) not in booked_slots:
             try:
                 dt = datetime.fromisoformat(date_iso)
@@ -396,7 +394,7 @@ def _slot_conflict_response(
                 same_day_alternatives.append(f"{date_iso} at {alt_time}")
 
     # Generate slots on other days
-    other_day_slots = _generate_visit_slots(event_entry, blocked_dates, booked_slots)
+    other_day_slots = _format_visit_slots(plan.ranked_slots(3))
 
     # Combine: prioritize same day alternatives, then other days
     all_alternatives = same_day_alternatives[:2] + [
@@ -529,12 +527,12 @@ def _handle_date_selection(
         return _ask_for_date_clarification(state, event_entry)
 
     # Check for conflicts
-    blocked_dates = _get_blocked_dates(event_entry)
-    if selected_date in blocked_dates:
+    plan = _site_visit_plan(state, event_entry)
+    if selected_date in plan.blocked_dates:
         return _date_conflict_response(state, event_entry, selected_date)
 
     # Get available time slots for this date
-    time_slots = _generate_time_slots_for_date(event_entry, selected_date)
+    time_slots = plan.times_for_date(selected_date)
 
     if not time_slots:
         # No time slots available on this date (all booked)
@@ -801,10 +799,10 @@ def _handle_time_selection(
         return _ask_for_time_clarification(state, event_entry, selected_date, proposed_times)
 
     # Validate that the time slot is still available
-    booked_slots = _get_booked_site_visit_slots(event_entry)
-    if (selected_date, selected_time) in booked_slots:
+    plan = _site_visit_plan(state, event_entry)
+    if (selected_date, selected_time) in plan.booked_slots:
         # Slot was booked in the meantime - offer remaining times
-        available_times = _generate_time_slots_for_date(event_entry, selected_date)
+        available_times = plan.times_for_date(selected_date)
         if not available_times:
             # All times booked - go back to date selection
             return _date_conflict_response(state, event_entry, selected_date)
@@ -1061,15 +1059,35 @@ def _site_visit_already_scheduled(
 # =============================================================================
 
 
+def _site_visit_plan(state: WorkflowState, event_entry: Dict[str, Any]) -> SiteVisitPlan:
+    """Slot plan for this turn, built once from the turn's DB snapshot.
+
+    Cached in the turn memo keyed by event and event date, so the helpers of
+    one site-visit turn share a single planning pass.
+    """
+    db = state.db if getattr(state, "db", None) is not None else _load_database()
+    key = (
+        event_entry.get("event_id"),
+        event_entry.get("chosen_date") or event_entry.get("user_info", {}).get("date"),
+    )
+    memo = getattr(state, "memo", None)
+    if memo is None:
+        return SiteVisitPlan.build(event_entry, db)
+    return memo.call(
+        "site_visit_handler.plan",
+        lambda *_: SiteVisitPlan.build(event_entry, db),
+        key,
+        {},
+        False,
+    )
+
+
 def _get_blocked_dates(
     event_entry: Dict[str, Any],
     db: Optional[Dict[str, Any]] = None,
 ) -> Set[str]:
     """Get dates that are blocked for site visits (event days).
 
-    Returns a set of ISO date strings (YYYY-MM-DD) that cannot be booked
-    for site visits because events are scheduled on those days.
-
     Conflict Rule: Site visits CANNOT be booked on event days (hard block).
 
     Args:
@@ -1079,87 +1097,20 @@ def _get_blocked_dates(
     Returns:
         Set of ISO date strings that are blocked for site visits
     """
-    blocked: Set[str] = set()
-
-    # Load database if not provided
-    if db is None:
-        db = _load_database()
-
-    # Get current event's ID to exclude from query (avoid blocking its own date twice)
-    current_event_id = event_entry.get("event_id")
-
-    # Query ALL event dates from the database
-    all_event_dates = get_event_dates(
-        db,
-        exclude_event_id=None,  # Include all events, even current one
-        exclude_cancelled=True,
-    )
-    blocked.update(all_event_dates)
-
-    # Also add current event's date if not yet in database
-    # (handles case where event is being created and not persisted yet)
-    event_date = event_entry.get("chosen_date") or event_entry.get("user_info", {}).get("date")
-    if event_date:
-        try:
-            if "." in event_date:
-                day, month, year = map(int, event_date.split("."))
-                blocked.add(f"{year:04d}-{month:02d}-{day:02d}")
-            else:
-                blocked.add(event_date[:10])  # ISO format
-        except (ValueError, IndexError):
-            pass
-
-    # Load additional blocked dates from config (holidays, maintenance, etc.)
-    config_blocked = get_site_visit_blocked_dates()
-    blocked.update(config_blocked)
-
-    return blocked
+    return collect_blocked_dates(event_entry, db if db is not None else _load_database())
 
 
 def _get_booked_site_visit_slots(
     event_entry: Dict[str, Any],
     db: Optional[Dict[str, Any]] = None,
 ) -> Set[tuple[str, str]]:
-    """Get already-booked site visit slots (per-slot availability).
-
-    Returns a set of (date_iso, time_slot) tuples that are already booked.
-    This allows multiple site visits on the same day at different times.
+    """Get already-booked site visit slots as (date_iso, time_slot) tuples.
 
     Args:
         event_entry: Current event being processed
         db: Optional database dict (if None, loads from file)
-
-    Returns:
-        Set of (date_iso, time_slot) tuples that are already booked
     """
-    booked_slots: Set[tuple[str, str]] = set()
-
-    # Load database if not provided
-    if db is None:
-        db = _load_database()
-
-    current_event_id = event_entry.get("event_id")
-
-    # Query all events with scheduled site visits
-    events = db.get("events", [])
-    for event in events:
-        # Skip current event
-        if event.get("event_id") == current_event_id:
-            continue
-
-        # Check site visit state
-        sv_state = event.get("site_visit_state", {})
-        if sv_state.get("status") == "scheduled":
-            date_iso = sv_state.get("date_iso") or sv_state.get("confirmed_date")
-            time_slot = sv_state.get("time_slot") or sv_state.get("confirmed_time")
-
-            if date_iso and time_slot:
-                booked_slots.add((date_iso, time_slot))
-            elif date_iso:
-                # If no time slot, consider the default time slot booked
-                booked_slots.add((date_iso, "10:00"))
-
-    return booked_slots
+    return collect_booked_slots(event_entry, db if db is not None else _load_database())
 
 
 def _is_slot_available(
@@ -1168,63 +1119,8 @@ def _is_slot_available(
     blocked_dates: Set[str],
     booked_slots: Set[tuple[str, str]],
 ) -> bool:
-    """Check if a specific date+time slot is available for site visit.
-
-    Args:
-        date_iso: Date in ISO format (YYYY-MM-DD)
-        time_slot: Time slot (e.g., "10:00", "14:00")
-        blocked_dates: Set of dates blocked for site visits (event days)
-        booked_slots: Set of (date, time) tuples already booked
-
-    Returns:
-        True if the slot is available, False otherwise
-    """
-    # First check if the date is blocked entirely (event day)
-    if date_iso in blocked_dates:
-        return False
-
-    # Then check if this specific slot is already booked
-    if (date_iso, time_slot) in booked_slots:
-        return False
-
-    return True
-
-
-def _has_any_room_available_for_slot(date_iso: str, time_slot: str) -> bool:
-    """Check if any room is available (not Option/Confirmed) for a given time slot.
-
-    Site visits are venue-wide, so we need at least one room to be "Available"
-    (not booked, not with Option status) for the tour to make sense.
-
-    Args:
-        date_iso: Date in ISO format (YYYY-MM-DD)
-        time_slot: Time slot (e.g., "10:00")
-
-    Returns:
-        True if at least one room is available, False if all rooms are busy/Option
-    """
-    from services.room_eval import evaluate_rooms
-
-    # Create a minimal event entry to evaluate rooms for this date+time
-    # Assume 2-hour site visit window
-    hour = int(time_slot.split(":")[0])
-    start_time = f"{hour:02d}:00"
-    end_time = f"{(hour + 2) % 24:02d}:00"
-
-    # Use timezone-aware ISO format with Zurich timezone offset (+01:00 or +02:00)
-    # Using +00:00 (UTC) for simplicity since calendar uses UTC comparison
-    fake_event = {
-        "requirements": {},
-        "requested_window": {
-            "date_iso": date_iso,
-            "start": f"{date_iso}T{start_time}:00+00:00",
-            "end": f"{date_iso}T{end_time}:00+00:00",
-        },
-    }
-
-    evaluations = evaluate_rooms(fake_event)
-    # Check if at least one room is "Available"
-    return any(e.status == "Available" for e in evaluations)
+    """Check if a specific date+time slot is available for site visit."""
+    return date_iso not in blocked_dates and (date_iso, time_slot) not in booked_slots
 
 
 # =============================================================================
@@ -1232,306 +1128,33 @@ def _has_any_room_available_for_slot(date_iso: str, time_slot: str) -> bool:
 # =============================================================================
 
 
+def _format_visit_slots(slots: List[Tuple[str, str]]) -> List[str]:
+    """(date_iso, time) pairs as "DD.MM.YYYY at HH:MM" strings."""
+    formatted: List[str] = []
+    for date_iso, time_slot in slots:
+        try:
+            formatted.append(datetime.fromisoformat(date_iso).strftime("%d.%m.%Y") + f" at {time_slot}")
+        except ValueError:
+            formatted.append(f"{date_iso} at {time_slot}")
+    return formatted
+
+
 def _generate_visit_slots(
     event_entry: Dict[str, Any],
     blocked_dates: Set[str],
     booked_slots: Optional[Set[tuple[str, str]]] = None,
 ) -> List[str]:
-    """Generate available site visit slots.
-
-    Slots are generated based on the event date:
-    - If event date exists: base = event_date - 7 days (visit before event)
-    - If no event date: base = today + 7 days
+    """Generate up to three available site visit slots ("DD.MM.YYYY at HH:MM").
 
     Excludes blocked dates (event days) and already-booked site visit slots.
     """
-    # Get booked slots if not provided
-    if booked_slots is None:
-        booked_slots = _get_booked_site_visit_slots(event_entry)
-
-    # Get event date
-    event_date_str = event_entry.get("chosen_date") or event_entry.get(
-        "user_info", {}
-    ).get("date")
-
-    # Determine the base date for slot generation
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    try:
-        if event_date_str:
-            # Event date exists - base is event_date - 7 days
-            if "." in event_date_str:
-                day, month, year = map(int, event_date_str.split("."))
-                event_date = datetime(year, month, day)
-            else:
-                event_date = datetime.fromisoformat(event_date_str.replace("Z", ""))
-            base_date = event_date - timedelta(days=7)
-        else:
-            # No event date - base is today + 7 days
-            base_date = today + timedelta(days=7)
-            event_date = None  # No upper bound
-    except (ValueError, IndexError):
-        base_date = today + timedelta(days=7)
-        event_date = None
-
-    slots: List[str] = []
-
-    # Load time slots from config (morning, early afternoon, late afternoon)
-    times = get_site_visit_slots()
-
-    # Load weekday preference and min days ahead from config
-    weekdays_only = get_site_visit_weekdays_only()
-    min_days_ahead = get_site_visit_min_days_ahead()
-
-    # Search around the base date
-    candidate = base_date
-
-    for _ in range(60):  # Search up to 60 days
-        # Ensure candidate is at least min_days_ahead from today
-        if candidate < today + timedelta(days=min_days_ahead):
-            candidate += timedelta(days=1)
-            continue
-
-        # If event date exists, ensure candidate is before it
-        if event_date and candidate >= event_date:
-            # Try going backwards from event_date - 1
-            candidate = event_date - timedelta(days=1)
-            if candidate < today + timedelta(days=min_days_ahead):
-                break  # No valid dates before event
-            continue
-
-        # Check if date is blocked entirely (event day)
-        candidate_iso = candidate.date().isoformat()
-        if candidate_iso in blocked_dates:
-            candidate += timedelta(days=1)
-            continue
-
-        # Check weekday requirement (configurable)
-        if weekdays_only and candidate.weekday() >= 5:
-            candidate += timedelta(days=1)
-            continue
-
-        # Check each time slot for availability
-        for hour in times:
-            time_slot = f"{hour:02d}:00"
-            # Check if this specific slot is booked
-            if (candidate_iso, time_slot) in booked_slots:
-                continue  # This slot is booked, try next time
-
-            slot_dt = candidate.replace(hour=hour, minute=0)
-            slots.append(slot_dt.strftime("%d.%m.%Y at %H:%M"))
-            if len(slots) >= 3:
-                break
-
-        if len(slots) >= 3:
-            break
-
-        candidate += timedelta(days=1)
-
-    return slots
-
-
-def _generate_date_time_slots(
-    event_entry: Dict[str, Any],
-    blocked_dates: Set[str],
-    max_dates: int = 3,
-) -> Dict[str, List[str]]:
-    """Generate available dates WITH their time slots for site visit.
-
-    Returns a dict of date_iso -> [available_times] for display in one message.
-    This is a UX improvement to avoid requiring two separate selections.
-
-    Args:
-        event_entry: Current event being processed
-        blocked_dates: Set of dates blocked for site visits
-        max_dates: Maximum number of dates to return (default 3)
-
-    Returns:
-        Dict mapping ISO dates to lists of available time slots
-        Example: {"2026-08-04": ["10:00", "14:00", "16:00"], "2026-08-05": ["10:00"]}
-    """
-    booked_slots = _get_booked_site_visit_slots(event_entry)
-
-    # Get event date
-    event_date_str = event_entry.get("chosen_date") or event_entry.get(
-        "user_info", {}
-    ).get("date")
-
-    # Determine the base date
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    try:
-        if event_date_str:
-            if "." in event_date_str:
-                day, month, year = map(int, event_date_str.split("."))
-                event_date = datetime(year, month, day)
-            else:
-                event_date = datetime.fromisoformat(event_date_str.replace("Z", ""))
-            base_date = event_date - timedelta(days=7)
-        else:
-            base_date = today + timedelta(days=7)
-            event_date = None
-    except (ValueError, IndexError):
-        base_date = today + timedelta(days=7)
-        event_date = None
-
-    result: Dict[str, List[str]] = {}
-    times = get_site_visit_slots()
-    weekdays_only = get_site_visit_weekdays_only()
-    min_days_ahead = get_site_visit_min_days_ahead()
-
-    candidate = base_date
-
-    for _ in range(60):
-        if candidate < today + timedelta(days=min_days_ahead):
-            candidate += timedelta(days=1)
-            continue
-
-        if event_date and candidate >= event_date:
-            candidate = event_date - timedelta(days=1)
-            if candidate < today + timedelta(days=min_days_ahead):
-                break
-            continue
-
-        candidate_iso = candidate.date().isoformat()
-
-        if candidate_iso in blocked_dates:
-            candidate += timedelta(days=1)
-            continue
-
-        if weekdays_only and candidate.weekday() >= 5:
-            candidate += timedelta(days=1)
-            continue
-
-        # Collect available time slots for this date
-        # A slot is available if: (1) not already booked, (2) at least one room is free
-        available_times: List[str] = []
-        for hour in times:
-            time_slot = f"{hour:02d}:00"
-            if (candidate_iso, time_slot) in booked_slots:
-                continue
-            # Check if any room is available at this time
-            if not _has_any_room_available_for_slot(candidate_iso, time_slot):
-                continue
-            available_times.append(time_slot)
-
-        if available_times:
-            result[candidate_iso] = available_times
-            if len(result) >= max_dates:
-                break
-
-        candidate += timedelta(days=1)
-
-    return result
-
-
-def _generate_available_dates(
-    event_entry: Dict[str, Any],
-    blocked_dates: Set[str],
-) -> List[str]:
-    """Generate available DATES for site visit (without times).
-
-    Returns a list of ISO date strings (YYYY-MM-DD).
-    Used for step 1 of 2-step selection (date → time → confirm).
-    """
-    booked_slots = _get_booked_site_visit_slots(event_entry)
-
-    # Get event date
-    event_date_str = event_entry.get("chosen_date") or event_entry.get(
-        "user_info", {}
-    ).get("date")
-
-    # Determine the base date
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    try:
-        if event_date_str:
-            if "." in event_date_str:
-                day, month, year = map(int, event_date_str.split("."))
-                event_date = datetime(year, month, day)
-            else:
-                event_date = datetime.fromisoformat(event_date_str.replace("Z", ""))
-            base_date = event_date - timedelta(days=7)
-        else:
-            base_date = today + timedelta(days=7)
-            event_date = None
-    except (ValueError, IndexError):
-        base_date = today + timedelta(days=7)
-        event_date = None
-
-    dates: List[str] = []
-    times = get_site_visit_slots()
-    weekdays_only = get_site_visit_weekdays_only()
-    min_days_ahead = get_site_visit_min_days_ahead()
-
-    candidate = base_date
-
-    for _ in range(60):
-        if candidate < today + timedelta(days=min_days_ahead):
-            candidate += timedelta(days=1)
-            continue
-
-        if event_date and candidate >= event_date:
-            candidate = event_date - timedelta(days=1)
-            if candidate < today + timedelta(days=min_days_ahead):
-                break
-            continue
-
-        candidate_iso = candidate.date().isoformat()
-
-        if candidate_iso in blocked_dates:
-            candidate += timedelta(days=1)
-            continue
-
-        if weekdays_only and candidate.weekday() >= 5:
-            candidate += timedelta(days=1)
-            continue
-
-        # Check if at least one time slot is available on this date
-        has_available_slot = False
-        for hour in times:
-            time_slot = f"{hour:02d}:00"
-            if (candidate_iso, time_slot) not in booked_slots:
-                has_available_slot = True
-                break
-
-        if has_available_slot:
-            dates.append(candidate_iso)
-            if len(dates) >= 3:
-                break
-
-        candidate += timedelta(days=1)
-
-    return dates
-
-
-def _generate_time_slots_for_date(
-    event_entry: Dict[str, Any],
-    date_iso: str,
-) -> List[str]:
-    """Generate available time slots for a specific date.
-
-    Returns list of time strings like ["10:00", "14:00", "16:00"].
-    Used for step 2 of 2-step selection.
-
-    A slot is available if:
-    1. It's not already booked as a site visit
-    2. At least one room is available (not Option/Confirmed) at that time
-    """
-    booked_slots = _get_booked_site_visit_slots(event_entry)
-    times = get_site_visit_slots()
-
-    available_times: List[str] = []
-    for hour in times:
-        time_slot = f"{hour:02d}:00"
-        if (date_iso, time_slot) in booked_slots:
-            continue
-        # Check if any room is available at this time
-        if not _has_any_room_available_for_slot(date_iso, time_slot):
-            continue
-        available_times.append(time_slot)
-
-    return available_times
+    plan = SiteVisitPlan.build(
+        event_entry,
+        _load_database() if booked_slots is None else {"events": []},
+        blocked_dates=blocked_dates,
+        booked_slots=booked_slots,
+    )
+    return _format_visit_slots(plan.ranked_slots(3))
 
 
 def _extract_date_from_message(message_text: str) -> Optional[str]:
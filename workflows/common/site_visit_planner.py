@@ -0,0 +1,277 @@
+"""Site-visit slot planner.
+
+Builds everything the site-visit handler needs to propose or validate a
+visit slot in a single pass over the turn's in-memory database snapshot:
+
+- blocked dates (event days, the current event's date, configured holidays)
+- already-booked site-visit slots of other events
+- an occupancy grid of candidate dates x configured time slots x rooms,
+  filled from one calendar busy lookup per room
+
+Weekday, min-days-ahead and blocked-date rules are applied as masks over
+the candidate dates, so the handler's helpers (combined date+time offer,
+date-only offer, time slots for a date, conflict alternatives) read ranked
+slots from the same plan instead of re-loading the database and running a
+full room evaluation per slot.
+
+    plan = SiteVisitPlan.build(event_entry, state.db)
+    plan.date_time_slots()        # {"2026-08-04": ["10:00", "14:00"], ...}
+    plan.times_for_date("2026-08-05")
+
+Candidate dates are ranked as before: starting one week before the event
+(or one week from today when there is no event date), walking forward for
+up to 60 days and never reaching the event day itself.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from workflows.io.config_store import (
+    get_site_visit_blocked_dates,
+    get_site_visit_min_days_ahead,
+    get_site_visit_slots,
+    get_site_visit_weekdays_only,
+)
+from workflows.io.database import get_event_dates
+
+SEARCH_DAYS = 60
+VISIT_HOURS = 2  # Length of the room window a visit needs
+DEFAULT_VISIT_TIME = "10:00"
+
+Slot = Tuple[str, str]
+Interval = Tuple[datetime, datetime]
+
+
+def _event_date_of(event_entry: Dict[str, Any]) -> Optional[str]:
+    return event_entry.get("chosen_date") or (event_entry.get("user_info") or {}).get("date")
+
+
+def _parse_event_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a DD.MM.YYYY or ISO event date (None when absent or malformed)."""
+    if not value:
+        return None
+    try:
+        if "." in value:
+            day, month, year = map(int, value.split("."))
+            return datetime(year, month, day)
+        return datetime.fromisoformat(value.replace("Z", "")).replace(tzinfo=None)
+    except (ValueError, IndexError):
+        return None
+
+
+def collect_blocked_dates(event_entry: Dict[str, Any], db: Dict[str, Any]) -> Set[str]:
+    """ISO dates on which no site visit can be booked (event days + config)."""
+    blocked: Set[str] = set(get_event_dates(db, exclude_event_id=None, exclude_cancelled=True))
+    # The current event's date may not be persisted yet
+    event_date = _event_date_of(event_entry)
+    if event_date:
+        try:
+            if "." in event_date:
+                day, month, year = map(int, event_date.split("."))
+                blocked.add(f"{year:04d}-{month:02d}-{day:02d}")
+            else:
+                blocked.add(event_date[:10])
+        except (ValueError, IndexError):
+            pass
+    blocked.update(get_site_visit_blocked_dates())
+    return blocked
+
+
+def collect_booked_slots(event_entry: Dict[str, Any], db: Dict[str, Any]) -> Set[Slot]:
+    """(date_iso, time_slot) pairs already taken by other events' site visits."""
+    booked: Set[Slot] = set()
+    current_event_id = event_entry.get("event_id")
+    for event in db.get("events", []):
+        if event.get("event_id") == current_event_id:
+            continue
+        sv_state = event.get("site_visit_state", {})
+        if sv_state.get("status") != "scheduled":
+            continue
+        date_iso = sv_state.get("date_iso") or sv_state.get("confirmed_date")
+        time_slot = sv_state.get("time_slot") or sv_state.get("confirmed_time")
+        if date_iso:
+            # Without a time slot the default visit time counts as booked
+            booked.add((date_iso, time_slot or DEFAULT_VISIT_TIME))
+    return booked
+
+
+def _parse_interval(start: Any, end: Any) -> Optional[Interval]:
+    try:
+        return (
+            datetime.fromisoformat(str(start).replace("Z", "+00:00")),
+            datetime.fromisoformat(str(end).replace("Z", "+00:00")),
+        )
+    except ValueError:
+        return None
+
+
+def _load_room_busy(start_iso: str, end_iso: str) -> Dict[str, Optional[List[Interval]]]:
+    """Busy intervals per room, one calendar lookup each (None: no calendar, always free)."""
+    from adapters.calendar_adapter import get_calendar_adapter
+    from services.rooms import load_room_catalog
+
+    adapter = None
+    busy: Dict[str, Optional[List[Interval]]] = {}
+    for record in load_room_catalog():
+        if not record.calendar_id:
+            busy[record.name] = None
+            continue
+        if adapter is None:
+            adapter = get_calendar_adapter()
+        intervals = []
+        for item in adapter.get_busy(record.calendar_id, start_iso, end_iso):
+            interval = _parse_interval(item.get("start"), item.get("end"))
+            if interval is not None:
+                intervals.append(interval)
+        busy[record.name] = intervals
+    return busy
+
+
+def _visit_window(date_iso: str, time_slot: str) -> Optional[Interval]:
+    # Same UTC window the calendar comparison uses elsewhere
+    hour = int(time_slot.split(":")[0])
+    return _parse_interval(
+        f"{date_iso}T{hour:02d}:00:00+00:00",
+        f"{date_iso}T{(hour + VISIT_HOURS) % 24:02d}:00:00+00:00",
+    )
+
+
+@dataclass
+class SiteVisitPlan:
+    """Blocked dates, booked visits and room occupancy for one planning pass."""
+
+    today: datetime
+    event_date: Optional[datetime]
+    times: List[str]
+    weekdays_only: bool
+    min_days_ahead: int
+    blocked_dates: Set[str]
+    booked_slots: Set[Slot]
+    room_busy: Dict[str, Optional[List[Interval]]]
+    # (date_iso, time_slot) -> names of rooms free for the visit window
+    occupancy: Dict[Slot, Tuple[str, ...]] = field(default_factory=dict)
+    candidates: List[str] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        event_entry: Dict[str, Any],
+        db: Dict[str, Any],
+        *,
+        today: Optional[datetime] = None,
+        blocked_dates: Optional[Set[str]] = None,
+        booked_slots: Optional[Set[Slot]] = None,
+    ) -> "SiteVisitPlan":
+        """Plan from the in-memory db; blocked_dates/booked_slots override what db yields."""
+        today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        event_date = _parse_event_date(_event_date_of(event_entry))
+        horizon = max(today, event_date or today) + timedelta(days=SEARCH_DAYS)
+        plan = cls(
+            today=today,
+            event_date=event_date,
+            times=[f"{hour:02d}:00" for hour in get_site_visit_slots()],
+            weekdays_only=get_site_visit_weekdays_only(),
+            min_days_ahead=get_site_visit_min_days_ahead(),
+            blocked_dates=blocked_dates if blocked_dates is not None else collect_blocked_dates(event_entry, db),
+            booked_slots=booked_slots if booked_slots is not None else collect_booked_slots(event_entry, db),
+            room_busy=_load_room_busy(
+                f"{today.date().isoformat()}T00:00:00+00:00",
+                f"{horizon.date().isoformat()}T00:00:00+00:00",
+            ),
+        )
+        plan.candidates = plan._candidate_dates()
+        for date_iso in plan.candidates:
+            for time_slot in plan.times:
+                plan._fill(date_iso, time_slot)
+        return plan
+
+    # -- grid -----------------------------------------------------------------
+
+    def _candidate_dates(self) -> List[str]:
+        """Dates passing the min-days-ahead, blocked-date and weekday masks, in rank order."""
+        earliest = self.today + timedelta(days=self.min_days_ahead)
+        if self.event_date is not None:
+            candidate = self.event_date - timedelta(days=7)
+        else:
+            candidate = self.today + timedelta(days=7)
+
+        dates: List[str] = []
+        for _ in range(SEARCH_DAYS):
+            if candidate < earliest:
+                candidate += timedelta(days=1)
+                continue
+            if self.event_date is not None and candidate >= self.event_date:
+                # Only dates before the event qualify; nothing left to walk
+                break
+            date_iso = candidate.date().isoformat()
+            if date_iso not in self.blocked_dates and not (self.weekdays_only and candidate.weekday() >= 5):
+                dates.append(date_iso)
+            candidate += timedelta(days=1)
+        return dates
+
+    def _fill(self, date_iso: str, time_slot: str) -> Tuple[str, ...]:
+        key = (date_iso, time_slot)
+        if key not in self.occupancy:
+            window = _visit_window(date_iso, time_slot)
+            free = []
+            for room, intervals in self.room_busy.items():
+                if intervals is None or window is None or not any(
+                    start < window[1] and window[0] < end for start, end in intervals
+                ):
+                    free.append(room)
+            self.occupancy[key] = tuple(free)
+        return self.occupancy[key]
+
+    # -- queries --------------------------------------------------------------
+
+    def is_slot_free(self, date_iso: str, time_slot: str) -> bool:
+        """Not an event day and not taken by another site visit."""
+        return date_iso not in self.blocked_dates and (date_iso, time_slot) not in self.booked_slots
+
+    def has_free_room(self, date_iso: str, time_slot: str) -> bool:
+        """At least one room is free for the visit window (visits are venue-wide)."""
+        return bool(self._fill(date_iso, time_slot))
+
+    def times_for_date(self, date_iso: str, *, require_room: bool = True) -> List[str]:
+        """Configured times on date_iso that are not booked (and have a free room)."""
+        return [
+            time_slot
+            for time_slot in self.times
+            if (date_iso, time_slot) not in self.booked_slots
+            and (not require_room or self.has_free_room(date_iso, time_slot))
+        ]
+
+    def date_time_slots(self, max_dates: int = 3) -> Dict[str, List[str]]:
+        """First max_dates candidate dates with their available times."""
+        result: Dict[str, List[str]] = {}
+        for date_iso in self.candidates:
+            times = self.times_for_date(date_iso)
+            if times:
+                result[date_iso] = times
+                if len(result) >= max_dates:
+                    break
+        return result
+
+    def available_dates(self, max_dates: int = 3) -> List[str]:
+        """First max_dates candidate dates with at least one unbooked time."""
+        dates = [d for d in self.candidates if self.times_for_date(d, require_room=False)]
+        return dates[:max_dates]
+
+    def ranked_slots(self, limit: int = 3, *, require_room: bool = False) -> List[Slot]:
+        """First limit (date_iso, time_slot) pairs in rank order."""
+        slots: List[Slot] = []
+        for date_iso in self.candidates:
+            for time_slot in self.times_for_date(date_iso, require_room=require_room):
+                slots.append((date_iso, time_slot))
+                if len(slots) >= limit:
+                    return slots
+        return slots
+
+
+__all__ = [
+    "SiteVisitPlan",
+    "collect_blocked_dates",
+    "collect_booked_slots",
+]
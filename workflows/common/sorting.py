@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional
 
+from workflows.common.turn_memo import turn_memoized
+
 ROOM_OUTCOME_AVAILABLE = "Available"
 ROOM_OUTCOME_OPTION = "Option"
 ROOM_OUTCOME_UNAVAILABLE = "Unavailable"
@@ -67,6 +69,7 @@ def _preference_score(features: Iterable[str], keywords: Iterable[str]) -> float
     return score
 
 
+@turn_memoized()
 def rank_rooms(
     status_map: Dict[str, str],
     *,
@@ -0,0 +1,226 @@
+"""
+Turn-scoped memoization for pure detection/parsing helpers.
+
+One process_msg turn runs the same detectors on the same message text many
+times: at intake, in pre-route, on every pass of the routing loop and again
+in the Q&A router. Functions registered with @turn_memoized are served from
+the active TurnMemo by an argument fingerprint, and the cache disappears
+when the turn ends. Outside a turn (scripts, unit tests calling the helper
+directly) the wrapper calls straight through.
+
+    with turn_scope() as memo:         # process_msg binds one per turn
+        detect_language(text)          # computed
+        detect_language(text)          # served from memo
+
+Each TurnMemo keeps per-function hit/miss counts and the time spent on
+misses. On scope exit they are folded into process-wide totals
+(`memo_totals()` / `format_memo_report()`) and logged when OE_PERF=1, so a
+profile shows which registrations pay off.
+
+Only register functions whose result depends solely on their arguments for
+the duration of a turn. Mutable results are copied on every hit unless the
+registration opts out with copy_result=False.
+
+Turn-local caches derived from mutable turn state (the availability matrices
+built from state.db) key on a TurnMemo version instead: the writer calls
+`memo.bump("bookings")` and the cache rebuilds once `memo.version("bookings")`
+moves. Writes made by other turns never touch this memo.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_ACTIVE: ContextVar[Optional["TurnMemo"]] = ContextVar("TURN_MEMO", default=None)
+_REGISTRY: Dict[str, Callable[..., Any]] = {}
+_TOTALS: Dict[str, "MemoStats"] = {}
+_TOTALS_LOCK = threading.Lock()
+_IMMUTABLE = (str, bytes, int, float, bool, type(None))
+
+
+@dataclass
+class MemoStats:
+    """Hit/miss counters for one registered function."""
+
+    hits: int = 0
+    misses: int = 0
+    miss_seconds: float = 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Estimated time saved: hits x average miss cost."""
+        if not self.misses:
+            return 0.0
+        return self.hits * self.miss_seconds / self.misses
+
+    def merge(self, other: "MemoStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.miss_seconds += other.miss_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "miss_ms": round(self.miss_seconds * 1000.0, 3),
+            "saved_ms": round(self.saved_seconds * 1000.0, 3),
+        }
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=repr)
+
+
+def fingerprint(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    """Hashable key for a call; dict/list arguments are canonicalised."""
+    if kwargs:
+        return (tuple(_freeze(arg) for arg in args), tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())))
+    return tuple(_freeze(arg) for arg in args)
+
+
+class TurnMemo:
+    """Results of registered functions for one turn, with hit statistics."""
+
+    def __init__(self) -> None:
+        self._values: Dict[Tuple[str, Any], Any] = {}
+        self.stats: Dict[str, MemoStats] = {}
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, name: str) -> None:
+        """Invalidate this turn's caches derived from name (e.g. "bookings")."""
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+    def version(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    def call(self, name: str, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any], copy_result: bool) -> Any:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = MemoStats()
+        key = (name, fingerprint(args, kwargs))
+        try:
+            cached = self._values[key]
+        except KeyError:
+            started = perf_counter()
+            result = fn(*args, **kwargs)
+            stats.misses += 1
+            stats.miss_seconds += perf_counter() - started
+            self._values[key] = result
+            return copy.deepcopy(result) if copy_result and not isinstance(result, _IMMUTABLE) else result
+        stats.hits += 1
+        return copy.deepcopy(cached) if copy_result and not isinstance(cached, _IMMUTABLE) else cached
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def stats_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def current_memo() -> Optional[TurnMemo]:
+    """The TurnMemo bound to this context, if a turn is active."""
+    return _ACTIVE.get()
+
+
+@contextmanager
+def turn_scope(memo: Optional[TurnMemo] = None) -> Iterator[TurnMemo]:
+    """Bind a TurnMemo for the duration of one turn, then discard its values."""
+    memo = memo if memo is not None else TurnMemo()
+    token = _ACTIVE.set(memo)
+    try:
+        yield memo
+    finally:
+        _ACTIVE.reset(token)
+        memo.clear()
+        with _TOTALS_LOCK:
+            for name, stats in memo.stats.items():
+                _TOTALS.setdefault(name, MemoStats()).merge(stats)
+        if memo.stats and os.environ.get("OE_PERF", "0") == "1":
+            logger.info("[PERF] turn memo: %s", memo.stats_dict())
+
+
+def turn_memoized(name: Optional[str] = None, *, copy_result: bool = True) -> Callable[[F], F]:
+    """Register a pure function to be memoized within the active turn."""
+
+    def decorator(fn: F) -> F:
+        key = name or f"{fn.__module__}.{fn.__qualname__}"
+        _REGISTRY[key] = fn
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            memo = _ACTIVE.get()
+            if memo is None:
+                return fn(*args, **kwargs)
+            return memo.call(key, fn, args, kwargs, copy_result)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def registered_functions() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def memo_totals() -> Dict[str, Dict[str, Any]]:
+    """Process-wide hit statistics accumulated over finished turns."""
+    with _TOTALS_LOCK:
+        return {name: stats.to_dict() for name, stats in sorted(_TOTALS.items())}
+
+
+def reset_memo_totals() -> None:
+    with _TOTALS_LOCK:
+        _TOTALS.clear()
+
+
+def format_memo_report() -> str:
+    """Table of accumulated turn-memo stats, biggest estimated saving first."""
+    with _TOTALS_LOCK:
+        rows = sorted(_TOTALS.items(), key=lambda item: item[1].saved_seconds, reverse=True)
+        lines = [f"{'function':<60} {'hits':>6} {'misses':>6} {'hit%':>6} {'saved ms':>9}"]
+        for name, stats in rows:
+            calls = stats.hits + stats.misses
+            rate = 100.0 * stats.hits / calls if calls else 0.0
+            lines.append(
+                f"{name:<60} {stats.hits:>6} {stats.misses:>6} {rate:>5.1f}% {stats.saved_seconds * 1000:>9.2f}"
+            )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "MemoStats",
+    "TurnMemo",
+    "current_memo",
+    "fingerprint",
+    "format_memo_report",
+    "memo_totals",
+    "registered_functions",
+    "reset_memo_totals",
+    "turn_memoized",
+    "turn_scope",
+]
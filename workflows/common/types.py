@@ -6,6 +6,8 @@ from typing import Any, Dict, List, Optional
 
 from domain import IntentLabel
 from workflows.common.prompts import compose_footer, FOOTER_SEPARATOR
+from workflows.common.turn_memo import TurnMemo
+from utils.cancellation import CancelToken
 
 
 @dataclass
@@ -189,6 +191,10 @@ class WorkflowState:
     subloops_trace: List[str] = field(default_factory=list)
     audit_log: List[Dict[str, Any]] = field(default_factory=list)
     telemetry: TurnTelemetry = field(default_factory=TurnTelemetry)
+    # Turn-scoped memo for @turn_memoized detectors (bound by process_msg)
+    memo: TurnMemo = field(default_factory=TurnMemo)
+    # Cancellation/deadline token of the API request driving this turn (None offline)
+    cancel: Optional[CancelToken] = None
 
     def record_context(self, context: Dict[str, Any]) -> None:
         """[OpenEvent Database] Store the latest context snapshot for the workflow."""
@@ -265,6 +271,7 @@ class WorkflowState:
                     role="assistant",
                     text=body_markdown,
                     metadata={"step": step_value, "thread_state": thread_state},
+                    client_id=self.client_id,
                 )
             except Exception:
                 pass  # Don't fail workflow on memory storage errors
@@ -7,21 +7,22 @@ under db["config"]["venue"] and can be updated via the API or edited directly.
 
 All accessors return sensible defaults if the config is missing, ensuring
 backward compatibility with existing installations.
+
+Sections are read from the current tenant's config snapshot
+(workflows.io.tenants): the database is parsed once per change of the file
+rather than on every accessor call, and with tenant routing enabled each team
+sees its own settings over the shared defaults.
 """
 
 from __future__ import annotations
 
 import re
-from pathlib import Path
 from typing import Any, Dict, List, Pattern, Tuple
 
-from workflows.io.database import load_db
+from workflows.io.tenants import tenant_config_section
 
 __workflow_role__ = "ConfigStore"
 
-# Database path (same as workflow_email.py)
-DB_PATH = Path(__file__).resolve().parents[2] / "events_database.json"
-
 # Default values - match current hardcoded behavior
 _DEFAULTS: Dict[str, Any] = {
     "name": "The Atelier",
@@ -55,14 +56,7 @@ _PRODUCT_DEFAULTS: Dict[str, Any] = {
 
 def _get_venue_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load venue config from database with defaults."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        venue = config.get("venue", {})
-        return venue
-    except Exception:
-        # If DB fails to load, return empty dict (defaults will be used)
-        return {}
+    return tenant_config_section("venue")
 
 
 def get_venue_name() -> str:
@@ -149,12 +143,7 @@ def get_all_venue_config() -> Dict[str, Any]:
 
 def _get_site_visit_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load site visit config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("site_visit", {})
-    except Exception:
-        return {}
+    return tenant_config_section("site_visit")
 
 
 def get_site_visit_blocked_dates() -> List[str]:
@@ -220,12 +209,7 @@ def get_all_site_visit_config() -> Dict[str, Any]:
 
 def _get_manager_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load manager config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("managers", {})
-    except Exception:
-        return {}
+    return tenant_config_section("managers")
 
 
 def get_manager_names() -> List[str]:
@@ -255,12 +239,7 @@ def get_all_manager_config() -> Dict[str, Any]:
 
 def _get_product_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load product config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("products", {})
-    except Exception:
-        return {}
+    return tenant_config_section("products")
 
 
 def get_product_autofill_threshold() -> float:
@@ -334,12 +313,7 @@ _MENU_DEFAULTS: Dict[str, Any] = {
 
 def _get_menus_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load menus config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("menus", {})
-    except Exception:
-        return {}
+    return tenant_config_section("menus")
 
 
 def get_dinner_menu_options() -> List[Dict[str, Any]]:
@@ -387,12 +361,7 @@ _CATALOG_DEFAULTS: Dict[str, Any] = {
 
 def _get_catalog_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load product catalog config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("catalog", {})
-    except Exception:
-        return {}
+    return tenant_config_section("catalog")
 
 
 def get_product_room_map() -> List[Dict[str, Any]]:
@@ -495,12 +464,7 @@ _FAQ_DEFAULTS: Dict[str, Any] = {
 
 def _get_faq_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load FAQ config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("faq", {})
-    except Exception:
-        return {}
+    return tenant_config_section("faq")
 
 
 def get_faq_items() -> List[Dict[str, Any]]:
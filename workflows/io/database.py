@@ -3,17 +3,25 @@ from __future__ import annotations
 import hashlib
 import os
 import tempfile
+import threading
 import time
 import uuid
+import weakref
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from functools import lru_cache
 
 from domain import EventStatus, TaskStatus
 from utils import json_io
+from utils.cancellation import check_cancelled
 from utils.calendar_events import create_calendar_event
+from workflows.common.turn_memo import current_memo
+from workflows.common.ordinal_dates import RoomDayIndex, event_day_ordinal, event_room, event_status
 
 __workflow_role__ = "Database"
 
@@ -124,6 +132,8 @@ class FileLock:
 
                 if time.time() >= deadline:
                     raise TimeoutError(f"Could not acquire lock {self.path}")
+                # A cancelled turn stops waiting (and saves nothing)
+                check_cancelled("db_lock")
                 time.sleep(self.sleep)
 
     def release(self) -> None:
@@ -165,6 +175,42 @@ def lock_path_for(path: Path, default_lock: Optional[Path] = None) -> Path:
     return path.with_name(f".{path.name}.lock")
 
 
+def _normalize_db(db: Dict[str, Any]) -> Dict[str, Any]:
+    if "events" not in db or not isinstance(db["events"], list):
+        db["events"] = []
+    if "clients" not in db or not isinstance(db["clients"], dict):
+        db["clients"] = {}
+    if "tasks" not in db or not isinstance(db["tasks"], list):
+        db["tasks"] = []
+    events = db.get("events", [])
+    for event in events:
+        ensure_event_defaults(event)
+    return db
+
+
+def _file_stamp(stat: os.stat_result) -> Tuple[int, int, int]:
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class LoadSnapshot:
+    """[OpenEvent Database] The records a db copy last read or wrote, for merging its next save.
+
+    stamp identifies the file while it still holds exactly these records
+    (None once another writer's records were merged into it).
+    """
+
+    text: str
+    stamp: Optional[Tuple[int, int, int]] = None
+
+    def records(self) -> Dict[str, Any]:
+        return _normalize_db(json_io.loads(self.text))
+
+
+# Key of the LoadSnapshot on a loaded db; save_db never persists it
+SNAPSHOT_KEY = "_load_snapshot"
+
+
 def load_db(path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool = False) -> Dict[str, Any]:
     """[OpenEvent Database] Load and validate the events database from disk.
 
@@ -176,33 +222,33 @@ def load_db(path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool =
 
     path = Path(path)
     if not path.exists():
-        return get_default_db()
+        db = get_default_db()
+        db[SNAPSHOT_KEY] = LoadSnapshot(json_io.dumps(db))
+        return db
 
     def _do_load():
         with path.open("r", encoding="utf-8") as fh:
-            return json_io.load(fh)
+            return fh.read(), _file_stamp(os.fstat(fh.fileno()))
 
     if _lock_held:
-        db = _do_load()
+        text, stamp = _do_load()
     else:
         lock_candidate = lock_path_for(path, lock_path)
         with FileLock(lock_candidate):
-            db = _do_load()
-    if "events" not in db or not isinstance(db["events"], list):
-        db["events"] = []
-    if "clients" not in db or not isinstance(db["clients"], dict):
-        db["clients"] = {}
-    if "tasks" not in db or not isinstance(db["tasks"], list):
-        db["tasks"] = []
-    events = db.get("events", [])
-    for event in events:
-        ensure_event_defaults(event)
+            text, stamp = _do_load()
+    db = _normalize_db(json_io.loads(text))
+    db[SNAPSHOT_KEY] = LoadSnapshot(text, stamp)
     return db
 
 
 def save_db(db: Dict[str, Any], path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool = False) -> None:
     """[OpenEvent Database] Persist the database atomically with crash-safe semantics.
 
+    A db that came from load_db is merged with the file: only the records it
+    changed since it was loaded (or last saved) are written, so concurrent
+    turns, batch partitions and API edits keep each other's changes (see
+    merge_saved_records). A db built from scratch replaces the file.
+
     Args:
         db: The database dict to persist
         path: Path to the database JSON file
@@ -211,31 +257,264 @@ def save_db(db: Dict[str, Any], path: Path, lock_path: Optional[Path] = None, *,
     """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    out_db = {
-        "events": db.get("events", []),
-        "clients": db.get("clients", {}),
-        "tasks": db.get("tasks", []),
-        "config": db.get("config", {}),
-    }
-
-    def _do_save():
+    owner = _RECORD_OWNER.get()
+    snapshot = db.get(SNAPSHOT_KEY)
+
+    def _do_save() -> LoadSnapshot:
+        out_db = {
+            "events": db.get("events", []),
+            "clients": db.get("clients", {}),
+            "tasks": db.get("tasks", []),
+            "config": db.get("config", {}),
+        }
+        written = out_db
+        if (snapshot is not None or owner is not None) and path.exists():
+            stamp = _file_stamp(path.stat())
+            if snapshot is None or snapshot.stamp != stamp:
+                # Another writer saved since this copy was loaded
+                disk = load_db(path, _lock_held=True)
+                if owner is not None:
+                    conflicts = booking_conflicts(disk, out_db, owner)
+                    if conflicts:
+                        raise BookingConflictError(owner.client_id, conflicts)
+                loaded = snapshot.records() if snapshot is not None else None
+                written = merge_saved_records(disk, out_db, loaded, owner)
+        text = json_io.dumps(written, indent=2, ensure_ascii=False)
         tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
         try:
             with os.fdopen(tmp_fd, "w", encoding="utf-8") as fh:
-                json_io.dump(out_db, fh, indent=2, ensure_ascii=False)
+                fh.write(text)
                 fh.flush()
                 os.fsync(fh.fileno())
             os.replace(tmp_path, path)
         finally:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
+        if written is out_db:
+            return LoadSnapshot(text, _file_stamp(path.stat()))
+        return LoadSnapshot(json_io.dumps(out_db))
 
     if _lock_held:
-        _do_save()
+        db[SNAPSHOT_KEY] = _do_save()
     else:
         lock_candidate = lock_path_for(path, lock_path)
         with FileLock(lock_candidate):
-            _do_save()
+            db[SNAPSHOT_KEY] = _do_save()
+
+
+@dataclass(frozen=True)
+class RecordOwner:
+    """[OpenEvent Database] The client (and thread) whose records a turn may write."""
+
+    client_id: str
+    thread_id: Optional[str] = None
+
+    def owns_event(self, event: Dict[str, Any]) -> bool:
+        email = ((event.get("event_data") or {}).get("Email") or "").lower()
+        if email and email == self.client_id:
+            return True
+        return self.thread_id is not None and event.get("thread_id") == self.thread_id
+
+    def owns_task(self, task: Dict[str, Any]) -> bool:
+        return (task.get("client_id") or "").lower() == self.client_id
+
+
+class BookingConflictError(RuntimeError):
+    """[OpenEvent Database] An owned save would double-book a room another client took meanwhile."""
+
+    def __init__(self, client_id: str, conflicts: List[str]) -> None:
+        super().__init__(f"{client_id}: {', '.join(conflicts)} confirmed by another client since load")
+        self.client_id = client_id
+        self.conflicts = conflicts
+
+
+_RECORD_OWNER: ContextVar[Optional[RecordOwner]] = ContextVar("oe_record_owner", default=None)
+
+
+def record_owner() -> Optional[RecordOwner]:
+    """[OpenEvent Database] The owner scope saves in this context merge under, if any."""
+
+    return _RECORD_OWNER.get()
+
+
+@contextmanager
+def owned_records(client_id: str, thread_id: Optional[str] = None) -> Iterator[RecordOwner]:
+    """[OpenEvent Database] Scope saves to one client's records.
+
+    Every save merges the records a turn changed into the file
+    (merge_saved_records). Inside the scope a record another writer changed
+    meanwhile is only overwritten when it belongs to this client; otherwise
+    the turn's write is dropped and logged. Batch ingestion runs each client
+    partition in its own scope so partitions can be processed in parallel
+    against the same JSON database. A save holding a room and day that
+    another client confirmed since the load raises BookingConflictError.
+
+    Scopes of the same client (or thread, without an email) run one at a
+    time: their turns edit the same records, which a merge cannot combine.
+    """
+
+    owner = RecordOwner((client_id or "").lower(), thread_id)
+    with _owner_turn(owner.client_id or owner.thread_id):
+        token = _RECORD_OWNER.set(owner)
+        try:
+            yield owner
+        finally:
+            _RECORD_OWNER.reset(token)
+
+
+_OWNER_LOCKS: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+_OWNER_LOCKS_GUARD = threading.Lock()
+
+
+@contextmanager
+def _owner_turn(key: Optional[str]) -> Iterator[None]:
+    if not key:
+        yield
+        return
+    with _OWNER_LOCKS_GUARD:
+        lock = _OWNER_LOCKS.get(key)
+        if lock is None:
+            lock = _OWNER_LOCKS[key] = threading.RLock()
+    # Waiting behind the client's previous turn stays cancellable
+    acquired = lock.acquire(blocking=False)
+    while not acquired:
+        check_cancelled("client_turn")
+        acquired = lock.acquire(timeout=LOCK_SLEEP)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+_BOOKING_FIELDS = frozenset({"status", "locked_room_id", "chosen_date", "event_data"})
+
+
+def _booking_written() -> None:
+    """Invalidate this turn's booking-derived caches (turn availability matrices)."""
+
+    memo = current_memo()
+    if memo is not None:
+        memo.bump("bookings")
+
+
+def booking_conflicts(disk: Dict[str, Any], ours: Dict[str, Any], owner: RecordOwner) -> List[str]:
+    """[OpenEvent Database] Rooms owner holds in ours that another client confirmed since the load.
+
+    Other partitions' bookings are compared as the turn saw them (ours) and as
+    they are on disk now; a hold on a room and day that became Confirmed in
+    between was decided on stale availability. Returns "room@day" labels.
+    """
+
+    def _others(db: Dict[str, Any]) -> RoomDayIndex:
+        return RoomDayIndex(e for e in db.get("events", []) if not owner.owns_event(e))
+
+    held = [
+        (event.get("event_id"), event_room(event), event_day_ordinal(event))
+        for event in ours.get("events", [])
+        if owner.owns_event(event) and event_status(event) in ("option", "confirmed")
+    ]
+    held = [(event_id, room, day) for event_id, room, day in held if room and day is not None]
+    if not held:
+        return []
+    seen, now = _others(ours), _others(disk)
+    return [
+        f"{room}@{day}"
+        for event_id, room, day in held
+        if now.status_on(room, day, exclude_event_id=event_id) == "Confirmed"
+        and seen.status_on(room, day, exclude_event_id=event_id) != "Confirmed"
+    ]
+
+
+_MISSING: Any = object()
+
+
+def _keyed(records: List[Dict[str, Any]], id_field: str) -> Dict[str, Dict[str, Any]]:
+    # Records without an id are keyed by content: an edit reads as remove + add
+    return {
+        str(record.get(id_field) or "~" + hashlib.sha1(json_io.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()): record
+        for record in records
+    }
+
+
+def _merge_section(
+    label: str,
+    disk: Dict[str, Any],
+    ours: Dict[str, Any],
+    loaded: Optional[Dict[str, Any]],
+    owned: Any,
+    writer: str,
+) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for key in list(disk) + [key for key in ours if key not in disk]:
+        on_disk, mine = disk.get(key, _MISSING), ours.get(key, _MISSING)
+        record = mine if mine is not _MISSING else on_disk
+        if loaded is None:
+            # No load snapshot: the owner's records are taken from ours
+            keep = mine if owned(key, record) else on_disk
+        else:
+            before = loaded.get(key, _MISSING)
+            if mine == before:
+                keep = on_disk
+            elif on_disk == before or on_disk == mine:
+                keep = mine
+            elif owned(key, record):
+                logger.info("[DB][MERGE] %s overwrote a concurrent change to %s:%s", writer, label, key)
+                keep = mine
+            else:
+                logger.warning("[DB][MERGE] dropped %s's write to %s:%s (changed meanwhile, not owned by this turn)", writer, label, key)
+                keep = on_disk
+        if keep is not _MISSING:
+            merged[key] = keep
+    return merged
+
+
+def merge_saved_records(
+    disk: Dict[str, Any],
+    ours: Dict[str, Any],
+    loaded: Optional[Dict[str, Any]],
+    owner: Optional[RecordOwner] = None,
+) -> Dict[str, Any]:
+    """[OpenEvent Database] On-disk db with the records ours changed since loaded applied.
+
+    Events, tasks (by id), client profiles and the config section are merged
+    one record at a time. A record ours left as loaded takes the file's
+    version, so other writers' changes and deletions survive; one ours
+    changed, added or removed is written. If both sides changed the same
+    record, an owner scope (owned_records) keeps ours only for the owner's
+    records and logs the dropped write otherwise; without an owner the last
+    writer wins. Without a load snapshot (loaded=None) only the owner's
+    records are taken from ours.
+    """
+
+    writer = owner.client_id if owner is not None else "unscoped save"
+
+    def _owned(section: str):
+        def owned(key: str, record: Any) -> bool:
+            if owner is None:
+                return True
+            if section == "event":
+                return owner.owns_event(record)
+            if section == "task":
+                return owner.owns_task(record)
+            return section == "client" and key == owner.client_id
+
+        return owned
+
+    def _section(section: str, pick) -> Dict[str, Any]:
+        return _merge_section(
+            section, pick(disk), pick(ours), pick(loaded) if loaded is not None else None, _owned(section), writer
+        )
+
+    events = _section("event", lambda db: _keyed(db.get("events", []), "event_id"))
+    tasks = _section("task", lambda db: _keyed(db.get("tasks", []), "task_id"))
+    clients = _section("client", lambda db: dict(db.get("clients", {})))
+    config = _section("config", lambda db: {"config": db.get("config", {})})
+    return {
+        "events": list(events.values()),
+        "clients": clients,
+        "tasks": list(tasks.values()),
+        "config": config.get("config", {}),
+    }
 
 
 def upsert_client(db: Dict[str, Any], email: str, name: Optional[str] = None) -> Dict[str, Any]:
@@ -384,6 +663,7 @@ def create_event_entry(db: Dict[str, Any], event_data: Dict[str, Any]) -> str:
         "deferred_intents": [],
     }
     db.setdefault("events", []).append(entry)
+    _booking_written()
     try:
         calendar_event = create_calendar_event(entry, "lead")
         entry["calendar_event_id"] = calendar_event.get("id")
@@ -547,6 +827,8 @@ def update_event_metadata(event: Dict[str, Any], **fields: Any) -> None:
     ensure_event_defaults(event)
     for key, value in fields.items():
         event[key] = value
+    if _BOOKING_FIELDS.intersection(fields):
+        _booking_written()
 
     # Sync booking status to event_data["Status"] for backward compatibility
     # Only sync recognized booking statuses, not workflow stages
@@ -23,6 +23,9 @@ Environment Variables:
     OE_EMAIL_PLAIN_TEXT: Set to "true" to strip Markdown from outgoing emails
     OE_ALLOW_JSON_FALLBACK: "true"/"false" to control JSON fallback on Supabase errors
                             Defaults to: allowed in dev, disabled in prod (ENV=prod)
+    OE_ENTITY_REGISTRY_TTL_SECONDS: Per-team room/product registry refresh interval (default 300)
+    OE_CLIENT_UUID_CACHE_SIZE: Max cached (team, email) -> client UUID entries (default 1024)
+    OE_CLIENT_UUID_NEGATIVE_TTL_SECONDS: How long "client not found" is cached (default 60)
 
 Fallback Behavior (Testing Branch):
     When OE_INTEGRATION_MODE=supabase AND allow_json_fallback=True:
@@ -86,6 +89,15 @@ class IntegrationConfig:
     # When False: Keep Markdown formatting (most email clients handle it)
     email_plain_text: bool = False
 
+    # Entity/client UUID caches (multi-tenant lookups)
+    # entity_registry_ttl_seconds: how long a team's room/product name -> UUID
+    #   mapping is trusted before it is reloaded from Supabase
+    # client_uuid_cache_size: max (team, email) -> client UUID entries kept (LRU)
+    # client_uuid_negative_ttl_seconds: how long a "no such client" answer is cached
+    entity_registry_ttl_seconds: float = 300.0
+    client_uuid_cache_size: int = 1024
+    client_uuid_negative_ttl_seconds: float = 60.0
+
     @classmethod
     def from_env(cls) -> "IntegrationConfig":
         """Load configuration from environment variables."""
@@ -122,6 +134,10 @@ class IntegrationConfig:
             allow_json_fallback=allow_fallback and mode == "supabase",
             # Email plain text mode
             email_plain_text=email_plain,
+            # UUID caches
+            entity_registry_ttl_seconds=float(os.getenv("OE_ENTITY_REGISTRY_TTL_SECONDS", "300")),
+            client_uuid_cache_size=int(os.getenv("OE_CLIENT_UUID_CACHE_SIZE", "1024")),
+            client_uuid_negative_ttl_seconds=float(os.getenv("OE_CLIENT_UUID_NEGATIVE_TTL_SECONDS", "60")),
         )
 
     def is_supabase_mode(self) -> bool:
@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .config import INTEGRATION_CONFIG, get_team_id, get_system_user_id
 from .field_mapping import (
@@ -36,7 +36,9 @@ from .uuid_adapter import (
     normalize_email,
     is_valid_uuid,
     register_client_lookup,
+    register_registry_loader,
     get_entity_registry,
+    get_client_uuid_cache,
 )
 from .offer_utils import generate_offer_number, format_date_for_supabase
 from .hil_tasks import create_message_approval_task, create_email_record
@@ -83,11 +85,11 @@ def get_supabase_client():
 
     _supabase_client = create_client(url, key)
 
-    # Register client lookup function for UUID adapter
+    # Register lookup functions for UUID adapter. Room/product registries
+    # are loaded lazily per team on first access (and refreshed on TTL),
+    # so tenants other than the one active at startup get their mappings too.
     register_client_lookup(_lookup_client_by_email)
-
-    # Load entity registries
-    _load_entity_registries()
+    register_registry_loader(_load_entity_registries)
 
     return _supabase_client
 
@@ -107,15 +109,9 @@ def _lookup_client_by_email(email: str, team_id: str) -> Optional[str]:
     return None
 
 
-def _load_entity_registries():
-    """Load room and product name -> UUID mappings."""
+def _load_entity_registries(team_id: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Load room and product name -> UUID rows for one team (used by uuid_adapter)."""
     client = get_supabase_client()
-    team_id = get_team_id()
-
-    if not team_id:
-        return
-
-    registry = get_entity_registry()
 
     # Load rooms
     rooms_result = client.table("rooms") \
@@ -129,10 +125,7 @@ def _load_entity_registries():
         .eq("team_id", team_id) \
         .execute()
 
-    registry.load_from_supabase(
-        rooms_result.data or [],
-        products_result.data or []
-    )
+    return rooms_result.data or [], products_result.data or []
 
 
 # =============================================================================
@@ -150,6 +143,11 @@ def upsert_client(
 
     Matches database.py:upsert_client interface but returns Supabase record.
 
+    A (team, email) already in the client UUID cache skips the select and
+    the name fill-in, returning just the cached id. A cached "not found"
+    entry is not trusted here: the client may have been created since, so
+    the select still runs before an insert.
+
     Args:
         email: Client email (used for lookup)
         name: Client name
@@ -163,6 +161,11 @@ def upsert_client(
     team_id = get_team_id()
     user_id = get_system_user_id()
     email_normalized = normalize_email(email)
+    cache = get_client_uuid_cache()
+
+    client_id = cache.get(email_normalized, team_id)
+    if client_id:
+        return {"id": client_id, "email": email_normalized, "team_id": team_id}
 
     # Try to find existing client
     existing = client.table("clients") \
@@ -173,6 +176,7 @@ def upsert_client(
         .execute()
 
     if existing.data:
+        cache.set(email_normalized, existing.data["id"], team_id)
         # Update if name was provided and client has no name
         if name and not existing.data.get("name"):
             client.table("clients") \
@@ -195,7 +199,10 @@ def upsert_client(
     }
 
     result = client.table("clients").insert(new_client).execute()
-    return result.data[0]
+    created = result.data[0]
+    # Replaces any cached "not found" entry for this email
+    cache.set(email_normalized, created["id"], team_id)
+    return created
 
 
 # =============================================================================
@@ -395,7 +402,7 @@ def update_event_room(
         Updated event record
     """
     # Convert room name to UUID if needed
-    registry = get_entity_registry()
+    registry = get_entity_registry(get_team_id())
     room_uuid = registry.get_room_uuid(selected_room) or selected_room
 
     return update_event_metadata(
@@ -14,9 +14,17 @@ Based on EMAIL_WORKFLOW_INTEGRATION_REQUIREMENTS.md Section A2.
 
 from __future__ import annotations
 
+import logging
 import re
+import threading
+import time
 import uuid
-from typing import Any, Dict, Optional, Callable
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import INTEGRATION_CONFIG, get_team_id
+
+logger = logging.getLogger(__name__)
 
 # UUID v4 regex pattern
 UUID_PATTERN = re.compile(
@@ -82,26 +90,104 @@ def normalize_email(email: str) -> str:
 
 class ClientUUIDCache:
     """
-    In-memory cache for email -> UUID mappings.
+    Bounded LRU cache for (team, email) -> UUID mappings.
 
-    Used to avoid repeated database lookups during a single workflow run.
-    Cache is cleared between sessions.
+    Used to avoid repeated database lookups across workflow runs. Entries are
+    scoped per team so tenants never see each other's client UUIDs. Lookups
+    that found no client are cached as negative entries for a short TTL, so
+    unknown senders don't trigger a Supabase query on every resolution.
     """
 
-    def __init__(self):
-        self._cache: Dict[str, str] = {}
-
-    def get(self, email: str) -> Optional[str]:
-        """Get cached UUID for email, or None if not cached."""
-        return self._cache.get(normalize_email(email))
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        negative_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_size = max(1, max_size or INTEGRATION_CONFIG.client_uuid_cache_size)
+        self._negative_ttl = (
+            INTEGRATION_CONFIG.client_uuid_negative_ttl_seconds
+            if negative_ttl is None else negative_ttl
+        )
+        self._clock = clock
+        # key -> (uuid or None for negative entry, expires_at or None)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[Optional[str], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(email: str, team_id: Optional[str]) -> Tuple[str, str]:
+        return (team_id or "", normalize_email(email))
+
+    def lookup(self, email: str, team_id: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Look up an email in the cache.
 
-    def set(self, email: str, uuid_str: str) -> None:
+        Returns:
+            (cached, uuid) - cached=True with uuid=None is a negative entry
+            ("client known not to exist"); cached=False means ask the backend.
+        """
+        key = self._key(email, team_id)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._cache[key]
+                self.misses += 1
+                return False, None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def get(self, email: str, team_id: Optional[str] = None) -> Optional[str]:
+        """Get cached UUID for email, or None if not cached (or cached as missing)."""
+        return self.lookup(email, team_id)[1]
+
+    def set(self, email: str, uuid_str: str, team_id: Optional[str] = None) -> None:
         """Cache a UUID for an email."""
-        self._cache[normalize_email(email)] = uuid_str
+        self._store(self._key(email, team_id), uuid_str, None)
+
+    def set_missing(self, email: str, team_id: Optional[str] = None) -> None:
+        """Cache that no client exists for an email (expires after the negative TTL)."""
+        if self._negative_ttl <= 0:
+            return
+        self._store(self._key(email, team_id), None, self._clock() + self._negative_ttl)
+
+    def invalidate(self, email: str, team_id: Optional[str] = None) -> None:
+        """Drop a single cached mapping (e.g. after creating the client)."""
+        with self._lock:
+            self._cache.pop(self._key(email, team_id), None)
+
+    def _store(self, key: Tuple[str, str], value: Optional[str], expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._cache[key] = (value, expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return size and hit/miss counters (for debug endpoints)."""
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def clear(self) -> None:
         """Clear all cached mappings."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
 
 
 # Global cache instance
@@ -143,7 +229,8 @@ def lookup_client_uuid(email: str, team_id: str) -> Optional[str]:
     """
     Look up client UUID by email.
 
-    First checks cache, then queries Supabase if registered.
+    First checks the per-team cache (including cached misses), then
+    queries Supabase if registered.
 
     Args:
         email: Client email address
@@ -155,15 +242,17 @@ def lookup_client_uuid(email: str, team_id: str) -> Optional[str]:
     email_normalized = normalize_email(email)
 
     # Check cache first
-    cached = _client_uuid_cache.get(email_normalized)
-    if cached:
+    is_cached, cached = _client_uuid_cache.lookup(email_normalized, team_id)
+    if is_cached:
         return cached
 
     # Query Supabase if lookup function is registered
     if _supabase_client_lookup:
         result = _supabase_client_lookup(email_normalized, team_id)
         if result:
-            _client_uuid_cache.set(email_normalized, result)
+            _client_uuid_cache.set(email_normalized, result, team_id)
+        else:
+            _client_uuid_cache.set_missing(email_normalized, team_id)
         return result
 
     return None
@@ -312,42 +401,169 @@ class EntityUUIDRegistry:
             if product.get("id") and product.get("name"):
                 self._products[product["name"].lower()] = product["id"]
 
+    def replace_from_supabase(self, rooms: list, products: list) -> None:
+        """
+        Replace all mappings with fresh Supabase query results.
+
+        The new dicts are built first and swapped in, so concurrent readers
+        never observe a half-cleared registry during a refresh.
+        """
+        fresh = EntityUUIDRegistry()
+        fresh.load_from_supabase(rooms, products)
+        self._rooms, self._products = fresh._rooms, fresh._products
+
     def clear(self) -> None:
         """Clear all registries."""
         self._rooms.clear()
         self._products.clear()
 
 
-# Global registry instance
-_entity_registry = EntityUUIDRegistry()
+# Type hint for the registry loader: team_id -> (room rows, product rows)
+RegistryLoaderFn = Callable[[str], Tuple[list, list]]
+
+# Will be set by supabase_adapter when initialized
+_registry_loader: Optional[RegistryLoaderFn] = None
+
+
+def register_registry_loader(fn: RegistryLoaderFn) -> None:
+    """
+    Register the Supabase room/product loader.
+
+    Called by supabase_adapter during initialization. Loaded teams are
+    invalidated so they pick up the new source on next access.
+    """
+    global _registry_loader
+    _registry_loader = fn
+    _team_registries.invalidate()
+
+
+class TeamEntityRegistryCache:
+    """
+    Per-team EntityUUIDRegistry instances.
+
+    A team's registry is loaded lazily on first access and reloaded once it
+    is older than the TTL or after invalidate() (change notification, e.g.
+    a room or product was created/renamed). If a reload fails, the previous
+    mappings are kept and retried after the next TTL window.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl = (
+            INTEGRATION_CONFIG.entity_registry_ttl_seconds
+            if ttl_seconds is None else ttl_seconds
+        )
+        self._clock = clock
+        self._registries: Dict[str, EntityUUIDRegistry] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, team_id: Optional[str]) -> EntityUUIDRegistry:
+        """Return the registry for a team, loading or refreshing it if stale."""
+        key = team_id or ""
+        registry = self._registries.get(key)
+        if registry is not None and not self._is_stale(key):
+            return registry
+
+        with self._lock:
+            registry = self._registries.setdefault(key, EntityUUIDRegistry())
+            if self._is_stale(key):
+                self._refresh(key, registry)
+        return registry
+
+    def _is_stale(self, key: str) -> bool:
+        loaded_at = self._loaded_at.get(key)
+        if loaded_at is None:
+            return True
+        return self._ttl > 0 and self._clock() - loaded_at >= self._ttl
+
+    def _refresh(self, key: str, registry: EntityUUIDRegistry) -> None:
+        loader = _registry_loader
+        if loader is None or not key:
+            # Nothing to load from yet; stay stale so a later access loads it
+            return
+        try:
+            rooms, products = loader(key)
+        except Exception as exc:
+            logger.warning("[UUID] Failed to load entity registry for team %s: %s", key, exc)
+        else:
+            registry.replace_from_supabase(rooms or [], products or [])
+            self.loads += 1
+        self._loaded_at[key] = self._clock()
+
+    def invalidate(self, team_id: Optional[str] = None) -> None:
+        """Mark one team (or all teams) stale; the next access reloads."""
+        with self._lock:
+            if team_id is None:
+                self._loaded_at.clear()
+            else:
+                self._loaded_at.pop(team_id, None)
+
+    def teams(self) -> List[str]:
+        """Team ids that currently have a registry in memory."""
+        return [key for key in self._registries if key]
+
+    def clear(self) -> None:
+        """Drop all registries (for testing)."""
+        with self._lock:
+            self._registries.clear()
+            self._loaded_at.clear()
+            self.loads = 0
+
+
+# Global per-team registry cache
+_team_registries = TeamEntityRegistryCache()
+
+
+def get_entity_registry(team_id: Optional[str] = None) -> EntityUUIDRegistry:
+    """
+    Get the entity UUID registry for a team.
+
+    Args:
+        team_id: Team UUID; defaults to the request/env team from config.get_team_id()
+    """
+    if team_id is None:
+        team_id = get_team_id()
+    return _team_registries.get(team_id)
+
+
+def get_team_registry_cache() -> TeamEntityRegistryCache:
+    """Get the global per-team registry cache."""
+    return _team_registries
 
 
-def get_entity_registry() -> EntityUUIDRegistry:
-    """Get the global entity UUID registry."""
-    return _entity_registry
+def invalidate_entity_registry(team_id: Optional[str] = None) -> None:
+    """Force a reload of a team's (or every team's) room/product mappings."""
+    _team_registries.invalidate(team_id)
 
 
-def room_id_to_uuid(room_id: str) -> Optional[str]:
+def room_id_to_uuid(room_id: str, team_id: Optional[str] = None) -> Optional[str]:
     """
     Convert a room ID (slug or UUID) to UUID.
 
     Args:
         room_id: Room identifier (slug like "room-a" or UUID)
+        team_id: Team UUID (defaults to the current request/env team)
 
     Returns:
         Room UUID or None if not found
     """
-    return _entity_registry.get_room_uuid(room_id)
+    return get_entity_registry(team_id).get_room_uuid(room_id)
 
 
-def product_id_to_uuid(product_id: str) -> Optional[str]:
+def product_id_to_uuid(product_id: str, team_id: Optional[str] = None) -> Optional[str]:
     """
     Convert a product ID (slug or UUID) to UUID.
 
     Args:
         product_id: Product identifier (slug like "menu-1" or UUID)
+        team_id: Team UUID (defaults to the current request/env team)
 
     Returns:
         Product UUID or None if not found
     """
-    return _entity_registry.get_product_uuid(product_id)
\ No newline at end of file
+    return get_entity_registry(team_id).get_product_uuid(product_id)
\ No newline at end of file
@@ -0,0 +1,434 @@
+"""
+[OpenEvent Tenants] Tenant partitions: storage, config snapshots, quota caches, turn limits.
+
+With TENANT_HEADER_ENABLED=1 (or OE_TEAM_ID) each team has its own events
+file, but everything around it used to be process-global, so one busy team
+could evict another's cache entries or keep every worker thread busy. This
+module gives each tenant its own share of those resources:
+
+- `tenant_partition()` returns the storage handle of the current tenant: its
+  database path (events_{team_id}.json next to the default database) and
+  lock, plus `config()`, a snapshot of db["config"] that is reloaded only
+  when the file changes (tenant sections overlay the default database's, so
+  a team without its own settings keeps the shared ones).
+- `TenantQuotaCache` is an LRU with a per-tenant entry quota: a tenant that
+  fills its quota evicts its own oldest entries, never another tenant's.
+- `tenant_turn_slot()` bounds the turns one tenant runs at once in the
+  message executor (`run_cancellable_turn`); further turns of that tenant
+  wait for a slot without taking worker threads from other tenants.
+  Streamed chat turns (agents.chatkit_runner) take the same slots. Turns
+  of one tenant run concurrently: their saves merge per record
+  (workflows.io.database.save_db); only turns of the same client wait
+  for each other.
+- `tenant_stats()` reports turns in flight/queued, queue wait and latency
+  percentiles per tenant, plus per-tenant hit/miss/eviction counts of every
+  quota cache.
+
+Outside any tenant context everything maps to the "default" tenant, which
+uses the default database path, so single-tenant installations behave as
+before.
+
+Environment:
+    OE_TENANT_MAX_TURNS: Concurrent turns per tenant (default: 4)
+    OE_TENANT_CACHE_TENANTS: Tenants kept per quota cache before the least recently used is dropped (default: 64)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Hashable, List, Optional, Tuple, Union
+
+from workflows.io.database import load_db, lock_path_for, save_db
+
+__workflow_role__ = "Tenants"
+
+DEFAULT_TENANT = "default"
+
+_SAFE_TENANT = re.compile(r"[^A-Za-z0-9_.-]+")
+_LATENCY_WINDOW = 200
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def current_tenant_id() -> str:
+    """[OpenEvent Tenants] Team id of the current request/turn, or "default"."""
+
+    try:
+        from workflows.io.integration.config import get_team_id
+    except ImportError:  # pragma: no cover - config not available
+        return DEFAULT_TENANT
+    return get_team_id() or DEFAULT_TENANT
+
+
+def tenant_key(tenant_id: str) -> str:
+    """[OpenEvent Tenants] Tenant id made safe for use in file and directory names."""
+
+    return _SAFE_TENANT.sub("_", tenant_id).strip(".") or DEFAULT_TENANT
+
+
+def _resolve_tenant(tenant_id: Optional[str]) -> str:
+    return tenant_id or current_tenant_id()
+
+
+# =============================================================================
+# STORAGE + CONFIG SNAPSHOTS
+# =============================================================================
+
+
+@dataclass
+class TenantPartition:
+    """[OpenEvent Tenants] One tenant's database handle and config snapshot."""
+
+    tenant_id: str
+    db_path: Path
+    lock_path: Path
+    parent: Optional["TenantPartition"] = None
+    _config: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _config_key: Optional[Tuple[int, int]] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    config_loads: int = 0
+    config_hits: int = 0
+
+    def load_db(self) -> Dict[str, Any]:
+        return load_db(self.db_path, lock_path=self.lock_path)
+
+    def save_db(self, db: Dict[str, Any]) -> None:
+        save_db(db, self.db_path, lock_path=self.lock_path)
+
+    def _own_config(self) -> Dict[str, Any]:
+        try:
+            stat = self.db_path.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        with self._lock:
+            if self._config is not None and key == self._config_key:
+                self.config_hits += 1
+                return self._config
+        config: Dict[str, Any] = {}
+        if key is not None:
+            try:
+                config = self.load_db().get("config") or {}
+            except Exception:
+                # Unreadable database: serve defaults, retry on the next change
+                config = {}
+        with self._lock:
+            self._config, self._config_key = config, key
+            self.config_loads += 1
+        return config
+
+    def config(self) -> Dict[str, Any]:
+        """db["config"] of this tenant over the default database's sections (read-only)."""
+
+        own = self._own_config()
+        if self.parent is None:
+            return own
+        merged = dict(self.parent.config())
+        merged.update(own)
+        return merged
+
+    def config_section(self, name: str) -> Dict[str, Any]:
+        """A copy of one config section (callers may mutate it)."""
+
+        return copy.deepcopy(self.config().get(name) or {})
+
+
+_PARTITIONS: Dict[Tuple[str, str], TenantPartition] = {}
+_PARTITIONS_LOCK = threading.Lock()
+
+
+def _default_paths() -> Tuple[Path, Path]:
+    # Imported here: workflow_email imports the io layer at import time
+    from workflow_email import DB_PATH, LOCK_PATH
+
+    return DB_PATH, LOCK_PATH
+
+
+def tenant_db_path(base_path: Path, tenant_id: str) -> Path:
+    """[OpenEvent Tenants] events_{team_id}.json next to base_path (base_path for the default tenant)."""
+
+    if tenant_id == DEFAULT_TENANT:
+        return base_path
+    return base_path.parent / f"events_{tenant_key(tenant_id)}.json"
+
+
+def tenant_partition(
+    tenant_id: Optional[str] = None,
+    *,
+    base_path: Optional[Path] = None,
+    base_lock: Optional[Path] = None,
+) -> TenantPartition:
+    """[OpenEvent Tenants] Storage handle of a tenant (the current one by default)."""
+
+    tenant = _resolve_tenant(tenant_id)
+    if base_path is None:
+        base_path, default_lock = _default_paths()
+        base_lock = base_lock or default_lock
+    base_path = Path(base_path)
+    key = (tenant, str(base_path))
+    with _PARTITIONS_LOCK:
+        partition = _PARTITIONS.get(key)
+    if partition is not None:
+        return partition
+
+    parent = None if tenant == DEFAULT_TENANT else tenant_partition(DEFAULT_TENANT, base_path=base_path, base_lock=base_lock)
+    db_path = tenant_db_path(base_path, tenant)
+    lock_path = base_lock if tenant == DEFAULT_TENANT and base_lock is not None else lock_path_for(db_path)
+    with _PARTITIONS_LOCK:
+        return _PARTITIONS.setdefault(key, TenantPartition(tenant, db_path, lock_path, parent))
+
+
+def tenant_config_section(name: str, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+    """[OpenEvent Tenants] config[name] of the current tenant ({} when unset or unreadable)."""
+
+    try:
+        return tenant_partition(tenant_id).config_section(name)
+    except Exception:
+        return {}
+
+
+# =============================================================================
+# QUOTA CACHES
+# =============================================================================
+
+
+@dataclass
+class _TenantShard:
+    entries: "OrderedDict[Hashable, Any]" = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+_CACHES: Dict[str, "TenantQuotaCache"] = {}
+
+
+class TenantQuotaCache:
+    """[OpenEvent Tenants] LRU cache partitioned by tenant, with a per-tenant entry quota."""
+
+    def __init__(self, name: str, quota: Union[int, Callable[[], int]]) -> None:
+        self.name = name
+        self._quota = quota
+        self._shards: "OrderedDict[str, _TenantShard]" = OrderedDict()
+        self._lock = threading.Lock()
+        _CACHES[name] = self
+
+    @property
+    def quota(self) -> int:
+        return max(1, int(self._quota() if callable(self._quota) else self._quota))
+
+    def _shard(self, tenant: str) -> _TenantShard:
+        shard = self._shards.get(tenant)
+        if shard is None:
+            shard = self._shards[tenant] = _TenantShard()
+            while len(self._shards) > _env_int("OE_TENANT_CACHE_TENANTS", 64):
+                self._shards.popitem(last=False)
+        else:
+            self._shards.move_to_end(tenant)
+        return shard
+
+    def get(self, key: Hashable, tenant_id: Optional[str] = None) -> Optional[Any]:
+        tenant = _resolve_tenant(tenant_id)
+        with self._lock:
+            shard = self._shard(tenant)
+            value = shard.entries.get(key)
+            if value is None:
+                shard.misses += 1
+                return None
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, tenant_id: Optional[str] = None) -> None:
+        tenant = _resolve_tenant(tenant_id)
+        quota = self.quota
+        with self._lock:
+            shard = self._shard(tenant)
+            shard.entries[key] = value
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > quota:
+                shard.entries.popitem(last=False)
+                shard.evictions += 1
+
+    def clear(self, tenant_id: Optional[str] = None) -> None:
+        """Drop one tenant's entries, or every tenant's when tenant_id is None."""
+        with self._lock:
+            if tenant_id is None:
+                self._shards.clear()
+            else:
+                self._shards.pop(tenant_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(shard.entries) for shard in self._shards.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                tenant: {
+                    "entries": len(shard.entries),
+                    "quota": self.quota,
+                    "hits": shard.hits,
+                    "misses": shard.misses,
+                    "evictions": shard.evictions,
+                }
+                for tenant, shard in self._shards.items()
+            }
+
+
+# =============================================================================
+# TURN LIMITS
+# =============================================================================
+
+
+@dataclass
+class _TurnStats:
+    turns: int = 0
+    active: int = 0
+    queued: int = 0
+    wait_s: float = 0.0
+    latencies_s: Deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+
+_TURNS: Dict[str, _TurnStats] = {}
+_TURNS_LOCK = threading.Lock()
+_SEMAPHORES: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+
+
+def _turn_stats(tenant: str) -> _TurnStats:
+    stats = _TURNS.get(tenant)
+    if stats is None:
+        stats = _TURNS[tenant] = _TurnStats()
+    return stats
+
+
+def _semaphore(tenant: str) -> asyncio.Semaphore:
+    # One semaphore per event loop: asyncio primitives are bound to the loop using them
+    key = (id(asyncio.get_running_loop()), tenant)
+    semaphore = _SEMAPHORES.get(key)
+    if semaphore is None:
+        semaphore = _SEMAPHORES[key] = asyncio.Semaphore(_env_int("OE_TENANT_MAX_TURNS", 4))
+    return semaphore
+
+
+@asynccontextmanager
+async def tenant_turn_slot(tenant_id: Optional[str] = None) -> AsyncIterator[str]:
+    """[OpenEvent Tenants] Hold one of the tenant's turn slots for the block; yields the tenant id."""
+
+    tenant = _resolve_tenant(tenant_id)
+    queued_at = time.monotonic()
+    with _TURNS_LOCK:
+        _turn_stats(tenant).queued += 1
+    try:
+        await _semaphore(tenant).acquire()
+    finally:
+        with _TURNS_LOCK:
+            _turn_stats(tenant).queued -= 1
+    started = time.monotonic()
+    with _TURNS_LOCK:
+        stats = _turn_stats(tenant)
+        stats.active += 1
+        stats.wait_s += started - queued_at
+    try:
+        yield tenant
+    finally:
+        _semaphore(tenant).release()
+        with _TURNS_LOCK:
+            stats = _turn_stats(tenant)
+            stats.active -= 1
+            stats.turns += 1
+            stats.latencies_s.append(time.monotonic() - queued_at)
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def tenant_turn_latency(tenant_id: str, fraction: float = 0.95) -> Optional[float]:
+    """Turn latency percentile (queue wait included) over the tenant's recent turns, in seconds."""
+
+    with _TURNS_LOCK:
+        stats = _TURNS.get(tenant_id)
+        values = list(stats.latencies_s) if stats is not None else []
+    return _percentile(values, fraction)
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+
+def tenant_stats() -> Dict[str, Any]:
+    """[OpenEvent Tenants] Per-tenant turn, cache and config-snapshot counters."""
+
+    report: Dict[str, Dict[str, Any]] = {}
+    with _TURNS_LOCK:
+        for tenant, stats in _TURNS.items():
+            latencies = list(stats.latencies_s)
+            p50 = _percentile(latencies, 0.5)
+            p95 = _percentile(latencies, 0.95)
+            report.setdefault(tenant, {})["turns"] = {
+                "completed": stats.turns,
+                "active": stats.active,
+                "queued": stats.queued,
+                "wait_s": round(stats.wait_s, 3),
+                "latency_ms": {
+                    "p50": round(p50 * 1000, 1) if p50 is not None else None,
+                    "p95": round(p95 * 1000, 1) if p95 is not None else None,
+                },
+            }
+    for name, cache in list(_CACHES.items()):
+        for tenant, counters in cache.stats().items():
+            report.setdefault(tenant, {}).setdefault("caches", {})[name] = counters
+    with _PARTITIONS_LOCK:
+        partitions = list(_PARTITIONS.values())
+    for partition in partitions:
+        entry = report.setdefault(partition.tenant_id, {})
+        entry["db_path"] = partition.db_path.name
+        entry["config"] = {"loads": partition.config_loads, "hits": partition.config_hits}
+    return {"max_turns_per_tenant": _env_int("OE_TENANT_MAX_TURNS", 4), "tenants": report}
+
+
+def reset_tenants() -> None:
+    """Drop partitions, turn counters and every quota cache (intended for tests)."""
+
+    with _PARTITIONS_LOCK:
+        _PARTITIONS.clear()
+    with _TURNS_LOCK:
+        _TURNS.clear()
+    _SEMAPHORES.clear()
+    for cache in list(_CACHES.values()):
+        cache.clear()
+
+
+__all__ = [
+    "DEFAULT_TENANT",
+    "TenantPartition",
+    "TenantQuotaCache",
+    "current_tenant_id",
+    "reset_tenants",
+    "tenant_config_section",
+    "tenant_db_path",
+    "tenant_key",
+    "tenant_partition",
+    "tenant_stats",
+    "tenant_turn_latency",
+    "tenant_turn_slot",
+]
@@ -6,13 +6,13 @@ import json
 import logging
 import os
 import re
-from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from adapters.agent_adapter import AgentAdapter, StubAgentAdapter, get_agent_adapter, reset_agent_adapter
 from domain import IntentLabel
 from llm.provider_registry import get_provider, reset_provider_for_tests
 from workflows.common.fallback_reason import create_fallback_reason
+from workflows.io.tenants import TenantQuotaCache
 
 from prefs.semantics import normalize_catering, normalize_products
 from services.products import list_product_records, normalise_product_payload
@@ -31,16 +31,17 @@ from workflows.common.datetime_parse import (
     month_name_to_number,
     weekday_name_to_number,
 )
+from utils.cancellation import check_cancelled
 from utils.dates import MONTH_INDEX_TO_NAME, from_hints
 
 adapter: AgentAdapter = get_agent_adapter()
 _LAST_CALL_METADATA: Dict[str, Any] = {}
 
-# Bounded LRU cache for analysis results.
-# Max entries configurable via env var; default 500 to limit memory.
-# Uses OrderedDict for LRU eviction when cache is full.
+# Bounded LRU cache for analysis results, partitioned by tenant.
+# Max entries per tenant configurable via env var; default 500 to limit memory.
+# A tenant filling its quota only evicts its own oldest entries.
 _ANALYSIS_CACHE_MAX_SIZE = int(os.getenv("LLM_CACHE_MAX_SIZE", "500"))
-_ANALYSIS_CACHE: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+_ANALYSIS_CACHE = TenantQuotaCache("llm_analysis", lambda: _ANALYSIS_CACHE_MAX_SIZE)
 
 logger = logging.getLogger(__name__)
 
@@ -285,6 +286,8 @@ def _invoke_provider_with_retry(payload: Dict[str, str], phase: str) -> Optional
     text = json.dumps(payload, ensure_ascii=False)
     last_error: Optional[Exception] = None
     for attempt in range(_MAX_RETRIES):
+        # Retries are pointless once the client is gone or the deadline passed
+        check_cancelled(f"{phase}.attempt{attempt + 1}")
         try:
             result = provider.classify_extract(text)
             validated = _validated_analysis(result)
@@ -359,27 +362,21 @@ def _fallback_analysis(
 def _analyze_payload(payload: Dict[str, str]) -> Dict[str, Any]:
     """Run LLM analysis with bounded LRU caching.
 
-    Cache is bounded to _ANALYSIS_CACHE_MAX_SIZE entries.
+    Cache is bounded to _ANALYSIS_CACHE_MAX_SIZE entries per tenant.
     On cache hit, entry is moved to end (most recently used).
-    On cache miss + insert, oldest entries are evicted if over limit.
+    On cache miss + insert, the tenant's oldest entries are evicted if over limit.
     """
     cache_key = _analysis_cache_key(payload)
     cached = _ANALYSIS_CACHE.get(cache_key)
     if cached is not None:
-        # Move to end (mark as recently used)
-        _ANALYSIS_CACHE.move_to_end(cache_key)
         return dict(cached)
 
     analysis = _invoke_provider_with_retry(payload, phase="analysis")
     if analysis is None:
         analysis = _fallback_analysis(payload)
 
-    # Insert new entry
-    _ANALYSIS_CACHE[cache_key] = analysis
-
-    # Evict oldest entries if over limit
-    while len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_MAX_SIZE:
-        _ANALYSIS_CACHE.popitem(last=False)
+    # Insert new entry (evicts the tenant's oldest entries if over limit)
+    _ANALYSIS_CACHE.put(cache_key, analysis)
 
     return dict(analysis)
 
@@ -702,11 +699,10 @@ def reset_llm_adapter() -> None:
 
     global adapter
     global _LAST_CALL_METADATA
-    global _ANALYSIS_CACHE
     reset_agent_adapter()
     adapter = get_agent_adapter()
     _LAST_CALL_METADATA = {}
-    _ANALYSIS_CACHE = OrderedDict()
+    _ANALYSIS_CACHE.clear()
     reset_provider_for_tests()
 
 
@@ -5,13 +5,17 @@ import json
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from services.products import list_product_records
 from prefs.semantics import normalize_catering, normalize_products
+from workflows.common.fuzzy_index import FuzzyIndex
 
 PreferencePayload = Dict[str, Any]
 
+# Lowest product similarity that still surfaces as an alternative
+_ALTERNATIVE_FLOOR = 0.5
+
 
 def extract_preferences(user_info: Dict[str, Any], raw_text: Optional[str] = None) -> Optional[PreferencePayload]:
     """
@@ -232,19 +236,16 @@ def _score_rooms_by_products(
     room_type_hint: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     catalog = _room_catalog()
-    rooms_data = {room["name"]: room for room in _load_rooms()}
+    rooms_data = _rooms_by_name()
+    feature_sets = _room_feature_sets()
     recommendations: List[Dict[str, Any]] = []
 
     for room, data in catalog.items():
         phrases = data["phrases"]
         variants_map = data.get("product_variants") or {}
-        # Get room's native features, services, and layout types for direct matching
         room_info = rooms_data.get(room, {})
-        room_features = set(_normalise_phrase(f) for f in (room_info.get("features") or []))
-        room_services = set(_normalise_phrase(s) for s in (room_info.get("services") or []))
-        # Include layout types (workshop, theatre, u_shape, etc.) as matchable features
-        room_layouts = set(_normalise_phrase(k) for k in (room_info.get("capacity_by_layout") or {}).keys())
-        room_all_features = room_features | room_services | room_layouts
+        # Room's native features, services, and layout types for direct matching
+        room_all_features = feature_sets.get(room, frozenset())
 
         score = 0.0
 
@@ -347,25 +348,30 @@ def _score_rooms_by_products(
     return recommendations[:5]
 
 
-def _match_against_features(wish_normalized: str, features: Set[str]) -> bool:
+def _match_against_features(wish_normalized: str, features: AbstractSet[str]) -> bool:
     """Check if a wish matches any room feature using fuzzy matching."""
     if not wish_normalized or not features:
         return False
-    # Direct containment check
-    for feature in features:
+    return not _features_matching(wish_normalized).isdisjoint(features)
+
+
+@lru_cache(maxsize=1024)
+def _features_matching(wish_normalized: str) -> FrozenSet[str]:
+    """All catalog features a wish matches (containment, or ratio >= 0.8)."""
+    index = _feature_index()
+    matched: Set[str] = set()
+    wish_no_space = wish_normalized.replace(" ", "")
+    for feature in index.phrases:
         if wish_normalized in feature or feature in wish_normalized:
-            return True
+            matched.add(feature)
+            continue
         # Handle common variations: "sound system" vs "sound_system"
-        wish_no_space = wish_normalized.replace(" ", "")
         feature_no_space = feature.replace(" ", "")
         if wish_no_space in feature_no_space or feature_no_space in wish_no_space:
-            return True
+            matched.add(feature)
     # Fuzzy match for close variations
-    for feature in features:
-        ratio = difflib.SequenceMatcher(a=wish_normalized, b=feature).ratio()
-        if ratio >= 0.8:
-            return True
-    return False
+    matched.update(index.scores(wish_normalized, 0.8))
+    return frozenset(matched)
 
 
 def _best_phrase_match(needle: str, phrases: Dict[str, str]) -> Tuple[float, Optional[str]]:
@@ -400,28 +406,27 @@ def _top_product_matches(
     needle = _normalise_phrase(wish)
     if not needle:
         return []
+    variant_scores = _variant_scores(needle)
     scored: List[Tuple[float, str]] = []
     for product, variants in variants_map.items():
-        ratios = [_similarity_ratio(needle, variant) for variant in variants if variant]
-        if not ratios:
+        if not variants:
             continue
-        best_ratio = max(ratios)
+        best_ratio = max(variant_scores.get(variant, 0.0) for variant in variants)
         scored.append((best_ratio, product))
     scored.sort(key=lambda entry: entry[0], reverse=True)
     return scored[:limit]
 
 
-def _similarity_ratio(a: str, b: str) -> float:
-    if not a or not b:
-        return 0.0
-    if a == b:
-        return 1.0
-    # Containment match only if both strings are long enough to be meaningful
-    # Avoid false positives like "art" in "flipchart" matching "latte art"
-    MIN_CONTAINMENT_LEN = 5
-    if (len(a) >= MIN_CONTAINMENT_LEN and len(b) >= MIN_CONTAINMENT_LEN) and (a in b or b in a):
-        return 0.92
-    return difflib.SequenceMatcher(a=a, b=b).ratio()
+@lru_cache(maxsize=1024)
+def _variant_scores(needle: str) -> Dict[str, float]:
+    """
+    Similarity of a wish to every product variant that can score >= 0.5.
+
+    Ratios below 0.5 never change a recommendation (they are neither matches
+    nor alternatives), so the index prunes everything that cannot reach that
+    floor. One lookup serves every room, since variants are shared across rooms.
+    """
+    return _variant_index().scores(needle, _ALTERNATIVE_FLOOR)
 
 
 def _make_match_entry(wish: str, product: str, ratio: float) -> Dict[str, Any]:
@@ -513,4 +518,55 @@ def _load_rooms() -> List[Dict[str, Any]]:
     return normalised
 
 
+@lru_cache(maxsize=1)
+def _rooms_by_name() -> Dict[str, Dict[str, Any]]:
+    return {room["name"]: room for room in _load_rooms()}
+
+
+@lru_cache(maxsize=1)
+def _room_feature_sets() -> Dict[str, FrozenSet[str]]:
+    """Normalised features, services and layout types (workshop, theatre, ...) per room."""
+    feature_sets: Dict[str, FrozenSet[str]] = {}
+    for name, room in _rooms_by_name().items():
+        values = list(room.get("features") or [])
+        values.extend(room.get("services") or [])
+        values.extend((room.get("capacity_by_layout") or {}).keys())
+        feature_sets[name] = frozenset(_normalise_phrase(value) for value in values)
+    return feature_sets
+
+
+@lru_cache(maxsize=1)
+def _feature_index() -> FuzzyIndex:
+    index = FuzzyIndex()
+    for features in _room_feature_sets().values():
+        for feature in sorted(features):
+            index.add(feature)
+    return index
+
+
+@lru_cache(maxsize=1)
+def _variant_index() -> FuzzyIndex:
+    index = FuzzyIndex()
+    for entry in _room_catalog().values():
+        for variants in (entry.get("product_variants") or {}).values():
+            for variant in variants:
+                index.add(variant)
+    return index
+
+
+def reset_match_indexes() -> None:
+    """Drop cached catalogs and match indexes (after reference data changes)."""
+    for cached in (
+        _load_rooms,
+        _room_catalog,
+        _rooms_by_name,
+        _room_feature_sets,
+        _feature_index,
+        _variant_index,
+        _features_matching,
+        _variant_scores,
+    ):
+        cached.cache_clear()
+
+
 __all__ = ["extract_preferences"]
@@ -18,9 +18,10 @@ Usage:
 from __future__ import annotations
 
 import re
-from difflib import SequenceMatcher
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from workflows.common.fuzzy_index import bounded_ratio
+
 from .shortcuts_types import (
     PlannerResult,
     _CLASS_KEYWORDS,
@@ -160,7 +161,8 @@ def parse_choice_selection(
         label = str(item.get("label") or "").lower()
         if not label:
             continue
-        ratio = SequenceMatcher(a=label, b=normalized).ratio()
+        # Ratios below 0.5 never select or make a choice ambiguous
+        ratio = bounded_ratio(label, normalized, 0.5)
         similarity.append((ratio, item))
 
     if not similarity:
@@ -209,7 +211,8 @@ def choice_clarification_prompt(
         label = str(item.get("label") or "").lower()
         if not label:
             continue
-        ratio = SequenceMatcher(a=label, b=normalized).ratio()
+        # Options within 0.08 of a >= 0.5 top match count as ambiguous
+        ratio = bounded_ratio(label, normalized, 0.42)
         similarity.append((ratio, item))
 
     if not similarity:
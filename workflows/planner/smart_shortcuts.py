@@ -8,7 +8,6 @@ from functools import lru_cache
 from pathlib import Path
 import json
 import re
-from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Tuple
 import logging
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date
 from typing import Any, Dict, List, Optional
 
 from services.qna_readonly import (
@@ -12,6 +12,7 @@ from services.qna_readonly import (
     list_rooms_by_capacity,
     load_room_static,
 )
+from workflows.common.ordinal_dates import day_ordinal, ordinal_to_iso
 from workflows.common.types import WorkflowState
 from workflows.qna.context_builder import EffectiveVariable, QnAContext, build_qna_context
 from workflows.qna.verbalizer import render_qna_answer
@@ -267,11 +268,8 @@ def _captured_state(event_entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     else:
         chosen = event_entry.get("chosen_date")
         if chosen:
-            try:
-                parsed = datetime.strptime(chosen, "%d.%m.%Y")
-                captured["date"] = parsed.date().isoformat()
-            except (ValueError, TypeError):
-                captured["date"] = None
+            # chosen_date may be ISO or DD.MM.YYYY
+            captured["date"] = ordinal_to_iso(day_ordinal(chosen))
 
     wish_products = event_entry.get("wish_products")
     products = event_entry.get("products") or event_entry.get("selected_products")
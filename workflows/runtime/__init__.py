@@ -5,4 +5,5 @@ This package contains extracted runtime components from the main workflow_email.
 - hil_tasks: HIL task management (approve, reject, cleanup) [W2]
 - router: Step routing loop and dispatch [W3]
 - pre_route: Pre-routing pipeline (duplicate detection, guards, shortcuts) [P1]
+- batch_ingest: Bulk inbound-email ingestion with per-thread ordering
 """
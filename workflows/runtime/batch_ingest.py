@@ -0,0 +1,412 @@
+"""
+Batch ingestion of inbound emails (mailbox backlog, migration replay).
+
+`process_msg` handles one message per call. `ingest_batch` takes many:
+
+1. Messages are read from JSONL, a JSON list, or a directory of `.eml` /
+   `.json` / `.jsonl` files and normalized to process_msg payloads (stable
+   msg_id, thread_id defaulting to the client email).
+2. They are partitioned by client email (thread id when there is none) and
+   ordered by timestamp within each partition, input order breaking ties.
+3. Partitions run in parallel on the shared `ingest` pool (utils.executors,
+   at most `workers` partitions in flight); messages inside a partition
+   run strictly one after another. save_db merges the records a turn
+   changed into the file, so partitions and API turns saving the same JSON
+   database keep each other's records. Each partition saves inside
+   `owned_records(client)`: under the file lock the save re-checks room
+   holds, and if another partition confirmed the same room and day since
+   the turn loaded, the save is refused (BookingConflictError) and the
+   message is processed again on the fresh database, where step 3 sees the
+   room as taken. A write to another client's record that changed
+   meanwhile is dropped by the merge and logged.
+4. Every processed msg_id is appended (and fsynced) to a checkpoint file. A
+   rerun after a crash skips checkpointed messages. When a message fails,
+   the rest of its partition is left for the next run so ordering holds.
+
+The report carries throughput and per-message latency percentiles.
+
+    report = ingest_batch(load_messages("backlog.jsonl"), checkpoint="backlog")
+    print(report.format())
+
+Turns read other clients' events as of their own load, as concurrent API
+requests do; only writes are partitioned.
+
+Environment:
+    OE_INGEST_WORKERS: Partitions processed in parallel, also the ingest pool size (default: 4)
+    OE_INGEST_DIR: Checkpoint directory for named checkpoints (default: <repo>/tmp-cache/ingest)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import email
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from email import policy
+from email.utils import parseaddr, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from utils.executors import POOL_INGEST, run_tasks
+from workflows.io.database import BookingConflictError, owned_records
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+Handler = Callable[[Message], Any]
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+_CONFLICT_RETRIES = 2
+
+
+def _default_workers() -> int:
+    try:
+        return max(1, int(os.getenv("OE_INGEST_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+def checkpoint_dir() -> Path:
+    override = os.getenv("OE_INGEST_DIR")
+    if override:
+        return Path(override)
+    return Path(__file__).resolve().parents[2] / "tmp-cache" / "ingest"
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+
+def parse_eml(raw: bytes) -> Message:
+    """process_msg payload for one RFC 822 message."""
+    msg = email.message_from_bytes(raw, policy=policy.default)
+    from_name, from_email = parseaddr(str(msg.get("From", "")))
+    body_part = msg.get_body(preferencelist=("plain",))
+    body = body_part.get_content() if body_part is not None else ""
+
+    ts = None
+    if msg.get("Date"):
+        try:
+            ts = parsedate_to_datetime(str(msg["Date"])).astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+        except (TypeError, ValueError):
+            ts = None
+
+    def _ids(header: str) -> List[str]:
+        return re.findall(r"<([^>]+)>", str(msg.get(header, "")))
+
+    message_ids = _ids("Message-ID")
+    # The thread is named after its first message
+    thread = str(msg.get("X-Thread-Id", "")).strip() or next(
+        iter(_ids("References") or _ids("In-Reply-To") or message_ids), None
+    )
+    return {
+        "msg_id": message_ids[0] if message_ids else None,
+        "from_name": from_name or None,
+        "from_email": from_email or None,
+        "subject": str(msg.get("Subject", "")),
+        "body": body.strip(),
+        "ts": ts,
+        "thread_id": thread,
+    }
+
+
+def _read_json_file(path: Path) -> List[Message]:
+    if path.suffix == ".jsonl":
+        with path.open("r", encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data if isinstance(data, list) else [data]
+
+
+def load_messages(source: Union[str, Path]) -> List[Message]:
+    """Messages from a JSONL/JSON/.eml file or a directory of such files."""
+    source = Path(source)
+    files = sorted(p for p in source.iterdir() if p.is_file()) if source.is_dir() else [source]
+    messages: List[Message] = []
+    for path in files:
+        if path.suffix == ".eml":
+            messages.append(parse_eml(path.read_bytes()))
+        elif path.suffix in (".json", ".jsonl"):
+            messages.extend(_read_json_file(path))
+    return messages
+
+
+def normalize_message(msg: Message) -> Message:
+    """Copy of msg with a stable msg_id and a thread_id."""
+    out = dict(msg)
+    if out.get("from_email"):
+        out["from_email"] = str(out["from_email"]).strip()
+    if not out.get("msg_id"):
+        # Content hash, so a replay of the same export maps to the same ids
+        digest = hashlib.sha1(
+            "\x1f".join(str(out.get(key) or "") for key in ("from_email", "ts", "subject", "body")).encode("utf-8")
+        ).hexdigest()[:20]
+        out["msg_id"] = f"ingest-{digest}"
+    out["thread_id"] = out.get("thread_id") or out.get("session_id") or (out.get("from_email") or "").lower() or None
+    return out
+
+
+def partition_key(msg: Message) -> str:
+    return (msg.get("from_email") or "").lower() or str(msg.get("thread_id") or msg["msg_id"])
+
+
+def _ts_key(msg: Message) -> float:
+    raw = msg.get("ts")
+    if not raw:
+        return float("inf")  # undated messages keep input order after dated ones
+    try:
+        parsed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return float("inf")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def plan_partitions(messages: Iterable[Message]) -> Dict[str, List[Message]]:
+    """Normalized messages grouped by partition key, each group in send order."""
+    indexed: Dict[str, List[Tuple[float, int, Message]]] = {}
+    for index, raw in enumerate(messages):
+        msg = normalize_message(raw)
+        indexed.setdefault(partition_key(msg), []).append((_ts_key(msg), index, msg))
+    return {key: [msg for _, _, msg in sorted(items, key=lambda item: item[:2])] for key, items in indexed.items()}
+
+
+# =============================================================================
+# Checkpoint
+# =============================================================================
+
+
+class Checkpoint:
+    """Append-only JSONL of processed msg_ids (fsynced per record)."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.done: Set[str] = set()
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        self.done.add(json.loads(line)["msg_id"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn last line from a crash
+
+    @classmethod
+    def named(cls, name: str) -> "Checkpoint":
+        safe = _SAFE_NAME.sub("_", name).strip("._") or "default"
+        return cls(checkpoint_dir() / f"{safe}.checkpoint.jsonl")
+
+    def record(self, msg_id: str, partition: str, latency_s: float) -> None:
+        line = json.dumps({"msg_id": msg_id, "partition": partition, "latency_ms": round(latency_s * 1000, 1)})
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            self.done.add(msg_id)
+
+
+# =============================================================================
+# Ingestion
+# =============================================================================
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+@dataclass
+class IngestReport:
+    total: int = 0
+    processed: int = 0
+    skipped: int = 0  # already in the checkpoint
+    failed: int = 0
+    blocked: int = 0  # behind a failed message in the same partition
+    conflicts: int = 0  # saves refused for a room another partition confirmed (message re-run)
+    partitions: int = 0
+    workers: int = 0
+    elapsed_s: float = 0.0
+    latencies_s: List[float] = field(default_factory=list, repr=False)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("latencies_s")
+        data["elapsed_s"] = round(self.elapsed_s, 3)
+        data["throughput_msgs_per_s"] = round(self.throughput, 2)
+        data["latency_ms"] = {
+            "p50": round(_percentile(self.latencies_s, 50) * 1000, 1),
+            "p95": round(_percentile(self.latencies_s, 95) * 1000, 1),
+            "max": round(max(self.latencies_s, default=0.0) * 1000, 1),
+        }
+        return data
+
+    def format(self) -> str:
+        s = self.summary()
+        lat = s["latency_ms"]
+        lines = [
+            f"ingested {s['processed']}/{s['total']} messages in {s['elapsed_s']:.1f}s "
+            f"({s['throughput_msgs_per_s']:.2f} msg/s, {s['partitions']} partitions, {s['workers']} workers)",
+            f"latency ms: p50={lat['p50']} p95={lat['p95']} max={lat['max']}",
+            f"skipped (checkpoint)={s['skipped']} failed={s['failed']} blocked={s['blocked']} conflicts={s['conflicts']}",
+        ]
+        lines.extend(f"  {err['msg_id']}: {err['error']}" for err in self.errors[:10])
+        return "\n".join(lines)
+
+
+def _default_handler(db_path: Optional[Path]) -> Handler:
+    import workflow_email  # pylint: disable=import-outside-toplevel
+
+    path = Path(db_path) if db_path is not None else workflow_email.DB_PATH
+    return lambda msg: workflow_email.process_msg(msg, db_path=path)
+
+
+def ingest_batch(
+    messages: Iterable[Message],
+    *,
+    handler: Optional[Handler] = None,
+    workers: Optional[int] = None,
+    checkpoint: Union[None, str, Path, Checkpoint] = None,
+    db_path: Optional[Path] = None,
+    progress: Optional[Callable[[IngestReport], None]] = None,
+) -> IngestReport:
+    """Process messages with per-partition ordering and cross-partition parallelism.
+
+    checkpoint is a Checkpoint, a file path, or a name under OE_INGEST_DIR.
+    handler defaults to workflow_email.process_msg on db_path.
+    progress, if given, is called with the live report after every message.
+    """
+    if isinstance(checkpoint, (str, Path)):
+        checkpoint = Checkpoint(checkpoint) if Path(checkpoint).suffix else Checkpoint.named(str(checkpoint))
+    handler = handler or _default_handler(db_path)
+    partitions = plan_partitions(messages)
+    report = IngestReport(
+        total=sum(len(group) for group in partitions.values()),
+        partitions=len(partitions),
+        workers=min(workers or _default_workers(), max(1, len(partitions))),
+    )
+    lock = threading.Lock()
+
+    def _run_partition(key: str, group: List[Message]) -> None:
+        for position, msg in enumerate(group):
+            if checkpoint is not None and msg["msg_id"] in checkpoint.done:
+                with lock:
+                    report.skipped += 1
+                continue
+            started = time.perf_counter()
+            try:
+                for attempt in range(_CONFLICT_RETRIES + 1):
+                    try:
+                        with owned_records(msg.get("from_email") or key, msg.get("thread_id")):
+                            handler(msg)
+                        break
+                    except BookingConflictError as exc:
+                        with lock:
+                            report.conflicts += 1
+                        if attempt == _CONFLICT_RETRIES:
+                            raise
+                        logger.info("[INGEST] %s re-run after booking conflict: %s", msg["msg_id"], exc)
+            except Exception as exc:
+                logger.warning("[INGEST] %s failed in partition %s: %s", msg["msg_id"], key, exc)
+                with lock:
+                    report.failed += 1
+                    report.blocked += len(group) - position - 1
+                    report.errors.append({"msg_id": msg["msg_id"], "partition": key, "error": f"{type(exc).__name__}: {exc}"})
+                return
+            latency = time.perf_counter() - started
+            if checkpoint is not None:
+                checkpoint.record(msg["msg_id"], key, latency)
+            with lock:
+                report.processed += 1
+                report.latencies_s.append(latency)
+                if progress is not None:
+                    progress(report)
+
+    started = time.perf_counter()
+    # Largest partitions first so a long thread does not start last
+    ordered = sorted(partitions.items(), key=lambda item: -len(item[1]))
+    run_tasks(
+        POOL_INGEST,
+        [functools.partial(_run_partition, key, group) for key, group in ordered],
+        max_in_flight=report.workers,
+    )
+    report.elapsed_s = time.perf_counter() - started
+    logger.info("[INGEST] %s", report.format().splitlines()[0])
+    return report
+
+
+# =============================================================================
+# Background jobs (API)
+# =============================================================================
+
+
+_JOBS: Dict[str, Dict[str, Any]] = {}
+_JOBS_LOCK = threading.Lock()
+
+
+def start_ingest_job(
+    messages: List[Message],
+    *,
+    checkpoint_name: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> str:
+    """Run ingest_batch in a background thread; returns the job id."""
+    job_id = uuid.uuid4().hex[:12]
+    job: Dict[str, Any] = {"job_id": job_id, "status": "running", "report": IngestReport(total=len(messages)).summary()}
+    with _JOBS_LOCK:
+        _JOBS[job_id] = job
+
+    def _progress(report: IngestReport) -> None:
+        job["report"] = report.summary()
+
+    def _run() -> None:
+        try:
+            report = ingest_batch(
+                messages, workers=workers, checkpoint=checkpoint_name or f"job-{job_id}", progress=_progress
+            )
+            job.update(status="done", report=report.summary())
+        except Exception as exc:  # pragma: no cover - surfaced through the job status
+            logger.exception("[INGEST] job %s failed", job_id)
+            job.update(status="error", error=f"{type(exc).__name__}: {exc}")
+
+    threading.Thread(target=contextvars.copy_context().run, args=(_run,), name=f"oe-ingest-job-{job_id}", daemon=True).start()
+    return job_id
+
+
+def get_ingest_job(job_id: str) -> Optional[Dict[str, Any]]:
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+    return dict(job) if job is not None else None
+
+
+__all__ = [
+    "Checkpoint",
+    "IngestReport",
+    "get_ingest_job",
+    "ingest_batch",
+    "load_messages",
+    "normalize_message",
+    "parse_eml",
+    "partition_key",
+    "plan_partitions",
+    "start_ingest_job",
+]
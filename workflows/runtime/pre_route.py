@@ -21,8 +21,9 @@ from typing import Any, Callable, Dict, Optional, Tuple
 from workflows.common.types import GroupResult, WorkflowState
 from workflow.guards import evaluate as evaluate_guards
 from workflows.planner import maybe_run_smart_shortcuts
-from detection.pre_filter import pre_filter, PreFilterResult, is_enhanced_mode
+from detection.pre_filter import duplicate_check_exempt, pre_filter, PreFilterResult, is_enhanced_mode
 from detection.unified import run_unified_detection, UnifiedDetectionResult, is_unified_mode
+from detection.routing import route_unified_detection
 from domain import TaskType
 from workflows.io.tasks import enqueue_task
 from workflows.io.config_store import get_manager_names
@@ -197,13 +198,28 @@ def run_unified_pre_filter(
             else:
                 last_topic = None
 
-        unified_result = run_unified_detection(
+        def _detect(model: Optional[str]) -> UnifiedDetectionResult:
+            return run_unified_detection(
+                combined_text,
+                current_step=current_step,
+                date_confirmed=date_confirmed,
+                room_locked=room_locked,
+                last_topic=last_topic,
+                model=model,
+            )
+
+        # Skip the LLM call (or use a cheaper model) when the pre-filter and
+        # the expected reply shape are conclusive
+        message = getattr(state, "message", None)
+        unified_result, route_decision = route_unified_detection(
             combined_text,
-            current_step=current_step,
-            date_confirmed=date_confirmed,
-            room_locked=room_locked,
-            last_topic=last_topic,
+            pre_result,
+            state.event_entry,
+            _detect,
+            reply_text=getattr(message, "body", None),
         )
+        if route_decision is not None:
+            state.extras["detection_route"] = route_decision.to_dict()
 
         # Store unified detection result
         state.extras["unified_detection"] = unified_result.to_dict()
@@ -585,16 +601,11 @@ def check_duplicate_message(
 
     # Only check for duplicates if we have a previous message and messages are identical
     if normalized_last and normalized_current == normalized_last:
-        # Don't flag as duplicate if this is a detour return or offer update flow
-        is_detour = state.event_entry.get("caller_step") is not None
+        # Don't flag as duplicate during a detour return or the billing flow
+        # (client may resend billing info)
         current_step = state.event_entry.get("current_step", 1)
-        # Don't flag as duplicate during billing flow - client may resend billing info
-        in_billing_flow = (
-            state.event_entry.get("offer_accepted")
-            and (state.event_entry.get("billing_requirements") or {}).get("awaiting_billing_for_accept")
-        )
 
-        if not is_detour and not in_billing_flow and current_step >= 2:
+        if not duplicate_check_exempt(state.event_entry) and current_step >= 2:
             # Return friendly "same message" response instead of processing
             duplicate_response = GroupResult(
                 action="duplicate_message",
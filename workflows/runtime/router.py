@@ -101,6 +101,9 @@ def run_routing_loop(
 
         step = event_entry.get("current_step")
         logger.debug("[WF][ROUTE][%d] current_step=%s", iteration, step)
+        cancel_token = getattr(state, "cancel", None)
+        if cancel_token is not None:
+            cancel_token.check(f"routing_loop.step{step}")
 
         # =================================================================
         # SITE VISIT INTERCEPT: Handle site visit requests at ANY step
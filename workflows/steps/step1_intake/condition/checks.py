@@ -9,6 +9,7 @@ from typing import Any, Dict, List
 
 from zoneinfo import ZoneInfo
 
+from workflows.common.ordinal_dates import RoomDayIndex
 from workflows.io.config_store import get_timezone
 from workflows.conditions.checks import has_event_date as _has_event_date
 from workflows.conditions.checks import is_event_request as _is_event_request
@@ -106,6 +107,7 @@ def suggest_dates(
     suggestions: List[str] = []
     preferred = preferred_room or "Not specified"
     search_window = days_ahead + len(blocked) + 7
+    index = RoomDayIndex.from_db(db)
 
     for offset in range(max(search_window, days_ahead)):
         if len(suggestions) >= max_results:
@@ -114,7 +116,7 @@ def suggest_dates(
         if day in blocked:
             continue
         day_ddmmyyyy = day.strftime("%d.%m.%Y")
-        status = room_status_on_date(db, day_ddmmyyyy, preferred)
+        status = room_status_on_date(db, day_ddmmyyyy, preferred, index=index)
         if status == "Available":
             suggestions.append(day_ddmmyyyy)
 
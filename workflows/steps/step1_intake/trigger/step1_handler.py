@@ -239,6 +239,7 @@ def process(state: WorkflowState) -> GroupResult:
         role="client",
         text=message_payload.get("body") or "",
         metadata={"intent": intent.value, "confidence": confidence},
+        client_id=state.client_id,
     )
     # Update profile with detected language/preferences
     if user_info.get("language"):
@@ -26,7 +26,7 @@ from workflows.io.database import load_rooms, update_event_metadata
 from workflows.qna.engine import build_structured_qna_result
 from workflows.qna.extraction import ensure_qna_extraction
 from workflows.qna.router import route_general_qna
-from workflows.steps.step3_room_availability.condition.decide import room_status_on_date
+from workflows.steps.step3_room_availability.condition.availability_matrix import turn_availability_matrix
 
 # D5: Import shared helpers from window_helpers (no circular deps)
 from .window_helpers import (
@@ -66,8 +66,9 @@ def _search_range_availability(
     iso_seen: set[str] = set()
     limit = 5
 
+    matrix = turn_availability_matrix(state, rooms, iso_dates)
     for iso_date in iso_dates:
-        status_map = {room: room_status_on_date(state.db, iso_date, room) for room in rooms}
+        status_map = matrix.statuses_on(iso_date, rooms)
         ranked = rank_rooms(
             status_map,
             preferred_room=preferred_room,
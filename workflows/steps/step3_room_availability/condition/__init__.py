@@ -1,4 +1,10 @@
 """Condition module for Step 3: Room Availability - Room status checking."""
+from .availability_matrix import AvailabilityMatrix, build_availability_matrix, turn_availability_matrix
 from .room_status_checker import room_status_on_date
 
-__all__ = ["room_status_on_date"]
+__all__ = [
+    "AvailabilityMatrix",
+    "build_availability_matrix",
+    "room_status_on_date",
+    "turn_availability_matrix",
+]
@@ -0,0 +1,203 @@
+"""
+Room x date availability matrix for a single turn.
+
+Step 3 asks the same question several times per turn: the status of every
+room on the chosen date (evaluation), the free candidate dates per ranked
+room (alternatives table), and Q&A asks it again for its date proposals.
+AvailabilityMatrix answers all of them from one RoomDayIndex pass over the
+events, and `turn_availability_matrix()` keeps the matrix in
+state.turn_notes so later callers in the same turn extend it instead of
+recomputing it. A stored matrix is reused while state.db is the same object
+and this turn has made no booking write: update_event_metadata (status,
+room, date or event_data fields) and create_event_entry bump the "bookings"
+version of the active TurnMemo (workflows.common.turn_memo). Saves and
+writes made by other turns never touch this turn's db object or memo.
+
+Calendar busy slots (external calendar adapter) are optional. When
+requested, they are fetched for all rooms concurrently on the shared I/O
+pool (utils.async_tools) with one get_busy() call per room covering the
+whole date span. They are reported separately through `calendar_busy()` and
+do not change the DB-derived statuses.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from workflows.common.ordinal_dates import RoomDayIndex, day_ordinal, ordinal_to_date
+from workflows.common.turn_memo import current_memo
+
+__workflow_role__ = "condition"
+
+FREE_STATUSES = ("Available", "Option")
+_TURN_NOTES_KEY = "_availability_matrices"
+
+
+class AvailabilityMatrix:
+    """Room x day status grid derived from one database snapshot."""
+
+    def __init__(
+        self,
+        db: Dict[str, Any],
+        *,
+        exclude_event_id: Optional[str] = None,
+    ) -> None:
+        self.exclude_event_id = exclude_event_id
+        self.db = db
+        self.version = _bookings_version()
+        self._index = RoomDayIndex.from_db(db)
+        self._grid: Dict[Tuple[str, int], str] = {}
+        self._rooms: List[str] = []
+        self._days: List[int] = []
+        self._calendar_checked: Set[str] = set()
+        self._calendar_busy: Set[Tuple[str, int]] = set()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def extend(self, rooms: Iterable[str], dates: Iterable[Any]) -> "AvailabilityMatrix":
+        """Fill the cells for rooms x dates that are not computed yet."""
+
+        for room in rooms:
+            if room not in self._rooms:
+                self._rooms.append(room)
+        for value in dates:
+            day = day_ordinal(value)
+            if day is not None and day not in self._days:
+                self._days.append(day)
+        for room in self._rooms:
+            for day in self._days:
+                if (room, day) not in self._grid:
+                    self._grid[(room, day)] = self._index.status_on(
+                        room, day, exclude_event_id=self.exclude_event_id
+                    )
+        return self
+
+    def load_calendar(self, calendar_adapter: Any = None, *, max_workers: int = 8) -> "AvailabilityMatrix":
+        """Fetch calendar busy slots for every room concurrently (one call per room)."""
+
+        from services.rooms import get_room
+        from utils.async_tools import run_io_tasks
+
+        if not self._days:
+            return self
+        if calendar_adapter is None:
+            from adapters.calendar_adapter import get_calendar_adapter
+
+            calendar_adapter = get_calendar_adapter()
+        pending = [room for room in self._rooms if room not in self._calendar_checked]
+        span_start = datetime.combine(ordinal_to_date(min(self._days)), time.min).isoformat()
+        span_end = datetime.combine(ordinal_to_date(max(self._days)) + timedelta(days=1), time.min).isoformat()
+
+        def _fetch(room: str) -> Tuple[str, List[Dict[str, Any]]]:
+            record = get_room(room)
+            if record is None or not record.calendar_id:
+                return room, []
+            return room, calendar_adapter.get_busy(record.calendar_id, span_start, span_end)
+
+        results = run_io_tasks([lambda room=room: _fetch(room) for room in pending], max_workers=max_workers)
+        for room, busy in results:
+            self._calendar_checked.add(room)
+            for slot in busy:
+                first, last = day_ordinal(slot.get("start")), day_ordinal(slot.get("end"))
+                if first is None or last is None:
+                    continue
+                for day in range(first, last + 1):
+                    self._calendar_busy.add((room, day))
+        return self
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def rooms(self) -> List[str]:
+        return list(self._rooms)
+
+    def covers(self, rooms: Iterable[str], dates: Iterable[Any]) -> bool:
+        days = [day_ordinal(value) for value in dates]
+        return all((room, day) in self._grid for room in rooms for day in days if day is not None)
+
+    def status(self, room: str, date_value: Any) -> str:
+        """Status of room on a DD.MM.YYYY / ISO date ("Unavailable" without a date)."""
+
+        day = day_ordinal(date_value)
+        if day is None:
+            return "Unavailable"
+        cached = self._grid.get((room, day))
+        if cached is None:
+            cached = self._index.status_on(room, day, exclude_event_id=self.exclude_event_id)
+            self._grid[(room, day)] = cached
+        return cached
+
+    def statuses_on(self, date_value: Any, rooms: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """{room: status} for one date, in room order."""
+
+        return {room: self.status(room, date_value) for room in (rooms if rooms is not None else self._rooms)}
+
+    def free_dates(self, room: str, iso_dates: Iterable[str]) -> List[str]:
+        """The given ISO dates on which room is Available or on Option."""
+
+        return [iso_date for iso_date in iso_dates if self.status(room, iso_date) in FREE_STATUSES]
+
+    def calendar_busy(self, room: str, date_value: Any) -> bool:
+        """True when the room's external calendar has a busy slot that day."""
+
+        return (room, day_ordinal(date_value)) in self._calendar_busy
+
+
+def build_availability_matrix(
+    db: Dict[str, Any],
+    rooms: Iterable[str],
+    dates: Iterable[Any],
+    *,
+    exclude_event_id: Optional[str] = None,
+    include_calendar: bool = False,
+    calendar_adapter: Any = None,
+) -> AvailabilityMatrix:
+    """[Condition] Compute the full rooms x dates status matrix in one pass."""
+
+    matrix = AvailabilityMatrix(db, exclude_event_id=exclude_event_id).extend(rooms, dates)
+    if include_calendar:
+        matrix.load_calendar(calendar_adapter)
+    return matrix
+
+
+def _bookings_version() -> Optional[int]:
+    memo = current_memo()
+    return memo.version("bookings") if memo is not None else None
+
+
+def turn_availability_matrix(
+    state: Any,
+    rooms: Iterable[str],
+    dates: Iterable[Any],
+    *,
+    exclude_event_id: Optional[str] = None,
+) -> AvailabilityMatrix:
+    """[Condition] Matrix shared by every caller in this turn.
+
+    Reuses the matrix stored in state.turn_notes while the bookings are
+    unchanged (same db object, no booking write by this turn since it was
+    built), extending it with any new rooms or dates; otherwise rebuilds it
+    from state.db.
+    """
+
+    rooms = list(rooms)
+    dates = list(dates)
+    matrices: Dict[Optional[str], AvailabilityMatrix] = state.turn_notes.setdefault(_TURN_NOTES_KEY, {})
+    matrix = matrices.get(exclude_event_id)
+    if matrix is None or matrix.db is not state.db or matrix.version != _bookings_version():
+        matrix = AvailabilityMatrix(state.db, exclude_event_id=exclude_event_id)
+        matrices[exclude_event_id] = matrix
+    return matrix.extend(rooms, dates)
+
+
+__all__ = [
+    "AvailabilityMatrix",
+    "FREE_STATUSES",
+    "build_availability_matrix",
+    "turn_availability_matrix",
+]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+from workflows.common.ordinal_dates import RoomDayIndex, day_ordinal, event_day_ordinal, event_room, event_status
+
 __workflow_role__ = "condition"
 
 
@@ -11,6 +13,7 @@ def room_status_on_date(
     room_name: str,
     *,
     exclude_event_id: Optional[str] = None,
+    index: Optional[RoomDayIndex] = None,
 ) -> str:
     """[Condition] Derive the availability for a specific room on a given date.
 
@@ -19,31 +22,34 @@ def room_status_on_date(
 
     Args:
         db: Database dict with "events" list
-        date_ddmmyyyy: Target date in DD.MM.YYYY format
+        date_ddmmyyyy: Target date in DD.MM.YYYY format (ISO is accepted too;
+                       both are compared as day ordinals)
         room_name: Room to check
         exclude_event_id: Event ID to exclude from conflict check (the current client's event).
                           This prevents a client's own booking from blocking themselves.
+        index: RoomDayIndex of db for callers asking about many rooms/dates;
+               a single lookup scans the events directly.
 
     Returns:
         "Available", "Option", or "Confirmed" based on other clients' bookings
+        ("Unavailable" when the date is missing or unparseable)
     """
 
-    if not date_ddmmyyyy:
+    day = day_ordinal(date_ddmmyyyy)
+    if day is None:
         return "Unavailable"
+    if index is not None:
+        return index.status_on(room_name, day, exclude_event_id=exclude_event_id)
     room_lc = room_name.lower()
     status_found = "Available"
     for event in db.get("events", []):
         # Skip the current client's event - they shouldn't conflict with themselves
         if exclude_event_id and event.get("event_id") == exclude_event_id:
             continue
-        data = event.get("event_data", {})
-        if data.get("Event Date") != date_ddmmyyyy:
-            continue
-        stored_room = data.get("Preferred Room") or event.get("locked_room_id")
-        if not stored_room or stored_room.lower() != room_lc:
+        if event_day_ordinal(event) != day or event_room(event) != room_lc:
             continue
-        # Use canonical event["status"], fall back to event_data["Status"] for legacy
-        normalized = (event.get("status") or data.get("Status") or "").lower()
+        # Canonical event["status"], legacy event_data["Status"] fallback
+        normalized = event_status(event)
         if normalized == "confirmed":
             return "Confirmed"
         if normalized in {"option", "lead"}:
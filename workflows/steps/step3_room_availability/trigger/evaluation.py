@@ -19,7 +19,7 @@ from typing import Any, Dict, List, Optional
 from workflows.common.timeutils import format_iso_date_to_ddmmyyyy
 from workflows.io.database import load_rooms
 
-from ..condition.decide import room_status_on_date
+from ..condition.availability_matrix import AvailabilityMatrix, build_availability_matrix
 
 
 def evaluate_room_statuses(
@@ -27,6 +27,7 @@ def evaluate_room_statuses(
     target_date: str | None,
     *,
     exclude_event_id: Optional[str] = None,
+    matrix: Optional[AvailabilityMatrix] = None,
 ) -> List[Dict[str, str]]:
     """[Trigger] Evaluate each configured room for the requested event date.
 
@@ -35,16 +36,14 @@ def evaluate_room_statuses(
         target_date: Target date in DD.MM.YYYY format
         exclude_event_id: Event ID to exclude from conflict check (the current client's event).
                           This prevents a client's own booking from blocking themselves.
+        matrix: Turn availability matrix to read from (built for the same
+                exclude_event_id); computed here when omitted.
     """
 
     rooms = load_rooms()
-    statuses: List[Dict[str, str]] = []
-    for room_name in rooms:
-        status = room_status_on_date(
-            db, target_date, room_name, exclude_event_id=exclude_event_id
-        )
-        statuses.append({room_name: status})
-    return statuses
+    if matrix is None or matrix.exclude_event_id != exclude_event_id:
+        matrix = build_availability_matrix(db, rooms, [target_date], exclude_event_id=exclude_event_id)
+    return [{room_name: matrix.status(room_name, target_date)} for room_name in rooms]
 
 
 def render_rooms_response(
@@ -12,6 +12,8 @@ This module contains:
 - _room_requirements_payload: Build requirements payload for room
 - _available_dates_for_rooms: Get available dates per room
 - _extract_participants: Extract participant count from requirements
+- guarded_room_ranking: Ranked rooms, badges and alternatives, served from the
+  hash-guarded result cache when requirements and bookings are unchanged
 
 Usage:
     from .room_ranking import (
@@ -23,18 +25,23 @@ Usage:
 
 from __future__ import annotations
 
+import copy
+from dataclasses import asdict
+from datetime import date
 from typing import Any, Dict, List, Optional, Tuple
 
-from workflows.common.sorting import RankedRoom
-from workflows.common.timeutils import format_iso_date_to_ddmmyyyy
+from workflows.common.guarded_results import STEP3_RANKING, catalog_version, guard_key, load_guarded, store_guarded
+from workflows.common.sorting import RankedRoom, rank_rooms
+from rooms import rank as rank_rooms_profiles
 
-from ..condition.decide import room_status_on_date
+from ..condition.availability_matrix import AvailabilityMatrix, build_availability_matrix, turn_availability_matrix
 from .constants import (
     ROOM_OUTCOME_UNAVAILABLE,
     ROOM_OUTCOME_AVAILABLE,
     ROOM_OUTCOME_OPTION,
     ROOM_SIZE_ORDER,
 )
+from .conflict_resolution import _to_iso
 
 
 # -----------------------------------------------------------------------------
@@ -238,19 +245,20 @@ def available_dates_for_rooms(
     ranked: List[RankedRoom],
     candidate_iso_dates: List[str],
     participants: Optional[int],
+    *,
+    matrix: Optional[AvailabilityMatrix] = None,
 ) -> Dict[str, List[str]]:
-    """Get available dates for each ranked room."""
+    """Get available dates for each ranked room.
+
+    Reads the turn's availability matrix when given (one built without an
+    excluded event); otherwise computes the rooms x dates matrix in one pass.
+    """
+    rooms = [entry.room for entry in ranked]
+    if matrix is None or matrix.exclude_event_id is not None:
+        matrix = build_availability_matrix(db, rooms, candidate_iso_dates)
     availability: Dict[str, List[str]] = {}
-    for entry in ranked:
-        dates: List[str] = []
-        for iso_date in candidate_iso_dates:
-            display_date = format_iso_date_to_ddmmyyyy(iso_date)
-            if not display_date:
-                continue
-            status = room_status_on_date(db, display_date, entry.room)
-            if status.lower() in {"available", "option"}:
-                dates.append(iso_date)
-        availability[entry.room] = dates
+    for room in rooms:
+        availability[room] = matrix.free_dates(room, candidate_iso_dates)
     return availability
 
 
@@ -279,6 +287,108 @@ def closest_alternatives_wrapper(
     return dates_module.closest_alternatives(anchor_iso, weekday_hint, month_hint, limit=limit)
 
 
+# -----------------------------------------------------------------------------
+# Guarded Ranking Results
+# -----------------------------------------------------------------------------
+
+
+def guarded_room_ranking(
+    state: Any,
+    event_entry: Dict[str, Any],
+    *,
+    requirements_hash: Optional[str],
+    status_map: Dict[str, str],
+    chosen_date: Optional[str],
+    participants: Optional[int],
+    preferred_room: Optional[str],
+    preferences: Dict[str, Any],
+    catering_tokens: List[str],
+    product_tokens: List[str],
+    range_detected: bool,
+    vague_month: Optional[Any],
+    vague_weekday: Optional[Any],
+) -> Tuple[Dict[str, Any], bool]:
+    """Rank rooms, build badge profiles and find alternative dates per room.
+
+    Returns ({ranked_rooms, profile_entries, candidate_mode,
+    candidate_iso_dates, available_dates_map}, served_from_cache). The
+    result is stored on the event (workflows.common.guarded_results) keyed
+    on the requirements hash plus every other ranking input, and versioned
+    by the bookings on the chosen and candidate dates and by the room
+    catalog (capacities, features), so a detour or Q&A re-entry with
+    unchanged inputs skips the ranking entirely.
+    """
+    inputs = {
+        "status_map": status_map,
+        "chosen_date": chosen_date,
+        "participants": participants,
+        "preferred_room": preferred_room,
+        "preferences": preferences,
+        "catering": catering_tokens,
+        "products": product_tokens,
+        "range": bool(range_detected),
+        "vague_month": vague_month,
+        "vague_weekday": vague_weekday,
+        "today": date.today().isoformat(),  # alternatives never lie in the past
+    }
+    key = guard_key(requirements_hash, inputs)
+    version = catalog_version()
+    cached = load_guarded(event_entry, STEP3_RANKING, key, state.db, version=version)
+    if cached is not None:
+        bundle = copy.deepcopy(cached)
+        bundle["ranked_rooms"] = [RankedRoom(**entry) for entry in cached["ranked_rooms"]]
+        return bundle, True
+
+    ranked_rooms = rank_rooms(status_map, preferred_room=preferred_room, pax=participants, preferences=preferences)
+    profile_entries = rank_rooms_profiles(
+        chosen_date,
+        participants,
+        status_map=status_map,
+        needs_catering=catering_tokens,
+        needs_products=product_tokens,
+    )
+
+    candidate_mode = "alternatives"
+    candidate_iso_dates: List[str] = []
+    if range_detected and (vague_month or vague_weekday):
+        candidate_iso_dates = dates_in_month_weekday_wrapper(vague_month, vague_weekday, limit=5)
+        candidate_mode = "range"
+    else:
+        iso_anchor = _to_iso(chosen_date)
+        if iso_anchor:
+            candidate_iso_dates = closest_alternatives_wrapper(iso_anchor, vague_weekday, vague_month, limit=3)
+        if not candidate_iso_dates and (vague_month or vague_weekday):
+            candidate_iso_dates = dates_in_month_weekday_wrapper(vague_month, vague_weekday, limit=5)
+            candidate_mode = "range"
+
+    available_dates_map = available_dates_for_rooms(
+        state.db,
+        ranked_rooms,
+        candidate_iso_dates,
+        participants,
+        matrix=turn_availability_matrix(state, [entry.room for entry in ranked_rooms], candidate_iso_dates),
+    )
+
+    bundle = {
+        "ranked_rooms": ranked_rooms,
+        "profile_entries": profile_entries,
+        "candidate_mode": candidate_mode,
+        "candidate_iso_dates": candidate_iso_dates,
+        "available_dates_map": available_dates_map,
+    }
+    store_guarded(
+        event_entry,
+        STEP3_RANKING,
+        key,
+        copy.deepcopy(dict(bundle, ranked_rooms=[asdict(entry) for entry in ranked_rooms])),
+        db=state.db,
+        dates=[chosen_date, *candidate_iso_dates],
+        requirements_hash=requirements_hash,
+        version=version,
+    )
+    return bundle, False
+
+
 # -----------------------------------------------------------------------------
 # Participant Extraction
 # -----------------------------------------------------------------------------
@@ -330,6 +440,7 @@ __all__ = [
     "dates_in_month_weekday_wrapper",
     "closest_alternatives_wrapper",
     "extract_participants",
+    "guarded_room_ranking",
     # Backward-compatible underscore aliases
     "_select_room",
     "_build_ranked_rows",
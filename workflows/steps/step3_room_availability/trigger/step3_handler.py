@@ -38,7 +38,7 @@ from workflows.common.detour_acknowledgment import (
     generate_detour_acknowledgment,
     add_detour_acknowledgment_draft,
 )
-from workflows.io.database import append_audit_entry, update_event_metadata
+from workflows.io.database import append_audit_entry, load_rooms, update_event_metadata
 from workflows.io.config_store import get_catering_teaser_products, get_currency_code
 # MIGRATED: from workflows.common.conflict -> backend.detection.special.room_conflict
 from detection.special.room_conflict import (
@@ -61,6 +61,7 @@ from workflows.steps.step3_room_availability.db_pers import load_rooms_config
 from workflows.nlu import detect_general_room_query, detect_sequential_workflow_request
 from rooms import rank as rank_rooms_profiles, get_max_capacity, any_room_fits_capacity
 
+from ..condition.availability_matrix import turn_availability_matrix
 from ..condition.decide import room_status_on_date
 from ..llm.analysis import summarize_room_statuses
 # Room choice detection (reused from Step 1)
@@ -121,6 +122,7 @@ from .room_ranking import (
     dates_in_month_weekday_wrapper as _dates_in_month_weekday_wrapper,
     closest_alternatives_wrapper as _closest_alternatives_wrapper,
     extract_participants as _extract_participants,
+    guarded_room_ranking as _guarded_room_ranking,
 )
 
 # R7 refactoring (Jan 2026): Room presentation extracted to dedicated module
@@ -899,8 +901,11 @@ def process(state: WorkflowState) -> GroupResult:
     vague_weekday = user_info.get("vague_weekday") or event_entry.get("vague_weekday")
     range_detected = bool(user_info.get("range_query_detected") or event_entry.get("range_query_detected"))
 
+    availability_matrix = turn_availability_matrix(
+        state, load_rooms(), [chosen_date], exclude_event_id=state.event_id
+    )
     room_statuses = evaluate_room_statuses(
-        state.db, chosen_date, exclude_event_id=state.event_id
+        state.db, chosen_date, exclude_event_id=state.event_id, matrix=availability_matrix
     )
     summary = summarize_room_statuses(room_statuses)
     trace_db_read(
@@ -1010,19 +1015,27 @@ def process(state: WorkflowState) -> GroupResult:
     product_tokens = [str(token).strip().lower() for token in (preferences.get("products") or []) if str(token).strip()]
     if not product_tokens:
         product_tokens = [str(token).strip().lower() for token in (preferences.get("wish_products") or []) if str(token).strip()]
-    ranked_rooms = rank_rooms(
-        status_map,
+    ranking, ranking_cached = _guarded_room_ranking(
+        state,
+        event_entry,
+        requirements_hash=current_req_hash,
+        status_map=status_map,
+        chosen_date=chosen_date,
+        participants=participants,
         preferred_room=preferred_room,
-        pax=participants,
         preferences=preferences,
+        catering_tokens=catering_tokens,
+        product_tokens=product_tokens,
+        range_detected=range_detected,
+        vague_month=vague_month,
+        vague_weekday=vague_weekday,
     )
-    profile_entries = rank_rooms_profiles(
-        chosen_date,
-        participants,
-        status_map=status_map,
-        needs_catering=catering_tokens,
-        needs_products=product_tokens,
-    )
+    if ranking_cached:
+        trace_marker(thread_id, "room_ranking_from_guard_cache", owner_step="Step3_Room")
+    else:
+        state.extras["persist"] = True
+    ranked_rooms = ranking["ranked_rooms"]
+    profile_entries = ranking["profile_entries"]
     room_profiles = {entry["room"]: entry for entry in profile_entries}
     # NOTE: Do NOT re-sort ranked_rooms by profile order - that would override
     # the preferred_room bonus from rank_rooms(). The ranking from sorting.py
@@ -1077,30 +1090,9 @@ def process(state: WorkflowState) -> GroupResult:
 
     outcome = selected_status or ROOM_OUTCOME_UNAVAILABLE
 
-    candidate_mode = "alternatives"
-    candidate_iso_dates: List[str] = []
-    if range_detected and (vague_month or vague_weekday):
-        candidate_iso_dates = _dates_in_month_weekday_wrapper(vague_month, vague_weekday, limit=5)
-        candidate_mode = "range"
-    else:
-        iso_anchor = _to_iso(chosen_date)
-        if iso_anchor:
-            candidate_iso_dates = _closest_alternatives_wrapper(
-                iso_anchor,
-                vague_weekday,
-                vague_month,
-                limit=3,
-            )
-        if not candidate_iso_dates and (vague_month or vague_weekday):
-            candidate_iso_dates = _dates_in_month_weekday_wrapper(vague_month, vague_weekday, limit=5)
-            candidate_mode = "range"
-
-    available_dates_map = _available_dates_for_rooms(
-        state.db,
-        ranked_rooms,
-        candidate_iso_dates,
-        participants,
-    )
+    candidate_mode = ranking["candidate_mode"]
+    candidate_iso_dates: List[str] = ranking["candidate_iso_dates"]
+    available_dates_map = ranking["available_dates_map"]
 
     table_rows, actions = _build_ranked_rows(
         chosen_date,
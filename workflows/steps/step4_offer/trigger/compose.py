@@ -18,10 +18,9 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
 from debug.hooks import trace_db_write
-from workflows.common.pricing import derive_room_rate, normalise_rate
+from workflows.common.pricing_engine import price_event
 from workflows.common.timeutils import format_iso_date_to_ddmmyyyy
 
-from .product_ops import menu_name_set as _menu_name_set, normalise_product_fields as _normalise_product_fields
 from ..llm.send_offer_llm import ComposeOffer
 
 
@@ -121,26 +120,11 @@ def _determine_offer_total(event_entry: Dict[str, Any], fallback_total: float) -
     except (TypeError, ValueError):
         display_total = 0.0
 
-    computed_total = 0.0
-
-    pricing_inputs = event_entry.get("pricing_inputs") or {}
-    base_rate = normalise_rate(pricing_inputs.get("base_rate"))
-    if base_rate is None:
-        base_rate = derive_room_rate(event_entry)
-    if base_rate is not None:
-        computed_total += base_rate
-
-    for product in event_entry.get("products", []):
-        normalized = _normalise_product_fields(product, menu_names=_menu_name_set())
-        try:
-            quantity = float(normalized.get("quantity") or 0)
-            unit_price = float(normalized.get("unit_price") or 0.0)
-        except (TypeError, ValueError):
-            continue
-        computed_total += quantity * unit_price
+    # Room rate (pricing_inputs, else catalog) plus products, memoized by inputs hash
+    computed_total = price_event(event_entry).total
 
     if computed_total > 0:
-        return round(computed_total, 2)
+        return computed_total
     return round(display_total, 2)
 
 
@@ -11,14 +11,10 @@ Usage:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from workflows.common.pricing import derive_room_rate, normalise_rate
-
-from .product_ops import (
-    menu_name_set as _menu_name_set,
-    normalise_product_fields as _normalise_product_fields,
-)
+from workflows.common.pricing import normalise_rate
+from workflows.common.pricing_engine import compile_price_table, price
 
 
 def rebuild_pricing_inputs(
@@ -31,7 +27,7 @@ def rebuild_pricing_inputs(
     1. Takes existing pricing_inputs from event_entry
     2. Applies room_rate override if provided in user_info
     3. Derives room rate from catalog if not set
-    4. Creates line_items from products
+    4. Creates line_items from products (pricing engine, memoized)
     5. Applies total_amount override if provided in user_info
 
     Args:
@@ -43,39 +39,23 @@ def rebuild_pricing_inputs(
     """
     pricing_inputs = dict(event_entry.get("pricing_inputs") or {})
     override_total = user_info.get("offer_total_override")
-    menu_names = _menu_name_set()
 
     # Apply room rate override from user_info
     base_rate_override = normalise_rate(user_info.get("room_rate")) if "room_rate" in user_info else None
     if base_rate_override is not None:
         pricing_inputs["base_rate"] = base_rate_override
 
-    # Derive room rate from catalog if not set
-    if normalise_rate(pricing_inputs.get("base_rate")) is None:
-        derived_rate = derive_room_rate(event_entry)
-        if derived_rate is not None:
-            pricing_inputs["base_rate"] = derived_rate
-
-    # Build line items from products
-    line_items: List[Dict[str, Any]] = []
-    normalised_products: List[Dict[str, Any]] = []
-    for product in event_entry.get("products", []):
-        normalised = _normalise_product_fields(product, menu_names=menu_names)
-        line_items.append(
-            {
-                "description": normalised["name"],
-                "quantity": normalised["quantity"],
-                "unit_price": normalised["unit_price"],
-                "amount": normalised["quantity"] * normalised["unit_price"],
-            }
-        )
-        normalised_products.append(normalised)
+    # Compile products + room rate into a price table (rate derived from catalog if not set)
+    table = compile_price_table(event_entry, base_rate=pricing_inputs.get("base_rate"))
+    if normalise_rate(pricing_inputs.get("base_rate")) is None and table.base_rate is not None:
+        pricing_inputs["base_rate"] = table.base_rate
 
-    # Update event_entry with normalised products
-    if normalised_products:
-        event_entry["products"] = normalised_products
+    # Line items from the memoized quote
+    pricing_inputs["line_items"] = price(table).line_items()
 
-    pricing_inputs["line_items"] = line_items
+    # Update event_entry with normalised products
+    if table.products:
+        event_entry["products"] = table.normalised_products()
 
     # Apply total override if provided
     if override_total is not None:
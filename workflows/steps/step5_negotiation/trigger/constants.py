@@ -7,6 +7,10 @@ Extracted from step5_handler.py and classification.py as part of N2 refactoring
 # Counter proposal limits
 MAX_COUNTER_PROPOSALS = 3
 
+# What-if solver (budget counter-offers): options shown / variants priced per turn
+WHATIF_MAX_OPTIONS = 3
+WHATIF_MAX_CANDIDATES = 400
+
 # Confidence thresholds for classification
 CONFIDENCE_ROOM_SELECTION = 0.85
 CONFIDENCE_COUNTER_PRICE = 0.65
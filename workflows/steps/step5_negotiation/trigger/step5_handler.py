@@ -22,7 +22,7 @@ from workflows.common.confirmation_gate import (
     get_next_prompt,
 )
 from workflows.common.prompts import append_footer
-from workflows.common.pricing import derive_room_rate, normalise_rate
+from workflows.common.pricing_engine import price_event
 # MIGRATED: from workflows.common.confidence -> backend.detection.intent.confidence
 from detection.intent.confidence import (
     should_defer_to_human,
@@ -71,6 +71,15 @@ from .constants import (
     OFFER_STATUS_DECLINED,
     SITE_VISIT_PROPOSED,
 )
+from .whatif_solver import (
+    OfferAlternative,
+    apply_alternative,
+    format_alternatives,
+    parse_budget,
+    parse_option_choice,
+    room_still_free,
+    solve_alternatives,
+)
 from .classification import (
     classify_message as _classify_message,
     collect_detected_intents as _collect_detected_intents,
@@ -315,6 +324,7 @@ def process(state: WorkflowState) -> GroupResult:
         update_event_metadata(event_entry, caller_step=5, current_step=target_step)
         append_audit_entry(event_entry, 5, target_step, reason)
         negotiation_state["counter_count"] = 0
+        negotiation_state.pop("whatif", None)  # Options were priced for the old offer
         # Clear stale negotiation state when detouring - old offer no longer valid
         if target_step in {2, 3}:
             event_entry.pop("negotiation_pending_decision", None)
@@ -338,6 +348,16 @@ def process(state: WorkflowState) -> GroupResult:
             halt=False,
         )
 
+    # [WHAT-IF CHOICE] Client picked one of the priced alternatives we sent
+    # (after change detection: "option 2, but on 5 March" is a date change)
+    whatif = negotiation_state.get("whatif")
+    if whatif:
+        choice = parse_option_choice(message_text, len(whatif.get("options") or []))
+        if choice is not None:
+            chosen = _apply_offer_alternative(state, event_entry, negotiation_state, choice)
+            if chosen is not None:
+                return chosen
+
     # -------------------------------------------------------------------------
     # SITE VISIT HANDLING: Check if client is responding to site visit proposal
     # -------------------------------------------------------------------------
@@ -571,6 +591,20 @@ def process(state: WorkflowState) -> GroupResult:
                 _append_deferred_general_qna(state, event_entry, qna_classification, thread_id)
             return result
 
+        budget = parse_budget(message_text)
+        if budget is not None:
+            alternatives = solve_alternatives(event_entry, state.db, budget=budget, state=state)
+            if alternatives:
+                return _present_offer_alternatives(
+                    state,
+                    event_entry,
+                    negotiation_state,
+                    budget,
+                    alternatives,
+                    qna_classification=qna_classification if deferred_general_qna else None,
+                    thread_id=thread_id,
+                )
+
         update_event_metadata(event_entry, caller_step=5, current_step=4)
         append_audit_entry(event_entry, 5, 4, "negotiation_counter")
         state.caller_step = 5
@@ -623,6 +657,134 @@ def process(state: WorkflowState) -> GroupResult:
     return result
 
 
+def _present_offer_alternatives(
+    state: WorkflowState,
+    event_entry: Dict[str, Any],
+    negotiation_state: Dict[str, Any],
+    budget: float,
+    alternatives: List[OfferAlternative],
+    *,
+    qna_classification: Optional[Dict[str, Any]],
+    thread_id: Optional[str],
+) -> GroupResult:
+    """Answer a budget counter with priced alternatives instead of a step 4 round trip."""
+
+    current_total = price_event(event_entry).total
+    negotiation_state["whatif"] = {
+        "budget": budget,
+        "base_total": current_total,
+        "options": [option.to_dict() for option in alternatives],
+    }
+    draft = {
+        "body": append_footer(
+            format_alternatives(budget, current_total, alternatives),
+            step=5,
+            next_step=5,
+            thread_state="Awaiting Client Response",
+        ),
+        "step": 5,
+        "topic": "negotiation_alternatives",
+        "requires_approval": True,  # Proposes another room / product set
+    }
+    state.add_draft_message(draft)
+    append_audit_entry(event_entry, 5, 5, "negotiation_alternatives")
+    update_event_metadata(event_entry, current_step=5, thread_state="Awaiting Client Response")
+    state.set_thread_state("Awaiting Client Response")
+    state.extras["persist"] = True
+    payload = {
+        "client_id": state.client_id,
+        "event_id": event_entry.get("event_id"),
+        "intent": state.intent.value if state.intent else None,
+        "confidence": round(state.confidence or 0.0, 3),
+        "counter_count": negotiation_state["counter_count"],
+        "budget": budget,
+        "alternatives": negotiation_state["whatif"]["options"],
+        "draft_messages": state.draft_messages,
+        "thread_state": state.thread_state,
+        "context": state.context_snapshot,
+        "persisted": True,
+    }
+    result = GroupResult(action="negotiation_alternatives", payload=payload, halt=True)
+    if qna_classification is not None:
+        _append_deferred_general_qna(state, event_entry, qna_classification, thread_id)
+    return result
+
+
+def _apply_offer_alternative(
+    state: WorkflowState,
+    event_entry: Dict[str, Any],
+    negotiation_state: Dict[str, Any],
+    choice: int,
+) -> Optional[GroupResult]:
+    """Apply the alternative the client picked and send the thread back to re-offer.
+
+    Product and rate changes are written to the event and step 4 re-prices
+    the offer; a room swap goes through step 3 as a room choice first.
+    Returns None when the stored options no longer match the offer.
+    """
+
+    whatif = negotiation_state.pop("whatif")
+    state.extras["persist"] = True
+    if round(price_event(event_entry).total, 2) != round(float(whatif.get("base_total") or 0.0), 2):
+        # The offer changed since the options were priced: treat the message normally
+        return None
+
+    option = whatif["options"][choice - 1]
+    room = option.get("room")
+    swap = bool(room) and room != event_entry.get("locked_room_id")
+    payload = {
+        "client_id": state.client_id,
+        "event_id": event_entry.get("event_id"),
+        "intent": state.intent.value if state.intent else None,
+        "confidence": round(state.confidence or 0.0, 3),
+        "choice": choice,
+        "alternative": option.get("label"),
+        "context": state.context_snapshot,
+        "persisted": True,
+    }
+
+    if swap and not room_still_free(event_entry, state.db, room):
+        negotiation_state["whatif"] = whatif  # The other options still stand
+        draft = {
+            "body": append_footer(
+                f"{room} is no longer available on {event_entry.get('chosen_date')}, so option {choice} "
+                "can't be booked any more. Let me know which of the other options you'd like, "
+                "or what else you'd like to adjust.",
+                step=5,
+                next_step=5,
+                thread_state="Awaiting Client Response",
+            ),
+            "step": 5,
+            "topic": "negotiation_alternative_unavailable",
+            "requires_approval": True,
+        }
+        state.add_draft_message(draft)
+        update_event_metadata(event_entry, current_step=5, thread_state="Awaiting Client Response")
+        state.set_thread_state("Awaiting Client Response")
+        payload.update(draft_messages=state.draft_messages, thread_state=state.thread_state)
+        return GroupResult(action="negotiation_alternative_unavailable", payload=payload, halt=True)
+
+    apply_alternative(event_entry, option)
+    negotiation_state["whatif_applied"] = {
+        "choice": choice,
+        "label": option.get("label"),
+        "total": option.get("total"),
+    }
+    target_step = 3 if swap else 4
+    if swap:
+        user_info = dict(state.user_info or {})
+        user_info["room"] = room
+        user_info["_room_choice_detected"] = True
+        state.user_info = user_info
+    update_event_metadata(event_entry, caller_step=5, current_step=target_step)
+    append_audit_entry(event_entry, 5, target_step, "negotiation_alternative_selected")
+    state.caller_step = 5
+    state.current_step = target_step
+    state.set_thread_state("In Progress")
+    payload["detour_to_step"] = target_step
+    return GroupResult(action="negotiation_alternative_selected", payload=payload, halt=False)
+
+
 def _ask_classification_clarification(
     state: WorkflowState,
     event_entry: Dict[str, Any],
@@ -1245,22 +1407,6 @@ def _determine_offer_total(event_entry: Dict[str, Any]) -> float:
     pricing_inputs = event_entry.get("pricing_inputs") or {}
     total_candidates.extend([pricing_inputs.get("total_amount"), pricing_inputs.get("total")])
 
-    computed_total = 0.0
-    base_rate = normalise_rate(pricing_inputs.get("base_rate"))
-    if base_rate is None:
-        base_rate = derive_room_rate(event_entry)
-    if base_rate is not None:
-        computed_total += base_rate
-
-    for product in event_entry.get("products") or []:
-        normalised = _normalise_product_fields(product, menu_names=_menu_name_set())
-        try:
-            quantity = float(normalised.get("quantity") or 0)
-            unit_price = float(normalised.get("unit_price") or 0.0)
-        except (TypeError, ValueError):
-            continue
-        computed_total += quantity * unit_price
-
     for candidate in total_candidates:
         try:
             value = float(candidate)
@@ -1269,8 +1415,10 @@ def _determine_offer_total(event_entry: Dict[str, Any]) -> float:
         except (TypeError, ValueError):
             continue
 
+    # Room rate plus products from the pricing engine (memoized by inputs hash)
+    computed_total = price_event(event_entry).total
     if computed_total > 0:
-        return round(computed_total, 2)
+        return computed_total
     return 0.0
 
 
@@ -0,0 +1,419 @@
+"""
+What-if solver for step 5 counter-offers.
+
+When a client answers the offer with a budget ("our budget is CHF 2'500",
+"we can't go above 3000"), the step used to send the thread back to step 4
+and let the client try changes one turn at a time. The solver instead
+enumerates a bounded set of concrete alternatives in one pass and prices
+each with the pricing engine (memoized quotes, see
+workflows.common.pricing_engine):
+
+- room swaps: cheaper catalog rooms with enough capacity that are free on
+  the chosen date (one shared availability matrix for all rooms);
+- dropping one or two products, or substituting the next cheaper catering
+  or beverage product with the same unit.
+
+Room and product variants are combined, deduplicated by quote and ranked by
+closeness to the budget: options within budget first (smallest gap, then
+fewest changes), otherwise the smallest overshoot. An option that fits is
+not listed when a subset of its changes already fits. Half-day rates are
+not offered: the booked time window would have to change with the rate.
+
+The options are stored on the event (negotiation_state["whatif"]); when the
+client answers with one of them ("option 2", "the second one"),
+`parse_option_choice` picks it (after step 5's structural change detection,
+so "option 2, but on 5 March" detours for the date instead) and
+`apply_alternative` writes its product and rate changes to the event so
+step 4 can re-price and resend the offer.
+
+Usage:
+    budget = parse_budget(message_text)
+    options = solve_alternatives(event_entry, state.db, budget=budget, state=state)
+    # [OfferAlternative(label="Switch to Room B; Remove Flipchart", total=2480.0, ...)]
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.products import find_product, list_product_records
+from services.rooms import load_room_catalog
+from workflows.common.pricing import room_rate_for_name
+from workflows.common.pricing_engine import PriceQuote, PriceTable, compile_price_table, price, what_if
+from workflows.steps.step3_room_availability.condition.availability_matrix import (
+    FREE_STATUSES,
+    build_availability_matrix,
+    turn_availability_matrix,
+)
+
+from .constants import WHATIF_MAX_CANDIDATES, WHATIF_MAX_OPTIONS
+
+_AMOUNT = re.compile(
+    r"(?:CHF|Fr\.?|EUR|€)?\s*(\d{1,3}(?:[',’ ]\d{3})+|\d+)(?:\.(\d{1,2}))?(?:\s*(?:CHF|francs?|EUR|€|\.-))?",
+    re.IGNORECASE,
+)
+_HEADCOUNT = re.compile(r"\s*(?:people|persons|guests|participants|attendees|pax)\b", re.IGNORECASE)
+_CUE = re.compile(
+    r"\b(?:budget|max(?:imum)?|at most|up to|under|below|less than|no more than|limit|cap|"
+    r"(?:go|be)\s+(?:above|over|beyond))\b",
+    re.IGNORECASE,
+)
+_BUDGET_AFTER = re.compile(r"\s*(?:budget|max(?:imum)?|limit)\b", re.IGNORECASE)
+_CUE_WINDOW = 60
+_ORDINALS = {"first": 1, "1st": 1, "second": 2, "2nd": 2, "third": 3, "3rd": 3, "fourth": 4, "4th": 4, "fifth": 5, "5th": 5}
+_OPTION_NUMBER = re.compile(r"(?:\b(?:option|alternative|choice|number|no\.?)|#)\s*(\d{1,2})\b", re.IGNORECASE)
+_OPTION_ORDINAL = re.compile(
+    r"\b(" + "|".join(_ORDINALS) + r")\s+(?:one|option|alternative|choice)\b", re.IGNORECASE
+)
+_BARE_NUMBER = re.compile(r"^\W*(\d{1,2})\W*$")
+# Categories whose products are tiers of the same service (lunch vs premium lunch)
+SUBSTITUTABLE_CATEGORIES = ("Catering", "Beverages")
+
+
+def _amount_value(match: "re.Match[str]") -> Optional[float]:
+    whole = re.sub(r"[',’ ]", "", match.group(1))
+    value = float(f"{whole}.{match.group(2) or '0'}")
+    return value if value > 0 else None
+
+
+def parse_budget(text: Optional[str]) -> Optional[float]:
+    """Budget ceiling stated in a client message, or None.
+
+    Looks for an amount shortly after a cue ("budget", "max", "can't go
+    above") or right before "budget"; headcounts ("for 30 people") are skipped.
+    """
+
+    if not text:
+        return None
+    for cue in _CUE.finditer(text):
+        window = text[cue.end(): cue.end() + _CUE_WINDOW]
+        for amount in _AMOUNT.finditer(window):
+            if _HEADCOUNT.match(window, amount.end()):
+                continue
+            return _amount_value(amount)
+    for amount in _AMOUNT.finditer(text):
+        if _BUDGET_AFTER.match(text, amount.end()):
+            return _amount_value(amount)
+    return None
+
+
+def parse_option_choice(text: Optional[str], count: int) -> Optional[int]:
+    """1-based option the client picked from a list of count options, or None."""
+
+    if not text or count <= 0:
+        return None
+    match = _OPTION_NUMBER.search(text) or _BARE_NUMBER.match(text)
+    if match:
+        choice = int(match.group(1))
+    else:
+        ordinal = _OPTION_ORDINAL.search(text)
+        if not ordinal:
+            return None
+        choice = _ORDINALS[ordinal.group(1).lower()]
+    return choice if 1 <= choice <= count else None
+
+
+@dataclass(frozen=True)
+class OfferAlternative:
+    """One priced alternative to the current offer."""
+
+    changes: Tuple[str, ...]
+    room: Optional[str]
+    base_rate: Optional[float]
+    quote: PriceQuote = field(repr=False)
+    saving: float
+    within_budget: bool
+    drop: Tuple[str, ...] = ()
+    add: Tuple[Dict[str, Any], ...] = ()
+
+    @property
+    def label(self) -> str:
+        return "; ".join(self.changes)
+
+    @property
+    def total(self) -> float:
+        return self.quote.total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "changes": list(self.changes),
+            "room": self.room,
+            "base_rate": self.base_rate,
+            "total": self.total,
+            "saving": self.saving,
+            "within_budget": self.within_budget,
+            "drop": list(self.drop),
+            "add": [dict(row) for row in self.add],
+            "line_items": self.quote.line_items(),
+        }
+
+
+@dataclass(frozen=True)
+class _RoomOption:
+    room: Optional[str]
+    base_rate: Optional[float]
+    changes: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _ProductOption:
+    drop: Tuple[str, ...]
+    add: Tuple[Dict[str, Any], ...]
+    changes: Tuple[str, ...]
+
+
+def _current_room(event_entry: Dict[str, Any]) -> Optional[str]:
+    return event_entry.get("locked_room_id") or (event_entry.get("room_pending_decision") or {}).get("selected_room")
+
+
+def _free_rooms(
+    event_entry: Dict[str, Any],
+    db: Dict[str, Any],
+    participants: Optional[int],
+    current: Optional[str],
+    state: Any,
+) -> List[str]:
+    chosen_date = event_entry.get("chosen_date")
+    if not chosen_date or not participants:
+        return []
+    candidates = [
+        record.name
+        for record in load_room_catalog()
+        if record.capacity_max and record.capacity_max >= participants
+        and (not current or record.name.lower() != current.lower())
+    ]
+    if not candidates:
+        return []
+    exclude = event_entry.get("event_id")
+    if state is not None:
+        matrix = turn_availability_matrix(state, candidates, [chosen_date], exclude_event_id=exclude)
+    else:
+        matrix = build_availability_matrix(db, candidates, [chosen_date], exclude_event_id=exclude)
+    return [room for room in candidates if matrix.status(room, chosen_date) in FREE_STATUSES]
+
+
+def _room_options(
+    event_entry: Dict[str, Any],
+    db: Dict[str, Any],
+    table: PriceTable,
+    state: Any,
+) -> List[_RoomOption]:
+    current = _current_room(event_entry)
+    options = [_RoomOption(current, table.base_rate, ())]
+    for room in _free_rooms(event_entry, db, table.participants, current, state):
+        rate = room_rate_for_name(room)
+        if rate is None or (table.base_rate is not None and rate >= table.base_rate):
+            continue
+        options.append(_RoomOption(room, rate, (f"Switch to {room}",)))
+    return options
+
+
+def _name_tokens(name: str) -> set:
+    return {token for token in re.findall(r"[a-z]+", name.lower()) if len(token) > 2}
+
+
+def _cheaper_substitute(name: str, unit_price: float) -> Optional[Any]:
+    """Next cheaper catalog product of the same kind, preferring a similar name."""
+
+    record = find_product(name)
+    if record is None or record.category not in SUBSTITUTABLE_CATEGORIES:
+        return None
+    tokens = _name_tokens(record.name)
+    cheaper = [
+        other
+        for other in list_product_records()
+        if other.category == record.category
+        and other.unit == record.unit
+        and other.name != record.name
+        and 0 < other.base_price < unit_price
+    ]
+    return max(cheaper, key=lambda other: (len(tokens & _name_tokens(other.name)), other.base_price), default=None)
+
+
+def _product_options(table: PriceTable) -> List[_ProductOption]:
+    options = [_ProductOption((), (), ())]
+    for name in table.names:
+        options.append(_ProductOption((name,), (), (f"Remove {name}",)))
+    if len(table.names) <= 8:
+        for first, second in combinations(table.names, 2):
+            options.append(_ProductOption((first, second), (), (f"Remove {first}", f"Remove {second}")))
+    for index, name in enumerate(table.names):
+        substitute = _cheaper_substitute(name, table.unit_prices[index])
+        if substitute is None:
+            continue
+        row = {
+            "name": substitute.name,
+            "unit": substitute.unit,
+            "quantity": table.quantities[index],
+            "unit_price": substitute.base_price,
+        }
+        options.append(_ProductOption((name,), (row,), (f"{substitute.name} instead of {name}",)))
+    return options
+
+
+def _fits_room(product: _ProductOption, room: Optional[str], table: PriceTable) -> Tuple[bool, Tuple[str, ...]]:
+    """Whether the product variant can run in room; also names lines the room forces out."""
+
+    if not room:
+        return True, ()
+    # Imported here: the step 4 handler imports step 5 at import time
+    from workflows.steps.step4_offer.trigger.product_ops import product_unavailable_in_room
+
+    for row in product.add:
+        record = find_product(row["name"])
+        if record is not None and product_unavailable_in_room(record, room):
+            return False, ()
+    forced = []
+    for name in table.names:
+        if name in product.drop:
+            continue
+        record = find_product(name)
+        if record is not None and product_unavailable_in_room(record, room):
+            forced.append(name)
+    return True, tuple(forced)
+
+
+def _rank(options: Sequence[OfferAlternative], budget: float, limit: int) -> List[OfferAlternative]:
+    feasible = [option for option in options if option.within_budget]
+    if feasible:
+        change_sets = [frozenset(option.changes) for option in feasible]
+        feasible = [
+            option
+            for option, changes in zip(feasible, change_sets)
+            if not any(other < changes for other in change_sets)
+        ]
+        feasible.sort(key=lambda option: (round(budget - option.total, 2), len(option.changes), option.label))
+        return feasible[:limit]
+    rest = sorted(options, key=lambda option: (round(option.total - budget, 2), len(option.changes), option.label))
+    return rest[:limit]
+
+
+def solve_alternatives(
+    event_entry: Dict[str, Any],
+    db: Dict[str, Any],
+    *,
+    budget: float,
+    state: Any = None,
+    limit: int = WHATIF_MAX_OPTIONS,
+    max_candidates: int = WHATIF_MAX_CANDIDATES,
+) -> List[OfferAlternative]:
+    """Priced alternatives to the current offer, closest to budget first.
+
+    Returns [] when the current offer already fits the budget. The event is
+    not modified; pass state to share the turn's availability matrix.
+    """
+
+    table = compile_price_table(event_entry)
+    base = price(table)
+    if base.total <= budget:
+        return []
+
+    current_room = _current_room(event_entry)
+    seen = {base.fingerprint}
+    priced: List[OfferAlternative] = []
+    evaluated = 0
+    product_options = _product_options(table)
+    for room_option in _room_options(event_entry, db, table, state):
+        swapped = room_option.room != current_room
+        for product_option in product_options:
+            if evaluated >= max_candidates:
+                break
+            fits, forced = _fits_room(product_option, room_option.room if swapped else None, table)
+            if not fits:
+                continue
+            evaluated += 1
+            quote = what_if(
+                table,
+                base_rate=room_option.base_rate,
+                drop=product_option.drop + forced,
+                add=product_option.add,
+            )
+            if quote.fingerprint in seen:
+                continue
+            seen.add(quote.fingerprint)
+            changes = (
+                room_option.changes
+                + product_option.changes
+                + tuple(f"Remove {name} (not available in {room_option.room})" for name in forced)
+            )
+            priced.append(
+                OfferAlternative(
+                    changes=changes,
+                    room=room_option.room,
+                    base_rate=room_option.base_rate,
+                    quote=quote,
+                    saving=round(base.total - quote.total, 2),
+                    within_budget=quote.total <= budget,
+                    drop=product_option.drop + forced,
+                    add=product_option.add,
+                )
+            )
+    return _rank([option for option in priced if option.saving > 0], budget, limit)
+
+
+def room_still_free(event_entry: Dict[str, Any], db: Dict[str, Any], room: str) -> bool:
+    """Whether room is still free on the event's date (options are stored across turns)."""
+
+    chosen_date = event_entry.get("chosen_date")
+    if not chosen_date:
+        return False
+    matrix = build_availability_matrix(db, [room], [chosen_date], exclude_event_id=event_entry.get("event_id"))
+    return matrix.status(room, chosen_date) in FREE_STATUSES
+
+
+def apply_alternative(event_entry: Dict[str, Any], option: Dict[str, Any]) -> None:
+    """Write a stored option's product and rate changes to the event.
+
+    A room swap is not applied here: the caller routes it through step 3 so
+    the new room is locked like any other room choice.
+    """
+
+    drop = {name.lower() for name in option.get("drop") or ()}
+    products = [
+        product for product in event_entry.get("products") or []
+        if str(product.get("name") or "").lower() not in drop
+    ]
+    products.extend(dict(row) for row in option.get("add") or ())
+    event_entry["products"] = products
+    pricing_inputs = dict(event_entry.get("pricing_inputs") or {})
+    pricing_inputs.pop("line_items", None)
+    if option.get("base_rate") is not None:
+        pricing_inputs["base_rate"] = option["base_rate"]
+    event_entry["pricing_inputs"] = pricing_inputs
+
+
+def format_alternatives(budget: float, current_total: float, options: Sequence[OfferAlternative]) -> str:
+    """Client-facing list of the options."""
+
+    fits = any(option.within_budget for option in options)
+    lines = [
+        f"Thanks for sharing your budget of CHF {budget:,.2f}. The current offer comes to CHF {current_total:,.2f}.",
+        "Here are some options that fit:" if fits else "These options come closest to it:",
+        "",
+    ]
+    for index, option in enumerate(options, start=1):
+        lines.append(
+            f"{index}. {option.label} — CHF {option.total:,.2f} (saves CHF {option.saving:,.2f})"
+        )
+    lines.extend(
+        [
+            "",
+            "Reply with the option you prefer and I'll update the offer, or let me know what else you'd like to adjust.",
+        ]
+    )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "OfferAlternative",
+    "apply_alternative",
+    "format_alternatives",
+    "parse_budget",
+    "parse_option_choice",
+    "room_still_free",
+    "solve_alternatives",
+]